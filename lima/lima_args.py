@@ -2,23 +2,70 @@
 
 # Standard Imports
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 import argparse
 import sys
 # Third Party Imports
 # Local Imports
+from lima.lima_defaults import (DEFAULT_BLOCK_SIZE, DEFAULT_DEBOUNCE, DEFAULT_LEASE, DEFAULT_PORT,
+                                DEFAULT_SLOWEST, DEFAULT_SOCKET, DEFAULT_UNIT_SIZE,
+                                DEFAULT_WORKERS, ENCODING_AUTO, SUPPORTED_REPORTS,
+                                SUPPORTED_SCHEDULES)
+from lima.lima_engine import ENGINE_AUTO, SUPPORTED_ENGINES, validate_engine
 from lima.lima_validation import validate_path_dir, validate_path_file, validate_string
 
 DEFAULT_ENCODING = 'utf-8'  # Default encoding
-# Supported --encoding values
-SUPPORTED_ENCODINGS = [DEFAULT_ENCODING, 'utf-16']
+# Supported --encoding values.  ENCODING_AUTO detects each file's encoding.
+SUPPORTED_ENCODINGS = [DEFAULT_ENCODING, 'utf-16', ENCODING_AUTO]
+STDIN_ARG = '-'  # --file value that reads the target from stdin
+
+# SUB-COMMANDS
+CMD_FILE = 'file'    # Use Case 1
+CMD_DIR = 'dir'      # Use Case 2
+CMD_WATCH = 'watch'  # Use Case 3
+CMD_SERVE = 'serve'  # Use Case 4
+CMD_GIT = 'git'      # Use Case 5
+CMD_COORDINATE = 'coordinate'  # Use Case 6
+CMD_WORKER = 'worker'          # Use Case 7
 
 # ARGUMENT DICTIONARY KEYS
+ARG_DICT_KEY_CMD = 'command'    # Sub-command
 ARG_DICT_KEY_FILE = 'file'      # -f, --file
+ARG_DICT_KEY_STDIN = 'stdin'    # -f -, --file -
 ARG_DICT_KEY_DIR = 'dir'        # -d, --dir
 ARG_DICT_KEY_WORDS = 'words'    # -w, --words
 ARG_DICT_KEY_RECUR = 'recurse'  # -r, --recursive
 ARG_DICT_KEY_ENCODE = 'encode'  # -e, --encoding
+ARG_DICT_KEY_ENGINE = 'engine'  # --engine
+ARG_DICT_KEY_DEBOUNCE = 'debounce'  # --debounce
+ARG_DICT_KEY_POLL = 'poll'          # --poll
+ARG_DICT_KEY_SOCKET = 'socket'      # --socket
+ARG_DICT_KEY_LOCAL = 'local'        # --local
+ARG_DICT_KEY_WORKERS = 'workers'    # --workers
+ARG_DICT_KEY_CACHE = 'cache'        # --cache
+ARG_DICT_KEY_NO_CACHE = 'no_cache'  # --no-cache
+ARG_DICT_KEY_OUTPUT = 'output'      # --output
+ARG_DICT_KEY_CHECKPOINT = 'checkpoint'  # --checkpoint
+ARG_DICT_KEY_ADDRESS = 'address'        # --listen, --connect
+ARG_DICT_KEY_UNIT_SIZE = 'unit_size'    # --unit-size
+ARG_DICT_KEY_LEASE = 'lease'            # --lease
+ARG_DICT_KEY_PREFILTER = 'prefilter'    # --prefilter
+ARG_DICT_KEY_BLOCK_SIZE = 'block_size'  # --block-size
+ARG_DICT_KEY_NO_CACHE_POLLUTION = 'no_cache_pollution'  # --no-cache-pollution
+ARG_DICT_KEY_SCHEDULE = 'schedule'                    # --schedule
+ARG_DICT_KEY_EXTENSION_WEIGHTS = 'extension_weights'  # --extension-weights
+ARG_DICT_KEY_TIME_BUDGET = 'time_budget'              # --time-budget
+ARG_DICT_KEY_TIMEOUT = 'timeout'                      # --timeout
+ARG_DICT_KEY_MAX_FILE_SIZE = 'max_file_size'          # --max-file-size
+ARG_DICT_KEY_REPORTS = 'reports'                      # --report
+ARG_DICT_KEY_PROFILE = 'profile'                      # --profile
+ARG_DICT_KEY_SLOWEST = 'slowest'                      # --slowest
+ARG_DICT_KEY_SECTIONS = 'sections'                    # --sections
+ARG_DICT_KEY_DECOMPRESS = 'decompress'                # --decompress
+ARG_DICT_KEY_EXTRACT = 'extract'                      # --extract
+ARG_DICT_KEY_PLUGINS = 'plugins'                      # --plugins
+ARG_DICT_KEY_SUBSUME = 'subsume'                      # --subsume
+ARG_DICT_KEY_NORMALIZE = 'normalize'                  # --normalize
 
 
 class LimaParser(argparse.ArgumentParser):
@@ -42,10 +89,10 @@ def parse_lima_args() -> Dict[str, Any]:
 
     Raises:
         FileNotFoundError: --database value not found
-        NotImplementedError: --encoding value not supported
+        NotImplementedError: --encoding or --engine value not supported
         OSError: --database value is not a file
         TypeError: Bad datatype
-        ValueError: Blank(?) --database value
+        ValueError: Blank(?) --database value, negative --debounce, or --workers less than 1
     """
     # LOCAL VARIABLES
     parsed_args = None  # Parsed args as an argparse.Namespace object
@@ -56,39 +103,164 @@ def parse_lima_args() -> Dict[str, Any]:
     subs = None         # Subparsers
     file_parser = None  # Use Case 1 (file) subparser
     dir_parser = None   # Use Case 2 (directory) subparser
+    watch_parser = None  # Use Case 3 (watch) subparser
+    serve_parser = None  # Use Case 4 (serve) subparser
+    git_parser = None    # Use Case 5 (git) subparser
+    cache_group = None   # Mutually exclusive git cache arguments
     # Object for parsing command line input into Python objects
     parser = LimaParser(prog='LIVING MANUAL (LIMA)')
 
     # ARGUMENTS
     # Add
-    subs = parser.add_subparsers(required=True)
+    subs = parser.add_subparsers(required=True, dest='command')
     # Use Case 1: File
-    file_parser = subs.add_parser('file', help='Search a file for dirty words')
+    file_parser = subs.add_parser(CMD_FILE, help='Search a file for dirty words')
     file_parser.add_argument('-f', '--file', action='store', required=True,
-                             help='Target file to search for dirty words')
+                             help='Target file to search for dirty words '
+                                  f'("{STDIN_ARG}" reads stdin)')
     file_parser.add_argument('-w', '--words', action='store', required=True,
                              help='Dirty word list')
     file_parser = _add_encoding_arg(file_parser)  # Add --encoding to the sub-parser
+    file_parser = _add_subsume_arg(file_parser)   # Add --subsume to the sub-parser
+    file_parser = _add_engine_arg(file_parser)    # Add --engine to the sub-parser
+    file_parser = _add_output_arg(file_parser)    # Add --output to the sub-parser
+    file_parser = _add_report_arg(file_parser)    # Add --report to the sub-parser
+    file_parser = _add_prefilter_arg(file_parser)  # Add --prefilter to the sub-parser
+    file_parser = _add_sections_arg(file_parser)  # Add --sections to the sub-parser
+    file_parser = _add_normalize_arg(file_parser)  # Add --normalize to the sub-parser
+    file_parser = _add_decompress_arg(file_parser)  # Add --decompress to the sub-parser
+    file_parser = _add_extract_arg(file_parser)   # Add --extract to the sub-parser
+    file_parser = _add_plugins_arg(file_parser)   # Add --plugins to the sub-parser
+    file_parser = _add_io_args(file_parser)       # Add --block-size and --no-cache-pollution
+    file_parser = _add_profile_args(file_parser)  # Add --profile and --slowest
+    file_parser = _add_client_args(file_parser)   # Add --socket and --local to the sub-parser
     # Use Case 2: Directory
-    dir_parser = subs.add_parser('dir', help='Search a directory for files with dirty words')
+    dir_parser = subs.add_parser(CMD_DIR, help='Search a directory for files with dirty words')
     dir_parser.add_argument('-d', '--dir', action='store', required=True,
                             help='Search for dirty words in all files found in this directory')
     dir_parser.add_argument('-w', '--words', action='store', required=True,
                             help='Dirty word list')
     dir_parser.add_argument('-r', '--recursive', action='store_true', required=False,
                             help='Search all child directories', default=False)
+    dir_parser.add_argument('--checkpoint', action='store', required=False,
+                            help='Record progress in this file, and resume from it if it exists',
+                            default=None)
     dir_parser = _add_encoding_arg(dir_parser)  # Add --encoding to the sub-parser
+    dir_parser = _add_subsume_arg(dir_parser)   # Add --subsume to the sub-parser
+    dir_parser = _add_engine_arg(dir_parser)    # Add --engine to the sub-parser
+    dir_parser = _add_output_arg(dir_parser)    # Add --output to the sub-parser
+    dir_parser = _add_report_arg(dir_parser)    # Add --report to the sub-parser
+    dir_parser = _add_prefilter_arg(dir_parser)  # Add --prefilter to the sub-parser
+    dir_parser = _add_sections_arg(dir_parser)  # Add --sections to the sub-parser
+    dir_parser = _add_normalize_arg(dir_parser)  # Add --normalize to the sub-parser
+    dir_parser = _add_decompress_arg(dir_parser)  # Add --decompress to the sub-parser
+    dir_parser = _add_extract_arg(dir_parser)   # Add --extract to the sub-parser
+    dir_parser = _add_plugins_arg(dir_parser)   # Add --plugins to the sub-parser
+    dir_parser = _add_io_args(dir_parser)       # Add --block-size and --no-cache-pollution
+    dir_parser = _add_schedule_args(dir_parser)  # Add --schedule, --extension-weights, etc.
+    dir_parser = _add_limit_args(dir_parser)    # Add --timeout and --max-file-size
+    dir_parser = _add_profile_args(dir_parser)  # Add --profile and --slowest
+    dir_parser = _add_client_args(dir_parser)   # Add --socket and --local to the sub-parser
+    # Use Case 3: Watch
+    watch_parser = subs.add_parser(CMD_WATCH, help='Search a directory, then search files again '
+                                   'as they are created or modified')
+    watch_parser.add_argument('-d', '--dir', action='store', required=True,
+                              help='Watch all files found in this directory for dirty words')
+    watch_parser.add_argument('-w', '--words', action='store', required=True,
+                              help='Dirty word list')
+    watch_parser.add_argument('-r', '--recursive', action='store_true', required=False,
+                              help='Watch all child directories', default=False)
+    watch_parser.add_argument('--debounce', action='store', type=float, required=False,
+                              help='Seconds a file must go without writes before it is searched '
+                                   f'(default: {DEFAULT_DEBOUNCE})', default=DEFAULT_DEBOUNCE)
+    watch_parser.add_argument('--poll', action='store_true', required=False,
+                              help='Poll for changes instead of using inotify', default=False)
+    watch_parser = _add_encoding_arg(watch_parser)  # Add --encoding to the sub-parser
+    watch_parser = _add_subsume_arg(watch_parser)   # Add --subsume to the sub-parser
+    watch_parser = _add_engine_arg(watch_parser)    # Add --engine to the sub-parser
+    watch_parser = _add_output_arg(watch_parser)    # Add --output to the sub-parser
+    watch_parser = _add_report_arg(watch_parser)    # Add --report to the sub-parser
+    # Use Case 4: Serve
+    serve_parser = subs.add_parser(CMD_SERVE, help='Load the dirty word list once and search '
+                                   'requests received on a Unix domain socket')
+    serve_parser.add_argument('-w', '--words', action='store', required=True,
+                              help='Dirty word list')
+    serve_parser.add_argument('--socket', action='store', required=False,
+                              help=f'Socket to listen on (default: {DEFAULT_SOCKET})',
+                              default=str(DEFAULT_SOCKET))
+    serve_parser.add_argument('--workers', action='store', type=int, required=False,
+                              help=f'Number of worker processes (default: {DEFAULT_WORKERS})',
+                              default=DEFAULT_WORKERS)
+    serve_parser = _add_encoding_arg(serve_parser)  # Add --encoding to the sub-parser
+    serve_parser = _add_subsume_arg(serve_parser)   # Add --subsume to the sub-parser
+    serve_parser = _add_engine_arg(serve_parser)    # Add --engine to the sub-parser
+    serve_parser = _add_extract_arg(serve_parser)   # Add --extract to the sub-parser
+    serve_parser = _add_plugins_arg(serve_parser)   # Add --plugins to the sub-parser
+    # Use Case 5: Git
+    git_parser = subs.add_parser(CMD_GIT, help='Search every blob in the history of a git '
+                                 'repository, straight from its object database')
+    git_parser.add_argument('-d', '--dir', action='store', required=True,
+                            help='Repository to search (work tree or git directory)')
+    git_parser.add_argument('-w', '--words', action='store', required=True,
+                            help='Dirty word list')
+    cache_group = git_parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--cache', action='store', required=False,
+                             help='Blob cache file (default: one per repository in the user '
+                                  'cache directory, e.g. ~/.cache/lima)', default=None)
+    cache_group.add_argument('--no-cache', action='store_true', required=False,
+                             help='Search every blob and leave the blob cache alone',
+                             default=False)
+    git_parser = _add_encoding_arg(git_parser)  # Add --encoding to the sub-parser
+    git_parser = _add_subsume_arg(git_parser)   # Add --subsume to the sub-parser
+    git_parser = _add_engine_arg(git_parser)    # Add --engine to the sub-parser
+    git_parser = _add_output_arg(git_parser)    # Add --output to the sub-parser
+    git_parser = _add_report_arg(git_parser)    # Add --report to the sub-parser
+    # Use Case 6: Coordinate
+    coord_parser = subs.add_parser(CMD_COORDINATE, help='Split a directory into work units and '
+                                   'search them on `lima worker` processes')
+    coord_parser.add_argument('-d', '--dir', action='store', required=True,
+                              help='Directory to search; workers must mount it at the same path')
+    coord_parser.add_argument('-w', '--words', action='store', required=True,
+                              help='Dirty word list')
+    coord_parser.add_argument('-r', '--recursive', action='store_true', required=False,
+                              help='Search all child directories', default=False)
+    coord_parser.add_argument('--listen', action='store', required=False,
+                              help=f'HOST:PORT to listen on (default: 127.0.0.1:{DEFAULT_PORT}).  '
+                                   'Only listen on trusted networks', default=None)
+    coord_parser.add_argument('--unit-size', action='store', type=int, required=False,
+                              help=f'Files per work unit (default: {DEFAULT_UNIT_SIZE})',
+                              default=DEFAULT_UNIT_SIZE)
+    coord_parser.add_argument('--lease', action='store', type=float, required=False,
+                              help='Seconds a work unit may go without a heartbeat before it is '
+                                   f'reassigned (default: {DEFAULT_LEASE})', default=DEFAULT_LEASE)
+    coord_parser = _add_encoding_arg(coord_parser)  # Add --encoding to the sub-parser
+    coord_parser = _add_subsume_arg(coord_parser)   # Add --subsume to the sub-parser
+    coord_parser = _add_output_arg(coord_parser)    # Add --output to the sub-parser
+    coord_parser = _add_report_arg(coord_parser)    # Add --report to the sub-parser
+    # Use Case 7: Worker
+    worker_parser = subs.add_parser(CMD_WORKER, help='Search work units pulled from a '
+                                    '`lima coordinate` process')
+    worker_parser.add_argument('--connect', action='store', required=True,
+                               help='HOST:PORT of the coordinator')
+    worker_parser.add_argument('--workers', action='store', type=int, required=False,
+                               help=f'Number of worker processes (default: {DEFAULT_WORKERS})',
+                               default=DEFAULT_WORKERS)
+    worker_parser = _add_engine_arg(worker_parser)  # Add --engine to the sub-parser
 
     # Parse
     parsed_args = parser.parse_args()
 
     # Validate
+    # command
+    arg_dict[ARG_DICT_KEY_CMD] = parsed_args.command
     # file
     try:
-        file_path = _validate_path_arg(path_arg=parsed_args.file, arg_name='--file')
-        validate_path_file(file_path)
+        arg_dict[ARG_DICT_KEY_STDIN] = parsed_args.file == STDIN_ARG
+        if not arg_dict[ARG_DICT_KEY_STDIN]:
+            file_path = _validate_path_arg(path_arg=parsed_args.file, arg_name='--file')
+            validate_path_file(file_path)
     except AttributeError:
-        pass  # Likely indicates a "partial refactor" BUG
+        arg_dict[ARG_DICT_KEY_STDIN] = False  # Likely indicates a "partial refactor" BUG
     finally:
         arg_dict[ARG_DICT_KEY_FILE] = file_path
     # dir
@@ -120,11 +292,237 @@ def parse_lima_args() -> Dict[str, Any]:
     finally:
         if arg_dict[ARG_DICT_KEY_ENCODE] not in SUPPORTED_ENCODINGS:
             raise NotImplementedError(f'Unsupported encoding "{arg_dict[ARG_DICT_KEY_ENCODE]}"')
+    # debounce
+    try:
+        arg_dict[ARG_DICT_KEY_DEBOUNCE] = parsed_args.debounce
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_DEBOUNCE] = DEFAULT_DEBOUNCE
+    finally:
+        if arg_dict[ARG_DICT_KEY_DEBOUNCE] < 0:
+            raise ValueError('--debounce may not be negative')
+    # poll
+    try:
+        arg_dict[ARG_DICT_KEY_POLL] = parsed_args.poll
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_POLL] = False
+    # socket
+    try:
+        arg_dict[ARG_DICT_KEY_SOCKET] = _validate_path_arg(path_arg=parsed_args.socket,
+                                                           arg_name='--socket')
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_SOCKET] = DEFAULT_SOCKET
+    # local
+    try:
+        arg_dict[ARG_DICT_KEY_LOCAL] = parsed_args.local
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_LOCAL] = True
+    # workers
+    try:
+        arg_dict[ARG_DICT_KEY_WORKERS] = parsed_args.workers
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_WORKERS] = DEFAULT_WORKERS
+    finally:
+        if arg_dict[ARG_DICT_KEY_WORKERS] < 1:
+            raise ValueError('--workers must be at least 1')
+    # cache
+    try:
+        arg_dict[ARG_DICT_KEY_CACHE] = None
+        if parsed_args.cache is not None:
+            arg_dict[ARG_DICT_KEY_CACHE] = _validate_path_arg(path_arg=parsed_args.cache,
+                                                              arg_name='--cache')
+    except AttributeError:
+        pass  # Not a git sub-command
+    # no cache
+    try:
+        arg_dict[ARG_DICT_KEY_NO_CACHE] = parsed_args.no_cache
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_NO_CACHE] = False
+    # output
+    try:
+        arg_dict[ARG_DICT_KEY_OUTPUT] = None
+        if parsed_args.output is not None:
+            arg_dict[ARG_DICT_KEY_OUTPUT] = _validate_path_arg(path_arg=parsed_args.output,
+                                                               arg_name='--output')
+            validate_path_dir(arg_dict[ARG_DICT_KEY_OUTPUT].absolute().parent)
+    except AttributeError:
+        pass  # Sub-command doesn't report findings
+    # reports
+    try:
+        arg_dict[ARG_DICT_KEY_REPORTS] = [_validate_report_arg(report_arg=report_arg,
+                                                               arg_name='--report')
+                                          for report_arg in parsed_args.report or []]
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_REPORTS] = []
+    # checkpoint
+    try:
+        arg_dict[ARG_DICT_KEY_CHECKPOINT] = None
+        if parsed_args.checkpoint is not None:
+            arg_dict[ARG_DICT_KEY_CHECKPOINT] = _validate_path_arg(
+                path_arg=parsed_args.checkpoint, arg_name='--checkpoint')
+            validate_path_dir(arg_dict[ARG_DICT_KEY_CHECKPOINT].absolute().parent)
+    except AttributeError:
+        pass  # Not a dir sub-command
+    # prefilter
+    try:
+        arg_dict[ARG_DICT_KEY_PREFILTER] = parsed_args.prefilter
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_PREFILTER] = False
+    # sections
+    try:
+        arg_dict[ARG_DICT_KEY_SECTIONS] = parsed_args.sections
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_SECTIONS] = False
+    # normalize
+    try:
+        arg_dict[ARG_DICT_KEY_NORMALIZE] = parsed_args.normalize
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_NORMALIZE] = False
+    # decompress
+    try:
+        arg_dict[ARG_DICT_KEY_DECOMPRESS] = parsed_args.decompress
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_DECOMPRESS] = False
+    # extract
+    try:
+        arg_dict[ARG_DICT_KEY_EXTRACT] = parsed_args.extract
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_EXTRACT] = False
+    # plugins
+    try:
+        arg_dict[ARG_DICT_KEY_PLUGINS] = parsed_args.plugins
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_PLUGINS] = False
+    # subsume
+    try:
+        arg_dict[ARG_DICT_KEY_SUBSUME] = parsed_args.subsume
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_SUBSUME] = False
+    # block size
+    try:
+        arg_dict[ARG_DICT_KEY_BLOCK_SIZE] = parsed_args.block_size
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_BLOCK_SIZE] = DEFAULT_BLOCK_SIZE
+    finally:
+        if arg_dict[ARG_DICT_KEY_BLOCK_SIZE] < 1:
+            raise ValueError('--block-size must be at least 1')
+    # no cache pollution
+    try:
+        arg_dict[ARG_DICT_KEY_NO_CACHE_POLLUTION] = parsed_args.no_cache_pollution
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_NO_CACHE_POLLUTION] = False
+    # schedule
+    try:
+        arg_dict[ARG_DICT_KEY_SCHEDULE] = parsed_args.schedule
+        arg_dict[ARG_DICT_KEY_EXTENSION_WEIGHTS] = None
+        if parsed_args.extension_weights is not None:
+            arg_dict[ARG_DICT_KEY_EXTENSION_WEIGHTS] = _validate_weights_arg(
+                weights_arg=parsed_args.extension_weights, arg_name='--extension-weights')
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_SCHEDULE] = None
+        arg_dict[ARG_DICT_KEY_EXTENSION_WEIGHTS] = None
+    finally:
+        if arg_dict[ARG_DICT_KEY_SCHEDULE] not in (None,) + SUPPORTED_SCHEDULES:
+            raise ValueError(f'Unsupported --schedule "{arg_dict[ARG_DICT_KEY_SCHEDULE]}", '
+                             f'choose from {", ".join(SUPPORTED_SCHEDULES)}')
+    # time budget
+    try:
+        arg_dict[ARG_DICT_KEY_TIME_BUDGET] = parsed_args.time_budget
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_TIME_BUDGET] = None
+    finally:
+        if arg_dict[ARG_DICT_KEY_TIME_BUDGET] is not None \
+                and arg_dict[ARG_DICT_KEY_TIME_BUDGET] <= 0:
+            raise ValueError('--time-budget must be positive')
+    # timeout
+    try:
+        arg_dict[ARG_DICT_KEY_TIMEOUT] = parsed_args.timeout
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_TIMEOUT] = None
+    finally:
+        if arg_dict[ARG_DICT_KEY_TIMEOUT] is not None and arg_dict[ARG_DICT_KEY_TIMEOUT] <= 0:
+            raise ValueError('--timeout must be positive')
+    # max file size
+    try:
+        arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] = parsed_args.max_file_size
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] = None
+    finally:
+        if arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] is not None \
+                and arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] < 0:
+            raise ValueError('--max-file-size may not be negative')
+    # profile
+    try:
+        arg_dict[ARG_DICT_KEY_PROFILE] = None
+        arg_dict[ARG_DICT_KEY_SLOWEST] = parsed_args.slowest
+        if parsed_args.profile is not None:
+            arg_dict[ARG_DICT_KEY_PROFILE] = _validate_path_arg(path_arg=parsed_args.profile,
+                                                                arg_name='--profile')
+            validate_path_dir(arg_dict[ARG_DICT_KEY_PROFILE].absolute().parent)
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_SLOWEST] = DEFAULT_SLOWEST
+    finally:
+        if arg_dict[ARG_DICT_KEY_SLOWEST] < 0:
+            raise ValueError('--slowest may not be negative')
+    # address
+    try:
+        arg_dict[ARG_DICT_KEY_ADDRESS] = _validate_address_arg(
+            address_arg=parsed_args.listen or f'127.0.0.1:{DEFAULT_PORT}', arg_name='--listen')
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_ADDRESS] = None
+    try:
+        arg_dict[ARG_DICT_KEY_ADDRESS] = _validate_address_arg(address_arg=parsed_args.connect,
+                                                               arg_name='--connect')
+    except AttributeError:
+        pass  # Not a worker sub-command
+    # unit size
+    try:
+        arg_dict[ARG_DICT_KEY_UNIT_SIZE] = parsed_args.unit_size
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_UNIT_SIZE] = DEFAULT_UNIT_SIZE
+    finally:
+        if arg_dict[ARG_DICT_KEY_UNIT_SIZE] < 1:
+            raise ValueError('--unit-size must be at least 1')
+    # lease
+    try:
+        arg_dict[ARG_DICT_KEY_LEASE] = parsed_args.lease
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_LEASE] = DEFAULT_LEASE
+    finally:
+        if arg_dict[ARG_DICT_KEY_LEASE] <= 0:
+            raise ValueError('--lease must be positive')
+    # engine
+    try:
+        arg_dict[ARG_DICT_KEY_ENGINE] = parsed_args.engine
+    except AttributeError:
+        arg_dict[ARG_DICT_KEY_ENGINE] = ENGINE_AUTO
+    finally:
+        validate_engine(arg_dict[ARG_DICT_KEY_ENGINE])
 
     # DONE
     return arg_dict
 
 
+def _add_client_args(lparser: LimaParser) -> LimaParser:
+    """SPOT for the thin client arguments.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add thin client support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--socket', action='store', required=False,
+                         help='Forward the search to the LIMA server listening on this socket, '
+                              f'if present (default: {DEFAULT_SOCKET})',
+                         default=str(DEFAULT_SOCKET))
+    lparser.add_argument('--local', action='store_true', required=False,
+                         help='Always search locally, even if a LIMA server is listening',
+                         default=False)
+    return lparser
+
+
 def _add_encoding_arg(lparser: LimaParser) -> LimaParser:
     """SPOT for the encoding argument.
 
@@ -143,6 +541,359 @@ def _add_encoding_arg(lparser: LimaParser) -> LimaParser:
     return lparser
 
 
+def _add_engine_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the engine argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add engine support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--engine', action='store', required=False,
+                         help='Matching engine to use: ' + ', '.join(SUPPORTED_ENGINES)
+                              + f' (default: {ENGINE_AUTO})',
+                         default=ENGINE_AUTO)
+    return lparser
+
+
+def _add_io_args(lparser: LimaParser) -> LimaParser:
+    """SPOT for the file reading arguments.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add --block-size and --no-cache-pollution support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--block-size', action='store', type=int, required=False,
+                         help='Bytes read, and dropped from the page cache, at a time with '
+                              f'--no-cache-pollution (default: {DEFAULT_BLOCK_SIZE})',
+                         default=DEFAULT_BLOCK_SIZE)
+    lparser.add_argument('--no-cache-pollution', action='store_true', required=False,
+                         help='Drop every file from the page cache as it is read, so a large '
+                              'scan does not evict data other programs need', default=False)
+    return lparser
+
+
+def _add_limit_args(lparser: LimaParser) -> LimaParser:
+    """SPOT for the per-file limit arguments.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add --timeout and --max-file-size support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--timeout', action='store', type=float, required=False,
+                         help='Skip any file that takes longer than this many seconds to search',
+                         default=None)
+    lparser.add_argument('--max-file-size', action='store', type=int, required=False,
+                         help='Skip any file larger than this many bytes', default=None)
+    return lparser
+
+
+def _add_output_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the output argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add output support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('-o', '--output', action='store', required=False,
+                         help='Write findings to this file instead of stderr', default=None)
+    return lparser
+
+
+def _add_prefilter_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the prefilter argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add prefilter support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--prefilter', action='store_true', required=False,
+                         help='Skip files that can not contain a dirty word, then report '
+                              'prefilter stats', default=False)
+    return lparser
+
+
+def _add_profile_args(lparser: LimaParser) -> LimaParser:
+    """SPOT for the profiling arguments.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add --profile and --slowest support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--profile', action='store', required=False,
+                         help='Profile the search: write cProfile stats to this file, then report '
+                              'per-file latency histograms and the slowest files', default=None)
+    lparser.add_argument('--slowest', action='store', type=int, required=False,
+                         help=f'Number of slowest files --profile lists (default: '
+                              f'{DEFAULT_SLOWEST})', default=DEFAULT_SLOWEST)
+    return lparser
+
+
+def _add_report_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the report argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add report support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--report', action='append', required=False,
+                         help='Also write a report of the findings, FORMAT or FORMAT=FILE, where '
+                              'FORMAT is one of ' + ', '.join(SUPPORTED_REPORTS)
+                              + ' (default FILE: stderr).  May be repeated', default=None)
+    return lparser
+
+
+def _add_schedule_args(lparser: LimaParser) -> LimaParser:
+    """SPOT for the search order arguments.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add --schedule, --extension-weights and --time-budget support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--schedule', action='store', required=False,
+                         help='Search files in this order: ' + ', '.join(SUPPORTED_SCHEDULES)
+                              + ' (default: directory order)', default=None)
+    lparser.add_argument('--extension-weights', action='store', required=False,
+                         help='Comma-separated EXT=WEIGHT pairs for --schedule extension, lowest '
+                              'weight first (e.g., ".txt=0,.iso=9")', default=None)
+    lparser.add_argument('--time-budget', action='store', type=float, required=False,
+                         help='Stop starting new files after this many seconds, then report the '
+                              'files left unsearched', default=None)
+    return lparser
+
+
+def _add_decompress_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the decompress argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add decompress support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--decompress', action='store_true', required=False,
+                         help='Also search the decompressed members of xz, lzma, bzip2, gzip, '
+                              'zstd and 7z files, then report the ones that could not be decoded',
+                         default=False)
+    return lparser
+
+
+def _add_extract_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the extract argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add extract support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--extract', action='store_true', required=False,
+                         help='Also search the text of Office documents (OOXML, ODF) and PDFs, '
+                              'extracted once per distinct document', default=False)
+    return lparser
+
+
+def _add_plugins_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the plugins argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add plugins support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--plugins', action='store_true', required=False,
+                         help='Also run the strategy and extractor plugins installed under the '
+                              "'lima.plugins' entry point group", default=False)
+    return lparser
+
+
+def _add_subsume_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the subsume argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add subsume support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--subsume', action='store_true', required=False,
+                         help='Drop dirty words that contain a shorter dirty word: they can never '
+                              'find another file, only more findings', default=False)
+    return lparser
+
+
+def _add_normalize_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the normalize argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add normalize support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--normalize', action='store_true', required=False,
+                         help='Also find dirty words written with Unicode lookalikes (e.g., '
+                              'full-width letters, decomposed accents, Cyrillic homoglyphs, '
+                              'zero-width characters) in text files',
+                         default=False)
+    return lparser
+
+
+def _add_sections_arg(lparser: LimaParser) -> LimaParser:
+    """SPOT for the sections argument.
+
+    Does not validate input.
+
+    Args:
+        lparser: Parser to add sections support to.
+
+    Returns:
+        Modified lparser.
+    """
+    lparser.add_argument('--sections', action='store_true', required=False,
+                         help='Search only the string sections of ELF and PE files (e.g., .rodata, '
+                              '.rsrc, .NET string heaps), then report the bytes skipped',
+                         default=False)
+    return lparser
+
+
+def _validate_address_arg(address_arg: str, arg_name: str) -> Tuple[str, int]:
+    """Validate HOST:PORT arguments and split them.
+
+    Args:
+        address_arg: HOST:PORT, where HOST may be a bracketed IPv6 address.
+        arg_name: Name of the argument to include in Exception messages.
+
+    Returns:
+        Tuple of (host, port).
+
+    Raises:
+        TypeError: Bad datatype
+        ValueError: Not HOST:PORT, or a bad port
+    """
+    validate_string(arg_name, 'arg_name')
+    validate_string(address_arg, arg_name)
+    host, _, port = address_arg.rpartition(':')
+    if not host or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f'{arg_name} must be HOST:PORT, not "{address_arg}"')
+    return host.strip('[]'), int(port)
+
+
+def _validate_report_arg(report_arg: str, arg_name: str) -> Tuple[str, Optional[Path]]:
+    """Validate FORMAT[=FILE] arguments and split them.
+
+    Args:
+        report_arg: A report format, optionally followed by = and the file to write it to.
+        arg_name: Name of the argument to include in Exception messages.
+
+    Returns:
+        Tuple of (format, Path object for the file or None for stderr).
+
+    Raises:
+        FileNotFoundError: FILE's directory not found
+        OSError: FILE's directory is not a directory
+        TypeError: Bad datatype
+        ValueError: Unsupported format, or a blank FILE
+    """
+    # LOCAL VARIABLES
+    report_format = ''  # Report format
+    report_path = None  # Path object for the report file
+
+    # INPUT VALIDATION
+    validate_string(arg_name, 'arg_name')
+    validate_string(report_arg, arg_name)
+
+    # SPLIT IT
+    report_format, separator, path_arg = report_arg.partition('=')
+    if report_format not in SUPPORTED_REPORTS:
+        raise ValueError(f'Unsupported {arg_name} format "{report_format}", choose from '
+                         f'{", ".join(SUPPORTED_REPORTS)}')
+    if separator:
+        report_path = _validate_path_arg(path_arg=path_arg, arg_name=arg_name)
+        validate_path_dir(report_path.absolute().parent)
+
+    # DONE
+    return report_format, report_path
+
+
+def _validate_weights_arg(weights_arg: str, arg_name: str) -> Dict[str, int]:
+    """Validate EXT=WEIGHT[,EXT=WEIGHT...] arguments and split them.
+
+    Args:
+        weights_arg: Comma-separated EXT=WEIGHT pairs.  The leading dot of EXT is optional.
+        arg_name: Name of the argument to include in Exception messages.
+
+    Returns:
+        Dictionary of lowercase extension, with its leading dot, to integer weight.
+
+    Raises:
+        TypeError: Bad datatype
+        ValueError: Not EXT=WEIGHT pairs, or a weight that isn't an integer
+    """
+    # LOCAL VARIABLES
+    weights = {}  # Return value
+
+    # INPUT VALIDATION
+    validate_string(arg_name, 'arg_name')
+    validate_string(weights_arg, arg_name)
+
+    # SPLIT IT
+    for pair in weights_arg.split(','):
+        extension, _, weight = pair.strip().rpartition('=')
+        extension = extension.strip().lower()
+        try:
+            if not extension.strip('.'):
+                raise ValueError('Missing extension')
+            weights['.' + extension.lstrip('.')] = int(weight)
+        except ValueError as err:
+            raise ValueError(f'{arg_name} must be EXT=WEIGHT pairs, not "{pair}"') from err
+
+    # DONE
+    return weights
+
+
 def _validate_path_arg(path_arg: str, arg_name: str) -> Path:
     """Validate file arguments and construct Path objects.
 
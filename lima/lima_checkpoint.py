@@ -0,0 +1,160 @@
+"""LIVING MANUAL (LIMA) resumable directory search checkpoints.
+
+A checkpoint is an append-only file of JSON lines.  The first line holds the search settings,
+every later line records one completed file (its relative path, return value, and findings) or one
+completed directory.  Records are buffered and synced to disk every SYNC_INTERVAL seconds, so an
+interrupted run loses at most that much work.  A torn final line, from a crash mid-write, is
+dropped when the checkpoint is reopened.
+
+    Typical usage example:
+
+    from lima.lima_checkpoint import Checkpoint
+
+    with Checkpoint(checkpoint_path=Path('scan.ckpt'), settings={'dir': '/archive'}) as ckpt:
+        if not ckpt.is_file_done('a/b.txt'):
+            ckpt.file_done('a/b.txt', 0, [])
+"""
+
+# Standard Imports
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import os
+import time
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_type
+
+
+CHECKPOINT_VERSION = 1  # Bump when the checkpoint format changes
+SYNC_INTERVAL = 5.0     # Seconds between syncs of the checkpoint to disk
+# Record keys, kept short because archive runs record millions of files
+KEY_CODE = 'c'
+KEY_DIR = 'd'
+KEY_FILE = 'f'
+KEY_FINDINGS = 'x'
+KEY_SETTINGS = 'settings'
+
+
+class Checkpoint():
+    """Record, and resume, the progress of one search_dir() run.
+
+    Raises:
+        OSError: checkpoint_path can not be read or written.
+        TypeError: Bad data type.
+        ValueError: checkpoint_path is not a checkpoint or was written with different settings.
+    """
+
+    def __init__(self, checkpoint_path: Path, settings: Dict[str, Any]) -> None:
+        """Checkpoint ctor.
+
+        Loads checkpoint_path, if it exists, and opens it for appending.
+
+        Args:
+            checkpoint_path: Checkpoint file, created if it doesn't exist.
+            settings: Search arguments a resumed run must agree with.  Must be JSON serializable.
+        """
+        # LOCAL VARIABLES
+        valid_size = 0  # Bytes of checkpoint_path holding complete records
+
+        # INPUT VALIDATION
+        validate_type(checkpoint_path, 'checkpoint_path', Path)
+        validate_type(settings, 'settings', dict)
+
+        # LOAD IT
+        self._path = checkpoint_path
+        self._settings = {**settings, 'version': CHECKPOINT_VERSION}
+        self._done_dirs = set()   # Relative paths of completed directories
+        self._done_files = set()  # Relative paths of completed files
+        self.findings: List[str] = []  # Findings recorded so far, in the order they were found
+        self.found = 0            # 0 if no dirty words were recorded, 3 if dirty words were
+        if checkpoint_path.exists():
+            valid_size = self._load()
+        self._file = open(checkpoint_path, 'ab')  # pylint: disable=consider-using-with
+        self._file.truncate(valid_size)  # Drop a torn final record
+        self._last_sync = time.monotonic()  # Last time the checkpoint was synced to disk
+        if not valid_size:
+            self._append({KEY_SETTINGS: self._settings})
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Sync every record to disk and close the checkpoint."""
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+
+    def dir_done(self, rel_path: str) -> None:
+        """Record a directory whose files, and child directories if recursive, are complete."""
+        self._done_dirs.add(rel_path)
+        self._append({KEY_DIR: rel_path})
+
+    def file_done(self, rel_path: str, code: int, findings: List[str]) -> None:
+        """Record a searched file, its return value and its findings."""
+        self._done_files.add(rel_path)
+        self.findings.extend(findings)
+        self.found = code or self.found
+        self._append({KEY_FILE: rel_path, KEY_CODE: code, KEY_FINDINGS: findings})
+
+    def is_dir_done(self, rel_path: str) -> bool:
+        """Has this directory been completed?"""
+        return rel_path in self._done_dirs
+
+    def is_file_done(self, rel_path: str) -> bool:
+        """Has this file been searched?"""
+        return rel_path in self._done_files
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record, syncing to disk if SYNC_INTERVAL has passed."""
+        self._file.write(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+        if time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            self._sync()
+
+    def _load(self) -> int:
+        """Load the records of an existing checkpoint.
+
+        Returns:
+            Size, in bytes, of the complete records.
+
+        Raises:
+            ValueError: Not a checkpoint, or written with different settings.
+        """
+        # LOCAL VARIABLES
+        valid_size = 0  # Return value
+        record: Optional[Dict[str, Any]] = None  # One parsed line
+
+        # LOAD IT
+        with open(self._path, 'rb') as in_file:
+            for line in in_file:
+                try:
+                    record = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    record = None
+                if not valid_size and (not isinstance(record, dict) or KEY_SETTINGS not in record):
+                    raise ValueError(f'{self._path} is not a checkpoint')
+                if not isinstance(record, dict):
+                    break  # Torn by a crash, everything before it is good
+                if not valid_size:
+                    if record[KEY_SETTINGS] != self._settings:
+                        raise ValueError(f'{self._path} is not a checkpoint of this search '
+                                         '(different directory, dirty words, or arguments)')
+                elif KEY_DIR in record:
+                    self._done_dirs.add(record[KEY_DIR])
+                else:
+                    self._done_files.add(record[KEY_FILE])
+                    self.findings.extend(record[KEY_FINDINGS])
+                    self.found = record[KEY_CODE] or self.found
+                valid_size += len(line)
+
+        # DONE
+        return valid_size
+
+    def _sync(self) -> None:
+        """Push every buffered record to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
@@ -0,0 +1,192 @@
+"""LIVING MANUAL (LIMA) thin client for a running `lima serve`.
+
+`lima file` and `lima dir` forward their work to the server whenever its socket is present and
+it holds the same word list.  They only trust a socket of their own user that no one else may
+write to (see check_socket()): another local user could otherwise listen first, see every
+searched path, and answer that nothing was found.  This module is imported on every such
+invocation, so it only depends on cheap standard modules.
+
+The protocol is newline-delimited JSON.  Each request is a single line:
+
+    {"version": 1, "words_digest": "<sha256 of the --words file>", "encoding": "utf-8",
+     "case_sensitive": true, "engine": "auto", "extract": false, "plugins": false,
+     "subsume": false, "recursive": false,
+     "items": [{"path": "/abs/file/or/dir"}, {"payload": "<base64>", "name": "label"}]}
+
+The server streams one line back per searched file or payload, in request order:
+
+    {"type": "result", "name": "<label>", "code": 0, "findings": ["<finding>", ...]}
+    {"type": "error", "name": "<label>", "message": "<error>"}
+
+...followed by {"type": "done", "code": 0} (or 3 if any dirty words were found).  Requests the
+server can not satisfy (e.g., a different word list) get a single {"type": "rejected"} line.
+
+    Typical usage example:
+
+    from lima.lima_client import forward_request
+
+    exit_code = forward_request(words_path=Path('words.txt'), encoding='utf-8',
+                                file_path=Path('target.txt'))
+    if exit_code is None:
+        exit_code = search_file(...)  # No server, search locally
+"""
+
+# Standard Imports
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import hashlib
+import json
+import os
+import socket
+import stat
+import sys
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import DEFAULT_SOCKET
+from lima.lima_engine import ENGINE_AUTO
+from lima.lima_output import emit_finding
+from lima.lima_validation import validate_path_file
+
+
+PROTOCOL_VERSION = 1    # Bump when the request or response format changes
+# Response types
+RESP_RESULT = 'result'
+RESP_ERROR = 'error'
+RESP_DONE = 'done'
+RESP_REJECTED = 'rejected'
+
+
+def forward_request(words_path: Path, encoding: str, case_sensitive: bool = True,
+                    engine: str = ENGINE_AUTO, file_path: Optional[Path] = None,
+                    dir_path: Optional[Path] = None, recursive: bool = False,
+                    extract: bool = False, plugins: bool = False, subsume: bool = False,
+                    socket_path: Path = DEFAULT_SOCKET) -> Optional[int]:
+    """Forward a `lima file` or `lima dir` search to a running server.
+
+    Emits the streamed findings exactly as a local search would.  An item of a directory search
+    that the server fails to search is reported on stderr, and the search goes on.  If the server
+    goes away after findings were emitted, searching locally would report them twice, so the
+    search fails instead.
+
+    Args:
+        words_path: Path object to the --words file.
+        encoding: Format with which to decode searched content.
+        case_sensitive: Optional; Considers case when checking content for dirty words.
+        engine: Optional; Matching engine to use.
+        file_path: Optional; File to search (Use Case 1).
+        dir_path: Optional; Directory to search (Use Case 2).
+        recursive: Optional; If True, search all the child directories found in dir_path.
+        extract: Optional; Also search the text of Office documents and PDFs.  Only a server
+            started with the same extract setting will do.
+        plugins: Optional; Also run the installed plugins.  Only a server started with the same
+            plugins setting will do.
+        subsume: Optional; Drop dirty words that contain a shorter dirty word.  Only a server
+            started with the same subsume setting will do.
+        socket_path: Optional; Server socket.
+
+    Returns:
+        None if no compatible, trusted server is listening, the local search must run instead.
+        Otherwise, 0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        ConnectionError: The server went away after findings were emitted.
+        OSError: The server failed to search file_path.
+    """
+    # LOCAL VARIABLES
+    items = []        # Request items
+    found = None      # Return value
+    emitted = 0       # Findings emitted so far
+    untrusted = None  # Why socket_path isn't trusted
+
+    # BUILD IT
+    if not os.path.lexists(socket_path):
+        return None  # Cheap check for the common case: no server
+    untrusted = check_socket(socket_path)
+    if untrusted:
+        print(f'WARNING: Not forwarding to {socket_path}, {untrusted}', file=sys.stderr)
+        return None
+    items = [{'path': str(path.absolute())} for path in (file_path, dir_path) if path]
+    request = {'words_digest': get_words_digest(words_path), 'encoding': encoding,
+               'case_sensitive': case_sensitive, 'engine': engine, 'extract': extract,
+               'plugins': plugins, 'subsume': subsume, 'recursive': recursive}
+
+    # SEND IT
+    try:
+        for response in request_scan(socket_path=socket_path, request=request, items=items):
+            if response['type'] == RESP_REJECTED:
+                return None
+            if response['type'] == RESP_RESULT:
+                for finding in response['findings']:
+                    emit_finding(finding)
+                emitted += len(response['findings'])
+            elif response['type'] == RESP_ERROR and not dir_path:
+                raise OSError(response['message'])  # The one item was the whole search
+            elif response['type'] == RESP_ERROR:
+                print(f'ERROR: {response["message"]}', file=sys.stderr)
+            elif response['type'] == RESP_DONE:
+                found = response['code']
+    except (ConnectionError, FileNotFoundError, socket.timeout) as err:
+        if emitted:
+            raise ConnectionError(f'The LIMA server went away after reporting {emitted} '
+                                  f'findings ({err}), search again with --local') from err
+        return None  # Stale socket, nothing reported yet
+
+    # DONE
+    return found
+
+
+def check_socket(socket_path: Path) -> Optional[str]:
+    """Check that socket_path is a socket of this user that no one else may write to.
+
+    Returns:
+        Why socket_path can't be trusted, None if it can.
+
+    Raises:
+        FileNotFoundError: socket_path is unavailable.
+    """
+    stat_result = os.lstat(socket_path)  # Not a symlink's target
+    if not stat.S_ISSOCK(stat_result.st_mode):
+        return 'it is not a socket'
+    if hasattr(os, 'getuid') and stat_result.st_uid != os.getuid():
+        return f'it is owned by uid {stat_result.st_uid}'
+    if stat_result.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return 'it is writable by group or others'
+    return None
+
+
+def get_words_digest(words_path: Path) -> str:
+    """Fingerprint a --words file so clients only use servers holding the same word list.
+
+    Raises:
+        FileNotFoundError: words_path is unavailable.
+        OSError: words_path is not a file.
+        TypeError: Bad data type.
+    """
+    validate_path_file(words_path)
+    return hashlib.sha256(words_path.read_bytes()).hexdigest()
+
+
+def request_scan(socket_path: Path, request: Dict[str, Any],
+                 items: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+    """Send one request to the server and yield its responses as they arrive.
+
+    Args:
+        socket_path: Server socket.
+        request: Search arguments (see the module docstring), minus the items.
+        items: Paths, or base64-encoded payloads, to search.
+
+    Raises:
+        ConnectionError: The server went away.
+        FileNotFoundError: socket_path is unavailable.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_sock:
+        client_sock.connect(str(socket_path))
+        client_sock.sendall(json.dumps({**request, 'version': PROTOCOL_VERSION,
+                                        'items': items}).encode() + b'\n')
+        with client_sock.makefile('rb') as responses:
+            for line in responses:
+                response = json.loads(line)
+                yield response
+                if response['type'] in (RESP_DONE, RESP_REJECTED):
+                    return
+        raise ConnectionError('The LIMA server closed the connection early')
@@ -0,0 +1,625 @@
+"""LIVING MANUAL (LIMA) streaming decoders for compressed files and 7z archives.
+
+A compressed file only shows its dirty words in the clear when they happen to be in a header
+(e.g., a file name).  open_members() recognizes xz/lzma, bzip2, gzip, zstd and 7z files by their
+magic numbers and yields each decompressed member as a binary stream, so search_stream() can search
+it one chunk at a time without the member ever being held in memory.  xz/lzma, bzip2 and gzip use
+the standard library.  zstd uses the zstandard package, or compression.zstd (Python 3.14+), if
+either is available.  7z archives are parsed by a minimal built-in reader that supports plain and
+LZMA-encoded headers, and folders coded with Copy, LZMA, LZMA2 (optionally after a BCJ or Delta
+filter), Deflate or BZip2.  Encrypted, multi-input (BCJ2) and other folders are skipped and
+recorded in DECOMPRESS_STATS.
+
+    Typical usage example:
+
+    from lima.lima_decompress import DECOMPRESS_STATS, get_member_label, open_members
+
+    with open(file_path, 'rb') as in_file:
+        for name, stream in open_members(in_file, str(file_path)):
+            search_stream(stream, dw_list, 'utf-8', label=get_member_label(str(file_path), name))
+"""
+
+# Standard Imports
+from pathlib import PurePath
+from threading import Lock
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+import bz2
+import gzip
+import io
+import lzma
+import struct
+import zlib
+# Third Party Imports
+# Local Imports
+
+
+FORMAT_XZ = 'xz'        # xz, or legacy .lzma ("alone")
+FORMAT_BZ2 = 'bz2'
+FORMAT_GZIP = 'gzip'
+FORMAT_ZSTD = 'zstd'
+FORMAT_7Z = '7z'
+# Magic number -> format
+MAGIC_NUMBERS = ((b'\xfd7zXZ\x00', FORMAT_XZ), (b'\x5d\x00\x00', FORMAT_XZ),
+                 (b'BZh', FORMAT_BZ2), (b'\x1f\x8b', FORMAT_GZIP),
+                 (b'\x28\xb5\x2f\xfd', FORMAT_ZSTD), (b'7z\xbc\xaf\x27\x1c', FORMAT_7Z))
+CHUNK_SIZE = 1 << 16  # Bytes decompressed, or read from a 7z pack stream, at a time
+# 7z header property IDs
+_7Z_END, _7Z_HEADER, _7Z_ARCHIVE_PROPERTIES, _7Z_ADDITIONAL_STREAMS = 0x00, 0x01, 0x02, 0x03
+_7Z_MAIN_STREAMS, _7Z_FILES, _7Z_PACK_INFO, _7Z_UNPACK_INFO = 0x04, 0x05, 0x06, 0x07
+_7Z_SUBSTREAMS, _7Z_SIZE, _7Z_CRC, _7Z_FOLDER = 0x08, 0x09, 0x0A, 0x0B
+_7Z_CODERS_UNPACK_SIZE, _7Z_NUM_UNPACK_STREAM, _7Z_EMPTY_STREAM = 0x0C, 0x0D, 0x0E
+_7Z_NAME, _7Z_ENCODED_HEADER, _7Z_DUMMY = 0x11, 0x17, 0x19
+# 7z coder IDs handled by an lzma raw filter chain
+_7Z_LZMA = b'\x03\x01\x01'
+_7Z_LZMA2 = b'\x21'
+_7Z_FILTERS = {b'\x03\x03\x01\x03': lzma.FILTER_X86, b'\x03\x03\x02\x05': lzma.FILTER_POWERPC,
+               b'\x03\x03\x04\x01': lzma.FILTER_IA64, b'\x03\x03\x05\x01': lzma.FILTER_ARM,
+               b'\x03\x03\x07\x01': lzma.FILTER_ARMTHUMB, b'\x03\x03\x08\x05': lzma.FILTER_SPARC}
+_7Z_DELTA = b'\x03'
+_7Z_COPY = b'\x00'
+_7Z_DEFLATE = b'\x04\x01\x08'
+_7Z_BZIP2 = b'\x04\x02\x02'
+
+
+class UnsupportedArchiveError(Exception):
+    """A compressed file, or part of one, can't be decoded here."""
+
+
+# Raised by a corrupt or truncated member (gzip.BadGzipFile is an OSError)
+DECOMPRESS_ERRORS = (lzma.LZMAError, zlib.error, EOFError, OSError)
+
+
+class DecompressStats():
+    """Thread-safe count of the members decompressed and the ones that couldn't be."""
+
+    def __init__(self) -> None:
+        """DecompressStats ctor."""
+        self._lock = Lock()
+        self.files = 0         # Compressed files opened
+        self.members = 0       # Members searched
+        self.bytes = 0         # Decompressed bytes searched
+        self.failed: List[Dict[str, str]] = []  # One {'path', 'detail'} per undecodable part
+
+    def record(self, members: int = 0, size: int = 0, files: int = 0) -> None:
+        """Count files opened, and members searched holding size decompressed bytes."""
+        with self._lock:
+            self.files += files
+            self.members += members
+            self.bytes += size
+
+    def record_failure(self, path: str, detail: str) -> None:
+        """Record part of path as undecodable."""
+        with self._lock:
+            self.failed.append({'path': path, 'detail': detail})
+
+    def reset(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self.files = self.members = self.bytes = 0
+            self.failed = []
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            return (f'Decompress: {self.files} compressed files, {self.members} members, '
+                    f'{self.bytes} bytes searched, {len(self.failed)} parts not decoded')
+
+
+DECOMPRESS_STATS = DecompressStats()  # Updated by every decompressing search in this process
+
+
+class _ChunkStream(io.RawIOBase):
+    """Read-only binary stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        """_ChunkStream ctor."""
+        super().__init__()
+        self._chunks = chunks  # Source of the stream's bytes
+        self._pending = b''    # Bytes of the current chunk not read yet
+
+    def readable(self) -> bool:
+        """It is."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Copy up to len(buffer) bytes into buffer.  Returns 0 only at the end of the stream."""
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b''
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def detect_format(header: bytes) -> Optional[str]:
+    """Name the compression format header, the start of a file, begins with.
+
+    Returns:
+        One of the FORMAT_* constants, or None.
+    """
+    for magic, compression in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def get_member_label(label: str, member_name: str) -> str:
+    """Name a member of the compressed file label in findings and DECOMPRESS_STATS."""
+    return f'{label} (member {member_name})'
+
+
+def open_members(in_file: BinaryIO, label: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """Yield the decompressed members of the compressed file in_file, if it is one.
+
+    Each stream must be read before the next member is requested.  Undecodable parts are
+    recorded in DECOMPRESS_STATS and skipped.  A corrupt or truncated member's stream ends where
+    the corruption starts, and is recorded too.
+
+    Args:
+        in_file: Seekable binary file, positioned at its start.
+        label: Name of the file (e.g., its path), used to name the member of single-member formats
+            and to record failures.
+
+    Yields:
+        (member name, decompressed binary stream) tuples.
+    """
+    # LOCAL VARIABLES
+    compression = detect_format(in_file.read(8))  # Format of in_file
+    member_name = PurePath(label).stem or label   # Single-member formats drop their extension
+    member_label = get_member_label(label, member_name)  # Label of a single member
+
+    # OPEN IT
+    in_file.seek(0)
+    if compression is None:
+        return
+    DECOMPRESS_STATS.record(files=1)
+    if compression == FORMAT_XZ:
+        yield member_name, _counted(lzma.LZMAFile(in_file), member_label)
+    elif compression == FORMAT_BZ2:
+        yield member_name, _counted(bz2.BZ2File(in_file), member_label)
+    elif compression == FORMAT_GZIP:
+        yield member_name, _counted(gzip.GzipFile(fileobj=in_file), member_label)
+    elif compression == FORMAT_ZSTD:
+        stream = _open_zstd(in_file)
+        if stream is None:
+            DECOMPRESS_STATS.record_failure(label, 'zstd support is not installed')
+        else:
+            yield member_name, _counted(stream, member_label)
+    else:
+        yield from _open_7z_members(in_file, label)
+
+
+def _counted(stream: BinaryIO, member_label: str) -> BinaryIO:
+    """Count stream as one member, and its bytes, in DECOMPRESS_STATS as it is read.
+
+    A decoding error ends the stream, and is recorded as a failure of member_label.
+    """
+    def _chunks() -> Iterator[bytes]:
+        size = 0  # Decompressed bytes read
+        try:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                size += len(chunk)
+                yield chunk
+        except DECOMPRESS_ERRORS as err:
+            DECOMPRESS_STATS.record_failure(member_label, str(err) or type(err).__name__)
+        finally:
+            DECOMPRESS_STATS.record(members=1, size=size)
+    return _ChunkStream(_chunks())
+
+
+def _open_zstd(in_file: BinaryIO) -> Optional[BinaryIO]:
+    """Decompressed stream of a zstd file, or None if zstd support isn't installed."""
+    # pylint: disable=import-outside-toplevel
+    try:
+        import zstandard
+    except ImportError:
+        try:
+            from compression import zstd
+        except ImportError:
+            return None
+        return _zstd_errors_as_os_errors(zstd.ZstdFile(in_file), zstd.ZstdError)
+    return _zstd_errors_as_os_errors(zstandard.ZstdDecompressor().stream_reader(
+        in_file, read_across_frames=True), zstandard.ZstdError)
+
+
+def _zstd_errors_as_os_errors(reader: BinaryIO, error_type: type) -> BinaryIO:
+    """Raise the zstd library's error_type as an OSError, one of DECOMPRESS_ERRORS."""
+    def _chunks() -> Iterator[bytes]:
+        try:
+            yield from iter(lambda: reader.read(CHUNK_SIZE), b'')
+        except error_type as err:
+            raise OSError(f'zstd: {err}') from err
+    return _ChunkStream(_chunks())
+
+
+def _open_7z_members(in_file: BinaryIO, label: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """Yield the files of a 7z archive, each a bounded stream over its folder's decoder."""
+    # LOCAL VARIABLES
+    try:
+        archive = _read_7z_archive(in_file)  # Parsed header
+    except (UnsupportedArchiveError, lzma.LZMAError, EOFError, IndexError, struct.error,
+            UnicodeDecodeError, ValueError) as err:
+        DECOMPRESS_STATS.record_failure(label, f'7z header: {err}')
+        return
+    names = iter(archive['names'])  # Names of the files with data, in folder order
+
+    # DECODE IT
+    for folder, pack_offset, unpack_sizes in archive['folders']:
+        member_names = [next(names, f'stream{index}') for index in range(len(unpack_sizes))]
+        try:
+            chunks = _decode_7z_folder(in_file, folder, pack_offset, sum(unpack_sizes))
+        except UnsupportedArchiveError as err:
+            for member_name in member_names:
+                DECOMPRESS_STATS.record_failure(get_member_label(label, member_name), str(err))
+            continue
+        source = _ChunkStream(chunks)  # Shared by the folder's files, read in order
+        for member_name, size in zip(member_names, unpack_sizes):
+            stream = _counted(io.BufferedReader(_LimitedStream(source, size), CHUNK_SIZE),
+                              get_member_label(label, member_name))
+            yield member_name, stream
+            while stream.read(CHUNK_SIZE):
+                pass  # Skip what the caller didn't read
+
+
+class _LimitedStream(io.RawIOBase):
+    """The next size bytes of another raw stream."""
+
+    def __init__(self, source: io.RawIOBase, size: int) -> None:
+        """_LimitedStream ctor."""
+        super().__init__()
+        self._source = source  # Stream to read from
+        self._left = size      # Bytes left to read
+
+    def readable(self) -> bool:
+        """It is."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Copy up to len(buffer) bytes, but no more than are left, into buffer."""
+        if self._left <= 0:
+            return 0
+        view = memoryview(buffer)[:min(len(buffer), self._left)]
+        size = self._source.readinto(view)
+        if not size:
+            raise EOFError('7z folder ended before its last file')
+        self._left -= size
+        return size
+
+
+def _read_7z_archive(in_file: BinaryIO) -> Dict[str, list]:
+    """Parse a 7z archive's header.
+
+    Returns:
+        {'folders': [(folder, pack offset, [file sizes])], 'names': [names of files with data]}.
+    """
+    # LOCAL VARIABLES
+    start = in_file.read(32)  # Signature header
+    next_offset, next_size = struct.unpack_from('<QQ', start, 12)
+
+    # READ THE HEADER
+    in_file.seek(32 + next_offset)
+    header = _Reader(in_file.read(next_size))
+    if len(header.data) != next_size:
+        raise EOFError('7z header is truncated')
+    while header.byte() == _7Z_ENCODED_HEADER:
+        streams = _read_7z_streams(header)
+        folder, pack_offset, unpack_sizes = streams[0]
+        header = _Reader(b''.join(_decode_7z_folder(in_file, folder, pack_offset,
+                                                    sum(unpack_sizes))))
+    header.position -= 1
+    if header.byte() != _7Z_HEADER:
+        raise UnsupportedArchiveError('unknown 7z header type')
+
+    # PARSE IT
+    streams = []  # (folder, pack offset, substream sizes)
+    names = []    # File names
+    has_stream = []  # Does the file at the same index have data?
+    prop = header.byte()
+    if prop == _7Z_ARCHIVE_PROPERTIES:
+        while header.byte() != _7Z_END:
+            header.skip(header.number())
+        prop = header.byte()
+    if prop == _7Z_ADDITIONAL_STREAMS:
+        _read_7z_streams(header)
+        prop = header.byte()
+    if prop == _7Z_MAIN_STREAMS:
+        streams = _read_7z_streams(header)
+        prop = header.byte()
+    if prop == _7Z_FILES:
+        names, has_stream = _read_7z_files(header)
+
+    # DONE
+    return {'folders': streams,
+            'names': [file_name for file_name, data in zip(names, has_stream) if data]}
+
+
+def _read_7z_streams(header: '_Reader') -> List[Tuple[list, int, List[int]]]:
+    """Parse a StreamsInfo: (coders, pack offset, substream sizes) for each folder."""
+    # LOCAL VARIABLES
+    pack_offset = 32     # File offset of the first pack stream
+    pack_sizes = []      # Size of each pack stream
+    folders = []         # Coders of each folder
+    unpack_sizes = []    # Unpacked size of each folder
+    folder_crcs = []     # Does each folder have a CRC?
+    substreams = None    # Substream sizes of each folder
+
+    # PARSE IT
+    prop = header.byte()
+    while prop != _7Z_END:
+        if prop == _7Z_PACK_INFO:
+            pack_offset += header.number()
+            pack_sizes = [0] * header.number()
+            prop = header.byte()
+            while prop != _7Z_END:
+                if prop == _7Z_SIZE:
+                    pack_sizes = [header.number() for _ in pack_sizes]
+                else:
+                    _skip_7z_digests(header, len(pack_sizes))
+                prop = header.byte()
+        elif prop == _7Z_UNPACK_INFO:
+            if header.byte() != _7Z_FOLDER:
+                raise UnsupportedArchiveError('7z unpack info without folders')
+            num_folders = header.number()
+            if header.byte() != 0:
+                raise UnsupportedArchiveError('external 7z folders')
+            folders = [_read_7z_folder(header) for _ in range(num_folders)]
+            folder_crcs = [False] * num_folders
+            if header.byte() != _7Z_CODERS_UNPACK_SIZE:
+                raise UnsupportedArchiveError('7z folder without sizes')
+            unpack_sizes = []
+            for coders in folders:
+                sizes = [header.number() for _ in range(sum(coder['out'] for coder in coders))]
+                unpack_sizes.append(sizes[0])
+            prop = header.byte()
+            while prop != _7Z_END:
+                folder_crcs = _skip_7z_digests(header, len(folders))
+                prop = header.byte()
+        elif prop == _7Z_SUBSTREAMS:
+            substreams = _read_7z_substreams(header, unpack_sizes, folder_crcs)
+        else:
+            raise UnsupportedArchiveError(f'7z property {prop:#x}')
+        prop = header.byte()
+
+    # DONE
+    offsets = [pack_offset + sum(pack_sizes[:index]) for index in range(len(pack_sizes))]
+    if substreams is None:
+        substreams = [[size] for size in unpack_sizes]
+    return [(coders, offsets[index], substreams[index])
+            for index, coders in enumerate(folders)]
+
+
+def _read_7z_folder(header: '_Reader') -> List[Dict[str, object]]:
+    """Parse one Folder: its coders, in order, each {'id', 'properties', 'in', 'out'}."""
+    # LOCAL VARIABLES
+    coders = []  # Return value
+
+    # PARSE IT
+    for _ in range(header.number()):
+        flags = header.byte()
+        coder = {'id': header.take(flags & 0x0F), 'properties': b'', 'in': 1, 'out': 1}
+        if flags & 0x10:
+            coder['in'], coder['out'] = header.number(), header.number()
+        if flags & 0x20:
+            coder['properties'] = header.take(header.number())
+        coders.append(coder)
+    total_in = sum(coder['in'] for coder in coders)
+    total_out = sum(coder['out'] for coder in coders)
+    bind_pairs = [(header.number(), header.number()) for _ in range(total_out - 1)]
+    if total_in - len(bind_pairs) != 1:
+        raise UnsupportedArchiveError('7z folder with several pack streams (e.g., BCJ2)')
+    if bind_pairs != [(index, index + 1) for index in range(len(bind_pairs))]:
+        raise UnsupportedArchiveError('7z folder that is not a simple chain of coders')
+
+    # DONE
+    return coders
+
+
+def _read_7z_substreams(header: '_Reader', unpack_sizes: List[int],
+                        folder_crcs: List[bool]) -> List[List[int]]:
+    """Parse a SubStreamsInfo: the size of each file in each folder."""
+    # LOCAL VARIABLES
+    counts = [1] * len(unpack_sizes)  # Files in each folder
+    sizes = None                      # Return value
+
+    # PARSE IT
+    prop = header.byte()
+    if prop == _7Z_NUM_UNPACK_STREAM:
+        counts = [header.number() for _ in unpack_sizes]
+        prop = header.byte()
+    if prop == _7Z_SIZE:
+        sizes = []
+        for count, unpack_size in zip(counts, unpack_sizes):
+            folder_sizes = [header.number() for _ in range(count - 1)] if count else []
+            if count:
+                folder_sizes.append(unpack_size - sum(folder_sizes))
+            sizes.append(folder_sizes)
+        prop = header.byte()
+    else:
+        sizes = [[unpack_size] if count else [] for count, unpack_size in zip(counts,
+                                                                                unpack_sizes)]
+    while prop != _7Z_END:
+        # Files alone in a folder that has a CRC have no CRC of their own
+        _skip_7z_digests(header, sum(count for count, crc in zip(counts, folder_crcs)
+                                     if count != 1 or not crc))
+        prop = header.byte()
+
+    # DONE
+    return sizes
+
+
+def _read_7z_files(header: '_Reader') -> Tuple[List[str], List[bool]]:
+    """Parse a FilesInfo: each file's name, and whether it has data."""
+    # LOCAL VARIABLES
+    num_files = header.number()   # Files, directories and empty files in the archive
+    names = [''] * num_files      # Return value
+    has_stream = [True] * num_files  # Return value
+
+    # PARSE IT
+    prop = header.byte()
+    while prop != _7Z_END:
+        size = header.number()
+        if prop == _7Z_EMPTY_STREAM:
+            has_stream = [not empty for empty in _read_7z_bits(header.take(size), num_files)]
+        elif prop == _7Z_NAME:
+            data = header.take(size)
+            if data[0] != 0:
+                raise UnsupportedArchiveError('external 7z file names')
+            names = data[1:].decode('utf-16-le').split('\x00')[:num_files]
+        else:
+            header.skip(size)  # Times, attributes, padding (_7Z_DUMMY), ...
+        prop = header.byte()
+
+    # DONE
+    return names, has_stream
+
+
+def _read_7z_bits(data: bytes, count: int) -> List[bool]:
+    """Unpack a 7z bit vector, most significant bit first."""
+    return [bool(data[index // 8] & (0x80 >> (index % 8))) for index in range(count)]
+
+
+def _skip_7z_digests(header: '_Reader', count: int) -> List[bool]:
+    """Skip a Digests structure for count items.
+
+    Returns:
+        Whether each item has a CRC.
+    """
+    defined = [True] * count  # Return value
+    if header.byte() == 0:
+        defined = _read_7z_bits(header.take((count + 7) // 8), count)
+    header.skip(4 * sum(defined))
+    return defined
+
+
+def _decode_7z_folder(in_file: BinaryIO, coders: List[Dict[str, object]], pack_offset: int,
+                      unpack_size: int) -> Iterator[bytes]:
+    """Decode one folder, at most CHUNK_SIZE bytes at a time.
+
+    Raises:
+        UnsupportedArchiveError: The folder's coders aren't supported.  Raised immediately.
+        EOFError: The pack stream ended early.  Raised while iterating.
+    """
+    decode = _get_7z_decoder(coders)  # Packed chunks -> unpacked chunks
+
+    def _packed() -> Iterator[bytes]:
+        position = pack_offset  # File offset of the next packed chunk
+        while True:
+            in_file.seek(position)
+            packed = in_file.read(CHUNK_SIZE)
+            if not packed:
+                return
+            position += len(packed)
+            yield packed
+
+    def _chunks() -> Iterator[bytes]:
+        left = unpack_size  # Unpacked bytes not yet yielded
+        for chunk in decode(_packed()):
+            if chunk:
+                yield chunk[:left]
+                left -= len(chunk)
+            if left <= 0:
+                return
+        raise EOFError('7z pack stream ended early')
+
+    return _chunks()
+
+
+def _get_7z_decoder(coders: List[Dict[str, object]]) -> Callable[[Iterator[bytes]],
+                                                                  Iterator[bytes]]:
+    """Build a function that decodes the packed chunks of a folder coded with coders."""
+    # LOCAL VARIABLES
+    filters = []  # lzma raw filter chain, first filter first
+
+    # SINGLE CODERS
+    if len(coders) == 1 and coders[0]['id'] == _7Z_COPY:
+        return lambda packed: packed
+    if len(coders) == 1 and coders[0]['id'] == _7Z_DEFLATE:
+        return _inflate
+    if len(coders) == 1 and coders[0]['id'] == _7Z_BZIP2:
+        return lambda packed: _decompress(bz2.BZ2Decompressor(), packed)
+
+    # LZMA CHAINS
+    for coder in coders:
+        coder_id, properties = coder['id'], coder['properties']
+        if coder_id == _7Z_LZMA2 and coder is coders[-1]:
+            filters.append({'id': lzma.FILTER_LZMA2, 'dict_size': _lzma2_dict_size(properties)})
+        elif coder_id == _7Z_LZMA and coder is coders[-1]:
+            value, dict_size = struct.unpack_from('<BI', properties)
+            filters.append({'id': lzma.FILTER_LZMA1, 'dict_size': dict_size, 'lc': value % 9,
+                            'lp': value // 9 % 5, 'pb': value // 45})
+        elif coder_id == _7Z_DELTA and coder is not coders[-1]:
+            filters.append({'id': lzma.FILTER_DELTA, 'dist': properties[0] + 1})
+        elif coder_id in _7Z_FILTERS and coder is not coders[-1]:
+            filters.append({'id': _7Z_FILTERS[coder_id]})
+        else:
+            raise UnsupportedArchiveError(f'7z coder {coder_id.hex()}')
+    return lambda packed: _decompress(lzma.LZMADecompressor(format=lzma.FORMAT_RAW,
+                                                            filters=filters), packed)
+
+
+def _decompress(decompressor, packed: Iterator[bytes]) -> Iterator[bytes]:
+    """Feed packed chunks to an lzma or bz2 decompressor, yielding at most CHUNK_SIZE at a time."""
+    for data in packed:
+        yield decompressor.decompress(data, CHUNK_SIZE)
+        while not decompressor.eof and not decompressor.needs_input:
+            yield decompressor.decompress(b'', CHUNK_SIZE)
+        if decompressor.eof:
+            return
+
+
+def _inflate(packed: Iterator[bytes]) -> Iterator[bytes]:
+    """Inflate raw Deflate chunks, yielding at most CHUNK_SIZE at a time."""
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    for data in packed:
+        yield decompressor.decompress(data, CHUNK_SIZE)
+        while decompressor.unconsumed_tail:
+            yield decompressor.decompress(decompressor.unconsumed_tail, CHUNK_SIZE)
+        if decompressor.eof:
+            return
+
+
+def _lzma2_dict_size(properties: bytes) -> int:
+    """Dictionary size encoded in a 7z LZMA2 coder's single property byte."""
+    bits = properties[0] & 0x3F
+    if bits > 40:
+        raise UnsupportedArchiveError('LZMA2 dictionary size')
+    return 0xFFFFFFFF if bits == 40 else (2 | (bits & 1)) << (bits // 2 + 11)
+
+
+class _Reader():
+    """Cursor over a 7z header."""
+
+    def __init__(self, data: bytes) -> None:
+        """_Reader ctor."""
+        self.data = data   # Header bytes
+        self.position = 0  # Offset of the next byte to read
+
+    def byte(self, skip: int = 0) -> int:
+        """Skip skip bytes, then read one byte."""
+        self.position += skip + 1
+        return self.data[self.position - 1]
+
+    def number(self) -> int:
+        """Read a 7z variable-length NUMBER."""
+        first = self.byte()
+        value = 0
+        for index in range(8):
+            mask = 0x80 >> index
+            if not first & mask:
+                return value | ((first & (mask - 1)) << (8 * index))
+            value |= self.byte() << (8 * index)
+        return value
+
+    def skip(self, size: int) -> None:
+        """Skip size bytes."""
+        self.position += size
+        if self.position > len(self.data):
+            raise EOFError('7z header is truncated')
+
+    def take(self, size: int) -> bytes:
+        """Read size bytes."""
+        self.skip(size)
+        return self.data[self.position - size:self.position]
@@ -0,0 +1,35 @@
+"""LIVING MANUAL (LIMA) defaults shared by the command line and the subsystems.
+
+lima_args builds its help text from these values before any subsystem is imported.  Keep this
+module free of expensive imports so every `lima` invocation starts quickly.
+"""
+
+# Standard Imports
+from pathlib import Path
+import os
+# Third Party Imports
+# Local Imports
+
+
+DEFAULT_DEBOUNCE = 0.2  # Seconds a watched file must be quiet before it is searched
+DEFAULT_WORKERS = os.cpu_count() or 1  # Server worker processes
+DEFAULT_PORT = 7451        # Coordinator TCP port
+DEFAULT_UNIT_SIZE = 256    # Files per distributed work unit
+DEFAULT_LEASE = 600.0      # Seconds a work unit may go without a heartbeat before it is reassigned
+DEFAULT_BLOCK_SIZE = 1 << 20  # Bytes read from a file at a time
+SCHEDULE_SMALLEST = 'smallest'    # Search the smallest files first
+SCHEDULE_NEWEST = 'newest'        # Search the most recently modified files first
+SCHEDULE_EXTENSION = 'extension'  # Search the lowest extension weight first, then the smallest
+SUPPORTED_SCHEDULES = (SCHEDULE_SMALLEST, SCHEDULE_NEWEST, SCHEDULE_EXTENSION)
+REPORT_SARIF = 'sarif'      # SARIF 2.1.0 log, one result per finding
+REPORT_CSV = 'csv'          # One row per finding
+REPORT_SUMMARY = 'summary'  # Counts only
+SUPPORTED_REPORTS = (REPORT_SARIF, REPORT_CSV, REPORT_SUMMARY)
+ENCODING_AUTO = 'auto'      # --encoding value that detects each file's encoding
+DEFAULT_SLOWEST = 10        # Slowest files listed by a profiled search
+# Server socket, one per user, in a directory only that user may enter: $XDG_RUNTIME_DIR, or a
+# lima-<uid> directory the server creates.  Avoids tempfile.gettempdir(): importing it is slow.
+_USER_ID = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+DEFAULT_SOCKET_DIR = (Path(os.environ['XDG_RUNTIME_DIR']) if os.environ.get('XDG_RUNTIME_DIR')
+                      else Path(os.environ.get('TMPDIR') or '/tmp') / f'lima-{_USER_ID}')
+DEFAULT_SOCKET = DEFAULT_SOCKET_DIR / 'lima.sock'
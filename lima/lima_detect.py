@@ -0,0 +1,224 @@
+"""LIVING MANUAL (LIMA) per-file encoding detection for `--encoding auto`.
+
+One --encoding for a whole tree decodes UTF-16 files as UTF-8: strategies 1 and 2 fail, and only
+the byte strategies, searching for UTF-8 dirty words, are left.  detect_encoding() picks each
+file's codec from a sample of its first SAMPLE_SIZE bytes, cheapest check first:
+
+    1. A byte order mark names the codec (UTF-8, UTF-16 and UTF-32, either byte order).
+    2. Null bytes in every other (UTF-16) or three of every four (UTF-32) positions, and almost
+       nowhere else, give away mostly-ASCII text in that codec and its byte order, as long as the
+       sample decodes.
+    3. Other null bytes mean a binary.  It is searched as DEFAULT_ENCODING, like any other
+       binary.
+    4. A sample that is valid UTF-8 (ASCII included) is UTF-8, anything else is 8-bit text
+       (Latin-1, which decodes every byte).
+
+UTF-16 and UTF-32 are reported by byte order (e.g., utf-16-le), never with a byte order mark:
+the byte strategies then find dirty words anywhere, not just at the start of a file.  The search
+strips the byte order mark instead (see strip_bom()).  Findings name the detected codec.
+get_encoding() caches the codec of each file by identity (device, inode, size and modification
+time), so a file searched again, unchanged, isn't sampled again (e.g., a server worker's next
+request).  DETECT_STATS counts the files per detected codec.
+
+    Typical usage example:
+
+    from lima.lima_detect import DETECT_STATS, get_encoding
+
+    encoding = get_encoding(data)  # E.g., 'utf-16-le'
+    print(DETECT_STATS.summary())
+"""
+
+# Standard Imports
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple, Union
+import codecs
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_type
+
+
+DEFAULT_ENCODING = 'utf-8'  # Binaries, and files with nothing but ASCII
+SAMPLE_SIZE = 4096          # Bytes sampled from the start of each file
+DEFAULT_CACHE_SIZE = 65536  # Files whose encoding DETECT_CACHE holds
+MIN_NULL_RATE = 0.3         # Share of the code unit positions that are null in UTF-16/32 text...
+MAX_NULL_RATE = 0.05        # ...and of the other positions
+# Byte order marks, longest first (the UTF-32 LE mark starts with the UTF-16 LE one)
+BOMS = ((codecs.BOM_UTF32_LE, 'utf-32-le'), (codecs.BOM_UTF32_BE, 'utf-32-be'),
+        (codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'),
+        (codecs.BOM_UTF16_BE, 'utf-16-be'))
+# Every codec detect_encoding() returns
+DETECTED_ENCODINGS = ('utf-8', 'utf-16-le', 'utf-16-be', 'utf-32-le', 'utf-32-be', 'latin-1')
+# Code unit width, the byte positions within a code unit that are null for ASCII, and the codec
+NULL_PATTERNS = ((4, (1, 2, 3), 'utf-32-le'), (4, (0, 1, 2), 'utf-32-be'),
+                 (2, (1,), 'utf-16-le'), (2, (0,), 'utf-16-be'))
+
+
+class DetectStats():
+    """Thread-safe count of the files each encoding was detected in."""
+
+    def __init__(self) -> None:
+        """DetectStats ctor."""
+        self._lock = Lock()
+        self.encodings: Dict[str, int] = {}  # Detected encoding -> files
+        self.cache_hits = 0    # Files whose encoding came from DETECT_CACHE
+
+    def record(self, encoding: str, cached: bool = False) -> None:
+        """Count one file detected as encoding."""
+        with self._lock:
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+            self.cache_hits += cached
+
+    def reset(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self.encodings = {}
+            self.cache_hits = 0
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            detected = ', '.join(f'{count} {encoding}' for encoding, count
+                                 in sorted(self.encodings.items(), key=lambda item: -item[1]))
+            return (f'Encodings: {sum(self.encodings.values())} files ({self.cache_hits} cached)'
+                    f'{": " + detected if detected else ""}')
+
+
+class DetectCache():
+    """Thread-safe LRU cache of detected encodings, keyed by file identity."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """DetectCache ctor.
+
+        Args:
+            max_size: Optional; Files to hold.
+        """
+        self._lock = Lock()
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, str]' = OrderedDict()  # Identity -> encoding
+
+    def get(self, identity: Hashable) -> Optional[str]:
+        """Encoding of the file with this identity, or None."""
+        with self._lock:
+            encoding = self._entries.get(identity)
+            if encoding is not None:
+                self._entries.move_to_end(identity)
+            return encoding
+
+    def put(self, identity: Hashable, encoding: str) -> None:
+        """Hold the encoding of the file with this identity."""
+        with self._lock:
+            self._entries[identity] = encoding
+            self._entries.move_to_end(identity)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self._entries.clear()
+
+
+DETECT_STATS = DetectStats()  # Updated by every auto-detecting search in this process
+DETECT_CACHE = DetectCache()  # Shared by every auto-detecting search in this process
+
+
+def detect_encoding(data: Union[bytes, bytearray]) -> str:
+    """Detect the encoding of data from a sample of its first SAMPLE_SIZE bytes.
+
+    Args:
+        data: Contents of a file (or at least its first SAMPLE_SIZE bytes).
+
+    Returns:
+        One of DETECTED_ENCODINGS.
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    # LOCAL VARIABLES
+    sample = data[:SAMPLE_SIZE]  # Bytes to look at
+
+    # INPUT VALIDATION
+    validate_type(data, 'data', (bytes, bytearray))
+
+    # DETECT IT
+    # 1. Byte order mark
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    # 2. UTF-16 or UTF-32 null byte pattern, 3. binary
+    if b'\x00' in sample:
+        for width, null_positions, encoding in NULL_PATTERNS:
+            if _matches_null_pattern(sample, width, null_positions) \
+                    and _decodes(sample, encoding, len(data) <= SAMPLE_SIZE):
+                return encoding
+        return DEFAULT_ENCODING
+
+    # DONE
+    # 4. UTF-8, or 8-bit text
+    return 'utf-8' if _decodes(sample, 'utf-8', len(data) <= SAMPLE_SIZE) else 'latin-1'
+
+
+def get_encoding(data: Union[bytes, bytearray], identity: Optional[Hashable] = None) -> str:
+    """Detect the encoding of data, recording it in DETECT_STATS.
+
+    Args:
+        data: Contents of a file.
+        identity: Optional; Changes whenever the file does (e.g., its device, inode, size and
+            modification time).  If given, the encoding is cached in DETECT_CACHE.
+
+    Returns:
+        One of DETECTED_ENCODINGS.
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    encoding = DETECT_CACHE.get(identity) if identity is not None else None  # Return value
+    if encoding is not None:
+        DETECT_STATS.record(encoding, cached=True)
+        return encoding
+    encoding = detect_encoding(data)
+    if identity is not None:
+        DETECT_CACHE.put(identity, encoding)
+    DETECT_STATS.record(encoding)
+    return encoding
+
+
+def strip_bom(data: Union[bytes, bytearray], encoding: str) -> Union[bytes, bytearray]:
+    """Remove the byte order mark of encoding, one of DETECTED_ENCODINGS, from the start of data.
+
+    Returns:
+        data itself, not a copy, if it doesn't start with the byte order mark.
+    """
+    for bom, bom_encoding in BOMS:
+        if bom_encoding == encoding and data.startswith(bom):
+            return data[len(bom):]
+    return data
+
+
+def _decodes(sample: Union[bytes, bytearray], encoding: str, final: bool) -> bool:
+    """Can encoding decode sample?  Unless final, a character may straddle the end of sample."""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _matches_null_pattern(sample: Union[bytes, bytearray], width: int,
+                          null_positions: Tuple[int, ...]) -> bool:
+    """Are the bytes at null_positions of each width-byte code unit mostly null, and no others?"""
+    # LOCAL VARIABLES
+    units = len(sample) // width  # Whole code units in sample
+
+    # CHECK IT
+    if not units:
+        return False
+    for position in range(width):
+        rate = sample[position:units * width:width].count(0) / units  # Share that is null
+        if (position in null_positions and rate < MIN_NULL_RATE) \
+                or (position not in null_positions and rate > MAX_NULL_RATE):
+            return False
+
+    # DONE
+    return True
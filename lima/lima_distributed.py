@@ -0,0 +1,401 @@
+"""LIVING MANUAL (LIMA) distributed directory search.
+
+`lima coordinate` walks a directory and splits its files into work units.  `lima worker`
+processes, on any host that mounts the same directory at the same path, connect to the coordinator
+over TCP, pull units, search them, and push the findings back.  Each unit is leased to one worker:
+if the worker disconnects, or stops sending heartbeats for lease seconds, the unit is handed to
+another worker.  The first result received for a unit wins, so findings are never reported twice.
+The coordinator returns the usual 0 (clean) or 3 (dirty words found).
+
+The protocol is newline-delimited JSON.  There is no authentication: only listen on trusted
+networks.
+
+    worker:      {"type": "hello", "version": 1}
+    coordinator: {"type": "settings", "dw_list": [...], "encoding": "utf-8",
+                  "case_sensitive": true, "lease": 600.0}
+    worker:      {"type": "pull"}
+    coordinator: {"type": "unit", "id": 7, "paths": ["/share/a.txt", ...]}  (or {"type": "done"})
+    worker:      {"type": "heartbeat", "id": 7}  (every lease / 4 seconds, while searching)
+    worker:      {"type": "result", "id": 7, "code": 3, "findings": [...], "errors": [...]}
+
+A result implies the next pull.  Incompatible workers get a single {"type": "rejected"} line.
+
+    Typical usage example:
+
+    from lima.lima_distributed import coordinate, work
+
+    exit_code = coordinate(dir_path=Path('/share'), dw_list=['dirty'], encoding='utf-8',
+                           recursive=True, address=('0.0.0.0', DEFAULT_PORT))
+    # ...and on every worker host
+    work(address=('coordinator.example.com', DEFAULT_PORT))
+"""
+
+# Standard Imports
+from collections import deque
+from multiprocessing import Process
+from pathlib import Path
+from threading import Condition, Event, Lock, Thread
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import json
+import socket
+import sys
+import time
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import DEFAULT_LEASE, DEFAULT_UNIT_SIZE
+from lima.lima_engine import ENGINE_AUTO, validate_engine
+from lima.lima_output import capture_findings, emit_finding
+from lima.lima_search import search_file, validate_search_args, walk_dir
+from lima.lima_validation import validate_path_dir, validate_type
+
+
+PROTOCOL_VERSION = 1    # Bump when the message format changes
+ACCEPT_TIMEOUT = 0.5    # Seconds between checks for finished work and expired leases
+SHUTDOWN_TIMEOUT = 2 * ACCEPT_TIMEOUT  # Seconds to tell idle workers the search is done
+# Message types
+MSG_HELLO = 'hello'
+MSG_SETTINGS = 'settings'
+MSG_PULL = 'pull'
+MSG_UNIT = 'unit'
+MSG_HEARTBEAT = 'heartbeat'
+MSG_RESULT = 'result'
+MSG_DONE = 'done'
+MSG_REJECTED = 'rejected'
+
+
+class _WorkQueue():
+    """Hand out work units, lazily, and take them back from workers that went away."""
+
+    def __init__(self, units: Iterator[List[str]], lease: float) -> None:
+        """_WorkQueue ctor.
+
+        Args:
+            units: Lists of paths to search, produced on demand.
+            lease: Seconds a unit may go without a heartbeat before it is reassigned.
+        """
+        self._units = units        # Units not yet handed out
+        self._lease = lease
+        self._next_id = 0          # Id of the next new unit
+        self._pending = deque()    # (id, paths) taken back from dead or hung workers
+        self._leases: Dict[int, Tuple[List[str], float, int]] = {}  # id -> paths, deadline, owner
+        self._exhausted = False    # Every unit has been handed out at least once
+        self._cond = Condition()   # Guards everything above
+        self.found = 0             # 0 if no dirty words were found, 3 if dirty words were found
+
+    def complete(self, unit_id: int, code: int) -> bool:
+        """Take a unit's result.
+
+        Returns:
+            False if the unit was already completed (e.g., by a worker it was reassigned to).
+        """
+        with self._cond:
+            if unit_id in self._leases:
+                del self._leases[unit_id]
+            elif not any(unit_id == pending[0] for pending in self._pending):
+                return False  # Completed already
+            else:
+                self._pending = deque(pending for pending in self._pending
+                                      if pending[0] != unit_id)
+            self.found = code or self.found
+            self._cond.notify_all()
+            return True
+
+    def expire(self) -> None:
+        """Take back every unit whose lease has run out."""
+        now = time.monotonic()  # Compared to every deadline
+        with self._cond:
+            for unit_id, (paths, deadline, _) in list(self._leases.items()):
+                if deadline < now:
+                    del self._leases[unit_id]
+                    self._pending.append((unit_id, paths))
+                    self._cond.notify_all()
+
+    def is_finished(self) -> bool:
+        """Has every unit been completed?"""
+        with self._cond:
+            return self._exhausted and not self._pending and not self._leases
+
+    def release(self, owner: int) -> None:
+        """Take back every unit leased to a worker that went away."""
+        with self._cond:
+            for unit_id, (paths, _, unit_owner) in list(self._leases.items()):
+                if unit_owner == owner:
+                    del self._leases[unit_id]
+                    self._pending.append((unit_id, paths))
+            self._cond.notify_all()
+
+    def renew(self, unit_id: int, owner: int) -> None:
+        """Extend a unit's lease."""
+        with self._cond:
+            if unit_id in self._leases and self._leases[unit_id][2] == owner:
+                self._leases[unit_id] = (self._leases[unit_id][0],
+                                         time.monotonic() + self._lease, owner)
+
+    def take(self, owner: int) -> Optional[Tuple[int, List[str]]]:
+        """Lease the next unit to a worker, waiting while other workers hold the rest.
+
+        Returns:
+            (id, paths), or None once every unit has been completed.
+        """
+        with self._cond:
+            while True:
+                if self._pending:
+                    unit_id, paths = self._pending.popleft()
+                    break
+                if not self._exhausted:
+                    paths = next(self._units, None)
+                    if paths is not None:
+                        unit_id, self._next_id = self._next_id, self._next_id + 1
+                        break
+                    self._exhausted = True
+                if not self._leases:
+                    return None
+                self._cond.wait(ACCEPT_TIMEOUT)  # For a result, or a unit to be taken back
+            self._leases[unit_id] = (paths, time.monotonic() + self._lease, owner)
+            return unit_id, paths
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def coordinate(dir_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool = True,
+               recursive: bool = False, address: Tuple[str, int] = ('127.0.0.1', 0),
+               unit_size: int = DEFAULT_UNIT_SIZE, lease: float = DEFAULT_LEASE,
+               stop_event: Optional[Event] = None) -> int:
+    """Search dir_path on workers that connect to address.
+
+    Emits findings (see lima_output) as workers report them.
+
+    Args:
+        dir_path: Path object to a directory to search.  Workers must see it at the same path.
+        dw_list: A list of non-empty strings to search for.
+        encoding: Format with which to decode files found in dir_path.
+        case_sensitive: Optional; Considers case when checking contents for dirty words.
+        recursive: Optional; If True, recursive search all the child directories found in dir_path.
+        address: Optional; (host, port) to listen on.
+        unit_size: Optional; Files per work unit.
+        lease: Optional; Seconds a unit may go without a heartbeat before it is reassigned.
+        stop_event: Optional; Give up once this Event is set.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        FileNotFoundError: dir_path is unavailable.
+        InterruptedError: stop_event was set before the search finished.
+        OSError: dir_path is not a directory, or address is unavailable.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string, unit_size less than 1).
+    """
+    # LOCAL VARIABLES
+    work_queue = None   # Units for the workers
+    settings = {}       # Sent to every worker
+    server_sock = None  # Listening socket
+    handlers = []       # One thread per worker connection
+    stop_event = stop_event if stop_event else Event()
+
+    # INPUT VALIDATION
+    validate_path_dir(dir_path)
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                         engine=ENGINE_AUTO)
+    validate_type(recursive, 'recursive', bool)
+    validate_type(address, 'address', tuple)
+    validate_type(unit_size, 'unit_size', int)
+    if unit_size < 1:
+        raise ValueError('unit_size must be at least 1')
+    validate_type(lease, 'lease', (int, float))
+    if lease <= 0:
+        raise ValueError('lease must be positive')
+    validate_type(stop_event, 'stop_event', Event)
+
+    # COORDINATE IT
+    work_queue = _WorkQueue(_get_units(dir_path, recursive, unit_size), float(lease))
+    settings = {'type': MSG_SETTINGS, 'dw_list': dw_list, 'encoding': encoding,
+                'case_sensitive': case_sensitive, 'lease': float(lease)}
+    server_sock = socket.create_server(address)
+    server_sock.settimeout(ACCEPT_TIMEOUT)
+    try:
+        print(f'Coordinating {dir_path} on {server_sock.getsockname()[:2]}', file=sys.stderr)
+        while not work_queue.is_finished():
+            if stop_event.is_set():
+                raise InterruptedError('Stopped before every unit was searched')
+            work_queue.expire()
+            try:
+                conn, _ = server_sock.accept()
+            except socket.timeout:
+                continue
+            conn.settimeout(None)
+            handlers.append(Thread(target=_handle_worker, daemon=True,
+                                   args=(conn, work_queue, settings, len(handlers))))
+            handlers[-1].start()
+    finally:
+        server_sock.close()
+    # Tell idle workers to exit.  Handlers still reading belong to hung workers (no leases remain).
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+    for handler in handlers:
+        handler.join(max(0, deadline - time.monotonic()))
+
+    # DONE
+    return work_queue.found
+
+
+def work(address: Tuple[str, int], workers: int = 1, engine: str = ENGINE_AUTO) -> int:
+    """Search work units pulled from a coordinator until it runs out.
+
+    Args:
+        address: (host, port) of the coordinator.
+        workers: Optional; Number of worker processes, each with its own connection.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+
+    Returns:
+        0 once the coordinator runs out of work.  Findings are reported to the coordinator.
+
+    Raises:
+        ConnectionError: The coordinator went away, or rejected this worker.
+        NotImplementedError: Unsupported or unavailable engine.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., workers less than 1).
+    """
+    # LOCAL VARIABLES
+    processes = []  # Worker processes
+
+    # INPUT VALIDATION
+    validate_type(address, 'address', tuple)
+    validate_type(workers, 'workers', int)
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    validate_engine(engine)
+
+    # WORK IT
+    if workers == 1:
+        _work_connection(address, engine)
+    else:
+        processes = [Process(target=_work_connection, args=(address, engine), daemon=True)
+                     for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        if any(process.exitcode for process in processes):
+            raise ConnectionError('At least one worker process failed')
+
+    # DONE
+    return 0
+
+
+def _get_units(dir_path: Path, recursive: bool, unit_size: int) -> Iterator[List[str]]:
+    """Yield lists of up to unit_size absolute paths, walking dir_path as they are needed."""
+    unit = []  # Paths of the next unit
+    for file_path in walk_dir(dir_path=dir_path, recursive=recursive):
+        unit.append(str(file_path.absolute()))
+        if len(unit) >= unit_size:
+            yield unit
+            unit = []
+    if unit:
+        yield unit
+
+
+def _handle_worker(conn: socket.socket, work_queue: _WorkQueue, settings: Dict[str, Any],
+                   owner: int) -> None:
+    """Serve one worker connection: lease it units and collect its results."""
+    with conn, conn.makefile('rb') as messages, conn.makefile('wb') as replies:
+        try:
+            message = json.loads(messages.readline() or b'{}')
+            if message.get('type') != MSG_HELLO or message.get('version') != PROTOCOL_VERSION:
+                _send(replies, {'type': MSG_REJECTED, 'message': 'Unsupported protocol version'})
+                return
+            _send(replies, settings)
+            for line in messages:
+                message = json.loads(line)
+                if message['type'] == MSG_HEARTBEAT:
+                    work_queue.renew(message['id'], owner)
+                    continue
+                if message['type'] == MSG_RESULT:
+                    if work_queue.complete(message['id'], message['code']):
+                        for finding in message['findings']:
+                            emit_finding(finding)
+                        for error in message['errors']:
+                            print(f'WARNING: {error}', file=sys.stderr)
+                unit = work_queue.take(owner)
+                if unit is None:
+                    _send(replies, {'type': MSG_DONE})
+                    return
+                _send(replies, {'type': MSG_UNIT, 'id': unit[0], 'paths': unit[1]})
+        except (ConnectionError, KeyError, TypeError, ValueError):
+            pass  # Dead or broken worker
+        finally:
+            work_queue.release(owner)
+
+
+def _heartbeat(replies: BinaryIO, send_lock: Lock, unit_id: int, interval: float,
+               stop_event: Event) -> None:
+    """Renew a unit's lease until stop_event is set."""
+    while not stop_event.wait(interval):
+        try:
+            with send_lock:
+                _send(replies, {'type': MSG_HEARTBEAT, 'id': unit_id})
+        except (ConnectionError, OSError):
+            return  # The main loop will notice
+
+
+def _search_unit(paths: List[str], settings: Dict[str, Any], engine: str) -> Dict[str, Any]:
+    """Search every path in a unit.
+
+    Returns:
+        The result message, minus the unit id.
+    """
+    result = {'type': MSG_RESULT, 'code': 0, 'findings': [], 'errors': []}  # Return value
+    for path in paths:
+        try:
+            with capture_findings() as findings:
+                code = search_file(file_path=Path(path), dw_list=settings['dw_list'],
+                                   encoding=settings['encoding'],
+                                   case_sensitive=settings['case_sensitive'], engine=engine)
+        except (LookupError, OSError, ValueError) as err:
+            result['errors'].append(f'{path}: {err}')  # E.g., deleted since the walk
+            continue
+        result['code'] = code or result['code']
+        result['findings'].extend(findings)
+    return result
+
+
+def _send(replies: BinaryIO, message: Dict[str, Any]) -> None:
+    """Write one message."""
+    replies.write(json.dumps(message).encode() + b'\n')
+    replies.flush()
+
+
+def _work_connection(address: Tuple[str, int], engine: str) -> None:
+    """Pull and search units over one connection until the coordinator runs out.
+
+    Raises:
+        ConnectionError: The coordinator went away, or rejected this worker.
+    """
+    # LOCAL VARIABLES
+    send_lock = Lock()   # Heartbeats and results share the connection
+    message = {}         # Last message from the coordinator
+    settings = {}        # Search arguments from the coordinator
+    result = {'type': MSG_PULL}  # Next message to send
+
+    # WORK IT
+    with socket.create_connection(address) as conn, conn.makefile('rb') as messages, \
+            conn.makefile('wb') as replies:
+        _send(replies, {'type': MSG_HELLO, 'version': PROTOCOL_VERSION})
+        settings = json.loads(messages.readline() or b'{}')
+        if settings.get('type') != MSG_SETTINGS:
+            raise ConnectionError(settings.get('message', 'The coordinator went away'))
+        while True:
+            with send_lock:
+                _send(replies, result)
+            message = json.loads(messages.readline() or b'{}')
+            if message.get('type') == MSG_DONE:
+                return
+            if message.get('type') != MSG_UNIT:
+                raise ConnectionError('The coordinator went away')
+            stop_event = Event()  # Stops this unit's heartbeats
+            Thread(target=_heartbeat, daemon=True,
+                   args=(replies, send_lock, message['id'], settings['lease'] / 4,
+                         stop_event)).start()
+            try:
+                result = _search_unit(message['paths'], settings, engine)
+            finally:
+                stop_event.set()
+            result['id'] = message['id']
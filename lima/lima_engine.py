@@ -0,0 +1,357 @@
+"""LIVING MANUAL (LIMA) multi-pattern matching engines.
+
+Every search strategy asks a Matcher which dirty words occur in a haystack.  The pure-Python
+engine is always available.  C-accelerated engines are detected the first time a matcher is
+built, so importing this module stays cheap, and used when installed:
+
+    pyahocorasick (ahocorasick): Aho-Corasick automaton over str or latin-1 mapped bytes
+    hyperscan (hyperscan): Intel Hyperscan literal database over UTF-8 or raw bytes
+
+Accelerated matchers take seconds to build for a long needle list.  When a long needle list
+differs from a cached matcher's by a few entries (e.g., a reloaded word list, see lima_words), a
+StagedMatcher serves it right away from the cached matcher plus a small matcher for the added
+needles, while the full matcher is built in a background thread.
+
+    Typical usage example:
+
+    from lima.lima_engine import get_matcher
+
+    matcher = get_matcher(['dirty', 'words'], engine='auto')
+    found_indices = matcher.search('some dirty text')
+"""
+
+# Standard Imports
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Event, Lock, Thread
+from typing import AnyStr, Dict, List, Optional, Sequence, Tuple
+import importlib
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_string, validate_type
+
+
+ENGINE_AUTO = 'auto'                # Pick the fastest available engine
+ENGINE_PYTHON = 'python'            # Pure-Python substring checks
+ENGINE_AHOCORASICK = 'ahocorasick'  # pyahocorasick
+ENGINE_HYPERSCAN = 'hyperscan'      # hyperscan
+# Supported --engine values
+SUPPORTED_ENGINES = [ENGINE_AUTO, ENGINE_PYTHON, ENGINE_AHOCORASICK, ENGINE_HYPERSCAN]
+# Engine -> module to import, in order of preference
+ENGINE_MODULES = {ENGINE_HYPERSCAN: 'hyperscan', ENGINE_AHOCORASICK: 'ahocorasick',
+                  ENGINE_PYTHON: None}
+MATCHER_CACHE_SIZE = 32  # Number of prepared matchers to keep around
+STAGE_MIN_NEEDLES = 1024  # Shorter needle lists are always built from scratch
+STAGE_MAX_CHANGE = 0.1    # Fraction of a needle list that may change and still be staged
+
+
+class Matcher():
+    """Pure-Python matcher: one substring check per needle.
+
+    Child classes override search() with an accelerated implementation.  All matchers must
+    return identical results for identical input.
+    """
+
+    name = ENGINE_PYTHON
+    staged = False  # Worth staging changes to a long needle list instead of building from scratch?
+
+    def __init__(self, needles: Sequence[AnyStr]) -> None:
+        """Matcher ctor.
+
+        Args:
+            needles: Non-empty str or bytes entries to search for.  All entries must share a type.
+        """
+        self._needles = list(needles)
+        self._index: Optional[Dict[AnyStr, int]] = None  # Built by get_index()
+
+    @property
+    def needles(self) -> List[AnyStr]:
+        """The needles, in index order.  Do not modify."""
+        return self._needles
+
+    def get_index(self) -> Dict[AnyStr, int]:
+        """Map each needle to its first index, built the first time it is needed."""
+        if self._index is None:
+            self._index = {}
+            for index, needle in enumerate(self._needles):
+                self._index.setdefault(needle, index)
+        return self._index
+
+    def search(self, haystack: AnyStr) -> List[int]:
+        """Find the needles that occur in haystack.
+
+        Args:
+            haystack: Object to search.  Must be the same type as the needles.
+
+        Returns:
+            Sorted list of needle indices found in haystack.
+        """
+        return [index for index, needle in enumerate(self._needles) if needle in haystack]
+
+
+class AhoCorasickMatcher(Matcher):
+    """pyahocorasick-backed matcher.
+
+    bytes are mapped 1:1 onto str code points using latin-1 so both types share one automaton
+    implementation.
+    """
+
+    name = ENGINE_AHOCORASICK
+    staged = True
+
+    def __init__(self, needles: Sequence[AnyStr]) -> None:
+        """AhoCorasickMatcher ctor."""
+        super().__init__(needles)
+        self._automaton = _import_engine(ENGINE_AHOCORASICK).Automaton()
+        key_dict: Dict[str, List[int]] = {}  # Needle -> indices, duplicates share a key
+        for index, needle in enumerate(self._needles):
+            key_dict.setdefault(_to_text(needle), []).append(index)
+        for key, indices in key_dict.items():
+            self._automaton.add_word(key, tuple(indices))
+        self._automaton.make_automaton()
+
+    def search(self, haystack: AnyStr) -> List[int]:
+        """Find the needles that occur in haystack."""
+        found = set()  # Indices found so far
+        for _, indices in self._automaton.iter(_to_text(haystack)):
+            found.update(indices)
+            if len(found) == len(self._needles):
+                break  # Nothing left to find
+        return sorted(found)
+
+
+class HyperscanMatcher(Matcher):
+    """hyperscan-backed matcher.
+
+    str objects are scanned as UTF-8 (surrogates passed through).  UTF-8 is self-synchronizing,
+    so a byte-level match always lands on character boundaries.
+    """
+
+    name = ENGINE_HYPERSCAN
+    staged = True
+
+    def __init__(self, needles: Sequence[AnyStr]) -> None:
+        """HyperscanMatcher ctor."""
+        super().__init__(needles)
+        self._hyperscan = _import_engine(ENGINE_HYPERSCAN)
+        hs_flag = self._hyperscan.HS_FLAG_SINGLEMATCH  # Report each needle once
+        expressions = [b''.join(b'\\x%02x' % byte for byte in _to_bytes(needle))
+                       for needle in self._needles]
+        self._database = self._hyperscan.Database(mode=self._hyperscan.HS_MODE_BLOCK)
+        self._database.compile(expressions=expressions, ids=list(range(len(expressions))),
+                               elements=len(expressions), flags=[hs_flag] * len(expressions))
+
+    def search(self, haystack: AnyStr) -> List[int]:
+        """Find the needles that occur in haystack."""
+        found = set()  # Indices found so far
+
+        def on_match(index: int, *_) -> bool:
+            found.add(index)
+            return len(found) == len(self._needles)  # True stops the scan
+
+        try:
+            self._database.scan(_to_bytes(haystack), match_event_handler=on_match)
+        except self._hyperscan.ScanTerminated:
+            pass  # on_match() found every needle
+        return sorted(found)
+
+
+class StagedMatcher(Matcher):
+    """Serves a needle list that differs slightly from a base matcher's, in stages.
+
+    The base matcher finds the needles the lists share, a delta matcher finds the added needles,
+    and the indices of removed needles are dropped.  Meanwhile, a background thread builds the
+    full matcher.  Once it is built, it serves every search and the stages are released.
+    """
+
+    def __init__(self, needles: Sequence[AnyStr], base: Matcher, added: List[AnyStr]) -> None:
+        """StagedMatcher ctor.
+
+        Args:
+            needles: Non-empty str or bytes entries to search for.
+            base: Matcher built for a similar needle list, by the same engine.
+            added: Distinct needles that base doesn't have.
+        """
+        super().__init__(needles)
+        self.name = base.name
+        self.compacted = Event()  # Set once the full matcher is built, or failed to build
+        self._full: Optional[Matcher] = None  # Serves every search once it is built
+        positions: Dict[AnyStr, List[int]] = {}  # Needle -> every index it has in needles
+        for index, needle in enumerate(self._needles):
+            positions.setdefault(needle, []).append(index)
+        # (base, base index -> indices, delta matcher, delta index -> indices) or None
+        self._stages = (base, [positions.get(needle, ()) for needle in base.needles],
+                        _ENGINE_CLASSES[self.name](added) if added else None,
+                        [positions[needle] for needle in added])
+        Thread(target=self._compact, daemon=True).start()
+
+    def search(self, haystack: AnyStr) -> List[int]:
+        """Find the needles that occur in haystack."""
+        found = set()  # Indices found so far
+        stages = self._stages
+        if stages is None:
+            return self._full.search(haystack)
+        base, base_map, delta, delta_map = stages
+        for index in base.search(haystack):
+            found.update(base_map[index])
+        if delta:
+            for index in delta.search(haystack):
+                found.update(delta_map[index])
+        return sorted(found)
+
+    def _compact(self) -> None:
+        """Build the full matcher, then release the stages."""
+        try:
+            self._full = _ENGINE_CLASSES[self.name](self._needles)
+            self._stages = None
+        except Exception:  # pylint: disable=broad-except
+            pass  # Keep searching in stages
+        finally:
+            self.compacted.set()
+
+
+_ENGINE_CLASSES = {ENGINE_PYTHON: Matcher, ENGINE_AHOCORASICK: AhoCorasickMatcher,
+                   ENGINE_HYPERSCAN: HyperscanMatcher}
+_MATCHERS_LOCK = Lock()  # Guards _MATCHERS
+# (needles, engine) -> Matcher, least recently used first
+_MATCHERS: 'OrderedDict[Tuple[Tuple[AnyStr, ...], str], Matcher]' = OrderedDict()
+
+
+def get_matcher(needles: Sequence[AnyStr], engine: str = ENGINE_AUTO) -> Matcher:
+    """Build, or fetch a cached, Matcher for needles.
+
+    Args:
+        needles: Non-empty str or bytes entries to search for.
+        engine: Optional; One of SUPPORTED_ENGINES.
+
+    Returns:
+        A Matcher object.
+
+    Raises:
+        NotImplementedError: engine is unsupported or not installed.
+        TypeError: Bad data type.
+        ValueError: Empty engine.
+    """
+    validate_engine(engine)
+    return _get_matcher(tuple(needles), resolve_engine(engine))
+
+
+@lru_cache(maxsize=None)
+def get_available_engines() -> List[str]:
+    """Detect the engines installed on this system.
+
+    Returns:
+        Engine names, in order of preference.  ENGINE_PYTHON is always available.
+    """
+    return [engine for engine in ENGINE_MODULES if _import_engine(engine) is not False]
+
+
+def resolve_engine(engine: str) -> str:
+    """Translate ENGINE_AUTO into the name of the preferred available engine.
+
+    Does not validate input.
+    """
+    if engine == ENGINE_AUTO:
+        return get_available_engines()[0]
+    return engine
+
+
+def validate_engine(engine: str) -> None:
+    """Verify engine is supported and installed.
+
+    Raises:
+        NotImplementedError: engine is unsupported or not installed.
+        TypeError: Bad data type.
+        ValueError: Empty engine.
+    """
+    validate_string(engine, 'engine')
+    if engine not in SUPPORTED_ENGINES:
+        raise NotImplementedError(f'Unsupported engine "{engine}"')
+    if engine != ENGINE_AUTO and engine not in get_available_engines():
+        raise NotImplementedError(f'The "{engine}" engine is not installed')
+
+
+@lru_cache(maxsize=None)
+def _import_engine(engine: str):
+    """Import the module backing engine.
+
+    Returns:
+        The module, None for the pure-Python engine, or False if the module is not installed.
+    """
+    if not ENGINE_MODULES[engine]:
+        return None
+    try:
+        return importlib.import_module(ENGINE_MODULES[engine])
+    except ImportError:
+        return False
+
+
+def _get_added(needles: Tuple[AnyStr, ...], base_index: Dict[AnyStr, int],
+               limit: int) -> Optional[List[AnyStr]]:
+    """Distinct needles missing from base_index, or None if there are more than limit."""
+    added = {}  # Ordered set of the added needles
+    for needle in needles:
+        if needle not in base_index:
+            added[needle] = None
+            if len(added) > limit:
+                return None
+    return list(added)
+
+
+def _get_matcher(needles: Tuple[AnyStr, ...], engine: str) -> Matcher:
+    """Cached Matcher factory.  Does not validate input.
+
+    A long needle list that is close to a cached one, for an engine that is slow to build, gets a
+    StagedMatcher based on the cached matcher.  Every other needle list is built from scratch.
+    """
+    # LOCAL VARIABLES
+    key = (needles, engine)                 # Cache key
+    engine_class = _ENGINE_CLASSES[engine]  # Matcher class to build
+    max_change = int(len(needles) * STAGE_MAX_CHANGE)  # Added needles a StagedMatcher may have
+    candidates = []                         # Cached (key, matcher) pairs, most recent first
+    matcher = None                          # Return value
+    added = None                            # Needles a candidate doesn't have
+
+    # CHECK THE CACHE
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(key)
+        if matcher is not None:
+            _MATCHERS.move_to_end(key)
+            return matcher
+        candidates = list(reversed(_MATCHERS.items()))
+
+    # BUILD IT
+    if engine_class.staged and len(needles) >= STAGE_MIN_NEEDLES:
+        for (base_needles, base_engine), base in candidates:
+            if base_engine == engine and abs(len(base_needles) - len(needles)) <= max_change \
+                    and isinstance(base_needles[0], type(needles[0])):
+                added = _get_added(needles, base.get_index(), max_change)
+                if added is not None:
+                    matcher = StagedMatcher(needles, base, added)
+                    break
+    if matcher is None:
+        matcher = engine_class(needles)
+
+    # CACHE IT
+    with _MATCHERS_LOCK:
+        _MATCHERS[key] = matcher
+        while len(_MATCHERS) > MATCHER_CACHE_SIZE:
+            _MATCHERS.popitem(last=False)
+
+    # DONE
+    return matcher
+
+
+def _to_bytes(value: AnyStr) -> bytes:
+    """Convert str to UTF-8 bytes.  Bytes-like objects are returned as-is, without a copy."""
+    if isinstance(value, str):
+        return value.encode('utf-8', 'surrogatepass')
+    validate_type(value, 'haystack', (bytes, bytearray, memoryview))
+    return value
+
+
+def _to_text(value: AnyStr) -> str:
+    """Convert bytes-like objects to str, one code point per byte.  str is returned as-is."""
+    if isinstance(value, str):
+        return value
+    return str(value, 'latin-1')
@@ -0,0 +1,425 @@
+"""LIVING MANUAL (LIMA) text extraction from Office documents and PDFs.
+
+Office documents keep their text in deflated XML parts, and PDFs in compressed content streams,
+so no search strategy ever sees it.  extract_parts() dispatches on a document's magic bytes to a
+registered extractor, which yields the text of each relevant part, one line at a time:
+
+    - OOXML (.docx, .xlsx, .pptx): the body, headers, footers, notes and comments of a Word
+      document, the shared strings, inline strings and comments of a workbook, the slides, notes
+      and comments of a presentation, and the document properties.  Parts are streamed out of
+      the zip archive and parsed incrementally.
+    - ODF (.odt, .ods, .odp, ...): content.xml, styles.xml (headers and footers) and meta.xml.
+    - PDF: the strings drawn by every uncompressed or FlateDecode content stream, and the
+      strings in FlateDecode object streams (e.g., annotations).  Text drawn with fonts that have
+      a custom or CID encoding is only found if its bytes happen to be Latin-1 text.
+
+Extractors are registered with register_extractor(), which is all a new format needs.  Extracted
+text is cached by the SHA-256 of the document, so a document seen again (e.g., the same
+attachment in many directories, or a server worker's next request) isn't extracted again.  Parts
+that can't be extracted are recorded in EXTRACT_STATS.
+
+    Typical usage example:
+
+    from lima.lima_extract import EXTRACT_STATS, extract_parts
+
+    for part_name, lines in extract_parts(read_file(file_path)):
+        ...  # Search lines, each a str
+    print(EXTRACT_STATS.summary())
+"""
+
+# Standard Imports
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+import hashlib
+import io
+import re
+import zipfile
+import zlib
+# Third Party Imports
+# Local Imports
+
+
+ZIP_MAGIC = b'PK\x03\x04'
+PDF_MAGIC = b'%PDF-'
+DEFAULT_CACHE_SIZE = 64 << 20  # Characters of extracted text EXTRACT_CACHE holds
+MAX_STREAM_SIZE = 64 << 20     # Decompressed bytes of one PDF stream that are searched
+# OOXML parts that hold text
+OOXML_TEXT_PARTS = re.compile(r'(word/(document|header\d*|footer\d*|footnotes|endnotes|comments)'
+                              r'|xl/(sharedStrings|worksheets/sheet\d+|comments\d*)'
+                              r'|ppt/(slides/slide\d+|notesSlides/notesSlide\d+'
+                              r'|comments/comment\d+)'
+                              r'|docProps/(core|app))\.xml')
+ODF_TEXT_PARTS = ('content.xml', 'styles.xml', 'meta.xml')
+ODF_MIMETYPE = b'application/vnd.oasis.opendocument.'
+# XML elements, by local name, whose text is one line: paragraphs (w:p, a:p, text:p), headings
+# (text:h), and shared (si) or inline (is) strings
+PARAGRAPH_TAGS = frozenset(('p', 'h', 'si', 'is'))
+OOXML_TEXT_TAGS = frozenset(('t',))                  # w:t, a:t and t hold the text of a run
+SPACE_TAGS = frozenset(('s', 'tab', 'br', 'line-break'))  # Empty elements that separate words
+# Operators that end a line of PDF text
+PDF_LINE_OPERATORS = frozenset((b'ET', b'T*', b'Td', b'TD', b"'", b'"'))
+# Literal strings (with one level of balanced parentheses), hex strings, operators and numbers
+PDF_TOKEN = re.compile(rb'\((?:[^()\\]|\\.|\((?:[^()\\]|\\.)*\))*\)|<[0-9A-Fa-f\s]*>|'
+                       rb'[A-Za-z\'"*]+[A-Za-z0-9*]*|-?\d*\.?\d+', re.DOTALL)
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+PDF_STREAM = re.compile(rb'stream\r?\n')
+PDF_LENGTH = re.compile(rb'/Length\s+(\d+)(?!\s+\d+\s+R)')
+PDF_TJ_SPACE = -250  # TJ adjustments, in thousandths of a unit, wider than this are spaces
+
+# An extractor yields (part name, iterator of lines) for a document, or nothing if the document
+# isn't one it extracts (e.g., a zip archive that isn't an OOXML document).
+Extractor = Callable[[bytes], Iterator[Tuple[str, Iterator[str]]]]
+
+
+class ExtractError(Exception):
+    """A part of a document can't be extracted."""
+
+
+# Raised by a corrupt document or part (xml.etree.ElementTree.ParseError is a SyntaxError)
+EXTRACT_ERRORS = (ExtractError, EOFError, OSError, SyntaxError, ValueError, zipfile.BadZipFile,
+                  zlib.error)
+
+
+class ExtractStats():
+    """Thread-safe count of the documents and parts text was extracted from."""
+
+    def __init__(self) -> None:
+        """ExtractStats ctor."""
+        self._lock = Lock()
+        self.documents = 0     # Documents an extractor recognized
+        self.parts = 0         # Parts extracted
+        self.characters = 0    # Characters of text extracted
+        self.cache_hits = 0    # Documents whose text came from EXTRACT_CACHE
+        self.failed: List[Dict[str, str]] = []  # One {'path', 'detail'} per part not extracted
+
+    def record(self, documents: int = 0, parts: int = 0, characters: int = 0,
+               cache_hits: int = 0) -> None:
+        """Add to the counters."""
+        with self._lock:
+            self.documents += documents
+            self.parts += parts
+            self.characters += characters
+            self.cache_hits += cache_hits
+
+    def record_failure(self, path: str, detail: str) -> None:
+        """Record a part of a document as not extracted."""
+        with self._lock:
+            self.failed.append({'path': path, 'detail': detail})
+
+    def reset(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self.documents = self.parts = self.characters = self.cache_hits = 0
+            self.failed = []
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            return (f'Extract: {self.documents} documents ({self.cache_hits} cached), '
+                    f'{self.parts} parts, {self.characters} characters, '
+                    f'{len(self.failed)} parts not extracted')
+
+
+class ExtractCache():
+    """Thread-safe LRU cache of extracted text, keyed by the SHA-256 of the document."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """ExtractCache ctor.
+
+        Args:
+            max_size: Optional; Characters of text to hold.  Larger documents aren't cached.
+        """
+        self._lock = Lock()
+        self.max_size = max_size
+        self._size = 0  # Characters held
+        # Digest -> (extractor name, [(part name, [lines])])
+        self._entries: 'OrderedDict[str, Tuple[str, List[Tuple[str, List[str]]]]]' = OrderedDict()
+
+    def get(self, digest: str) -> Optional[Tuple[str, List[Tuple[str, List[str]]]]]:
+        """Extractor name and parts of the document with this digest, or None."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest: str, name: str, parts: List[Tuple[str, List[str]]]) -> None:
+        """Hold the parts extractor name extracted from the document with this digest."""
+        size = sum(len(line) for _, lines in parts for line in lines)  # Characters to hold
+        with self._lock:
+            if size > self.max_size or digest in self._entries:
+                return
+            self._entries[digest] = (name, parts)
+            self._size += size
+            while self._size > self.max_size:
+                _, (_, old_parts) = self._entries.popitem(last=False)
+                self._size -= sum(len(line) for _, lines in old_parts for line in lines)
+
+    def clear(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+EXTRACT_STATS = ExtractStats()  # Updated by every extracting search in this process
+EXTRACT_CACHE = ExtractCache()  # Shared by every extracting search in this process
+_EXTRACTORS: Dict[str, Tuple[Tuple[bytes, ...], Extractor]] = {}  # Name -> (magic, extractor)
+
+
+def register_extractor(name: str, magic: Tuple[bytes, ...], extractor: Extractor) -> None:
+    """Extract text from documents that start with one of magic, replacing any extractor name.
+
+    Args:
+        name: Name of the format (e.g., 'pdf').
+        magic: Prefixes of the documents extractor is tried on.
+        extractor: Yields (part name, iterator of lines) for a document it recognizes, and
+            nothing for one it doesn't.  EXTRACT_ERRORS it raises are recorded in EXTRACT_STATS.
+    """
+    _EXTRACTORS[name] = (magic, extractor)
+
+
+def get_part_label(label: str, part_name: str) -> str:
+    """Name a part of the document label in findings and EXTRACT_STATS."""
+    return f'{label} (part {part_name})'
+
+
+def extract_parts(data: bytes, label: str = '') -> Iterator[Tuple[str, Iterator[str]]]:
+    """Yield the text of each part of a document, if an extractor recognizes it.
+
+    Each part's lines should be read before the next part is requested.  Parts that can't be
+    extracted end early and are recorded in EXTRACT_STATS.  Documents whose every part was read
+    to the end are cached in EXTRACT_CACHE.
+
+    Args:
+        data: Contents of a file.
+        label: Optional; Name of the file, used to record failures.
+
+    Yields:
+        (part name, iterator of lines) tuples.
+    """
+    # LOCAL VARIABLES
+    digest = None  # SHA-256 of data, computed once an extractor might recognize it
+    cached = None  # Cache entry for digest
+
+    # EXTRACT IT
+    for name, (magic, extractor) in list(_EXTRACTORS.items()):
+        if not data.startswith(magic):
+            continue
+        if digest is None:
+            digest = hashlib.sha256(data).hexdigest()
+            cached = EXTRACT_CACHE.get(digest)
+        if cached is not None:
+            if cached[0] == name:
+                EXTRACT_STATS.record(documents=1, cache_hits=1)
+                for part_name, lines in cached[1]:
+                    yield part_name, iter(lines)
+                return
+            continue
+        parts = []  # (part name, lines) extracted, for the cache
+        # Characters left before the document is too large to cache, and was every part read?
+        state = {'left': EXTRACT_CACHE.max_size, 'complete': True}
+        try:
+            for part_name, lines in extractor(data):
+                if not parts:
+                    EXTRACT_STATS.record(documents=1)
+                parts.append((part_name, []))
+                part_lines = _recorded(lines, parts[-1][1], state, get_part_label(label, part_name))
+                yield part_name, part_lines
+                part_lines.close()  # A part that wasn't read to the end isn't complete
+        except EXTRACT_ERRORS as err:
+            EXTRACT_STATS.record_failure(label, str(err) or type(err).__name__)
+            state['complete'] = False
+        if parts:
+            if state['complete'] and state['left'] >= 0:
+                EXTRACT_CACHE.put(digest, name, parts)
+            return
+
+
+def _recorded(lines: Iterator[str], record: List[str], state: Dict[str, int],
+              part_label: str) -> Iterator[str]:
+    """Yield lines, appending each to record until state['left'] characters run out.
+
+    Errors end the part, and are recorded.  state['complete'] is cleared unless every line was
+    read.
+    """
+    characters = 0  # Characters yielded
+    complete = False  # Was every line read?
+    try:
+        for line in lines:
+            characters += len(line)
+            if state['left'] >= 0:
+                state['left'] -= len(line)
+                record.append(line)
+            yield line
+        complete = True
+    except EXTRACT_ERRORS as err:
+        EXTRACT_STATS.record_failure(part_label, str(err) or type(err).__name__)
+    finally:
+        state['complete'] = state['complete'] and complete
+        EXTRACT_STATS.record(parts=1, characters=characters)
+
+
+def _extract_ooxml(data: bytes) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Extractor: the text-bearing XML parts of an OOXML document, in archive order."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+        if '[Content_Types].xml' not in names:
+            return
+        for part_name in names:
+            if OOXML_TEXT_PARTS.fullmatch(part_name):
+                with archive.open(part_name) as part:
+                    yield part_name, _get_xml_lines(part, _get_ooxml_text)
+
+
+def _extract_odf(data: bytes) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Extractor: the text-bearing XML parts of an ODF document."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+        if 'mimetype' not in names or not archive.read('mimetype').startswith(ODF_MIMETYPE):
+            return
+        for part_name in ODF_TEXT_PARTS:
+            if part_name in names:
+                with archive.open(part_name) as part:
+                    yield part_name, _get_xml_lines(part, _get_odf_text)
+
+
+def _extract_pdf(data: bytes) -> Iterator[Tuple[str, Iterator[str]]]:
+    """Extractor: the strings in each uncompressed or FlateDecode stream of a PDF, in file order."""
+    # LOCAL VARIABLES
+    position = 0  # Offset to look for the next stream from
+
+    # FIND THE STREAMS
+    while True:
+        match = PDF_STREAM.search(data, position)
+        if not match:
+            return
+        start = match.end()  # Offset of the stream's data
+        obj_start = data.rfind(b' obj', max(position, match.start() - 4096), match.start())
+        dictionary = data[obj_start:match.start()]
+        length = PDF_LENGTH.search(dictionary)
+        end = start + int(length.group(1)) if length else -1  # Offset of the end of the data
+        if not length or not data[end:end + 11].lstrip(b'\r\n').startswith(b'endstream'):
+            end = data.find(b'endstream', start)
+            if end < 0:
+                raise ExtractError(f'The stream at byte {start} never ends')
+        position = end
+        if obj_start < 0:
+            continue  # Not a stream object
+        # SKIP THE STREAMS WITHOUT TEXT
+        filters = re.findall(rb'/(\w+Decode)', dictionary)
+        if filters not in ([], [b'FlateDecode']) or b'/DecodeParms' in dictionary:
+            continue  # Images, or other filters, or predictor-coded xref streams
+        if re.search(rb'/(Subtype\s*/Image|Type\s*/XRef|Length1)', dictionary):
+            continue  # Images, xref streams and embedded fonts hold no text
+        object_id = b' '.join(data[max(0, obj_start - 32):obj_start].split()[-2:])
+        yield f'object {object_id.decode("latin-1")}', _get_pdf_lines(data[start:end],
+                                                                       bool(filters))
+
+
+def _get_xml_lines(part: io.BufferedIOBase, get_text: Callable[[ElementTree.Element], str]
+                   ) -> Iterator[str]:
+    """Parse an XML part incrementally, yielding the text of each paragraph as a line.
+
+    Text outside any paragraph (e.g., a document property) is yielded an element at a time.
+    """
+    depth = 0  # Paragraphs open around the current element
+    for event, element in ElementTree.iterparse(part, events=('start', 'end')):
+        tag = _get_local_name(element.tag)
+        if event == 'start':
+            depth += tag in PARAGRAPH_TAGS
+        elif tag in PARAGRAPH_TAGS:
+            depth -= 1
+            if not depth:
+                yield get_text(element)
+                element.clear()
+        elif not depth:
+            if element.text and element.text.strip():
+                yield element.text
+            element.clear()
+
+
+def _get_ooxml_text(paragraph: ElementTree.Element) -> str:
+    """Text of an OOXML paragraph: its runs' text elements, tabs and breaks as spaces."""
+    parts = []  # Return value, in pieces
+    for element in paragraph.iter():
+        tag = _get_local_name(element.tag)
+        if tag in OOXML_TEXT_TAGS:
+            parts.append(element.text or '')
+        elif tag in SPACE_TAGS:
+            parts.append(' ')
+    return ''.join(parts)
+
+
+def _get_odf_text(paragraph: ElementTree.Element) -> str:
+    """Text of an ODF paragraph: its mixed content, spaces, tabs and line breaks as spaces."""
+    parts = [paragraph.text or '']  # Return value, in pieces
+    for child in paragraph:
+        if _get_local_name(child.tag) in SPACE_TAGS:
+            parts.append(' ')
+        parts.append(_get_odf_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+def _get_local_name(tag: str) -> str:
+    """Tag without its {namespace}."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _get_pdf_lines(stream: bytes, compressed: bool) -> Iterator[str]:
+    """Yield the strings drawn by a PDF content stream, one text line at a time."""
+    # LOCAL VARIABLES
+    line = []  # Pieces of the current line
+
+    # DECODE IT
+    if compressed:
+        decompressor = zlib.decompressobj()
+        stream = decompressor.decompress(stream, MAX_STREAM_SIZE)
+
+    # TOKENIZE IT
+    for match in PDF_TOKEN.finditer(stream):
+        token = match.group()
+        if token[:1] == b'(':
+            line.append(_decode_pdf_string(_unescape_pdf_string(token[1:-1])))
+        elif token[:1] == b'<':
+            hex_digits = re.sub(rb'\s', b'', token[1:-1])
+            line.append(_decode_pdf_string(bytes.fromhex(
+                (hex_digits + b'0' * (len(hex_digits) % 2)).decode('ascii'))))
+        elif token in PDF_LINE_OPERATORS:
+            if line:
+                yield ''.join(line)
+            line = []
+        elif token[:1] in b'-.0123456789' and line and float(token) < PDF_TJ_SPACE:
+            line.append(' ')
+    if line:
+        yield ''.join(line)
+
+
+def _unescape_pdf_string(literal: bytes) -> bytes:
+    """Undo the backslash escapes of a PDF literal string."""
+    return re.sub(rb'\\([0-7]{1,3}|\r\n|.)', lambda match: _unescape_pdf_sequence(match.group(1)),
+                  literal, flags=re.DOTALL)
+
+
+def _unescape_pdf_sequence(sequence: bytes) -> bytes:
+    """Byte(s) a PDF escape sequence, minus its backslash, stands for."""
+    if sequence[:1].isdigit() and sequence[:1] < b'8':
+        return bytes([int(sequence, 8) & 0xFF])
+    if sequence in (b'\r\n', b'\r', b'\n'):
+        return b''  # Line continuation
+    return PDF_ESCAPES.get(sequence, sequence)
+
+
+def _decode_pdf_string(raw: bytes) -> str:
+    """Decode a PDF string: UTF-16BE with a byte order mark, otherwise Latin-1."""
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', 'replace')
+    return raw.decode('latin-1')
+
+
+register_extractor('ooxml', (ZIP_MAGIC,), _extract_ooxml)
+register_extractor('odf', (ZIP_MAGIC,), _extract_odf)
+register_extractor('pdf', (PDF_MAGIC,), _extract_pdf)
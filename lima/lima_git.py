@@ -0,0 +1,631 @@
+"""LIVING MANUAL (LIMA) git repository search.
+
+Search every blob reachable from any ref, straight from the object database: loose objects and
+packfiles (deltas included) are decompressed in-process, no checkout or git binary required.  Each
+unique blob is searched exactly once, no matter how many commits or paths share it, and its
+findings are cached by blob id so later runs only search blobs they have never seen.  The cache
+lives in the user's cache directory, one file per repository (see get_cache_path()), so a search
+never writes to the repository it reads.  Findings name the blob, the path it was committed at,
+and the oldest commit that contains it.
+
+    Typical usage example:
+
+    from lima.lima_git import search_git
+
+    exit_code = search_git(repo_path=Path('my_repo'), dw_list=['dirty'], encoding='utf-8')
+"""
+
+# Standard Imports
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+# Third Party Imports
+# Local Imports
+from lima.lima_engine import ENGINE_AUTO
+from lima.lima_output import capture_findings, emit_finding
+from lima.lima_search import search_data, validate_search_args
+from lima.lima_validation import validate_path_dir, validate_type
+
+
+CACHE_DIR_NAME = 'lima'  # Directory holding the default blob caches, in the user's cache directory
+CACHE_VERSION = 1        # Bump when the cache format changes
+DELTA_BASE_CACHE_BYTES = 96 << 20  # Unpacked delta bases kept around, like git's default
+# Git object types
+OBJ_COMMIT = 'commit'
+OBJ_TREE = 'tree'
+OBJ_BLOB = 'blob'
+OBJ_TAG = 'tag'
+# Packfile object type numbers
+_PACK_TYPES = {1: OBJ_COMMIT, 2: OBJ_TREE, 3: OBJ_BLOB, 4: OBJ_TAG}
+_PACK_OFS_DELTA = 6
+_PACK_REF_DELTA = 7
+_IDX_V2_MAGIC = b'\xfftOc'
+_TREE_MODE_DIR = b'40000'
+_TREE_MODE_GITLINK = b'160000'  # Submodule commit, not in this repository
+
+
+class PackFile():
+    """Read objects from one packfile using its .idx file.
+
+    Raises:
+        NotImplementedError: Unsupported .idx version.
+        OSError: The packfile or its .idx file can not be read.
+    """
+
+    def __init__(self, pack_path: Path) -> None:
+        """PackFile ctor.
+
+        Args:
+            pack_path: Path to a .pack file.  The .idx file must sit next to it.
+        """
+        self._pack = _map_file(pack_path)
+        self._idx = _map_file(pack_path.with_suffix('.idx'))
+        self._fanout_offset = 0   # Start of the 256 entry fanout table
+        self._version = 1         # .idx version
+        if self._idx[:4] == _IDX_V2_MAGIC:
+            self._version = struct.unpack_from('>I', self._idx, 4)[0]
+            if self._version != 2:
+                raise NotImplementedError(f'Unsupported pack index version {self._version}')
+            self._fanout_offset = 8
+        self._count = struct.unpack_from('>I', self._idx, self._fanout_offset + 255 * 4)[0]
+
+    def close(self) -> None:
+        """Unmap the packfile and its .idx file."""
+        self._pack.close()
+        self._idx.close()
+
+    def find(self, sha: bytes) -> Optional[int]:
+        """Find the packfile offset of a binary object id, or None if it's not in this pack."""
+        # LOCAL VARIABLES
+        low = 0     # First candidate index
+        high = 0    # One past the last candidate index
+        names = 0   # Start of the sorted object id table
+        width = 20  # Bytes per object id table entry
+
+        # NARROW IT
+        if sha[0]:
+            low = struct.unpack_from('>I', self._idx, self._fanout_offset + (sha[0] - 1) * 4)[0]
+        high = struct.unpack_from('>I', self._idx, self._fanout_offset + sha[0] * 4)[0]
+        names = self._fanout_offset + 256 * 4
+        if self._version == 1:
+            names, width = names + 4, 24  # Entries are (offset, id)
+
+        # SEARCH IT
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self._idx[names + middle * width:names + middle * width + 20]
+            if candidate == sha:
+                return self._get_offset(middle)
+            if candidate < sha:
+                low = middle + 1
+            else:
+                high = middle
+
+        # DONE
+        return None
+
+    def _get_offset(self, index: int) -> int:
+        """Translate an object id table index into a packfile offset."""
+        # LOCAL VARIABLES
+        table = self._fanout_offset + 256 * 4  # Start of the object id table
+        offset = 0                             # Return value
+
+        # LOOK IT UP
+        if self._version == 1:
+            return struct.unpack_from('>I', self._idx, table + index * 24)[0]
+        table += self._count * (20 + 4)  # Skip the object ids and CRCs
+        offset = struct.unpack_from('>I', self._idx, table + index * 4)[0]
+        if offset & 0x80000000:  # Index into the 8-byte offset table
+            table += self._count * 4
+            offset = struct.unpack_from('>Q', self._idx, table + (offset & 0x7fffffff) * 8)[0]
+
+        # DONE
+        return offset
+
+    def read(self, offset: int, store: 'GitObjectStore') -> Tuple[str, bytes]:
+        """Unpack the object at offset, resolving deltas.
+
+        Delta bases are read through store, which caches them.
+
+        Returns:
+            Tuple of (object type, object contents).
+        """
+        # LOCAL VARIABLES
+        pos = offset                 # Current position in the packfile
+        byte = self._pack[pos]       # Current header byte
+        type_num = (byte >> 4) & 7   # Packfile object type
+        size = byte & 0x0f           # Inflated size
+        shift = 4                    # Bit position of the next size bits
+        base = None                  # Delta base (type, contents)
+
+        # PARSE THE HEADER
+        pos += 1
+        while byte & 0x80:
+            byte = self._pack[pos]
+            pos += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+        if type_num == _PACK_OFS_DELTA:
+            byte = self._pack[pos]
+            pos += 1
+            base_distance = byte & 0x7f
+            while byte & 0x80:
+                byte = self._pack[pos]
+                pos += 1
+                base_distance = ((base_distance + 1) << 7) | (byte & 0x7f)
+            base = store.read_packed_base(self, offset - base_distance)
+        elif type_num == _PACK_REF_DELTA:
+            base = store.read_base(self._pack[pos:pos + 20].hex())
+            pos += 20
+        elif type_num not in _PACK_TYPES:
+            raise ValueError(f'Unsupported packfile object type {type_num} at offset {offset}')
+
+        # UNPACK IT
+        if base:
+            return base[0], _apply_delta(base[1], _inflate(self._pack, pos, size))
+        return _PACK_TYPES[type_num], _inflate(self._pack, pos, size)
+
+
+class GitObjectStore():
+    """Read objects from a git directory's loose objects and packfiles.
+
+    Only objects that deltas are based on are cached, up to base_cache_bytes in all.  Every other
+    object is read once by search_git(), so caching it would only pin its memory.
+
+    Raises:
+        OSError: A packfile can not be read.
+    """
+
+    def __init__(self, git_dir: Path, base_cache_bytes: int = DELTA_BASE_CACHE_BYTES) -> None:
+        """GitObjectStore ctor.
+
+        Args:
+            git_dir: The git directory (e.g., my_repo/.git), not the work tree.
+            base_cache_bytes: Optional; Bytes of unpacked delta bases to keep around.
+        """
+        self._objects_dir = git_dir / 'objects'
+        self._packs = [PackFile(pack_path) for pack_path
+                       in sorted((self._objects_dir / 'pack').glob('*.pack'))]
+        self.base_cache_bytes = base_cache_bytes
+        self.base_cache_size = 0  # Bytes held by _bases
+        # (pack, offset) -> delta base (type, contents), least recently used first
+        self._bases: 'OrderedDict[Tuple[int, int], Tuple[str, bytes]]' = OrderedDict()
+
+    def close(self) -> None:
+        """Close every packfile, and forget the delta bases."""
+        for pack in self._packs:
+            pack.close()
+        self._packs = []
+        self._bases.clear()
+        self.base_cache_size = 0
+
+    def read(self, sha: str) -> Tuple[str, bytes]:
+        """Read an object.
+
+        Args:
+            sha: Hexadecimal object id.
+
+        Returns:
+            Tuple of (object type, object contents).
+
+        Raises:
+            KeyError: The object is not in this repository.
+        """
+        # LOCAL VARIABLES
+        loose_path = self._objects_dir / sha[:2] / sha[2:]  # Loose object filename
+        raw = b''                                          # Inflated loose object
+        binary_sha = bytes.fromhex(sha)                    # Packfile index key
+
+        # LOOSE
+        try:
+            raw = zlib.decompress(loose_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        else:
+            header, _, contents = raw.partition(b'\x00')
+            return header.split(b' ')[0].decode(), contents
+
+        # PACKED
+        for pack in self._packs:
+            offset = pack.find(binary_sha)
+            if offset is not None:
+                return pack.read(offset, self)
+
+        # DONE
+        raise KeyError(sha)
+
+    def read_base(self, sha: str) -> Tuple[str, bytes]:
+        """Read the base of a REF delta, through the delta base cache.
+
+        Raises:
+            KeyError: The object is not in this repository.
+        """
+        binary_sha = bytes.fromhex(sha)  # Packfile index key
+        for pack in self._packs:
+            offset = pack.find(binary_sha)
+            if offset is not None:
+                return self.read_packed_base(pack, offset)
+        return self.read(sha)  # Loose, e.g. the base of a thin pack's delta
+
+    def read_packed_base(self, pack: PackFile, offset: int) -> Tuple[str, bytes]:
+        """Read the base of a delta from pack, through the delta base cache."""
+        # LOCAL VARIABLES
+        key = (id(pack), offset)     # Delta base cache key
+        base = self._bases.get(key)  # Return value
+
+        # CACHE IT
+        if base is not None:
+            self._bases.move_to_end(key)
+            return base
+        base = pack.read(offset, self)
+        if len(base[1]) <= self.base_cache_bytes:  # Bigger bases would evict everything else
+            self._bases[key] = base
+            self.base_cache_size += len(base[1])
+            while self.base_cache_size > self.base_cache_bytes:
+                self.base_cache_size -= len(self._bases.popitem(last=False)[1][1])
+
+        # DONE
+        return base
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def search_git(repo_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool = True,
+               engine: str = ENGINE_AUTO, cache_path: Optional[Path] = None,
+               use_cache: bool = True) -> int:
+    """Searches every blob in repo_path's history for dw_list entries.
+
+    Emits findings labeled with the path, commit and blob id.
+
+    Args:
+        repo_path: Work tree or git directory of a repository.
+        dw_list: A list of non-empty strings to search for.
+        encoding: Format with which to decode blobs.
+        case_sensitive: Optional; Considers case when checking blobs for dirty words.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        cache_path: Optional; Blob cache file.  Defaults to get_cache_path(), outside the
+            repository.
+        use_cache: Optional; If False, search every blob and leave the cache alone.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        FileNotFoundError: repo_path is unavailable.
+        LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine, or unsupported pack index.
+        OSError: repo_path is not a git repository.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string).
+    """
+    # LOCAL VARIABLES
+    found = 0         # 0 if no dirty words were found, 3 if dirty words were found
+    git_dir = None    # The repository's git directory
+    store = None      # Object database
+    settings = {}     # Search arguments the cache must agree with
+    cache = {}        # Blob id -> findings, minus the label, from previous runs
+    reachable = {}    # Blob id -> findings, minus the label, for blobs seen this run
+    findings = []     # Findings for one blob
+
+    # INPUT VALIDATION
+    git_dir = find_git_dir(repo_path)
+    validate_type(use_cache, 'use_cache', bool)
+    if cache_path is not None:
+        validate_type(cache_path, 'cache_path', Path)
+    cache_path = cache_path if cache_path else get_cache_path(git_dir)
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                         engine=engine)
+
+    # LOAD IT
+    settings = {'version': CACHE_VERSION, 'encoding': encoding, 'case_sensitive': case_sensitive,
+                'words_digest': hashlib.sha256('\n'.join(dw_list).encode()).hexdigest()}
+    if use_cache:
+        cache = _load_cache(cache_path, settings)
+
+    # SEARCH IT
+    store = GitObjectStore(git_dir)
+    try:
+        for blob, commit, path in walk_blobs(store, git_dir):
+            if blob in cache:
+                findings = cache[blob]
+            else:
+                findings = _search_blob(store, blob, dw_list, encoding, case_sensitive, engine)
+            reachable[blob] = findings
+            for finding in findings:
+                found = 3
+                emit_finding(f'{path} (commit {commit}, blob {blob}) : {finding}')
+    finally:
+        store.close()
+        if use_cache:
+            _save_cache(cache_path, settings, reachable)  # Drops unreachable blobs
+
+    # DONE
+    return found
+
+
+def find_git_dir(repo_path: Path) -> Path:
+    """Find the git directory for a work tree, a bare repository, or a git directory.
+
+    Raises:
+        FileNotFoundError: repo_path is unavailable.
+        OSError: repo_path is not a git repository.
+        TypeError: Bad data type.
+    """
+    # LOCAL VARIABLES
+    git_dir = repo_path / '.git'  # Return value
+
+    # INPUT VALIDATION
+    validate_path_dir(repo_path)
+
+    # FIND IT
+    if git_dir.is_file():  # Linked work tree or submodule: "gitdir: <path>"
+        git_dir = git_dir.parent / git_dir.read_text().split(':', 1)[1].strip()
+        if (git_dir / 'commondir').is_file():
+            git_dir = git_dir / (git_dir / 'commondir').read_text().strip()
+    elif not git_dir.is_dir():
+        git_dir = repo_path  # Bare repository or git directory
+    if not (git_dir / 'objects').is_dir() or not (git_dir / 'HEAD').is_file():
+        raise OSError(f'{repo_path} is not a git repository')
+
+    # DONE
+    return git_dir
+
+
+def get_cache_path(git_dir: Path) -> Path:
+    """Default blob cache file for git_dir: one per repository, in the user's cache directory.
+
+    The cache directory is $XDG_CACHE_HOME, %LOCALAPPDATA% or ~/.cache, followed by CACHE_DIR_NAME.
+    """
+    cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+                     or Path.home() / '.cache')  # The user's cache directory
+    digest = hashlib.sha256(os.fsencode(git_dir.resolve())).hexdigest()[:16]  # Names git_dir
+    return cache_dir / CACHE_DIR_NAME / f'blob-cache-{digest}.json'
+
+
+def get_refs(git_dir: Path) -> List[str]:
+    """List the object ids every ref, and HEAD, point to.
+
+    Symbolic refs are resolved.  Annotated tags are listed as-is.
+    """
+    # LOCAL VARIABLES
+    refs = {}                           # Ref name -> object id
+    packed_path = git_dir / 'packed-refs'  # Refs packed by git pack-refs
+
+    # PACKED
+    if packed_path.is_file():
+        for line in packed_path.read_text().splitlines():
+            if line and line[0] not in '#^':
+                sha, name = line.split(' ', 1)
+                refs[name] = sha
+    # LOOSE
+    for ref_path in sorted((git_dir / 'refs').rglob('*')):
+        if ref_path.is_file():
+            refs[ref_path.relative_to(git_dir).as_posix()] = ref_path.read_text().strip()
+    refs['HEAD'] = (git_dir / 'HEAD').read_text().strip()
+    # RESOLVE
+    for name, value in refs.items():
+        for _ in range(10):  # Symbolic ref chains are short
+            if not value.startswith('ref: '):
+                break
+            value = refs.get(value[5:], '')
+        refs[name] = value
+
+    # DONE
+    return list(dict.fromkeys(sha for sha in refs.values() if len(sha) == 40))
+
+
+def walk_blobs(store: GitObjectStore, git_dir: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield every unique blob reachable from any ref, exactly once.
+
+    Commits are visited oldest first, so each blob is paired with the oldest commit, and the path,
+    that contains it.  Trees shared between commits are only walked once.
+
+    Yields:
+        Tuple of (blob id, commit id, path).
+    """
+    # LOCAL VARIABLES
+    commits = {}        # Commit id -> (committer timestamp, discovery order, root tree id)
+    seen_trees = set()  # Trees already walked
+    seen_blobs = set()  # Blobs already yielded
+
+    # WALK THE HISTORY
+    commits = _get_commits(store, get_refs(git_dir))
+
+    # WALK THE TREES
+    for commit, (_, _, root_tree) in sorted(commits.items(), key=lambda item: item[1][:2]):
+        tree_stack = [(root_tree, '')]  # (tree id, path) left to walk
+        while tree_stack:
+            tree, tree_path = tree_stack.pop()
+            if tree in seen_trees:
+                continue
+            seen_trees.add(tree)
+            try:
+                entries = _parse_tree(store.read(tree)[1])
+            except KeyError:
+                print(f'WARNING: Tree {tree} is missing from {git_dir}', file=sys.stderr)
+                continue
+            for mode, name, sha in reversed(entries):
+                path = f'{tree_path}{name}'
+                if mode == _TREE_MODE_DIR:
+                    tree_stack.append((sha, f'{path}/'))
+                elif mode != _TREE_MODE_GITLINK and sha not in seen_blobs:
+                    seen_blobs.add(sha)
+                    yield sha, commit, path
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its delta base and a packfile delta."""
+    # LOCAL VARIABLES
+    pos = 0               # Current position in delta
+    result = bytearray()  # Rebuilt object
+
+    # APPLY IT
+    _, pos = _read_delta_size(delta, pos)  # Base size
+    _, pos = _read_delta_size(delta, pos)  # Result size
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:  # Copy from base
+            copy_offset = copy_size = 0
+            for bit in range(4):
+                if opcode & (1 << bit):
+                    copy_offset |= delta[pos] << (8 * bit)
+                    pos += 1
+            for bit in range(3):
+                if opcode & (0x10 << bit):
+                    copy_size |= delta[pos] << (8 * bit)
+                    pos += 1
+            result += base[copy_offset:copy_offset + (copy_size or 0x10000)]
+        elif opcode:  # Insert literal bytes
+            result += delta[pos:pos + opcode]
+            pos += opcode
+        else:
+            raise ValueError('Corrupt packfile delta')
+
+    # DONE
+    return bytes(result)
+
+
+def _get_commits(store: GitObjectStore,
+                 tips: List[str]) -> Dict[str, Tuple[int, int, str]]:
+    """Find every commit reachable from tips, peeling annotated tags.
+
+    Returns:
+        Dictionary of commit id -> (committer timestamp, discovery order, root tree id).
+    """
+    # LOCAL VARIABLES
+    commits = {}             # Return value
+    pending = list(tips)     # Object ids left to visit
+
+    # WALK IT
+    while pending:
+        sha = pending.pop()
+        if sha in commits:
+            continue
+        try:
+            obj_type, contents = store.read(sha)
+        except KeyError:
+            continue  # Shallow clone boundary or dangling ref
+        headers = _parse_headers(contents)
+        if obj_type == OBJ_TAG:
+            pending.append(headers.get(b'object', [b''])[0].decode())
+        elif obj_type == OBJ_COMMIT:
+            committer = headers.get(b'committer', [b'0 +0000'])[0].rsplit(b' ', 2)
+            commits[sha] = (int(committer[-2]) if len(committer) > 2 else 0, len(commits),
+                            headers[b'tree'][0].decode())
+            pending.extend(parent.decode() for parent in headers.get(b'parent', []))
+
+    # DONE
+    return commits
+
+
+def _inflate(data: mmap.mmap, pos: int, size: int) -> bytes:
+    """Inflate the zlib stream at data[pos:] into size bytes."""
+    # LOCAL VARIABLES
+    decompressor = zlib.decompressobj()  # Stops at the end of the zlib stream
+    step = max(size, 4096)               # Compressed bytes to feed at once
+    chunks = []                          # Inflated data
+
+    # INFLATE IT
+    while not decompressor.eof:
+        if pos >= len(data):
+            raise ValueError('Truncated packfile object')
+        chunks.append(decompressor.decompress(data[pos:pos + step]))
+        pos += step
+
+    # DONE
+    return b''.join(chunks)
+
+
+def _load_cache(cache_path: Path, settings: Dict[str, object]) -> Dict[str, List[str]]:
+    """Load the blob cache, or start a new one if it's missing, corrupt, or used other settings."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('settings') != settings:
+        return {}
+    return cache.get('blobs', {})
+
+
+def _map_file(file_path: Path) -> mmap.mmap:
+    """Map a file into memory, read-only."""
+    with open(file_path, 'rb') as in_file:
+        return mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_headers(contents: bytes) -> Dict[bytes, List[bytes]]:
+    """Parse the headers of a commit or tag object into a dictionary of key -> values."""
+    headers = {}  # Return value
+    for line in contents.split(b'\n\n', 1)[0].split(b'\n'):
+        if line and not line.startswith(b' '):  # Continuation lines (e.g., gpgsig) are skipped
+            key, _, value = line.partition(b' ')
+            headers.setdefault(key, []).append(value)
+    return headers
+
+
+def _parse_tree(contents: bytes) -> List[Tuple[bytes, str, str]]:
+    """Parse a tree object into a list of (mode, name, object id) entries."""
+    # LOCAL VARIABLES
+    entries = []  # Return value
+    pos = 0       # Current position in contents
+
+    # PARSE IT
+    while pos < len(contents):
+        space = contents.index(b' ', pos)
+        null = contents.index(b'\x00', space)
+        entries.append((contents[pos:space], os.fsdecode(contents[space + 1:null]),
+                        contents[null + 1:null + 21].hex()))
+        pos = null + 21
+
+    # DONE
+    return entries
+
+
+def _read_delta_size(delta: bytes, pos: int) -> Tuple[int, int]:
+    """Read a little-endian base-128 size from a delta header.
+
+    Returns:
+        Tuple of (size, new position).
+    """
+    size = shift = 0  # Return value, bit position of the next bits
+    while True:
+        byte = delta[pos]
+        pos += 1
+        size |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, pos
+
+
+def _save_cache(cache_path: Path, settings: Dict[str, object],
+                cache: Dict[str, List[str]]) -> None:
+    """Atomically replace the blob cache."""
+    temp_path = cache_path.with_name(cache_path.name + '.tmp')  # Written first
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump({'settings': settings, 'blobs': cache}, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError as err:
+        print(f'WARNING: Unable to save the blob cache to {cache_path}: {err}', file=sys.stderr)
+
+
+def _search_blob(store: GitObjectStore, blob: str, dw_list: List[str], encoding: str,
+                 case_sensitive: bool, engine: str) -> List[str]:
+    """Search one blob.
+
+    Returns:
+        Findings, minus the label, so they can be cached and relabeled.
+    """
+    with capture_findings() as findings:
+        search_data(data=store.read(blob)[1], dw_list=dw_list, encoding=encoding,
+                    case_sensitive=case_sensitive, engine=engine, label=blob)
+    return [finding[len(blob) + 3:] for finding in findings]
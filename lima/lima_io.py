@@ -0,0 +1,217 @@
+"""LIVING MANUAL (LIMA) file reading that is kind to the page cache and the allocator.
+
+Path.read_bytes() leaves every byte it reads in the page cache.  A nightly scan of a large tree
+reads each file exactly once, yet evicts data other services on the host will need again.
+read_file() tells the kernel files larger than MIN_REUSE_SIZE are read sequentially (bigger
+readahead).  With no_cache_pollution, it reads every file in block_size blocks and tells the
+kernel to drop each block from the page cache as soon as it has been read.  The advice is a no-op
+on platforms without posix_fadvise().  With a max_size, read_file() refuses larger files and stops
+reading a file that grows past it (see lima_limits).
+
+Path.read_bytes() also allocates a fresh buffer for every file and, unless the allocator kept
+one around, the kernel zero-fills its pages all over again.  With reuse, read_file() reads files
+larger than MIN_REUSE_SIZE into the calling thread's BufferPool instead: one bytearray per
+power-of-two size class, resized in place to fit each file.  A pool keeps at most
+DEFAULT_POOL_LIMIT bytes in all, so a long-lived thread (e.g., in `lima serve` or `lima watch`)
+doesn't hold on to a buffer per size class it ever read.  The contents are only valid until
+that thread's next read_file(reuse=True).  Smaller files are read like Path.read_bytes() does,
+the allocator recycles those buffers just as well.
+
+    Typical usage example:
+
+    from lima.lima_io import read_file
+
+    data = read_file(Path('huge.bin'), no_cache_pollution=True)
+"""
+
+# Standard Imports
+from pathlib import Path
+from threading import local
+from typing import Dict, Optional, Union
+import os
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import DEFAULT_BLOCK_SIZE
+from lima.lima_validation import validate_type
+
+
+DEFAULT_POOL_LIMIT = 1 << 26  # Bytes of buffer, in all, a BufferPool keeps for reuse
+MIN_REUSE_SIZE = 1 << 13      # Files up to this size, in bytes, are read without hints or the pool
+_FADVISE = getattr(os, 'posix_fadvise', None)  # None on platforms without it (e.g., Windows)
+_LOCAL = local()  # Per-thread state: the BufferPool
+
+
+class BufferPool():
+    """Reusable read buffers for one thread, one per power-of-two size class."""
+
+    def __init__(self, limit: int = DEFAULT_POOL_LIMIT) -> None:
+        """BufferPool ctor.
+
+        Args:
+            limit: Optional; Bytes of buffer kept in all.  Buffers larger than this are allocated
+                for one read, not kept.  Keeping a new buffer drops the others, smallest first,
+                until they fit.
+        """
+        self._buffers: Dict[int, bytearray] = {}  # Size class -> buffer
+        self.limit = limit
+        self.allocated = 0  # Bytes allocated for buffers, kept or not
+        self.reused = 0     # Requests served by a kept buffer
+        self.retained = 0   # Bytes of buffer kept for reuse, at most limit
+
+    def get(self, size: int) -> bytearray:
+        """Get a buffer of exactly size bytes.  Its contents are undefined.
+
+        The buffer is the same object the next get() of the same size class returns.  It may be
+        shrunk by one byte without reallocating.
+        """
+        # LOCAL VARIABLES
+        # 1 << size_class is at least size, and at most twice size - 1
+        size_class = (size - 1).bit_length() if size else 0
+        buffer = self._buffers.get(size_class)  # Return value
+
+        # GET IT
+        if buffer is None:
+            if 1 << size_class > self.limit:
+                self.allocated += size
+                return bytearray(size)
+            self.allocated += 1 << size_class
+            self.retained += 1 << size_class
+            for kept_class in sorted(self._buffers):
+                if self.retained <= self.limit:
+                    break
+                del self._buffers[kept_class]
+                self.retained -= 1 << kept_class
+            buffer = self._buffers[size_class] = bytearray(1 << size_class)
+        else:
+            self.reused += 1
+        # size, and size - 1, are at least half the allocation: bytearray resizes in place
+        if len(buffer) > size:
+            del buffer[size:]
+        elif len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+
+        # DONE
+        return buffer
+
+
+def get_pool() -> BufferPool:
+    """The calling thread's BufferPool."""
+    try:
+        return _LOCAL.pool
+    except AttributeError:
+        _LOCAL.pool = BufferPool()
+        return _LOCAL.pool
+
+
+def read_file(file_path: Path, block_size: int = DEFAULT_BLOCK_SIZE,
+              no_cache_pollution: bool = False, reuse: bool = False,
+              max_size: Optional[int] = None) -> Union[bytes, bytearray]:
+    """Read all of file_path, hinting the kernel to read ahead and, optionally, drop the pages.
+
+    Args:
+        file_path: File to read.
+        block_size: Optional; Bytes read, and dropped from the page cache, at a time when
+            no_cache_pollution.
+        no_cache_pollution: Optional; Drop each block from the page cache once it has been read.
+        reuse: Optional; Read files larger than MIN_REUSE_SIZE into the calling thread's
+            BufferPool.  The contents are only valid until this thread's next
+            read_file(reuse=True).
+        max_size: Optional; Largest file, in bytes, to read.
+
+    Returns:
+        The file's contents.
+
+    Raises:
+        lima_limits.FileLimitError: file_path is larger than max_size.
+        OSError: file_path can not be read.
+        TypeError: Bad data type.
+        ValueError: block_size is less than 1, or max_size is negative.
+    """
+    # LOCAL VARIABLES
+    data = bytearray()  # Return value, sized by fstat() up front
+    size = 0            # Size of data, one spare byte finds EOF
+    offset = 0          # Bytes read so far
+    count = 0           # Bytes read by the last readinto()
+    stop = 0            # End of the next readinto(): one block if it is dropped, else all of data
+    limit = -1 if max_size is None else max_size + 1  # Bytes to read(), one spare finds the limit
+
+    # INPUT VALIDATION
+    validate_io_args(block_size=block_size, no_cache_pollution=no_cache_pollution)
+    validate_type(reuse, 'reuse', bool)
+    if max_size is not None:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_limits import validate_limit_args
+        validate_limit_args(timeout=None, max_file_size=max_size)
+
+    # READ IT
+    with open(file_path, 'rb', buffering=0) as in_file:
+        size = os.fstat(in_file.fileno()).st_size + 1
+        if max_size is not None and size > limit:
+            _raise_too_large(f'{size - 1} bytes is larger than {max_size} bytes')
+        if size <= MIN_REUSE_SIZE and not no_cache_pollution:
+            # Too small for readahead or the pool to make a difference
+            return _check_size(in_file.read(limit), max_size)
+        _advise(in_file.fileno(), 0, 0, 'POSIX_FADV_SEQUENTIAL')
+        if not no_cache_pollution and not reuse:
+            return _check_size(in_file.read(limit), max_size)  # One read, like Path.read_bytes()
+        data = get_pool().get(size) if reuse else bytearray(size)
+        while True:
+            if offset == len(data):
+                data.extend(bytes(block_size))  # The file grew, or st_size lied (e.g., /proc)
+            stop = offset + block_size if no_cache_pollution else len(data)
+            with memoryview(data)[offset:stop] as chunk:
+                count = in_file.readinto(chunk)
+            if not count:
+                break  # EOF
+            if no_cache_pollution:
+                _advise(in_file.fileno(), offset, count, 'POSIX_FADV_DONTNEED')
+            offset += count
+            if max_size is not None and offset > max_size:
+                _check_size(data, max_size)
+        if no_cache_pollution:
+            # Blocks still under readahead I/O when they were advised on are dropped now
+            _advise(in_file.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+
+    # DONE
+    del data[offset:]
+    return data
+
+
+def validate_io_args(block_size: int, no_cache_pollution: bool) -> None:
+    """Validate the read_file() arguments the search functions pass through.
+
+    Raises:
+        TypeError: Bad data type.
+        ValueError: block_size is less than 1.
+    """
+    validate_type(block_size, 'block_size', int)
+    validate_type(no_cache_pollution, 'no_cache_pollution', bool)
+    if block_size < 1:
+        raise ValueError('block_size must be at least 1')
+
+
+def _check_size(data: Union[bytes, bytearray], max_size: Optional[int]) -> Union[bytes, bytearray]:
+    """Return data, unless it is larger than max_size.
+
+    Raises:
+        lima_limits.FileLimitError: data is larger than max_size.
+    """
+    if max_size is not None and len(data) > max_size:
+        _raise_too_large(f'grew past {max_size} bytes while it was read')
+    return data
+
+
+def _raise_too_large(detail: str) -> None:
+    """Raise lima_limits.FileLimitError, imported on demand, for a file that is too large."""
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_limits import REASON_SIZE, FileLimitError
+    raise FileLimitError(REASON_SIZE, detail)
+
+
+def _advise(file_desc: int, offset: int, length: int, advice: str) -> None:
+    """Call posix_fadvise(), if this platform has it.  Advice is best effort, errors are ignored."""
+    if _FADVISE:
+        try:
+            _FADVISE(file_desc, offset, length, getattr(os, advice))
+        except OSError:
+            pass  # E.g., a pipe, or a file system that doesn't take advice
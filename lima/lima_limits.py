@@ -0,0 +1,151 @@
+"""LIVING MANUAL (LIMA) per-file limits that keep one pathological file from stalling a search.
+
+A huge single-line text file, or a device node a mount reports as a regular file, can hold up a
+serial directory search indefinitely.  read_file() refuses files larger than its max_size, and
+stops reading a file that keeps growing past it.  time_limit() interrupts whatever the calling
+thread is doing once a file has had its share of wall-clock time.  Both raise FileLimitError, and
+the directory search records the file in LIMIT_STATS and moves on.
+
+time_limit() interrupts with SIGALRM in the main thread on platforms with signal.setitimer().  A
+signal can't interrupt a matching engine in the middle of a C call, so the timeout fires once that
+call returns.  Elsewhere (other threads, Windows), only the Deadline it yields enforces the limit:
+the search checks it between strategies, so one strategy may overrun it.
+
+    Typical usage example:
+
+    from lima.lima_limits import LIMIT_STATS, FileLimitError, time_limit
+
+    try:
+        with time_limit(5.0) as deadline:
+            ...  # Search one file, calling deadline.check() between steps
+    except FileLimitError as err:
+        LIMIT_STATS.record(file_path, err)
+"""
+
+# Standard Imports
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock, current_thread, main_thread
+from typing import Dict, Iterator, List, Optional
+import time
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_type
+
+
+REASON_SIZE = 'size'        # The file is larger than the size limit
+REASON_TIMEOUT = 'timeout'  # Searching the file took longer than the time limit
+
+
+class FileLimitError(Exception):
+    """A file exceeded a per-file limit."""
+
+    def __init__(self, reason: str, detail: str) -> None:
+        """FileLimitError ctor.
+
+        Args:
+            reason: REASON_SIZE or REASON_TIMEOUT.
+            detail: Human-readable description of the limit that was exceeded.
+        """
+        super().__init__(detail)
+        self.reason = reason
+        self.detail = detail
+
+
+class Deadline():
+    """Monotonic clock time after which a search is abandoned."""
+
+    def __init__(self, seconds: float) -> None:
+        """Deadline ctor.
+
+        Args:
+            seconds: Time allowed from now.
+        """
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def check(self) -> None:
+        """Raise FileLimitError if the deadline has passed."""
+        if time.monotonic() >= self.expires:
+            raise FileLimitError(REASON_TIMEOUT, f'took longer than {self.seconds} seconds')
+
+
+class LimitStats():
+    """Thread-safe record of the files skipped for exceeding a limit."""
+
+    def __init__(self) -> None:
+        """LimitStats ctor."""
+        self._lock = Lock()
+        self.skipped: List[Dict[str, str]] = []  # One {'path', 'reason', 'detail'} per file
+
+    def record(self, file_path: Path, err: FileLimitError) -> None:
+        """Record file_path as skipped because of err."""
+        with self._lock:
+            self.skipped.append({'path': str(file_path), 'reason': err.reason,
+                                 'detail': err.detail})
+
+    def reset(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self.skipped = []
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            timed_out = sum(record['reason'] == REASON_TIMEOUT for record in self.skipped)
+            return (f'Limits: {len(self.skipped)} files skipped, {timed_out} timed out, '
+                    f'{len(self.skipped) - timed_out} too large')
+
+
+LIMIT_STATS = LimitStats()  # Updated by every limited search in this process
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Raise FileLimitError in the calling thread if the context lasts longer than seconds.
+
+    In the main thread, with signal.setitimer(), SIGALRM interrupts the context.  Elsewhere, the
+    context must call check() on the Deadline it gets.  Does nothing if seconds is None.  Does
+    not validate input.
+
+    Yields:
+        The Deadline to check, None if seconds is None.
+
+    Raises:
+        FileLimitError: The context took longer than seconds.
+    """
+    import signal  # pylint: disable=import-outside-toplevel
+    if seconds is None:
+        yield None
+        return
+    if current_thread() is not main_thread() or not hasattr(signal, 'setitimer'):
+        yield Deadline(seconds)
+        return
+
+    def _on_alarm(signum, frame) -> None:  # pylint: disable=unused-argument
+        raise FileLimitError(REASON_TIMEOUT, f'took longer than {seconds} seconds')
+
+    previous = signal.signal(signal.SIGALRM, _on_alarm)  # Restored on the way out
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield Deadline(seconds)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def validate_limit_args(timeout: Optional[float], max_file_size: Optional[int]) -> None:
+    """Validate the limit arguments the search functions pass through.
+
+    Raises:
+        TypeError: Bad data type.
+        ValueError: timeout is not positive or max_file_size is negative.
+    """
+    if timeout is not None:
+        validate_type(timeout, 'timeout', (int, float))
+        if timeout <= 0:
+            raise ValueError('timeout must be positive')
+    if max_file_size is not None:
+        validate_type(max_file_size, 'max_file_size', int)
+        if max_file_size < 0:
+            raise ValueError('max_file_size may not be negative')
@@ -1,5 +1,8 @@
 """LIVING MANUAL (LIMA) entry point.
 
+Subsystems are imported by the Use Case that needs them.  A `lima file` run never pays for the
+server's process pool or the watcher's ctypes bindings.
+
     Typical usage example:
 
     from lima.lima_main import execute
@@ -9,13 +12,30 @@
 """
 
 # Standard Imports
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, List, Optional
 import sys
 # Third Party Imports
 # Local Imports
-from lima.lima_args import (ARG_DICT_KEY_DIR, ARG_DICT_KEY_ENCODE,
-                            ARG_DICT_KEY_FILE, ARG_DICT_KEY_RECUR, ARG_DICT_KEY_WORDS,
-                            parse_lima_args)
-from lima.lima_search import get_dirty_words, search_dir, search_file
+from lima.lima_args import (ARG_DICT_KEY_ADDRESS, ARG_DICT_KEY_BLOCK_SIZE, ARG_DICT_KEY_CACHE,
+                            ARG_DICT_KEY_CHECKPOINT, ARG_DICT_KEY_CMD, ARG_DICT_KEY_DEBOUNCE,
+                            ARG_DICT_KEY_DECOMPRESS, ARG_DICT_KEY_DIR, ARG_DICT_KEY_ENCODE,
+                            ARG_DICT_KEY_ENGINE, ARG_DICT_KEY_EXTENSION_WEIGHTS,
+                            ARG_DICT_KEY_EXTRACT, ARG_DICT_KEY_FILE, ARG_DICT_KEY_LEASE,
+                            ARG_DICT_KEY_LOCAL, ARG_DICT_KEY_MAX_FILE_SIZE, ARG_DICT_KEY_NO_CACHE,
+                            ARG_DICT_KEY_NO_CACHE_POLLUTION, ARG_DICT_KEY_NORMALIZE,
+                            ARG_DICT_KEY_OUTPUT, ARG_DICT_KEY_PLUGINS, ARG_DICT_KEY_POLL,
+                            ARG_DICT_KEY_PREFILTER, ARG_DICT_KEY_PROFILE, ARG_DICT_KEY_RECUR,
+                            ARG_DICT_KEY_REPORTS, ARG_DICT_KEY_SCHEDULE, ARG_DICT_KEY_SECTIONS,
+                            ARG_DICT_KEY_SLOWEST, ARG_DICT_KEY_SOCKET, ARG_DICT_KEY_STDIN,
+                            ARG_DICT_KEY_SUBSUME, ARG_DICT_KEY_TIME_BUDGET, ARG_DICT_KEY_TIMEOUT,
+                            ARG_DICT_KEY_UNIT_SIZE, ARG_DICT_KEY_WORDS, ARG_DICT_KEY_WORKERS,
+                            CMD_COORDINATE, CMD_DIR, CMD_FILE, CMD_GIT, CMD_SERVE, CMD_WATCH,
+                            CMD_WORKER, parse_lima_args)
+from lima.lima_defaults import ENCODING_AUTO
+from lima.lima_output import open_sink
+if TYPE_CHECKING:
+    from lima.lima_report import FindingReport  # Imported on demand by _open_reports()
 
 
 # pylint: disable=broad-except
@@ -40,9 +60,8 @@ def main() -> int:
     """
     # LOCAL VARIABLES
     exit_code = 0       # 0 on success, 1 for bad input, 2 on exception, 3 if dirty words found
-    temp_code = 0       # Temporary exit code for successive function calls
     arg_dict = {}       # Dictionary of command line arguments
-    dirty_words = []    # List of dirty words parsed from the command line
+    forwarded = False   # Did a LIMA server search instead of this process?
 
     # PARSE ARGS
     try:
@@ -51,20 +70,282 @@ def main() -> int:
         print(f'ERROR: {str(err)}')
         exit_code = 1
     else:
-        dirty_words = get_dirty_words(arg_dict[ARG_DICT_KEY_WORDS])
-        # Use Case 1
-        if arg_dict[ARG_DICT_KEY_FILE]:
-            temp_code = search_file(file_path=arg_dict[ARG_DICT_KEY_FILE], dw_list=dirty_words,
-                                    encoding=arg_dict[ARG_DICT_KEY_ENCODE])
-            if temp_code != 0:
-                exit_code = temp_code
-        # Use Case 2
-        if arg_dict[ARG_DICT_KEY_DIR]:
-            temp_code = search_dir(dir_path=arg_dict[ARG_DICT_KEY_DIR], dw_list=dirty_words,
-                                   encoding=arg_dict[ARG_DICT_KEY_ENCODE],
-                                   recursive=arg_dict[ARG_DICT_KEY_RECUR])
-            if temp_code != 0:
-                exit_code = temp_code
+        # Findings are batched to stderr, or --output, by a single writer
+        with open_sink(output_path=arg_dict[ARG_DICT_KEY_OUTPUT],
+                       reports=_open_reports(arg_dict)):
+            # Use Cases 1 and 2 are forwarded to a running LIMA server, if there is one
+            exit_code = _forward_to_server(arg_dict)
+            forwarded = exit_code is not None
+            if exit_code is None:
+                with _profile(arg_dict):
+                    exit_code = _search_locally(arg_dict)
+        if arg_dict[ARG_DICT_KEY_PREFILTER]:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_prefilter import PREFILTER_STATS
+            print(PREFILTER_STATS.summary(), file=sys.stderr)  # After every finding
+        if arg_dict[ARG_DICT_KEY_SECTIONS]:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_sections import SECTION_STATS
+            print(SECTION_STATS.summary(), file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_DECOMPRESS]:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_decompress import DECOMPRESS_STATS
+            print(DECOMPRESS_STATS.summary(), file=sys.stderr)
+            for record in DECOMPRESS_STATS.failed:
+                print(f'Not decoded: {record["path"]} ({record["detail"]})', file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_EXTRACT] and not forwarded \
+                and arg_dict[ARG_DICT_KEY_CMD] != CMD_SERVE:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_extract import EXTRACT_STATS
+            print(EXTRACT_STATS.summary(), file=sys.stderr)  # The server keeps its own
+            for record in EXTRACT_STATS.failed:
+                print(f'Not extracted: {record["path"]} ({record["detail"]})', file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_ENCODE] == ENCODING_AUTO and not forwarded \
+                and arg_dict[ARG_DICT_KEY_CMD] != CMD_SERVE:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_detect import DETECT_STATS
+            print(DETECT_STATS.summary(), file=sys.stderr)  # The server keeps its own
+        if arg_dict[ARG_DICT_KEY_PLUGINS] and not forwarded \
+                and arg_dict[ARG_DICT_KEY_CMD] != CMD_SERVE:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_plugins import LOAD_FAILURES
+            for record in LOAD_FAILURES:  # The server reports its own
+                print(f'Plugin not loaded: {record["path"]} ({record["detail"]})',
+                      file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_TIME_BUDGET] is not None:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_schedule import SCHEDULE_STATS
+            print(SCHEDULE_STATS.summary(), file=sys.stderr)
+            for file_path in SCHEDULE_STATS.unsearched:
+                print(f'Not searched: {file_path}', file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_TIMEOUT] is not None \
+                or arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] is not None:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_limits import LIMIT_STATS
+            print(LIMIT_STATS.summary(), file=sys.stderr)
+            for record in LIMIT_STATS.skipped:
+                print(f'Skipped: {record["path"]} ({record["reason"]}: {record["detail"]})',
+                      file=sys.stderr)
+        if arg_dict[ARG_DICT_KEY_PROFILE] is not None:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_profile import PROFILE_STATS
+            print(PROFILE_STATS.summary(), file=sys.stderr)
+            print(f'cProfile stats written to {arg_dict[ARG_DICT_KEY_PROFILE]}', file=sys.stderr)
+
+    # DONE
+    return exit_code
+
+
+def _forward_to_server(arg_dict: Dict[str, Any]) -> Optional[int]:
+    """Forward Use Cases 1 and 2 to a running LIMA server.
+
+    Args:
+        arg_dict: Dictionary of command line arguments.
+
+    Returns:
+        None if the search must run locally, otherwise the server's exit code.
+    """
+    if arg_dict[ARG_DICT_KEY_LOCAL] or arg_dict[ARG_DICT_KEY_CMD] not in (CMD_FILE, CMD_DIR):
+        return None
+    if arg_dict[ARG_DICT_KEY_STDIN]:
+        return None  # Streamed locally, without buffering all of stdin
+    if arg_dict[ARG_DICT_KEY_CHECKPOINT] or arg_dict[ARG_DICT_KEY_PREFILTER]:
+        return None  # Progress and prefilter stats are recorded locally
+    if arg_dict[ARG_DICT_KEY_SECTIONS]:
+        return None  # The server searches whole files
+    if arg_dict[ARG_DICT_KEY_NORMALIZE]:
+        return None  # The server matches exactly
+    if arg_dict[ARG_DICT_KEY_DECOMPRESS]:
+        return None  # The server doesn't decompress, and decompress stats are recorded locally
+    if arg_dict[ARG_DICT_KEY_NO_CACHE_POLLUTION]:
+        return None  # The server reads with its own page cache policy
+    if arg_dict[ARG_DICT_KEY_SCHEDULE] or arg_dict[ARG_DICT_KEY_TIME_BUDGET] is not None:
+        return None  # The server searches in directory order, without a budget
+    if arg_dict[ARG_DICT_KEY_TIMEOUT] is not None \
+            or arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE] is not None:
+        return None  # The server's workers search without per-file limits
+    if arg_dict[ARG_DICT_KEY_PROFILE] is not None:
+        return None  # Profile this process, not the server
+    if not arg_dict[ARG_DICT_KEY_SOCKET].exists():
+        return None  # No server, don't bother importing the client
+    from lima.lima_client import forward_request  # pylint: disable=import-outside-toplevel
+    return forward_request(words_path=arg_dict[ARG_DICT_KEY_WORDS],
+                           encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                           engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                           file_path=arg_dict[ARG_DICT_KEY_FILE],
+                           dir_path=arg_dict[ARG_DICT_KEY_DIR],
+                           recursive=arg_dict[ARG_DICT_KEY_RECUR],
+                           extract=arg_dict[ARG_DICT_KEY_EXTRACT],
+                           plugins=arg_dict[ARG_DICT_KEY_PLUGINS],
+                           subsume=arg_dict[ARG_DICT_KEY_SUBSUME],
+                           socket_path=arg_dict[ARG_DICT_KEY_SOCKET])
+
+
+def _open_reports(arg_dict: Dict[str, Any]) -> List['FindingReport']:
+    """Start every --report, if any.
+
+    Args:
+        arg_dict: Dictionary of command line arguments.
+
+    Returns:
+        The reports, in command line order.
+    """
+    # LOCAL VARIABLES
+    root = arg_dict[ARG_DICT_KEY_DIR]  # Top-level directories in the reports are its children
+
+    # OPEN THEM
+    if not arg_dict[ARG_DICT_KEY_REPORTS]:
+        return []
+    from lima.lima_report import open_report  # pylint: disable=import-outside-toplevel
+    if root is None and arg_dict[ARG_DICT_KEY_FILE]:
+        root = arg_dict[ARG_DICT_KEY_FILE].absolute().parent
+    return [open_report(report_format=report_format, output_path=report_path, root=root)
+            for report_format, report_path in arg_dict[ARG_DICT_KEY_REPORTS]]
+
+
+def _profile(arg_dict: Dict[str, Any]) -> ContextManager:
+    """Profile the local search if --profile was given, otherwise do nothing.
+
+    Args:
+        arg_dict: Dictionary of command line arguments.
+
+    Returns:
+        A context manager to run the local search in.
+    """
+    if arg_dict[ARG_DICT_KEY_PROFILE] is None:
+        return nullcontext()
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_profile import PROFILE_STATS, profile_scan
+    PROFILE_STATS.reset(slowest=arg_dict[ARG_DICT_KEY_SLOWEST])
+    return profile_scan(arg_dict[ARG_DICT_KEY_PROFILE])
+
+
+def _search_locally(arg_dict: Dict[str, Any]) -> int:
+    """Execute the Use Case selected on the command line in this process.
+
+    Args:
+        arg_dict: Dictionary of command line arguments.
+
+    Returns:
+        0 on success, 3 if dirty words found
+    """
+    # LOCAL VARIABLES
+    exit_code = 0       # 0 on success, 3 if dirty words found
+    temp_code = 0       # Temporary exit code for successive function calls
+    dirty_words = []    # List of dirty words parsed from the command line
+    removed = {}        # Dirty word entries dropped while preparing the list, per reason
+
+    # SEARCH IT
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_search import search_dir, search_file, search_stream
+    from lima.lima_words import describe_removed, load_dirty_words
+    if arg_dict[ARG_DICT_KEY_CMD] not in (CMD_SERVE, CMD_WORKER):
+        # The server loads its own, workers get theirs from the coordinator
+        dirty_words, removed = load_dirty_words(arg_dict[ARG_DICT_KEY_WORDS],
+                                                subsume=arg_dict[ARG_DICT_KEY_SUBSUME],
+                                                encoding=arg_dict[ARG_DICT_KEY_ENCODE])
+        if removed:
+            print(f'Dropped dirty word entries: {describe_removed(removed)}', file=sys.stderr)
+    # Use Case 1
+    if arg_dict[ARG_DICT_KEY_STDIN]:
+        temp_code = search_stream(stream=sys.stdin.buffer, dw_list=dirty_words,
+                                  encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                                  engine=arg_dict[ARG_DICT_KEY_ENGINE])
+        if temp_code != 0:
+            exit_code = temp_code
+    if arg_dict[ARG_DICT_KEY_FILE]:
+        temp_code = search_file(file_path=arg_dict[ARG_DICT_KEY_FILE], dw_list=dirty_words,
+                                encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                                engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                                prefilter=arg_dict[ARG_DICT_KEY_PREFILTER],
+                                block_size=arg_dict[ARG_DICT_KEY_BLOCK_SIZE],
+                                no_cache_pollution=arg_dict[ARG_DICT_KEY_NO_CACHE_POLLUTION],
+                                profile=arg_dict[ARG_DICT_KEY_PROFILE] is not None,
+                                sections=arg_dict[ARG_DICT_KEY_SECTIONS],
+                                normalize=arg_dict[ARG_DICT_KEY_NORMALIZE],
+                                decompress=arg_dict[ARG_DICT_KEY_DECOMPRESS],
+                                extract=arg_dict[ARG_DICT_KEY_EXTRACT],
+                                plugins=arg_dict[ARG_DICT_KEY_PLUGINS])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 2
+    if arg_dict[ARG_DICT_KEY_DIR] and arg_dict[ARG_DICT_KEY_CMD] == CMD_DIR:
+        temp_code = search_dir(dir_path=arg_dict[ARG_DICT_KEY_DIR], dw_list=dirty_words,
+                               encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                               recursive=arg_dict[ARG_DICT_KEY_RECUR],
+                               engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                               checkpoint_path=arg_dict[ARG_DICT_KEY_CHECKPOINT],
+                               prefilter=arg_dict[ARG_DICT_KEY_PREFILTER],
+                               block_size=arg_dict[ARG_DICT_KEY_BLOCK_SIZE],
+                               no_cache_pollution=arg_dict[ARG_DICT_KEY_NO_CACHE_POLLUTION],
+                               schedule=arg_dict[ARG_DICT_KEY_SCHEDULE],
+                               extension_weights=arg_dict[ARG_DICT_KEY_EXTENSION_WEIGHTS],
+                               time_budget=arg_dict[ARG_DICT_KEY_TIME_BUDGET],
+                               timeout=arg_dict[ARG_DICT_KEY_TIMEOUT],
+                               max_file_size=arg_dict[ARG_DICT_KEY_MAX_FILE_SIZE],
+                               profile=arg_dict[ARG_DICT_KEY_PROFILE] is not None,
+                               sections=arg_dict[ARG_DICT_KEY_SECTIONS],
+                               normalize=arg_dict[ARG_DICT_KEY_NORMALIZE],
+                               decompress=arg_dict[ARG_DICT_KEY_DECOMPRESS],
+                               extract=arg_dict[ARG_DICT_KEY_EXTRACT],
+                               plugins=arg_dict[ARG_DICT_KEY_PLUGINS])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 3
+    if arg_dict[ARG_DICT_KEY_DIR] and arg_dict[ARG_DICT_KEY_CMD] == CMD_WATCH:
+        from lima.lima_watch import watch_dir
+        temp_code = watch_dir(dir_path=arg_dict[ARG_DICT_KEY_DIR], dw_list=dirty_words,
+                              encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                              recursive=arg_dict[ARG_DICT_KEY_RECUR],
+                              engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                              debounce=arg_dict[ARG_DICT_KEY_DEBOUNCE],
+                              poll=arg_dict[ARG_DICT_KEY_POLL],
+                              words_path=arg_dict[ARG_DICT_KEY_WORDS],
+                              subsume=arg_dict[ARG_DICT_KEY_SUBSUME])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 4
+    if arg_dict[ARG_DICT_KEY_CMD] == CMD_SERVE:
+        from lima.lima_server import serve
+        temp_code = serve(socket_path=arg_dict[ARG_DICT_KEY_SOCKET],
+                          words_path=arg_dict[ARG_DICT_KEY_WORDS],
+                          encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                          engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                          workers=arg_dict[ARG_DICT_KEY_WORKERS],
+                          extract=arg_dict[ARG_DICT_KEY_EXTRACT],
+                          plugins=arg_dict[ARG_DICT_KEY_PLUGINS],
+                          subsume=arg_dict[ARG_DICT_KEY_SUBSUME])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 5
+    if arg_dict[ARG_DICT_KEY_CMD] == CMD_GIT:
+        from lima.lima_git import search_git
+        temp_code = search_git(repo_path=arg_dict[ARG_DICT_KEY_DIR], dw_list=dirty_words,
+                               encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                               engine=arg_dict[ARG_DICT_KEY_ENGINE],
+                               cache_path=arg_dict[ARG_DICT_KEY_CACHE],
+                               use_cache=not arg_dict[ARG_DICT_KEY_NO_CACHE])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 6
+    if arg_dict[ARG_DICT_KEY_CMD] == CMD_COORDINATE:
+        from lima.lima_distributed import coordinate
+        temp_code = coordinate(dir_path=arg_dict[ARG_DICT_KEY_DIR], dw_list=dirty_words,
+                               encoding=arg_dict[ARG_DICT_KEY_ENCODE],
+                               recursive=arg_dict[ARG_DICT_KEY_RECUR],
+                               address=arg_dict[ARG_DICT_KEY_ADDRESS],
+                               unit_size=arg_dict[ARG_DICT_KEY_UNIT_SIZE],
+                               lease=arg_dict[ARG_DICT_KEY_LEASE])
+        if temp_code != 0:
+            exit_code = temp_code
+    # Use Case 7
+    if arg_dict[ARG_DICT_KEY_CMD] == CMD_WORKER:
+        from lima.lima_distributed import work
+        temp_code = work(address=arg_dict[ARG_DICT_KEY_ADDRESS],
+                         workers=arg_dict[ARG_DICT_KEY_WORKERS],
+                         engine=arg_dict[ARG_DICT_KEY_ENGINE])
+        if temp_code != 0:
+            exit_code = temp_code
 
     # DONE
     return exit_code
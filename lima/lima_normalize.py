@@ -0,0 +1,164 @@
+"""LIVING MANUAL (LIMA) Unicode normalization and confusable folding.
+
+A dirty word can hide from an exact search behind characters that merely look like it: full-width
+forms (`ｄｉｒｔｙ`), mathematical letters (`𝐝𝐢𝐫𝐭𝐲`), decomposed accents, homoglyphs from other
+scripts (Cyrillic `а` for Latin `a`) and invisible characters (e.g., a zero-width space inside
+`dirty`).  fold() maps text onto one canonical form with a single str.translate() over the whole
+buffer.  Every character is replaced by its NFKD decomposition, homoglyphs by the Latin letter
+they imitate, and invisible characters are removed.  Decomposition, rather than NFKC composition,
+keeps the mapping one character at a time: two strings fold alike if they are NFKC-equivalent (up
+to the order of stacked combining marks), or only differ in homoglyphs and invisible characters.
+
+The translation table is a list indexed by code point, precomputed the first time non-ASCII text
+is folded (tens of milliseconds, once per process).  A list lookup is about twice as fast as a
+dict lookup inside str.translate().  ASCII text is returned as is.  Newlines fold to themselves,
+so lines of text and their folded lines match up one to one.  get_span() maps a match in folded
+text back to the original text.
+
+    Typical usage example:
+
+    from lima.lima_normalize import fold, get_span
+
+    folded = fold(line)
+    start = folded.find(fold(dw_entry))
+    start, end = get_span(line, start, start + len(fold(dw_entry)))
+    print(f'Found {line[start:end]}')
+"""
+
+# Standard Imports
+from typing import List, Optional, Tuple, Union
+import unicodedata
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_type
+
+
+# Homoglyph -> the Latin letter it imitates.  NFKD already handles compatibility forms (e.g.,
+# full-width, mathematical and circled letters), these are the letters of other scripts.
+CONFUSABLES = {
+    # Cyrillic
+    '\u0430': 'a', '\u0435': 'e', '\u043e': 'o', '\u0440': 'p', '\u0441': 'c', '\u0443': 'y',
+    '\u0445': 'x', '\u0455': 's', '\u0456': 'i', '\u0458': 'j', '\u0501': 'd', '\u04bb': 'h',
+    '\u051b': 'q', '\u051d': 'w', '\u04cf': 'l', '\u04af': 'y', '\u0410': 'A', '\u0412': 'B',
+    '\u0415': 'E', '\u041a': 'K', '\u041c': 'M', '\u041d': 'H', '\u041e': 'O', '\u0420': 'P',
+    '\u0421': 'C', '\u0422': 'T', '\u0423': 'Y', '\u0425': 'X', '\u0405': 'S', '\u0406': 'I',
+    '\u0408': 'J', '\u0500': 'D', '\u051a': 'Q', '\u051c': 'W', '\u04ae': 'Y', '\u04c0': 'I',
+    # Greek
+    '\u03b1': 'a', '\u03b9': 'i', '\u03ba': 'k', '\u03bd': 'v', '\u03bf': 'o', '\u03c1': 'p',
+    '\u03c5': 'u', '\u03f2': 'c', '\u03f3': 'j', '\u0391': 'A', '\u0392': 'B', '\u0395': 'E',
+    '\u0396': 'Z', '\u0397': 'H', '\u0399': 'I', '\u039a': 'K', '\u039c': 'M', '\u039d': 'N',
+    '\u039f': 'O', '\u03a1': 'P', '\u03a4': 'T', '\u03a5': 'Y', '\u03a7': 'X', '\u03f9': 'C',
+    # Armenian
+    '\u0585': 'o', '\u057d': 'u', '\u0570': 'h', '\u0578': 'n',
+    # Latin lookalikes NFKD leaves alone
+    '\u0261': 'g', '\u0131': 'i', '\u0237': 'j', '\u0251': 'a', '\u0269': 'i', '\u028f': 'y',
+}
+# Characters that render as nothing: soft hyphen, zero-width (non-)joiners and spaces, word joiner,
+# Mongolian vowel separator and zero-width no-break space (byte order mark)
+INVISIBLES = '\u00ad\u180e\u200b\u200c\u200d\u2060\ufeff'
+# Size of the translation table.  No character at or above it has a decomposition, and
+# str.translate() leaves the characters past the end of the table alone.
+FOLD_TABLE_SIZE = 0x30000
+HANGUL_SYLLABLES = ('\uac00', '\ud7a3')  # First and last precomposed Hangul syllable
+
+_FOLD_TABLE: Optional[List[Union[int, str]]] = None  # Code point -> folded, see _get_fold_table()
+
+
+def fold(text: str) -> str:
+    """Map text onto its canonical form, for confusable-aware matching.
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    validate_type(text, 'text', str)
+    if text.isascii():
+        return text  # Nothing to fold
+    return text.translate(_get_fold_table())
+
+
+def get_offsets(text: str, case_sensitive: bool = True) -> List[int]:
+    """Map every character of fold(text) back to the character of text it came from.
+
+    Args:
+        text: Original text.
+        case_sensitive: Optional; If False, map fold(text).lower() instead.
+
+    Returns:
+        The index into text of each character of fold(text), followed by len(text).
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    # LOCAL VARIABLES
+    offsets = []  # Return value
+    table = _get_fold_table()  # Translation table
+
+    # INPUT VALIDATION
+    validate_type(text, 'text', str)
+    validate_type(case_sensitive, 'case_sensitive', bool)
+
+    # MAP IT
+    # str.lower() works one character at a time, so it can't change how the characters line up
+    for index, char in enumerate(text):
+        folded = char.translate(table)
+        offsets.extend([index] * len(folded if case_sensitive else folded.lower()))
+    offsets.append(len(text))
+
+    # DONE
+    return offsets
+
+
+def get_span(text: str, start: int, end: int, case_sensitive: bool = True) -> Tuple[int, int]:
+    """Map the slice [start:end] of fold(text) back to the slice of text it came from.
+
+    Args:
+        text: Original text.
+        start: Index of the first character of the slice in fold(text).
+        end: Index just past the last character of the slice in fold(text).
+        case_sensitive: Optional; If False, start and end index fold(text).lower() instead.
+
+    Returns:
+        The start and end of the smallest slice of text that folds to a superset of the slice.
+
+    Raises:
+        IndexError: The slice is not inside fold(text).
+        TypeError: Bad data type.
+    """
+    offsets = get_offsets(text, case_sensitive)  # Index into text of each folded character
+    validate_type(start, 'start', int)
+    validate_type(end, 'end', int)
+    if not 0 <= start <= end < len(offsets):
+        raise IndexError(f'[{start}:{end}] is not inside the folded text')
+    if start == end:
+        return offsets[start], offsets[start]
+    return offsets[start], offsets[end - 1] + 1
+
+
+def _fold_char(char: str) -> str:
+    """Fold one character: decompose it, then replace homoglyphs and drop invisible characters."""
+    return ''.join(CONFUSABLES.get(part, part) for part in unicodedata.normalize('NFKD', char)
+                   if part not in INVISIBLES)
+
+
+def _get_fold_table() -> List[Union[int, str]]:
+    """The translation table for fold(), built the first time it is needed."""
+    # pylint: disable=global-statement
+    global _FOLD_TABLE
+    # LOCAL VARIABLES
+    table = _FOLD_TABLE  # Return value
+
+    # BUILD IT
+    # Two threads may both build it, the last one wins and both tables are the same
+    if table is None:
+        table = list(range(FOLD_TABLE_SIZE))  # Every character maps to itself...
+        for ordinal in range(FOLD_TABLE_SIZE):
+            char = chr(ordinal)
+            # ...except the ones that fold to something else.  Hangul syllables decompose by
+            # algorithm, so unicodedata.decomposition() doesn't list them.
+            if char in CONFUSABLES or char in INVISIBLES or unicodedata.decomposition(char) \
+                    or HANGUL_SYLLABLES[0] <= char <= HANGUL_SYLLABLES[1]:
+                table[ordinal] = _fold_char(char)
+        _FOLD_TABLE = table
+
+    # DONE
+    return table
@@ -0,0 +1,213 @@
+"""LIVING MANUAL (LIMA) findings output.
+
+Every finding goes through emit_finding().  Library callers get the historical behavior: one
+print() to stderr per finding.  The command line installs an OutputSink instead: findings are
+queued, and a writer thread drains the queue in large batches to stderr or an --output file.
+Whole lines are written, so findings from parallel threads never interleave.  The queue is
+bounded: once the writer falls behind, searches block until it catches up (backpressure).  The
+writer thread also hands every finding to the sink's reports, if any (see lima_report).
+
+    Typical usage example:
+
+    from lima.lima_output import emit_finding, open_sink
+
+    with open_sink(output_path=Path('findings.txt')):
+        emit_finding('target.txt : line 1 : "dirty" found in "dirty"')
+"""
+
+# Standard Imports
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Condition, Thread, local
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, TextIO
+import sys
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_type
+if TYPE_CHECKING:
+    from lima.lima_report import FindingReport  # Imported on demand by the command line
+
+
+DEFAULT_QUEUE_SIZE = 1 << 16  # Findings buffered before emit_finding() blocks
+DEFAULT_BATCH_SIZE = 1 << 10  # Findings handed to the writer thread at once
+FLUSH_INTERVAL = 0.1          # Seconds a partial batch may wait before it is written
+
+_SINK: Optional['OutputSink'] = None  # Installed by open_sink()
+_CAPTURE = local()            # Per-thread capture_findings() list
+
+
+class OutputSink():
+    """Write findings to a stream, in batches, from a dedicated writer thread.
+
+    Producers append findings to a shared batch.  Full batches are queued for the writer thread,
+    partial batches are picked up after FLUSH_INTERVAL.  Everything happens under one lock, so
+    findings are written in the order they were emitted.
+
+    Raises:
+        OSError: The writer thread failed to write (e.g., BrokenPipeError).  Raised by close().
+        ValueError: The writer thread failed to encode a finding.  Raised by close().
+    """
+
+    def __init__(self, stream: TextIO, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 reports: Sequence['FindingReport'] = ()) -> None:
+        """OutputSink ctor.
+
+        Args:
+            stream: Text stream to write findings to.
+            queue_size: Optional; Findings buffered before write() blocks.
+            batch_size: Optional; Findings handed to the writer thread at once.
+            reports: Optional; Reports every written finding is added to.
+        """
+        self._stream = stream
+        self._reports = reports
+        self._batch_size = batch_size
+        self._max_batches = max(1, queue_size // batch_size)  # Queued batches before write() blocks
+        self._batch: List[str] = []     # Findings not yet queued
+        self._batches: deque = deque()  # Full batches, oldest first
+        self._busy = False              # The writer thread is writing a batch
+        self._closing = False           # close() was called
+        self._cond = Condition()        # Guards every attribute above
+        self._error: Optional[Exception] = None  # First error raised by the writer thread
+        self._writer = Thread(target=self._write_batches, name='lima-output', daemon=True)
+        self._writer.start()
+
+    def close(self) -> None:
+        """Write every buffered finding and stop the writer thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        if self._error:
+            raise self._error
+
+    def flush(self) -> None:
+        """Block until every buffered finding has been written."""
+        with self._cond:
+            self._queue_batch()
+            self._cond.wait_for(lambda: not self._batches and not self._busy)
+
+    def write(self, line: str) -> None:
+        """Buffer one finding.  Blocks while the writer thread is too far behind."""
+        with self._cond:
+            self._batch.append(line)
+            if len(self._batch) >= self._batch_size:
+                self._cond.wait_for(lambda: len(self._batches) < self._max_batches)
+                self._queue_batch()
+
+    def _queue_batch(self) -> None:
+        """Hand the current batch to the writer thread.  Hold self._cond."""
+        if self._batch:
+            self._batches.append(self._batch)
+            self._batch = []
+            self._cond.notify_all()
+
+    def _write_batches(self) -> None:
+        """Writer thread: write queued batches until close() is called."""
+        # LOCAL VARIABLES
+        batch = []  # Findings to write at once
+
+        # WRITE IT
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()  # Wake blocked producers and flush()
+                if not self._cond.wait_for(lambda: self._batches or self._closing,
+                                           timeout=FLUSH_INTERVAL):
+                    self._queue_batch()  # Idle: pick up a partial batch
+                if self._closing:
+                    self._queue_batch()
+                if not self._batches:
+                    if self._closing:
+                        return
+                    continue
+                batch = self._batches.popleft()
+                self._busy = True
+            try:
+                if not self._error:
+                    self._stream.write('\n'.join(batch) + '\n')
+                    if not self._batches:
+                        self._stream.flush()  # Caught up, don't sit on findings
+                    for report in self._reports:
+                        for line in batch:
+                            report.add(line)
+            except (OSError, ValueError) as err:
+                self._error = err  # Keep draining so producers never block forever
+
+
+@contextmanager
+def capture_findings() -> Iterator[List[str]]:
+    """Collect the findings emitted by this thread, instead of writing them.
+
+    Yields:
+        The list findings are appended to.
+    """
+    previous = getattr(_CAPTURE, 'findings', None)  # Nested captures are restored
+    _CAPTURE.findings = []
+    try:
+        yield _CAPTURE.findings
+    finally:
+        _CAPTURE.findings = previous
+
+
+def emit_finding(line: str) -> None:
+    """Report one finding through the installed sink, or print it to stderr if there isn't one."""
+    captured = getattr(_CAPTURE, 'findings', None)  # capture_findings() list
+    if captured is not None:
+        captured.append(line)
+    elif _SINK:
+        _SINK.write(line)
+    else:
+        print(line, file=sys.stderr)
+
+
+@contextmanager
+def open_sink(output_path: Optional[Path] = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+              batch_size: int = DEFAULT_BATCH_SIZE,
+              reports: Sequence['FindingReport'] = ()) -> Iterator[OutputSink]:
+    """Install an OutputSink for the duration of the context.
+
+    Args:
+        output_path: Optional; File to write findings to, replacing its contents.  Defaults to
+            stderr.
+        queue_size: Optional; Findings buffered before emit_finding() blocks.
+        batch_size: Optional; Findings handed to the writer thread at once.
+        reports: Optional; Reports every finding is added to.  Closed, after every finding has
+            been added, when the context exits.
+
+    Raises:
+        OSError: output_path can not be written.
+        TypeError: Bad data type.
+        ValueError: queue_size or batch_size less than 1.
+    """
+    # LOCAL VARIABLES
+    global _SINK  # pylint: disable=global-statement
+    previous = _SINK  # Nested sinks are restored
+    out_file = None   # Opened output_path
+
+    # INPUT VALIDATION
+    if output_path is not None:
+        validate_type(output_path, 'output_path', Path)
+    validate_type(queue_size, 'queue_size', int)
+    validate_type(batch_size, 'batch_size', int)
+    if queue_size < 1 or batch_size < 1:
+        raise ValueError('queue_size and batch_size must be at least 1')
+
+    # INSTALL IT
+    if output_path is not None:
+        out_file = open(output_path, 'w', encoding='utf-8',  # pylint: disable=consider-using-with
+                        errors='backslashreplace')
+    _SINK = OutputSink(out_file if out_file else sys.stderr, queue_size=queue_size,
+                       batch_size=batch_size, reports=reports)
+    try:
+        yield _SINK
+    finally:
+        sink, _SINK = _SINK, previous
+        try:
+            sink.close()
+        finally:
+            if out_file:
+                out_file.close()
+            for report in reports:
+                report.close()
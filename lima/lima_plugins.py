@@ -0,0 +1,208 @@
+"""LIVING MANUAL (LIMA) registry of search strategy and extractor plugins.
+
+Every way LIMA searches a file is a Plugin: the four search strategies, and the extractors that
+search what is inside a file (e.g., the members of an archive).  Each plugin declares the content
+signatures (leading magic bytes) it handles, what it costs, and the search option that enables
+it.  select_plugins() chooses the plugins that apply to a file and orders them, cheapest first,
+so a plugin never slows down the files it doesn't apply to.  Strategies run until one finds a
+dirty word.  Extractors all run.
+
+LIMA registers its own plugins with register_plugin().  Plugins installed by other packages are
+Plugin objects advertised under the 'lima.plugins' entry point group.  Looking up entry points is
+slow to import, so they are only loaded by load_plugins() (e.g., `--plugins`).  Once loaded, they
+stay registered for the rest of the process.
+
+    Typical usage example:
+
+    from lima.lima_plugins import KIND_STRATEGY, Plugin, register_plugin
+
+    register_plugin(Plugin(name='rot13', kind=KIND_STRATEGY, search=search_rot13, cost=50))
+
+    # Or, in the setup.py of another package:
+    entry_points={'lima.plugins': ['rot13 = lima_rot13:ROT13_PLUGIN']}
+"""
+
+# Standard Imports
+from threading import Lock
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+# Third Party Imports
+# Local Imports
+from lima.lima_validation import validate_string, validate_type
+
+
+PLUGIN_GROUP = 'lima.plugins'  # Entry point group installed plugins are advertised under
+KIND_STRATEGY = 'strategy'     # Searches a file, stops the search once it finds a dirty word
+KIND_EXTRACTOR = 'extractor'   # Searches what is inside a file, always runs if it applies
+PLUGIN_KINDS = (KIND_STRATEGY, KIND_EXTRACTOR)
+DEFAULT_COST = 100  # Cost of a plugin that doesn't declare one: after every built-in strategy
+
+# search(label, data, dw_list, encoding, case_sensitive, engine) emits findings (see
+# lima_output) and returns 0 if no dirty words were found, 3 if dirty words were found.  With
+# `--encoding auto`, strategies get the encoding detected for data, and extractors get 'auto'.
+SearchFunc = Callable[[str, bytes, List[str], str, bool, str], int]
+# Leading bytes of the files a plugin applies to, or a function that returns them the first time
+# they are needed (e.g., to import a format module on demand)
+Signatures = Union[Tuple[bytes, ...], Callable[[], Tuple[bytes, ...]]]
+
+
+class Plugin():
+    """A search strategy or extractor, and the files it applies to."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, name: str, kind: str, search: SearchFunc,
+                 signatures: Optional[Signatures] = None, cost: int = DEFAULT_COST,
+                 errors: Tuple[type, ...] = (), text: bool = False,
+                 option: Optional[str] = None, title: Optional[str] = None,
+                 unless: Optional[str] = None, prefilter_covered: bool = False) -> None:
+        """Plugin ctor.
+
+        Args:
+            name: Unique name.  Registering another plugin with this name replaces this one.
+            kind: KIND_STRATEGY or KIND_EXTRACTOR.
+            search: Searches a file's contents.  See SearchFunc.
+            signatures: Optional; Leading bytes of the files this plugin applies to.  None
+                applies it to every file.
+            cost: Optional; Relative cost.  Cheaper plugins run first.  The built-in strategies
+                cost 10 through 40.
+            errors: Optional; Exceptions search raises when it can't decode a file.  They are
+                counted as decode failures, and the next plugin runs.
+            text: Optional; Only apply this plugin to files that may be lines of text (e.g., not
+                the string sections of a binary).
+            option: Optional; Only apply this plugin to searches with this option enabled
+                (e.g., 'decompress').
+            title: Optional; Name used in profiles.  Defaults to name.
+            unless: Optional; Only apply this plugin to searches with this option disabled
+                (e.g., a strategy another plugin stands in for when the option is enabled).
+            prefilter_covered: Optional; The prefilter (see lima_prefilter) finds everything this
+                strategy would, so it is skipped for files the prefilter proves clean.  Only true
+                of the built-in strategies: other strategies always run.
+
+        Raises:
+            TypeError: Bad data type.
+            ValueError: Empty name or unknown kind.
+        """
+        validate_string(name, 'name')
+        validate_type(kind, 'kind', str)
+        if kind not in PLUGIN_KINDS:
+            raise ValueError(f'Plugin kind must be one of {", ".join(PLUGIN_KINDS)}')
+        if not callable(search):
+            raise TypeError('The search argument must be callable')
+        if signatures is not None and not callable(signatures):
+            validate_type(signatures, 'signatures', tuple)
+        validate_type(cost, 'cost', int)
+        validate_type(errors, 'errors', tuple)
+        validate_type(text, 'text', bool)
+        validate_type(prefilter_covered, 'prefilter_covered', bool)
+        if option is not None:
+            validate_string(option, 'option')
+        if unless is not None:
+            validate_string(unless, 'unless')
+        self.name = name
+        self.kind = kind
+        self.search = search
+        self.cost = cost
+        self.errors = errors
+        self.text = text
+        self.option = option
+        self.title = title or name
+        self.unless = unless
+        self.prefilter_covered = prefilter_covered
+        self._signatures = signatures  # Resolved by get_signatures()
+
+    def get_signatures(self) -> Optional[Tuple[bytes, ...]]:
+        """Leading bytes of the files this plugin applies to, or None for every file."""
+        if callable(self._signatures):
+            self._signatures = self._signatures()
+        return self._signatures
+
+
+_LOCK = Lock()                    # Guards the registry
+_PLUGINS: Dict[str, Plugin] = {}  # Name -> plugin, in registration order
+# (text, options) -> (strategies, extractors) that may apply, cheapest first
+_CANDIDATES: Dict[Tuple[bool, FrozenSet[str]], Tuple[List[Plugin], List[Plugin]]] = {}
+_LOADED = False                   # Has load_plugins() looked up the entry points?
+# One {'path', 'detail'} per entry point that didn't load a Plugin
+LOAD_FAILURES: List[Dict[str, str]] = []
+
+
+def register_plugin(plugin: Plugin) -> None:
+    """Register plugin, replacing any plugin with the same name.
+
+    Raises:
+        TypeError: plugin is not a Plugin.
+    """
+    validate_type(plugin, 'plugin', Plugin)
+    with _LOCK:
+        _PLUGINS[plugin.name] = plugin
+        _CANDIDATES.clear()
+
+
+def get_plugins() -> List[Plugin]:
+    """Every registered plugin, cheapest first."""
+    with _LOCK:
+        return sorted(_PLUGINS.values(), key=lambda plugin: plugin.cost)
+
+
+def load_plugins() -> None:
+    """Register the plugins installed under the PLUGIN_GROUP entry point group, once.
+
+    Entry points that fail to load, or don't name a Plugin, are recorded in LOAD_FAILURES.
+    """
+    # pylint: disable=global-statement,import-outside-toplevel
+    global _LOADED
+    if _LOADED:
+        return
+    try:
+        from importlib import metadata
+    except ImportError:  # Python 3.7
+        _LOADED = True
+        return
+    try:
+        entry_points = metadata.entry_points(group=PLUGIN_GROUP)
+    except TypeError:  # Python 3.8 and 3.9 group entry points by hand
+        entry_points = metadata.entry_points().get(PLUGIN_GROUP, ())
+    for entry_point in entry_points:
+        try:
+            register_plugin(entry_point.load())
+        except Exception as err:  # pylint: disable=broad-except
+            LOAD_FAILURES.append({'path': entry_point.name, 'detail': str(err) or repr(err)})
+    _LOADED = True
+
+
+def select_plugins(data: bytes, text: bool,
+                   options: FrozenSet[str]) -> Tuple[List[Plugin], List[Plugin]]:
+    """Choose the plugins that apply to data, cheapest first.
+
+    Does not validate input.
+
+    Args:
+        data: Contents of the file.
+        text: Data may be lines of text.
+        options: Search options that are enabled (e.g., 'decompress').
+
+    Returns:
+        The strategies and the extractors to run, in order.
+    """
+    candidates = _CANDIDATES.get((text, options))  # Plugins enabled for (text, options)
+    if candidates is None:
+        candidates = _get_candidates(text, options)
+    return ([plugin for plugin in candidates[0] if _applies(plugin, data)],
+            [plugin for plugin in candidates[1] if _applies(plugin, data)])
+
+
+def _applies(plugin: Plugin, data: bytes) -> bool:
+    """Does plugin handle data's signature?"""
+    signatures = plugin.get_signatures()
+    return signatures is None or data.startswith(signatures)
+
+
+def _get_candidates(text: bool, options: FrozenSet[str]) -> Tuple[List[Plugin], List[Plugin]]:
+    """Sort the plugins enabled for (text, options) by kind and cost, and remember them."""
+    enabled = [plugin for plugin in get_plugins()
+               if (text or not plugin.text) and (plugin.option is None or plugin.option in options)
+               and plugin.unless not in options]
+    candidates = ([plugin for plugin in enabled if plugin.kind == KIND_STRATEGY],
+                  [plugin for plugin in enabled if plugin.kind == KIND_EXTRACTOR])
+    with _LOCK:
+        _CANDIDATES[(text, options)] = candidates
+    return candidates
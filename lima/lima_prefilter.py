@@ -0,0 +1,195 @@
+"""LIVING MANUAL (LIMA) prefilter: reject files that can not contain a dirty word.
+
+search_file() tries up to four strategies on every file: decoded text, decoded bytes, encoded
+words, and encoded words with null bytes stripped.  A clean file pays for all four.  The prefilter
+derives, from each dirty word, byte probes that must be present in the file for any strategy to
+match, then makes one matcher pass over the file's bytes (null bytes stripped and ASCII case
+folded as needed).  No probe, no strategy can match: the file is clean.  Any probe: the file is a
+candidate and every strategy runs as usual, so findings are identical.
+
+Probes are exact for the encoded-word strategies.  For the decoded strategies they are the longest
+run of ASCII characters in the word, which every supported encoding stores as the character plus
+optional null bytes.  A word without a usable run (e.g., only non-ASCII characters in a
+case-insensitive search) disables the prefilter for that word list.
+
+    Typical usage example:
+
+    from lima.lima_prefilter import PREFILTER_STATS, get_prefilter
+
+    if get_prefilter(('dirty',), 'utf-8', True, 'auto').may_match(data):
+        ...  # Search data
+"""
+
+# Standard Imports
+from functools import lru_cache
+from threading import Lock
+from typing import List, Optional, Tuple
+import codecs
+# Third Party Imports
+# Local Imports
+from lima.lima_engine import Matcher, get_matcher
+
+
+PREFILTER_CACHE_SIZE = 8  # Number of prepared prefilters to keep around
+# Codecs that store every ASCII character as that byte, optionally padded with null bytes
+ASCII_TRANSPARENT_CODECS = ('utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le', 'utf-16-be', 'utf-32',
+                            'utf-32-le', 'utf-32-be', 'ascii', 'iso8859-1', 'cp1252')
+# ASCII characters str.lower() produces from non-ASCII characters (e.g., KELVIN SIGN -> 'k').
+# Matches on these can't be traced back to ASCII bytes, so they break case-insensitive runs.
+UNSAFE_LOWER = frozenset('ik')
+# Universal newlines translate these, so they break runs too
+UNSAFE_TEXT = frozenset('\r\n')
+# bytes.translate() table that folds ASCII case exactly like bytes.lower()
+ASCII_LOWER = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+
+
+class PrefilterStats():
+    """Thread-safe prefilter counters."""
+
+    def __init__(self) -> None:
+        """PrefilterStats ctor."""
+        self._lock = Lock()
+        self.checked = 0          # Buffers the prefilter looked at
+        self.rejected = 0         # Buffers the prefilter proved clean
+        self.false_positives = 0  # Candidates the strategies found clean
+
+    def record(self, candidate: bool, found: int = 0) -> None:
+        """Count one buffer: was it a candidate, and what did the strategies return?"""
+        with self._lock:
+            self.checked += 1
+            if not candidate:
+                self.rejected += 1
+            elif not found:
+                self.false_positives += 1
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self.checked = self.rejected = self.false_positives = 0
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            clean = self.rejected + self.false_positives  # Buffers without a finding
+            rate = 100 * self.false_positives / clean if clean else 0.0
+            return (f'Prefilter: {self.checked} checked, {self.rejected} rejected, '
+                    f'{self.checked - self.rejected} candidates, {self.false_positives} false '
+                    f'positives ({rate:.1f}% of clean buffers)')
+
+
+PREFILTER_STATS = PrefilterStats()  # Updated by every prefiltered search in this process
+
+
+class Prefilter():
+    """Byte probes for a dirty word list, and the matcher that finds them."""
+
+    def __init__(self, dw_list: Tuple[str, ...], encoding: str, case_sensitive: bool,
+                 engine: str) -> None:
+        """Prefilter ctor.
+
+        Args:
+            dw_list: Non-empty dirty words.
+            encoding: Format with which the strategies decode files and encode dw_list.
+            case_sensitive: Considers case when checking content for dirty words.
+            engine: Matching engine used to find the probes.
+        """
+        self._case_sensitive = case_sensitive
+        self._matcher: Optional[Matcher] = None  # None disables the prefilter
+        probes = _get_probes(dw_list, encoding, case_sensitive)  # None if a word has no probe
+        if probes:
+            self._matcher = get_matcher(probes, engine)
+
+    @property
+    def enabled(self) -> bool:
+        """Can this prefilter reject anything?"""
+        return self._matcher is not None
+
+    def may_match(self, data: bytes) -> bool:
+        """Could any search strategy find a dirty word in data?"""
+        if not self._matcher:
+            return True
+        return bool(self._matcher.search(strip_nulls(data, self._case_sensitive)))
+
+
+@lru_cache(maxsize=PREFILTER_CACHE_SIZE)
+def get_prefilter(dw_list: Tuple[str, ...], encoding: str, case_sensitive: bool,
+                  engine: str) -> Prefilter:
+    """Build, or fetch a cached, Prefilter.  Does not validate input.
+
+    Raises:
+        LookupError: Unknown encoding.
+    """
+    return Prefilter(dw_list, encoding, case_sensitive, engine)
+
+
+def strip_nulls(data: bytes, case_sensitive: bool = True) -> bytes:
+    """Remove every null byte from data and, unless case_sensitive, fold its ASCII case.
+
+    One bytes.translate() pass does both.  It is several times faster than bytes.replace()
+    followed by bytes.lower() on null-heavy data (e.g., UTF-16 text, executables).
+    """
+    if case_sensitive and b'\x00' not in data:
+        return data  # Nothing to do, skip the copy
+    return data.translate(None if case_sensitive else ASCII_LOWER, b'\x00')
+
+
+def _get_longest_run(word: str, case_sensitive: bool) -> str:
+    """Longest run of word's characters that decoded text stores as plain ASCII bytes."""
+    # LOCAL VARIABLES
+    longest = ''  # Return value
+    run = ''      # Current run
+    unsafe = UNSAFE_TEXT if case_sensitive else UNSAFE_TEXT | UNSAFE_LOWER
+
+    # FIND IT
+    for char in (word if case_sensitive else word.lower()):
+        if char.isascii() and char not in unsafe:
+            run += char
+            longest = max(longest, run, key=len)
+        else:
+            run = ''
+
+    # DONE
+    return longest
+
+
+def _get_probes(dw_list: Tuple[str, ...], encoding: str,
+                case_sensitive: bool) -> Optional[List[bytes]]:
+    """Byte probes: at least one is in the stripped, folded data if any strategy can match.
+
+    Returns:
+        The probes, or None if the prefilter can't reject anything for this word list.
+
+    Raises:
+        LookupError: Unknown encoding.
+    """
+    # LOCAL VARIABLES
+    probes = set()  # Return value
+    codec_name = codecs.lookup(encoding).name  # Normalized encoding name
+    encoded = b''   # One dirty word, encoded like the byte strategies do
+    text_probe = b''  # Must be present for a decoded strategy to find the dirty word
+
+    # PROBE IT
+    if codec_name not in ASCII_TRANSPARENT_CODECS:
+        return None
+    for word in dw_list:
+        # Encoded-word strategies: exact
+        try:
+            encoded = bytes(word, encoding=encoding)
+        except UnicodeError:
+            encoded = b''  # Those strategies raise, and move on, for this word list
+        else:
+            encoded = strip_nulls(encoded, case_sensitive)
+            if not encoded:
+                return None
+            probes.add(encoded)
+        # Decoded strategies: a run of ASCII characters, or the whole word as UTF-8
+        if codec_name == 'utf-8' and case_sensitive and not UNSAFE_TEXT & set(word):
+            text_probe = word.encode('utf-8', 'surrogatepass')
+        else:
+            text_probe = _get_longest_run(word, case_sensitive).encode('ascii')
+        if not text_probe or b'\x00' in text_probe:
+            return None
+        probes.add(text_probe)
+
+    # DONE
+    return sorted(probes)
@@ -0,0 +1,172 @@
+"""LIVING MANUAL (LIMA) profiling: where a slow search spends its time.
+
+profile_scan() runs a search under cProfile and dumps the pstats to a file, for
+`python -m pstats PATH`.  cProfile only sees the calling thread, so the output sink's writer
+thread is left out.  Searches started with profile=True also record each file in PROFILE_STATS:
+its size, the seconds spent reading and searching it, the strategy that found a dirty word, and
+the strategies that failed to decode it.  PROFILE_STATS keeps a latency histogram, in
+power-of-two buckets, per size class and winning strategy, plus the slowest files.  It also
+totals the calls, seconds and findings of each strategy and extractor plugin (see lima_plugins).
+
+    Typical usage example:
+
+    from lima.lima_profile import PROFILE_STATS, profile_scan
+
+    with profile_scan(Path('scan.pstats')):
+        search_dir(dir_path, dw_list, 'utf-8', recursive=True, profile=True)
+    print(PROFILE_STATS.summary())
+"""
+
+# Standard Imports
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Sequence, Tuple
+import cProfile
+import heapq
+import math
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import DEFAULT_SLOWEST
+from lima.lima_validation import validate_type
+
+
+# Upper bound, in bytes, and name of each size class, smallest first
+SIZE_CLASSES = ((4 << 10, '< 4 KiB'), (64 << 10, '< 64 KiB'), (1 << 20, '< 1 MiB'),
+                (16 << 20, '< 16 MiB'), (math.inf, '>= 16 MiB'))
+STRATEGY_CLEAN = 'clean'              # No strategy found a dirty word
+STRATEGY_PREFILTERED = 'prefiltered'  # The prefilter proved the file clean
+
+
+class ProfileStats():
+    """Thread-safe per-file latency histograms and slowest files."""
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST) -> None:
+        """ProfileStats ctor.
+
+        Args:
+            slowest: Optional; Number of slowest files to keep.
+        """
+        self._lock = Lock()
+        self._slowest = slowest
+        self.files = 0              # Files recorded
+        self.read_seconds = 0.0     # Total seconds spent reading files
+        self.search_seconds = 0.0   # Total seconds spent searching what was read
+        self.decode_failures: Dict[str, int] = {}  # Strategy title to files it failed to decode
+        # (size class, winning strategy) to {bucket exponent: files}.  A file that took t
+        # microseconds is counted in the bucket e for which 2**(e-1) <= t < 2**e.
+        self.histograms: Dict[Tuple[str, str], Dict[int, int]] = {}
+        # Min-heap of the slowest (seconds, path, size, winning strategy)
+        self.slowest: List[Tuple[float, str, int, str]] = []
+        # Plugin title to [calls, seconds, calls that found a dirty word]
+        self.plugins: Dict[str, List[float]] = {}
+
+    def record(self, label: str, size: int, read_seconds: float, search_seconds: float,
+               strategy: str, failures: Sequence[str] = ()) -> None:
+        """Record one file.
+
+        Args:
+            label: Name of the file, as reported in its findings.
+            size: Bytes read.
+            read_seconds: Seconds spent reading the file.
+            search_seconds: Seconds spent searching what was read.
+            strategy: Winning strategy (e.g., 'strategy 1'), STRATEGY_CLEAN or
+                STRATEGY_PREFILTERED.
+            failures: Optional; Strategies (e.g., 'strategy 1') that failed to decode the file.
+        """
+        seconds = read_seconds + search_seconds  # Latency
+        histogram_key = (get_size_class(size), strategy)
+        bucket = math.frexp(seconds * 1e6)[1]
+        with self._lock:
+            self.files += 1
+            self.read_seconds += read_seconds
+            self.search_seconds += search_seconds
+            for failure in failures:
+                self.decode_failures[failure] = self.decode_failures.get(failure, 0) + 1
+            histogram = self.histograms.setdefault(histogram_key, {})
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+            if len(self.slowest) < self._slowest:
+                heapq.heappush(self.slowest, (seconds, label, size, strategy))
+            elif self._slowest and seconds > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (seconds, label, size, strategy))
+
+    def record_plugin(self, title: str, seconds: float, found: int) -> None:
+        """Record one run of the plugin title, which took seconds and returned found."""
+        with self._lock:
+            totals = self.plugins.setdefault(title, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += bool(found)
+
+    def reset(self, slowest: int = DEFAULT_SLOWEST) -> None:
+        """Forget everything, then keep the slowest files from now on."""
+        with self._lock:
+            self.__init__(slowest)  # pylint: disable=unnecessary-dunder-call
+
+    def summary(self) -> str:
+        """Describe the histograms and the slowest files, a few lines each."""
+        with self._lock:
+            lines = [f'Profile: {self.files} files, {self.read_seconds:.3f} seconds reading, '
+                     f'{self.search_seconds:.3f} seconds searching']  # Return value
+            if self.decode_failures:
+                lines.append('Decode failures: ' + ', '.join(
+                    f'{title} {count}' for title, count in sorted(self.decode_failures.items())))
+            lines.append('Latency (files per bucket, by size class and winning strategy):')
+            size_order = [name for _, name in SIZE_CLASSES]
+            for size_class, strategy in sorted(self.histograms, key=lambda key: (
+                    size_order.index(key[0]), key[1])):
+                histogram = self.histograms[(size_class, strategy)]
+                lines.append(f'  {size_class}, {strategy}: ' + ', '.join(
+                    f'< {_format_micros(2 ** bucket)} {count}'
+                    for bucket, count in sorted(histogram.items())))
+            if self.plugins:
+                lines.append('Plugins (calls, seconds, calls that found dirty words):')
+                lines.extend(f'  {title}: {calls}, {seconds:.3f}, {found}'
+                             for title, (calls, seconds, found) in sorted(
+                                 self.plugins.items(), key=lambda item: -item[1][1]))
+            lines.append('Slowest files:')
+            lines.extend(f'{seconds:>12.6f} s {size:>12} bytes  {strategy:<12} {label}'
+                         for seconds, label, size, strategy in sorted(self.slowest, reverse=True))
+            return '\n'.join(lines)
+
+
+PROFILE_STATS = ProfileStats()  # Updated by every profiled search in this process
+
+
+def get_size_class(size: int) -> str:
+    """Name of the SIZE_CLASSES entry size falls into."""
+    for upper_bound, name in SIZE_CLASSES:
+        if size < upper_bound:
+            return name
+    return SIZE_CLASSES[-1][1]  # Unreachable, the last upper bound is infinite
+
+
+@contextmanager
+def profile_scan(pstats_path: Path) -> Iterator[cProfile.Profile]:
+    """Run the context under cProfile, then dump the pstats to pstats_path.
+
+    The pstats are dumped even if the context raises.
+
+    Args:
+        pstats_path: File to write the pstats to, replacing its contents.
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    validate_type(pstats_path, 'pstats_path', Path)
+    profiler = cProfile.Profile()  # Profiles this thread only
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(pstats_path))
+
+
+def _format_micros(micros: int) -> str:
+    """Describe a duration given in whole microseconds, in the largest sensible unit."""
+    if micros >= 1_000_000:
+        return f'{micros / 1_000_000:g} s'
+    if micros >= 1000:
+        return f'{micros / 1000:g} ms'
+    return f'{micros} us'
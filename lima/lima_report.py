@@ -0,0 +1,311 @@
+"""LIVING MANUAL (LIMA) SARIF, CSV and summary reports, aggregated while the search runs.
+
+Findings are lines of text (see lima_output).  A report parses each finding once, as the output
+sink writes it, into the file, line, dirty word and search strategy it describes.  SARIF results
+and CSV rows are streamed to disk as they arrive.  Counts of findings per dirty word, per
+top-level directory and per strategy are kept in BoundedCounters: each holds at most
+MAX_COUNTER_KEYS keys, and folds the rest into OTHER_KEY.  Memory stays bounded however many
+findings a search reports.
+
+Strategies 3 and 4 (see README) report findings the same way, so both are counted as
+STRATEGY_BYTES.
+
+    Typical usage example:
+
+    from lima.lima_output import open_sink
+    from lima.lima_report import open_report
+
+    with open_sink(reports=[open_report(REPORT_SARIF, Path('lima.sarif'), root=Path('tree'))]):
+        search_dir(Path('tree'), ['dirty'], 'utf-8')
+"""
+
+# Standard Imports
+from pathlib import Path, PurePath
+from typing import Dict, Optional, TextIO, Tuple
+import codecs
+import csv
+import json
+import re
+import sys
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import REPORT_CSV, REPORT_SARIF, REPORT_SUMMARY, SUPPORTED_REPORTS
+from lima.lima_validation import validate_string, validate_type
+
+
+STRATEGY_TEXT = 'text'        # Strategy 1: newline-delimited text
+STRATEGY_DECODED = 'decoded'  # Strategy 2: the entire file, decoded
+STRATEGY_BYTES = 'bytes'      # Strategies 3 and 4: encoded dirty words, with or without nulls
+STRATEGY_UNKNOWN = 'unknown'  # A finding this module can't parse
+MAX_COUNTER_KEYS = 1000     # Distinct keys a BoundedCounter holds before folding into OTHER_KEY
+OTHER_KEY = '<other>'       # Every key past MAX_COUNTER_KEYS
+ROOT_KEY = '.'              # Top-level directory of files directly in the searched directory
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_RULE_ID = 'dirty-word'  # The one SARIF rule: the dirty word is a result property
+CSV_HEADER = ('path', 'line', 'word', 'strategy', 'finding')
+# label : line N : "word" found in "line"
+_TEXT_FINDING = re.compile(r'(?P<path>.*?) : line (?P<line>\d+) : "(?P<word>.*?)" found in "',
+                           re.DOTALL)
+# label : word found in binary file using encoding, where word may be a bytes literal sans b
+_BINARY_FINDING = re.compile(r'(?P<path>.*?) : (?P<word>.*) found in binary file using '
+                             r'(?P<encoding>\S+)$', re.DOTALL)
+# lima_git labels: path (commit SHA, blob SHA)
+_GIT_LABEL = re.compile(r'(?P<path>.*) \(commit [0-9a-f]+, blob [0-9a-f]+\)$', re.DOTALL)
+# lima_decompress labels: path (member NAME), and lima_extract labels: path (part NAME)
+_MEMBER_LABEL = re.compile(r'(?P<path>.*?) \((?:member|part) .*\)$', re.DOTALL)
+
+
+class BoundedCounter():
+    """Count keys, folding every key past max_keys into OTHER_KEY."""
+
+    def __init__(self, max_keys: int = MAX_COUNTER_KEYS) -> None:
+        """BoundedCounter ctor.
+
+        Args:
+            max_keys: Optional; Distinct keys to count before folding the rest into OTHER_KEY.
+        """
+        self.counts: Dict[str, int] = {}  # Key -> count
+        self._max_keys = max_keys
+
+    def add(self, key: str) -> None:
+        """Count key once."""
+        if key not in self.counts and len(self.counts) >= self._max_keys:
+            key = OTHER_KEY
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def most_common(self) -> Dict[str, int]:
+        """Every count, largest first, ties in the order they were first counted."""
+        return dict(sorted(self.counts.items(), key=lambda item: -item[1]))
+
+
+class FindingStats():
+    """Counts of findings: in total, per dirty word, per top-level directory and per strategy."""
+
+    def __init__(self, root: Optional[Path] = None, max_keys: int = MAX_COUNTER_KEYS) -> None:
+        """FindingStats ctor.
+
+        Args:
+            root: Optional; Searched directory.  Top-level directories are its children.
+            max_keys: Optional; Distinct keys each counter holds.
+        """
+        self.findings = 0  # Findings counted
+        self.words = BoundedCounter(max_keys)       # Dirty word -> findings
+        self.dirs = BoundedCounter(max_keys)        # Top-level directory -> findings
+        self.strategies = BoundedCounter(max_keys)  # Strategy -> findings
+        self._root = PurePath(root.absolute()) if root else None
+
+    def add(self, path: str, word: str, strategy: str) -> None:
+        """Count one finding."""
+        self.findings += 1
+        self.words.add(word)
+        self.dirs.add(self._get_top_level(path))
+        self.strategies.add(strategy)
+
+    def as_dict(self) -> Dict[str, object]:
+        """Every count, ready for json.dumps()."""
+        return {'findings': self.findings, 'words': self.words.most_common(),
+                'dirs': self.dirs.most_common(), 'strategies': self.strategies.most_common()}
+
+    def _get_top_level(self, path: str) -> str:
+        """Top-level directory of path, relative to the searched directory if there is one."""
+        parts = PurePath(path).parts  # Components of path
+        if self._root:
+            try:
+                parts = PurePath(path).relative_to(self._root).parts
+            except ValueError:
+                pass  # Not under root (e.g., <stdin>)
+        return parts[0] if len(parts) > 1 else ROOT_KEY
+
+
+class FindingReport():
+    """Base class: parse and count every finding, then let the subclass write it."""
+
+    def __init__(self, out_file: TextIO, root: Optional[Path] = None) -> None:
+        """FindingReport ctor.
+
+        Args:
+            out_file: Open text file the report is written to.  Closed by close(), unless it is
+                sys.stderr.
+            root: Optional; Searched directory.  See FindingStats.
+        """
+        self.stats = FindingStats(root)
+        self._out_file = out_file
+
+    def add(self, finding: str) -> None:
+        """Parse, count and report one finding."""
+        path, line_num, word, strategy = parse_finding(finding)
+        self.stats.add(path, word, strategy)
+        self._write_finding(finding, path, line_num, word, strategy)
+
+    def close(self) -> None:
+        """Finish the report and close its file."""
+        try:
+            self._write_end()
+        finally:
+            if self._out_file is sys.stderr:
+                self._out_file.flush()
+            else:
+                self._out_file.close()
+
+    def _write_finding(self, finding: str, path: str, line_num: Optional[int], word: str,
+                       strategy: str) -> None:
+        """Write one parsed finding.  Reports that only count write nothing."""
+
+    def _write_end(self) -> None:
+        """Write whatever follows the last finding."""
+
+
+class CsvReport(FindingReport):
+    """One CSV row per finding, under a CSV_HEADER row."""
+
+    def __init__(self, out_file: TextIO, root: Optional[Path] = None) -> None:
+        """CsvReport ctor.  See FindingReport."""
+        super().__init__(out_file, root)
+        self._writer = csv.writer(out_file)
+        self._writer.writerow(CSV_HEADER)
+
+    def _write_finding(self, finding: str, path: str, line_num: Optional[int], word: str,
+                       strategy: str) -> None:
+        """Write one row."""
+        self._writer.writerow((path, '' if line_num is None else line_num, word, strategy,
+                               finding))
+
+
+class SarifReport(FindingReport):
+    """SARIF 2.1.0 log: one result per finding, the counts in the run's properties.
+
+    Results are written as they arrive.  JSON doesn't order keys, so the tool and the counts are
+    written after the results.
+    """
+
+    def __init__(self, out_file: TextIO, root: Optional[Path] = None) -> None:
+        """SarifReport ctor.  See FindingReport."""
+        super().__init__(out_file, root)
+        out_file.write(f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", '
+                       '"runs": [{"results": [')
+
+    def _write_finding(self, finding: str, path: str, line_num: Optional[int], word: str,
+                       strategy: str) -> None:
+        """Write one result."""
+        location = {'artifactLocation': {'uri': _get_uri(path)}}  # Physical location
+        if line_num is not None:
+            location['region'] = {'startLine': line_num}
+        self._out_file.write(('\n' if self.stats.findings == 1 else ',\n') + json.dumps({
+            'ruleId': SARIF_RULE_ID, 'level': 'warning', 'message': {'text': finding},
+            'locations': [{'physicalLocation': location}],
+            'properties': {'word': word, 'strategy': strategy}}))
+
+    def _write_end(self) -> None:
+        """Close the results, then write the tool and the counts."""
+        driver = {'name': 'LIVING MANUAL (LIMA)',
+                  'informationUri': 'https://github.com/hark130/living_manual',
+                  'rules': [{'id': SARIF_RULE_ID, 'name': 'DirtyWord',
+                             'shortDescription': {'text': 'Dirty word found'}}]}
+        self._out_file.write('\n], "tool": ' + json.dumps({'driver': driver})
+                             + ', "properties": ' + json.dumps(self.stats.as_dict()) + '}]}\n')
+
+
+class SummaryReport(FindingReport):
+    """Counts only, written once the search is done."""
+
+    def _write_end(self) -> None:
+        """Write the counts."""
+        self._out_file.write(format_summary(self.stats))
+
+
+def format_summary(stats: FindingStats) -> str:
+    """Describe stats in a few lines per counter, largest counts first."""
+    lines = [f'Findings: {stats.findings}']  # Return value, one line at a time
+    for title, counter in (('Words', stats.words), ('Top-level directories', stats.dirs),
+                           ('Strategies', stats.strategies)):
+        lines.append(f'{title}:')
+        lines.extend(f'{count:>10}  {key}' for key, count in counter.most_common().items())
+    return '\n'.join(lines) + '\n'
+
+
+def open_report(report_format: str, output_path: Optional[Path] = None,
+                root: Optional[Path] = None) -> FindingReport:
+    """Create output_path and start a report of report_format in it.
+
+    Args:
+        report_format: One of SUPPORTED_REPORTS.
+        output_path: Optional; File to write the report to, replacing its contents.  Defaults to
+            stderr.
+        root: Optional; Searched directory.  Top-level directories are its children.
+
+    Raises:
+        OSError: output_path can not be written.
+        TypeError: Bad data type.
+        ValueError: Unsupported report_format.
+    """
+    # LOCAL VARIABLES
+    report_class = {REPORT_SARIF: SarifReport, REPORT_CSV: CsvReport,
+                    REPORT_SUMMARY: SummaryReport}.get(report_format)  # Report to create
+
+    # INPUT VALIDATION
+    validate_string(report_format, 'report_format')
+    if output_path is not None:
+        validate_type(output_path, 'output_path', Path)
+    if root is not None:
+        validate_type(root, 'root', Path)
+    if not report_class:
+        raise ValueError(f'Unsupported report format "{report_format}", choose from '
+                         f'{", ".join(SUPPORTED_REPORTS)}')
+
+    # OPEN IT
+    if output_path is None:
+        return report_class(sys.stderr, root)
+    # pylint: disable=consider-using-with
+    return report_class(open(output_path, 'w', encoding='utf-8', errors='backslashreplace',
+                             newline='' if report_format == REPORT_CSV else None), root)
+
+
+def parse_finding(finding: str) -> Tuple[str, Optional[int], str, str]:
+    """Split a finding into what it describes.
+
+    Returns:
+        Tuple of (path, line number or None, dirty word, strategy).  A finding that can't be
+        parsed is (finding, None, OTHER_KEY, STRATEGY_UNKNOWN).
+    """
+    # LOCAL VARIABLES
+    match = _TEXT_FINDING.match(finding)  # Parsed finding
+    path = finding   # Return value: file the finding is in
+    line_num = None  # Return value: line the finding is on, if any
+    word = OTHER_KEY  # Return value: dirty word found
+    strategy = STRATEGY_UNKNOWN  # Return value: strategy that found it
+
+    # PARSE IT
+    if match:
+        path, line_num, word = match['path'], int(match['line']), match['word']
+        strategy = STRATEGY_TEXT
+    else:
+        match = _BINARY_FINDING.match(finding)
+        if match:
+            path, word = match['path'], match['word']
+            strategy = STRATEGY_DECODED
+            if len(word) > 1 and word[0] == word[-1] and word[0] in '\'"':
+                word = _decode_bytes_literal(word, match['encoding'])
+                strategy = STRATEGY_BYTES
+    match = _GIT_LABEL.match(path) or _MEMBER_LABEL.match(path)
+    if match:
+        path = match['path']
+
+    # DONE
+    return path, line_num, word, strategy
+
+
+def _decode_bytes_literal(literal: str, encoding: str) -> str:
+    """Decode the repr() of an encoded dirty word, minus its b prefix, back into the word."""
+    raw = codecs.escape_decode(literal[1:-1].encode('latin-1', 'backslashreplace'))[0]
+    try:
+        if b'\x00' in raw or b'\x00' not in 'a'.encode(encoding):
+            return raw.decode(encoding)
+    except (LookupError, UnicodeError):
+        pass
+    # E.g., a UTF-16 word with its null bytes stripped: drop what is left of the BOM
+    return raw.decode('latin-1').lstrip('\xfe\xff')
+
+
+def _get_uri(path: str) -> str:
+    """SARIF artifact URI for path: a file URI if path is absolute, else path as is."""
+    return PurePath(path).as_uri() if PurePath(path).is_absolute() else path
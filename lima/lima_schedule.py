@@ -0,0 +1,149 @@
+"""LIVING MANUAL (LIMA) search order and time budgets for directory searches.
+
+search_dir() normally searches each directory's files in the order the file system lists them,
+then its child directories.  If a time budget cuts the search short, that order may have spent
+the whole budget on one disk image while thousands of small, recently touched files waited.
+get_schedule() lists every file up front and orders the list by a policy: smallest first, most
+recently modified first, or by extension weight (lowest weight first, then smallest).  Whatever a
+time budget leaves unsearched is recorded in SCHEDULE_STATS.
+
+    Typical usage example:
+
+    from lima.lima_schedule import SCHEDULE_SMALLEST, get_schedule
+
+    for file_path, size in get_schedule(Path('tree'), True, SCHEDULE_SMALLEST):
+        ...  # Search file_path
+"""
+
+# Standard Imports
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import os
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import (SCHEDULE_EXTENSION, SCHEDULE_NEWEST, SCHEDULE_SMALLEST,
+                                SUPPORTED_SCHEDULES)
+from lima.lima_validation import validate_path_dir, validate_string, validate_type
+
+
+DEFAULT_EXTENSION_WEIGHT = 0  # Weight of extensions missing from the extension weights
+
+
+class ScheduleStats():
+    """Thread-safe record of the files a time budget left unsearched."""
+
+    def __init__(self) -> None:
+        """ScheduleStats ctor."""
+        self._lock = Lock()
+        self.searched = 0            # Files searched before the budget ran out
+        self.unsearched: List[str] = []  # Files the budget left unsearched, in schedule order
+        self.unsearched_bytes = 0    # Total size of the unsearched files
+
+    def record(self, file_path: Optional[Path] = None, size: int = 0) -> None:
+        """Count one searched file, or record an unsearched file_path of size bytes."""
+        with self._lock:
+            if file_path is None:
+                self.searched += 1
+            else:
+                self.unsearched.append(str(file_path))
+                self.unsearched_bytes += size
+
+    def reset(self) -> None:
+        """Forget everything."""
+        with self._lock:
+            self.searched = self.unsearched_bytes = 0
+            self.unsearched = []
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            if not self.unsearched:
+                return f'Time budget: all {self.searched} files searched'
+            return (f'Time budget ran out: {self.searched} files searched, '
+                    f'{len(self.unsearched)} files ({self.unsearched_bytes} bytes) not searched')
+
+
+SCHEDULE_STATS = ScheduleStats()  # Updated by every budgeted search in this process
+
+
+def get_schedule(dir_path: Path, recursive: bool, schedule: Optional[str] = None,
+                 extension_weights: Optional[Dict[str, int]] = None) -> List[Tuple[Path, int]]:
+    """List the files in dir_path in the order they should be searched.
+
+    Args:
+        dir_path: Directory to list.
+        recursive: List the files in every child directory too.
+        schedule: Optional; One of SUPPORTED_SCHEDULES.  None lists files in search_dir() order.
+        extension_weights: Optional; Lowercase extension (e.g., '.iso') to weight, for
+            SCHEDULE_EXTENSION.  Others weigh DEFAULT_EXTENSION_WEIGHT.
+
+    Returns:
+        List of (file, size in bytes) tuples.  Ties keep search_dir() order.
+
+    Raises:
+        FileNotFoundError: dir_path is unavailable.
+        OSError: dir_path is not a directory.
+        TypeError: Bad data type.
+        ValueError: Unsupported schedule.
+    """
+    # LOCAL VARIABLES
+    files: List[Tuple[Path, os.stat_result]] = []  # Every file, in search_dir() order
+    weights = extension_weights or {}               # Extension -> weight
+
+    # INPUT VALIDATION
+    validate_path_dir(dir_path)
+    validate_type(recursive, 'recursive', bool)
+    validate_schedule_args(schedule=schedule, extension_weights=extension_weights)
+
+    # LIST IT
+    _list_files(dir_path, recursive, files)
+
+    # ORDER IT
+    if schedule == SCHEDULE_SMALLEST:
+        files.sort(key=lambda entry: entry[1].st_size)
+    elif schedule == SCHEDULE_NEWEST:
+        files.sort(key=lambda entry: -entry[1].st_mtime)
+    elif schedule == SCHEDULE_EXTENSION:
+        files.sort(key=lambda entry: (weights.get(entry[0].suffix.lower(),
+                                                  DEFAULT_EXTENSION_WEIGHT), entry[1].st_size))
+
+    # DONE
+    return [(file_path, stat.st_size) for file_path, stat in files]
+
+
+def validate_schedule_args(schedule: Optional[str],
+                           extension_weights: Optional[Dict[str, int]]) -> None:
+    """Validate the get_schedule() arguments the search functions pass through.
+
+    Raises:
+        TypeError: Bad data type.
+        ValueError: Unsupported schedule.
+    """
+    if schedule is not None:
+        validate_string(schedule, 'schedule')
+        if schedule not in SUPPORTED_SCHEDULES:
+            raise ValueError(f'Unsupported schedule "{schedule}", choose from '
+                             f'{", ".join(SUPPORTED_SCHEDULES)}')
+    if extension_weights is not None:
+        validate_type(extension_weights, 'extension_weights', dict)
+        for extension, weight in extension_weights.items():
+            validate_string(extension, 'extension_weights key')
+            validate_type(weight, 'extension_weights value', int)
+
+
+def _list_files(dir_path: Path, recursive: bool,
+                files: List[Tuple[Path, os.stat_result]]) -> None:
+    """Append dir_path's files, then its child directories' files, to files."""
+    # LOCAL VARIABLES
+    child_dirs = []  # Child directories, listed after every file in dir_path
+
+    # LIST IT
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files.append((dir_path / entry.name, entry.stat()))
+            elif recursive and entry.is_dir():
+                child_dirs.append(dir_path / entry.name)
+    for child_dir in child_dirs:
+        _list_files(child_dir, recursive, files)
@@ -2,22 +2,199 @@
 
 # Standard Imports
 from pathlib import Path
-from typing import List
+from contextlib import nullcontext
+from typing import (TYPE_CHECKING, Any, AnyStr, BinaryIO, Dict, FrozenSet, Hashable, Iterator,
+                    List, Optional, Sequence, Set, Tuple)
+import codecs
+import io
 import sys
+import time
 # Third Party Imports
 # Local Imports
+from lima.lima_defaults import DEFAULT_BLOCK_SIZE, ENCODING_AUTO
+from lima.lima_engine import ENGINE_AUTO, get_matcher, validate_engine
+from lima.lima_io import read_file, validate_io_args
+from lima.lima_output import capture_findings, emit_finding
+from lima.lima_plugins import (KIND_EXTRACTOR, KIND_STRATEGY, Plugin, load_plugins,
+                               register_plugin, select_plugins)
+from lima.lima_prefilter import PREFILTER_STATS, get_prefilter, strip_nulls
 from lima.lima_validation import (validate_path_dir, validate_path_file,
                                   validate_string, validate_type)
+from lima.lima_words import load_dirty_words
+if TYPE_CHECKING:
+    from lima.lima_checkpoint import Checkpoint  # Imported on demand by search_dir()
+    from lima.lima_limits import Deadline  # Imported on demand by search_file()
 
 
 VERBOSITY = False  # Place holder for `-v`/`--verbosity` functionality
+DEFAULT_LABEL = '<data>'  # Names in-memory buffers in findings
+STDIN_LABEL = '<stdin>'   # Names standard input in findings
+DEFAULT_CHUNK_SIZE = 1 << 16  # Bytes search_stream() reads at once
+MAX_LINE_LENGTH = 1 << 20     # Characters of one line search_stream() holds before searching it
 
 
-def get_dirty_words(dw_path: Path) -> List[str]:
+class _StreamMatcher():
+    """Search a stream one chunk at a time.
+
+    The tail of each chunk, one item shorter than the longest needle, is carried over to the next
+    chunk so needles that straddle a chunk boundary are still found.
+    """
+
+    def __init__(self, needles: Sequence[AnyStr], engine: str) -> None:
+        """_StreamMatcher ctor.
+
+        Args:
+            needles: Non-empty str or bytes entries to search for.
+            engine: Matching engine to use.
+        """
+        self.needles = needles
+        self.found: Set[int] = set()  # Indices of the needles found so far
+        self._matcher = get_matcher(needles, engine)
+        self._overlap = max(len(needle) for needle in needles) - 1
+        self._tail = needles[0][:0]   # Carried over from the previous chunk
+
+    def feed(self, chunk: AnyStr) -> List[int]:
+        """Search the next chunk.
+
+        Returns:
+            Sorted indices of the needles found for the first time.
+        """
+        window = self._tail + chunk  # Chunk plus the carried over tail
+        new_found = []               # Return value
+
+        if len(self.found) < len(self.needles):
+            new_found = [index for index in self._matcher.search(window)
+                         if index not in self.found]
+            self.found.update(new_found)
+        self._tail = window[max(0, len(window) - self._overlap):] if self._overlap else window[:0]
+        return new_found
+
+
+class _NativeOrderDecoder(codecs.IncrementalDecoder):
+    """Incremental equivalent of bytes.decode() for the utf-16 and utf-32 codecs.
+
+    Their incremental decoders insist on a BOM.  bytes.decode() falls back to the native byte
+    order instead.
+    """
+
+    def __init__(self, encoding: str, errors: str = 'strict') -> None:
+        """_NativeOrderDecoder ctor.
+
+        Args:
+            encoding: Normalized codec name: utf-16 or utf-32.
+            errors: Optional; Error handling scheme.
+        """
+        super().__init__(errors)
+        self._encoding = encoding
+        self._boms = ((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE) if encoding == 'utf-16'
+                      else (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE))
+        self._buffer = b''     # Input held until the BOM, if any, is complete
+        self._decoder = None   # Incremental decoder, picked once the BOM is complete
+
+    def decode(self, input: bytes, final: bool = False) -> str:  # pylint: disable=redefined-builtin
+        """Decode input.  See codecs.IncrementalDecoder.decode()."""
+        if not self._decoder:
+            self._buffer += input
+            if len(self._buffer) < len(self._boms[0]) and not final:
+                return ''
+            if self._buffer.startswith(self._boms):
+                self._decoder = codecs.getincrementaldecoder(self._encoding)(self.errors)
+            else:
+                self._decoder = codecs.getincrementaldecoder(
+                    f'{self._encoding}-{sys.byteorder[0]}e')(self.errors)
+            input, self._buffer = self._buffer, b''
+        return self._decoder.decode(input, final)
+
+
+class _LineSearch():
+    """Strategy 1 for streams: search decoded text, one line at a time, as it arrives.
+
+    Lines longer than MAX_LINE_LENGTH are searched in pieces so memory stays bounded.  Findings
+    on those lines quote the piece instead of the whole line.
+    """
+
+    def __init__(self, label: str, dw_list: List[str], engine: str) -> None:
+        """_LineSearch ctor.
+
+        Args:
+            label: Name used to identify the stream in the findings.
+            dw_list: A list of non-empty strings to search for.
+            engine: Matching engine to use.
+        """
+        self.found = 0                 # 0 if no dirty words were found, 3 if dirty words were found
+        self._label = label
+        self._dw_list = dw_list
+        self._engine = engine
+        self._matcher = get_matcher(dw_list, engine)
+        self._pending = ''             # Start of the current line
+        self._line_num = 0             # Lines completed so far
+        self._long_line: Optional[_StreamMatcher] = None  # Searches a line too long to hold
+
+    def close(self) -> None:
+        """Search the last line.  Like str.split('\n'), text after the last newline is a line."""
+        self._end_line(self._pending)
+        self._pending = ''
+
+    def feed(self, text: str) -> None:
+        """Search every line text completes and hold on to the start of the next one."""
+        # LOCAL VARIABLES
+        head = ''       # Complete lines
+        newline = '\n'  # Non-empty if head holds complete lines
+
+        # SPLIT IT
+        self._pending += text
+        if '\n' in text:
+            head, self._pending = self._pending.rsplit('\n', 1)
+            if self._long_line:
+                line, newline, head = head.partition('\n')
+                self._end_line(line)
+            # SEARCH IT
+            # One pass over the complete lines rules out clean text before the line-by-line pass
+            if newline and self._matcher.search(head):
+                for line in head.split('\n'):
+                    self._end_line(line)
+            elif newline:
+                self._line_num += head.count('\n') + 1
+        if len(self._pending) > MAX_LINE_LENGTH:
+            self._search_long_line(self._pending)
+            self._pending = ''
+
+    def _end_line(self, line: str) -> None:
+        """Search the rest of the current line and move on to the next one."""
+        if self._long_line:
+            self._search_long_line(line)
+        else:
+            for index in self._matcher.search(line):
+                self._report(index, line)
+        self._long_line = None
+        self._line_num += 1
+
+    def _report(self, index: int, line: str) -> None:
+        """Print a finding on the current line."""
+        self.found = 3
+        emit_finding(f'{self._label} : line {self._line_num + 1} : "{self._dw_list[index]}" '
+                     f'found in "{line}"')
+
+    def _search_long_line(self, piece: str) -> None:
+        """Search the next piece of a line too long to hold."""
+        if not self._long_line:
+            self._long_line = _StreamMatcher(self._dw_list, self._engine)
+        for index in self._long_line.feed(piece):
+            self._report(index, piece)
+
+
+def get_dirty_words(dw_path: Path, case_sensitive: bool = True, subsume: bool = False,
+                    encoding: str = 'utf-8') -> List[str]:
     """Parse dirty word file into a list.
 
+    The entries are prepared first: normalized, with blank, duplicate and (optionally) subsumed
+    entries removed.  See lima_words.prepare_dirty_words().
+
     Args:
         dw_path: Path object to the --words file.
+        case_sensitive: Optional; The search considers case.
+        subsume: Optional; Drop entries that contain a shorter entry.
+        encoding: Optional; Format with which the search encodes dirty words.
 
     Returns:
         A list of strings to use as dirty words during the search.
@@ -25,33 +202,64 @@ def get_dirty_words(dw_path: Path) -> List[str]:
     Raises:
         TypeError: Bad data type.
         FileNotFoundError: dw_path is unavailable.
+        LookupError: Unknown encoding.
         OSError: dw_path is not a file.
     """
     # LOCAL VARIABLES
     dw_list = []  # List of dirty words to return
 
-    # INPUT VALIDATION
-    validate_path_file(dw_path)
-
     # GET IT
-    dw_list = [entry for entry in dw_path.read_text().split('\n') if entry]
+    dw_list, _ = load_dirty_words(dw_path, case_sensitive=case_sensitive, subsume=subsume,
+                                  encoding=encoding)
 
     # DONE
     return dw_list
 
 
 def search_dir(dir_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool = True,
-               recursive: bool = False) -> int:
+               recursive: bool = False, engine: str = ENGINE_AUTO,
+               checkpoint_path: Optional[Path] = None, prefilter: bool = False,
+               block_size: int = DEFAULT_BLOCK_SIZE, no_cache_pollution: bool = False,
+               schedule: Optional[str] = None, extension_weights: Optional[Dict[str, int]] = None,
+               time_budget: Optional[float] = None, timeout: Optional[float] = None,
+               max_file_size: Optional[int] = None, profile: bool = False,
+               sections: bool = False, decompress: bool = False, extract: bool = False,
+               plugins: bool = False, normalize: bool = False) -> int:
     """Searches dir_path for files that contain dw_list entries.
 
-    Prints findings and file decoding errors (AKA UnicodeDecodeErrors) to stderr.
+    Emits findings (see lima_output).  With a checkpoint_path, progress and findings are recorded
+    as the search goes (see lima_checkpoint).  Searching again with the same checkpoint_path
+    re-emits the recorded findings once, then searches only the files that weren't completed.
+    With a schedule or a time_budget, every file is listed up front and searched in schedule
+    order until the budget runs out (see lima_schedule).  Files that exceed timeout or
+    max_file_size are skipped and recorded in lima_limits.LIMIT_STATS.
 
     Args:
         dir_path: Path object to a directory to search.
         dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode files found in dir_path.
+        encoding: Format with which to decode files found in dir_path, or ENCODING_AUTO.
         case_sensitive: Optional; Considers case when checking file_path contents for dirty words.
         recursive: Optional; If True, recursive search all the child directories found in dir_path.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        checkpoint_path: Optional; Record progress here, and resume from it if it exists.
+        prefilter: Optional; Skip files the prefilter proves clean.  See lima_prefilter.
+        block_size: Optional; Bytes read from a file at a time.  See lima_io.
+        no_cache_pollution: Optional; Drop what was read from the page cache.  See lima_io.
+        schedule: Optional; Search order, one of lima_schedule.SUPPORTED_SCHEDULES.
+        extension_weights: Optional; Extension to weight for the 'extension' schedule.
+        time_budget: Optional; Seconds after which no more files are started.  The files left
+            unsearched are recorded in lima_schedule.SCHEDULE_STATS.
+        timeout: Optional; Seconds each file may take.  See lima_limits.time_limit().
+        max_file_size: Optional; Largest file, in bytes, to search.
+        profile: Optional; Record each file in lima_profile.PROFILE_STATS.
+        sections: Optional; Search only the string sections of ELF and PE files.  See
+            lima_sections.
+        decompress: Optional; Also search the decompressed members of compressed files and
+            archives.  See lima_decompress.
+        extract: Optional; Also search the text of Office documents and PDFs.  See lima_extract.
+        plugins: Optional; Also run the installed plugins.  See lima_plugins.load_plugins().
+        normalize: Optional; Fold Unicode lookalikes before strategy 1 matches.  See
+            search_file().
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
@@ -59,292 +267,1055 @@ def search_dir(dir_path: Path, dw_list: List[str], encoding: str, case_sensitive
     Raises:
         FileNotFoundError: dir_path is unavailable.
         LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine.
         OSError: dir_path is not a directory.
         TypeError: Bad data type.
-        ValueError: Bad value (e.g., empty string).
+        ValueError: Bad value (e.g., empty string, checkpoint of a different search, unsupported
+            schedule, negative time_budget, timeout that isn't positive).
     """
     # LOCAL VARIABLES
-    target_files = []    # List of files found within dir_path to search for dirty words
-    child_dir_list = []  # List of children directories to dir_path
-    temp_found = 0       # Temporary return value storage
-    found = 0            # 0 if no dirty words were found, 3 if dirty words were found
+    found = 0         # 0 if no dirty words were found, 3 if dirty words were found
+    settings = {}     # Search arguments a resumed search must agree with
+    scheduled = schedule is not None or time_budget is not None  # List every file up front?
+    # search_file() arguments shared by every file
+    file_kwargs = {'dw_list': dw_list, 'encoding': encoding, 'case_sensitive': case_sensitive,
+                   'engine': engine, 'prefilter': prefilter, 'block_size': block_size,
+                   'no_cache_pollution': no_cache_pollution, 'timeout': timeout,
+                   'max_file_size': max_file_size, 'profile': profile, 'sections': sections,
+                   'decompress': decompress, 'extract': extract, 'plugins': plugins,
+                   'normalize': normalize}
 
     # INPUT VALIDATION
     validate_path_dir(dir_path)
     validate_type(recursive, 'recursive', bool)
-
-    # SEARCH IT
-    # dir_path
-    target_files = [t_file for t_file in dir_path.iterdir() if t_file.is_file()]
-    for target_file in target_files:
-        temp_found = search_file(file_path=target_file, dw_list=dw_list, encoding=encoding,
-                                 case_sensitive=case_sensitive)
-        if temp_found != 0:
-            found = temp_found
-    # Recurse?
-    if recursive:
-        child_dir_list = [child_dir for child_dir in dir_path.iterdir() if child_dir.is_dir()]
-        for child_dir in child_dir_list:
-            temp_found = search_dir(dir_path=child_dir, dw_list=dw_list, encoding=encoding,
-                                    case_sensitive=case_sensitive, recursive=recursive)
-            if temp_found != 0:
-                found = temp_found
+    validate_type(prefilter, 'prefilter', bool)
+    validate_type(profile, 'profile', bool)
+    validate_type(sections, 'sections', bool)
+    validate_type(decompress, 'decompress', bool)
+    validate_type(extract, 'extract', bool)
+    validate_type(plugins, 'plugins', bool)
+    validate_type(normalize, 'normalize', bool)
+    validate_io_args(block_size=block_size, no_cache_pollution=no_cache_pollution)
+    if timeout is not None or max_file_size is not None:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_limits import validate_limit_args
+        validate_limit_args(timeout=timeout, max_file_size=max_file_size)
+    if time_budget is not None:
+        validate_type(time_budget, 'time_budget', (int, float))
+        if time_budget < 0:
+            raise ValueError('time_budget may not be negative')
+    if scheduled:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_schedule import validate_schedule_args
+        validate_schedule_args(schedule=schedule, extension_weights=extension_weights)
+    if checkpoint_path is None:
+        if scheduled:
+            return _search_scheduled(dir_path=dir_path, recursive=recursive, schedule=schedule,
+                                     extension_weights=extension_weights,
+                                     time_budget=time_budget, file_kwargs=file_kwargs)
+        return _search_dir(dir_path=dir_path, recursive=recursive, file_kwargs=file_kwargs)
+    validate_type(checkpoint_path, 'checkpoint_path', Path)
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                         engine=engine)
+
+    # RESUME IT
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    import hashlib
+    from lima.lima_checkpoint import Checkpoint
+    # Every argument that changes the findings, so a resume can't replay findings of another search
+    settings = {'dir': str(dir_path.resolve()), 'recursive': recursive, 'encoding': encoding,
+                'case_sensitive': case_sensitive, 'engine': engine, 'sections': sections,
+                'decompress': decompress, 'extract': extract, 'plugins': plugins,
+                'normalize': normalize,
+                'words_digest': hashlib.sha256('\n'.join(dw_list).encode()).hexdigest()}
+    with Checkpoint(checkpoint_path=checkpoint_path, settings=settings) as checkpoint:
+        for finding in checkpoint.findings:
+            emit_finding(finding)
+        if scheduled:
+            found = _search_scheduled(dir_path=dir_path, recursive=recursive, schedule=schedule,
+                                      extension_weights=extension_weights,
+                                      time_budget=time_budget, file_kwargs=file_kwargs,
+                                      checkpoint=checkpoint)
+        else:
+            found = _search_dir(dir_path=dir_path, recursive=recursive, file_kwargs=file_kwargs,
+                                checkpoint=checkpoint, root_path=dir_path)
+        found = checkpoint.found or found
 
     # DONE
     return found
 
 
-# pylint: disable=too-many-branches
-# Just leave me be
+def search_data(data: bytes, dw_list: List[str], encoding: str, case_sensitive: bool = True,
+                engine: str = ENGINE_AUTO, label: str = DEFAULT_LABEL,
+                prefilter: bool = False, extract: bool = False, plugins: bool = False,
+                normalize: bool = False) -> int:
+    """Searches an in-memory buffer for dw_list entries using the format encoding.
+
+    Emits findings (see lima_output), identified by label.  With extract, the text of an Office
+    document or PDF is searched too.  With normalize, strategy 1 folds Unicode lookalikes (see
+    search_file()).
+
+    Args:
+        data: Raw contents to search (e.g., a payload that never touched the disk).
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to decode data, or ENCODING_AUTO.
+        case_sensitive: Optional; Considers case when checking data for dirty words.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        label: Optional; Name used to identify data in the findings.
+        prefilter: Optional; Skip data the prefilter proves clean.  See lima_prefilter.
+        extract: Optional; If data is an Office document or PDF, also search its text.
+            See lima_extract.
+        plugins: Optional; Also run the installed plugins.  See lima_plugins.load_plugins().
+        normalize: Optional; Fold Unicode lookalikes before strategy 1 matches.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string).
+    """
+    # INPUT VALIDATION
+    validate_type(data, 'data', bytes)
+    validate_string(label, 'label')
+    validate_type(prefilter, 'prefilter', bool)
+    validate_type(extract, 'extract', bool)
+    validate_type(plugins, 'plugins', bool)
+    validate_type(normalize, 'normalize', bool)
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                          engine=engine)
+    if plugins:
+        load_plugins()
+
+    # SEARCH IT
+    return _search_data(label=label, data=data, dw_list=dw_list, encoding=encoding,
+                        case_sensitive=case_sensitive, engine=engine, prefilter=prefilter,
+                        options=_get_options(extract=extract, normalize=normalize))
+
+
 def search_file(file_path: Path, dw_list: List[str], encoding: str,
-                case_sensitive: bool = True) -> int:
+                case_sensitive: bool = True, engine: str = ENGINE_AUTO,
+                prefilter: bool = False, block_size: int = DEFAULT_BLOCK_SIZE,
+                no_cache_pollution: bool = False, timeout: Optional[float] = None,
+                max_file_size: Optional[int] = None, profile: bool = False,
+                sections: bool = False, decompress: bool = False, extract: bool = False,
+                plugins: bool = False, normalize: bool = False) -> int:
     """Searches file_path for dw_list entries using the format encoding.
 
-    Prints findings to stderr.
+    Emits findings (see lima_output).  Findings emitted before a limit is exceeded stand.
+    With decompress, the members of a compressed file or archive are searched too, one chunk at
+    a time, after file_path itself.  Their findings are labeled "file_path (member NAME)".
+    With extract, the text of an Office document or PDF is searched too, line by line, whatever
+    the encoding.  Its findings are labeled "file_path (part NAME)".  With normalize, strategy 1
+    folds file_path and dw_list (see lima_normalize) so full-width, decomposed, homoglyph and
+    invisible character variants of a dirty word are found too.  Its findings quote the original
+    line, followed by the original text of the match if it differs from the dirty word.  The
+    prefilter can't rule out lookalikes, so normalize turns it off.  With an encoding of
+    ENCODING_AUTO, file_path is decoded with the encoding detected from its first bytes (see
+    lima_detect), cached by file identity.  The strategies and extractors that run are the
+    registered plugins that apply to file_path (see lima_plugins).
 
     Args:
         file_path: Path object to a file to search.
         dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode file_path.
+        encoding: Format with which to decode file_path, or ENCODING_AUTO.
         case_sensitive: Optional; Considers case when checking file_path contents for dirty words.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        prefilter: Optional; Skip the search if the prefilter proves file_path clean.  See
+            lima_prefilter.
+        block_size: Optional; Bytes read from file_path at a time.  See lima_io.
+        no_cache_pollution: Optional; Drop file_path from the page cache as it is read.  See
+            lima_io.
+        timeout: Optional; Seconds the search may take.  See lima_limits.time_limit().
+        max_file_size: Optional; Largest file_path, in bytes, to search.
+        profile: Optional; Record file_path in lima_profile.PROFILE_STATS.
+        sections: Optional; If file_path is an ELF or PE file, search only its string sections.
+            See lima_sections.
+        decompress: Optional; If file_path is a compressed file or archive, also search its
+            decompressed members.  Members that can't be decoded are recorded in
+            lima_decompress.DECOMPRESS_STATS.
+        extract: Optional; If file_path is an Office document or PDF, also search its text.
+            See lima_extract.
+        plugins: Optional; Also run the installed plugins.  See lima_plugins.load_plugins().
+        normalize: Optional; Fold Unicode lookalikes before strategy 1 matches.
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
 
     Raises:
+        lima_limits.FileLimitError: file_path exceeded timeout or max_file_size.
         FileNotFoundError: file_path is unavailable.
         LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine.
         OSError: file_path is not a file.
         TypeError: Bad data type.
-        ValueError: Bad value (e.g., empty string).
+        ValueError: Bad value (e.g., empty string, timeout that isn't positive).
     """
     # LOCAL VARIABLES
-    found = 0       # 0 if no dirty words were found, 3 if dirty words were found
-    strategy = 0    # Track the winning strategy for this input
+    limit = nullcontext()  # Enforces timeout
+    read_times = None      # perf_counter() before and after reading file_path, if profiling
+    text = True            # Try strategy 1?
+    identity = None        # Caches the encoding detected for file_path, if auto-detecting
+    found = 0              # 0 if no dirty words were found, 3 if dirty words were found
 
     # INPUT VALIDATION
     validate_path_file(file_path)
-    validate_type(dw_list, 'dw_list', list)
-    if not dw_list:
-        raise ValueError('Dirty word list may not be empty')
-    for dw_entry in dw_list:
-        validate_string(dw_entry, 'dw_list entry')
-    validate_string(encoding, 'encoding')
-    validate_type(case_sensitive, 'case_sensitive', bool)
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                          engine=engine)
+    validate_type(prefilter, 'prefilter', bool)
+    validate_type(profile, 'profile', bool)
+    validate_type(sections, 'sections', bool)
+    validate_type(decompress, 'decompress', bool)
+    validate_type(extract, 'extract', bool)
+    validate_type(plugins, 'plugins', bool)
+    validate_type(normalize, 'normalize', bool)
+    validate_io_args(block_size=block_size, no_cache_pollution=no_cache_pollution)
+    if timeout is not None or max_file_size is not None:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_limits import time_limit, validate_limit_args
+        validate_limit_args(timeout=timeout, max_file_size=max_file_size)
+        limit = time_limit(timeout)
+    if plugins:
+        load_plugins()
 
-    # READ IT
-    # First attempt: as text
-    try:
-        found = _search_file_text(file_path=file_path, dw_list=dw_list,
-                                  encoding=encoding, case_sensitive=case_sensitive)
-        if found:
-            strategy = 1
-    except (RuntimeError, UnicodeDecodeError) as err:
-        if VERBOSITY:
-            print(f'Unable to decode {file_path.absolute()} using {encoding}... {err}')
-    # Second attempt: decoded bytes
-    if found == 0:
-        try:
-            found = _search_file_bytes(file_path=file_path, dw_list=dw_list,
-                                       encoding=encoding, case_sensitive=case_sensitive)
-            if found:
-                strategy = 2
-        except (UnicodeDecodeError, UnicodeError) as err:
-            if VERBOSITY:
-                print(f'Unable to decode {file_path.absolute()} using {encoding}... {err}')
-    # Third attempt: encode the dirty words as bytes objects
-    if found == 0:
-        try:
-            found = _search_bytes(file_path=file_path, dw_list=dw_list, encoding=encoding,
-                                  case_sensitive=case_sensitive)
-            if found:
-                strategy = 3
-        except (UnicodeDecodeError, UnicodeError) as err:
-            if VERBOSITY:
-                print(f'Unable to decode {file_path.absolute()} using {encoding}... {err}')
-    # Fourth attempt: remove \x00 byte values and search again
-    if found == 0:
+    # SEARCH IT
+    # Read once, every strategy searches the same buffer
+    with limit as deadline:
+        started = time.perf_counter()  # Reading starts
+        if encoding == ENCODING_AUTO:
+            stat = file_path.stat()  # Before reading, so a change while reading isn't cached
+            identity = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        data = read_file(file_path, block_size, no_cache_pollution, reuse=True,
+                         max_size=max_file_size)
+        if sections:
+            # pylint: disable=import-outside-toplevel
+            from lima.lima_sections import get_string_data
+            string_data = get_string_data(data)
+            if string_data is not None:
+                data, text = string_data, False  # Sections aren't lines of text
+                identity = None  # Not the contents of file_path
+        if profile:
+            read_times = (started, time.perf_counter())
+        found = _search_data(label=str(file_path.absolute()), data=data, dw_list=dw_list,
+                             encoding=encoding, case_sensitive=case_sensitive, engine=engine,
+                             prefilter=prefilter, read_times=read_times, text=text,
+                             options=_get_options(decompress=decompress, extract=extract,
+                                                  normalize=normalize),
+                             identity=identity, deadline=deadline)
+
+    # DONE
+    return found
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def search_stream(stream: BinaryIO, dw_list: List[str], encoding: str, case_sensitive: bool = True,
+                  engine: str = ENGINE_AUTO, label: str = STDIN_LABEL,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Searches a binary stream (e.g., stdin) for dw_list entries, one chunk at a time.
+
+    Memory use is bounded by chunk_size and MAX_LINE_LENGTH, no matter how long the stream is.
+    Text findings are emitted as soon as their line is complete.  The binary strategies search
+    every chunk at the same time and report their findings at the end of the stream, if the text
+    strategy found nothing.  With an encoding of ENCODING_AUTO, stream is decoded with the
+    encoding detected from its first lima_detect.SAMPLE_SIZE bytes.  Differences from
+    search_file():
+        - Text findings emitted before a decoding error are not taken back.
+
+    Args:
+        stream: Binary stream to read until EOF.
+        dw_list: A list of non-empty strings to search stream for.
+        encoding: Format with which to decode stream, or ENCODING_AUTO.
+        case_sensitive: Optional; Considers case when checking stream contents for dirty words.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        label: Optional; Name used to identify stream in the findings.
+        chunk_size: Optional; Maximum number of bytes to read at once.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string, chunk_size less than 1).
+    """
+    # LOCAL VARIABLES
+    found = 0                 # 0 if no dirty words were found, 3 if dirty words were found
+    head = b''                # First bytes of stream, read ahead to detect its encoding
+    chunk = b''               # Raw bytes read from stream
+    text = ''                 # chunk, decoded by strategy 2
+    text_list = dw_list       # Local copy of dw_list contents
+    byte_list = []            # Local copy of dw_list contents as bytes objects
+    decoder = None            # Strategy 1 decoder, None once stream can not be decoded
+    line_search = None        # Strategy 1: decoded text, line by line
+    bytes_decoder = None      # Strategy 2 decoder, None once stream can not be decoded
+    text_search = None        # Strategy 2: decoded bytes
+    byte_search = None        # Strategy 3: raw bytes
+    null_search = None        # Strategy 4: raw bytes, minus null bytes
+
+    # INPUT VALIDATION
+    validate_type(stream, 'stream', (io.RawIOBase, io.BufferedIOBase))
+    validate_string(label, 'label')
+    validate_type(chunk_size, 'chunk_size', int)
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    validate_search_args(dw_list=dw_list, encoding=encoding, case_sensitive=case_sensitive,
+                          engine=engine)
+
+    # PREPARE IT
+    read = getattr(stream, 'read1', stream.read)  # Don't wait on a pipe to fill a whole chunk
+    if encoding == ENCODING_AUTO:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_detect import SAMPLE_SIZE, get_encoding, strip_bom
+        head = stream.read(SAMPLE_SIZE)
+        encoding = get_encoding(head)
+        head = strip_bom(head, encoding)
+    byte_list = [bytes(dw_entry, encoding=encoding) for dw_entry in dw_list]
+    if not case_sensitive:
+        text_list = [dw_entry.lower() for dw_entry in dw_list]
+        byte_list = [local_entry.lower() for local_entry in byte_list]
+    # Universal newlines, exactly like Path.read_text(), even if \r\n straddles two chunks
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(),
+                                           translate=True)
+    line_search = _LineSearch(label=label, dw_list=text_list, engine=engine)
+    bytes_decoder = _get_bytes_decoder(encoding)
+    text_search = _StreamMatcher(text_list, engine)
+    byte_search = _StreamMatcher(byte_list, engine)
+    null_search = _StreamMatcher(byte_list, engine)
+
+    # SEARCH IT
+    while True:
+        chunk, head = head or read(chunk_size), b''
+        if decoder:
+            decoder = _feed_decoder(decoder, line_search, chunk, case_sensitive, label, encoding)
+        if not chunk:
+            break  # EOF
+        if line_search.found:
+            continue  # Strategy 1 wins, no need to run the others
+        if bytes_decoder:
+            try:
+                text = bytes_decoder.decode(chunk)
+                text_search.feed(text if case_sensitive else text.lower())
+            except UnicodeError:
+                bytes_decoder = None
+        null_search.feed(strip_nulls(chunk, case_sensitive))
+        byte_search.feed(chunk if case_sensitive else chunk.lower())
+    if bytes_decoder and not line_search.found:
         try:
-            found = _search_null(file_path=file_path, dw_list=dw_list, encoding=encoding,
-                                 case_sensitive=case_sensitive)
-            if found:
-                strategy = 4
-        except (UnicodeDecodeError, UnicodeError) as err:
-            if VERBOSITY:
-                print(f'Unable to decode {file_path.absolute()} using {encoding}... {err}')
+            text_search.feed(bytes_decoder.decode(b'', final=True))
+        except UnicodeError:
+            bytes_decoder = None
+
+    # REPORT IT
+    found = line_search.found
+    if found == 0 and bytes_decoder and text_search.found:
+        found = 3
+        for index in sorted(text_search.found):
+            emit_finding(f'{label} : {text_list[index]} found in binary file using {encoding}')
+    for binary_search in (byte_search, null_search):
+        if found == 0 and binary_search.found:
+            found = 3
+            for index in sorted(binary_search.found):
+                emit_finding(f'{label} : {str(byte_list[index])[1:]} found in binary file using '
+                             f'{encoding}')
 
     # DONE
+    return found
+
+
+def walk_dir(dir_path: Path, recursive: bool = False) -> Iterator[Path]:
+    """Yield the files search_dir() would search, in the order it would search them.
+
+    Args:
+        dir_path: Path object to a directory to walk.
+        recursive: Optional; If True, walk all the child directories found in dir_path.
+
+    Raises:
+        FileNotFoundError: dir_path is unavailable.
+        OSError: dir_path is not a directory.
+        TypeError: Bad data type.
+    """
+    # INPUT VALIDATION
+    validate_path_dir(dir_path)
+    validate_type(recursive, 'recursive', bool)
+
+    # WALK IT
+    yield from [t_file for t_file in dir_path.iterdir() if t_file.is_file()]
+    if recursive:
+        for child_dir in [child_dir for child_dir in dir_path.iterdir() if child_dir.is_dir()]:
+            yield from walk_dir(dir_path=child_dir, recursive=recursive)
+
+
+# pylint: disable=too-many-branches
+# Just leave me be
+def _search_data(label: str, data: bytes, dw_list: List[str], encoding: str,
+                 case_sensitive: bool, engine: str, prefilter: bool = False,
+                 read_times: Optional[Tuple[float, float]] = None, text: bool = True,
+                 options: FrozenSet[str] = frozenset(),
+                 identity: Optional[Hashable] = None,
+                 deadline: Optional['Deadline'] = None) -> int:
+    """Run each search strategy against data until one finds a dirty word, then each extractor.
+
+    The strategies and extractors are the registered plugins that apply to data (see
+    lima_plugins.select_plugins()).  Emits findings (see lima_output).  Does not validate input.
+    With an encoding of ENCODING_AUTO, the strategies decode data, minus its byte order mark, with
+    the encoding detected from its first bytes.  The extractors get ENCODING_AUTO (e.g., to detect
+    it per member).
+
+    Args:
+        label: Name used to identify data in the findings (e.g., an absolute filename).
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to decode data, or ENCODING_AUTO.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
+        prefilter: Optional; Skip the strategies if the prefilter proves data clean.
+        read_times: Optional; perf_counter() before and after data was read.  If given, data and
+            the time each plugin took are recorded in lima_profile.PROFILE_STATS.
+        text: Optional; Try strategy 1.  False if data isn't lines of text (e.g., binary sections).
+        options: Optional; Search options that enable plugins (e.g., 'decompress').
+        identity: Optional; Caches the encoding detected for data (see lima_detect.get_encoding()).
+        deadline: Optional; Checked before each plugin runs (see lima_limits.time_limit()).
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        lima_limits.FileLimitError: deadline passed.
+    """
+    # LOCAL VARIABLES
+    found = 0       # 0 if no dirty words were found, 3 if dirty words were found
+    strategy = ''   # Title of the winning strategy for this input, None if prefiltered
+    candidate = True  # Did the prefilter let data through?
+    failures = []   # Titles of the strategies that failed to decode data
+    strategies, extractors = select_plugins(data, text, options)  # Plugins to run, in order
+    timed = read_times is not None  # Record each plugin in lima_profile.PROFILE_STATS?
+    # search() arguments shared by every strategy
+    plugin_kwargs = {'label': label, 'data': data, 'dw_list': dw_list, 'encoding': encoding,
+                     'case_sensitive': case_sensitive, 'engine': engine}
+
+    # DETECT IT
+    if encoding == ENCODING_AUTO:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_detect import get_encoding, strip_bom
+        plugin_kwargs['encoding'] = get_encoding(data, identity)
+        # Like the utf-16 codec does, instead of decoding it as U+FEFF on line 1
+        plugin_kwargs['data'] = strip_bom(data, plugin_kwargs['encoding'])
+
+    # PREFILTER IT
+    # The prefilter only proves data itself clean for the built-in strategies, not what another
+    # strategy decodes or an extractor finds inside it, and it can't rule out the lookalikes a
+    # normalized search finds
+    prefilter = prefilter and 'normalize' not in options
+    if prefilter and not get_prefilter(tuple(dw_list), plugin_kwargs['encoding'], case_sensitive,
+                                       engine).may_match(plugin_kwargs['data']):
+        candidate = False
+        strategy = None
+        strategies = [plugin for plugin in strategies if not plugin.prefilter_covered]
+
+    # SEARCH IT
+    # Strategies, cheapest first, until one finds a dirty word
+    for plugin in strategies:
+        if deadline:
+            deadline.check()
+        found = _run_plugin(plugin, plugin_kwargs, timed, failures)
+        if found:
+            strategy = plugin.title
+            break
     if strategy and VERBOSITY:
-        print(f'Dirty word detected using strategy {strategy}')
+        print(f'Dirty word detected using {strategy}')
+    if prefilter:
+        PREFILTER_STATS.record(candidate=candidate, found=found)
+    if read_times:
+        _record_profile(label, data, read_times, strategy, failures)
+    # Extractors, every one
+    plugin_kwargs.update(data=data, encoding=encoding)
+    for plugin in extractors:
+        if deadline:
+            deadline.check()
+        found = max(found, _run_plugin(plugin, plugin_kwargs, timed, failures))
+
+    # DONE
     return found
 
 
-def _search_bytes(file_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool) -> int:
-    """Compare a file's bytes to dw_list entries encoded as encoding.
+def _run_plugin(plugin: Plugin, plugin_kwargs: Dict[str, Any], timed: bool,
+                failures: List[str]) -> int:
+    """Run one plugin, recording it in failures if it can't decode the data.
 
-    Prints findings to stderr.  Does not validate input.
+    If timed, the plugin is recorded in lima_profile.PROFILE_STATS.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # LOCAL VARIABLES
+    found = 0                                   # 0 if no dirty words were found, 3 if found
+    started = time.perf_counter() if timed else 0.0  # Plugin starts
+
+    # RUN IT
+    try:
+        found = plugin.search(**plugin_kwargs)
+    except plugin.errors as err:
+        failures.append(plugin.title)
+        if VERBOSITY:
+            print(f'Unable to decode {plugin_kwargs["label"]} using '
+                  f'{plugin_kwargs["encoding"]}... {err}')
+    if timed:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_profile import PROFILE_STATS
+        PROFILE_STATS.record_plugin(plugin.title, time.perf_counter() - started, found)
+
+    # DONE
+    return found
+
+
+def _record_profile(label: str, data: bytes, read_times: Tuple[float, float],
+                    strategy: Optional[str], failures: List[str]) -> None:
+    """Record data in lima_profile.PROFILE_STATS.
+
+    A strategy of None means prefiltered, and an empty strategy means clean.
+    """
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_profile import PROFILE_STATS, STRATEGY_CLEAN, STRATEGY_PREFILTERED
+    if strategy is None:
+        strategy_name = STRATEGY_PREFILTERED
+    else:
+        strategy_name = strategy or STRATEGY_CLEAN
+    PROFILE_STATS.record(label=label, size=len(data), read_seconds=read_times[1] - read_times[0],
+                         search_seconds=time.perf_counter() - read_times[1],
+                         strategy=strategy_name, failures=failures)
+
+
+def _search_bytes(label: str, data: bytes, dw_list: List[str], encoding: str,
+                  case_sensitive: bool, engine: str) -> int:
+    """Compare raw bytes to dw_list entries encoded as encoding.
+
+    Emits findings (see lima_output).  Does not validate input.
 
     Args:
-        file_path: Path object to a file to search.
-        dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode file_path.
-        case_sensitive: Considers case when checking file_path contents for dirty words.
+        label: Name used to identify data in the findings.
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to encode dw_list.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
     """
     # LOCAL VARIABLES
     found = 0             # 0 if no dirty words were found, 3 if dirty words were found
-    file_contents = b''   # Byte content of file_path
+    file_contents = data  # Byte content to search
     # Local copy of dw_list contents as bytes objects
     local_list = [bytes(dw_entry, encoding=encoding) for dw_entry in dw_list]
 
-    # READ IT
-    file_contents = file_path.read_bytes()
-
     # PREPARE IT
     if not case_sensitive:
         local_list = [local_entry.lower() for local_entry in local_list]
-        file_contents = [file_entry.lower() for file_entry in file_contents]
+        file_contents = file_contents.lower()
 
     # SEARCH IT
-    for local_entry in local_list:
-        if local_entry in file_contents:
-            found = 3
-            print(f'{file_path.absolute()} : {str(local_entry)[1:]} found in binary file using '
-                  f'{encoding}', file=sys.stderr)
+    for index in get_matcher(local_list, engine).search(file_contents):
+        found = 3
+        emit_finding(f'{label} : {str(local_list[index])[1:]} found in binary file using '
+                     f'{encoding}')
+
+    # DONE
+    return found
+
+
+def _search_dir(dir_path: Path, recursive: bool, file_kwargs: Dict[str, Any],
+                checkpoint: Optional['Checkpoint'] = None, root_path: Optional[Path] = None) -> int:
+    """Search one directory, skipping the files and directories checkpoint already completed.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # LOCAL VARIABLES
+    target_files = []    # List of files found within dir_path to search for dirty words
+    child_dir_list = []  # List of children directories to dir_path
+    temp_found = 0       # Temporary return value storage
+    found = 0            # 0 if no dirty words were found, 3 if dirty words were found
+
+    # SEARCH IT
+    # dir_path
+    if checkpoint and checkpoint.is_dir_done(dir_path.relative_to(root_path).as_posix()):
+        return 0  # Its findings were already emitted from the checkpoint
+    target_files = [t_file for t_file in dir_path.iterdir() if t_file.is_file()]
+    for target_file in target_files:
+        temp_found = _search_target(target_file=target_file, file_kwargs=file_kwargs,
+                                    checkpoint=checkpoint, root_path=root_path)
+        if temp_found != 0:
+            found = temp_found
+    # Recurse?
+    if recursive:
+        child_dir_list = [child_dir for child_dir in dir_path.iterdir() if child_dir.is_dir()]
+        for child_dir in child_dir_list:
+            temp_found = _search_dir(dir_path=child_dir, recursive=recursive,
+                                     file_kwargs=file_kwargs, checkpoint=checkpoint,
+                                     root_path=root_path)
+            if temp_found != 0:
+                found = temp_found
+    if checkpoint:
+        checkpoint.dir_done(dir_path.relative_to(root_path).as_posix())
 
     # DONE
     return found
 
 
-def _search_file_bytes(file_path: Path, dw_list: List[str], encoding: str,
-                       case_sensitive: bool) -> int:
-    """Decode a file's bytes as encoding and search for dw_list entries.
+def _search_scheduled(dir_path: Path, recursive: bool, schedule: Optional[str],
+                      extension_weights: Optional[Dict[str, int]], time_budget: Optional[float],
+                      file_kwargs: Dict[str, Any],
+                      checkpoint: Optional['Checkpoint'] = None) -> int:
+    """List every file up front, then search them in schedule order until time_budget runs out.
 
-    Prints findings to stderr.  Does not validate input.
+    Directories are never marked done in checkpoint: a resumed search lists them again and skips
+    the files that were completed.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # LOCAL VARIABLES
+    temp_found = 0  # Temporary return value storage
+    found = 0       # 0 if no dirty words were found, 3 if dirty words were found
+    # Monotonic clock time after which no more files are started
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_schedule import SCHEDULE_STATS, get_schedule
+    files = get_schedule(dir_path=dir_path, recursive=recursive, schedule=schedule,
+                         extension_weights=extension_weights)  # (file, size), in search order
+
+    # SEARCH IT
+    for index, (target_file, _) in enumerate(files):
+        if deadline is not None and time.monotonic() >= deadline:
+            for unsearched_file, unsearched_size in files[index:]:
+                SCHEDULE_STATS.record(unsearched_file, unsearched_size)
+            break
+        temp_found = _search_target(target_file=target_file, file_kwargs=file_kwargs,
+                                    checkpoint=checkpoint, root_path=dir_path)
+        SCHEDULE_STATS.record()
+        if temp_found != 0:
+            found = temp_found
+
+    # DONE
+    return found
+
+
+def _search_target(target_file: Path, file_kwargs: Dict[str, Any],
+                   checkpoint: Optional['Checkpoint'] = None,
+                   root_path: Optional[Path] = None) -> int:
+    """Search one file, unless checkpoint already completed it, and record it in checkpoint.
+
+    A file that exceeds a limit is recorded in lima_limits.LIMIT_STATS.  What it found before then
+    is still reported, and a resumed search does not try it again.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # LOCAL VARIABLES
+    found = 0     # 0 if no dirty words were found, 3 if dirty words were found
+    rel_path = ''  # Path relative to root_path, as recorded in the checkpoint
+
+    # SEARCH IT
+    if checkpoint:
+        rel_path = target_file.relative_to(root_path).as_posix()
+        if checkpoint.is_file_done(rel_path):
+            return found  # Its findings were already emitted from the checkpoint
+    if file_kwargs['timeout'] is None and file_kwargs['max_file_size'] is None:
+        if not checkpoint:
+            return search_file(file_path=target_file, **file_kwargs)
+        with capture_findings() as findings:
+            found = search_file(file_path=target_file, **file_kwargs)
+    else:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_limits import LIMIT_STATS, FileLimitError
+        with capture_findings() as findings:
+            try:
+                found = search_file(file_path=target_file, **file_kwargs)
+            except FileLimitError as err:
+                LIMIT_STATS.record(target_file, err)
+                found = 3 if findings else 0
+    for finding in findings:
+        emit_finding(finding)
+    if checkpoint:
+        checkpoint.file_done(rel_path, found, findings)
+
+    # DONE
+    return found
+
+
+def _search_file_bytes(label: str, data: bytes, dw_list: List[str], encoding: str,
+                       case_sensitive: bool, engine: str) -> int:
+    """Decode raw bytes as encoding and search for dw_list entries.
+
+    Emits findings (see lima_output).  Does not validate input.
 
     Args:
-        file_path: Path object to a file to search.
-        dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode file_path.
-        case_sensitive: Considers case when checking file_path contents for dirty words.
+        label: Name used to identify data in the findings.
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to decode data.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
     """
     # LOCAL VARIABLES
     found = 0             # 0 if no dirty words were found, 3 if dirty words were found
-    file_contents = b''   # Byte content of file_path
+    file_contents = ''    # Decoded content of data
     local_list = dw_list  # Local copy of dw_list contents
 
-    # READ IT
-    file_contents = file_path.read_bytes().decode(encoding=encoding)
+    # DECODE IT
+    file_contents = data.decode(encoding=encoding)
 
     # PREPARE IT
     if not case_sensitive:
         local_list = [dw_entry.lower() for dw_entry in dw_list]
-        file_contents = [file_entry.lower() for file_entry in file_contents]
+        file_contents = file_contents.lower()
 
     # SEARCH IT
-    for dw_entry in local_list:
-        if dw_entry in file_contents:
-            found = 3
-            print(f'{file_path.absolute()} : {dw_entry} found in binary file using '
-                  f'{encoding}', file=sys.stderr)
+    for index in get_matcher(local_list, engine).search(file_contents):
+        found = 3
+        emit_finding(f'{label} : {local_list[index]} found in binary file using '
+                     f'{encoding}')
 
     # DONE
     return found
 
 
-def _search_file_text(file_path: Path, dw_list: List[str], encoding: str,
-                      case_sensitive: bool) -> int:
-    """Search a file for dw_list entries using the encoding format.
+def _search_file_text(label: str, data: bytes, dw_list: List[str], encoding: str,
+                      case_sensitive: bool, engine: str) -> int:
+    """Search raw bytes, decoded as newline-delimited text, for dw_list entries.
 
-    Prints findings to stderr.  Call _search_file_bytes() if this function raises a
+    Emits findings (see lima_output).  Call _search_file_bytes() if this function raises a
     RuntimeError except from the resulting UnicodeDecodeError.  Does not validate input.
 
     Args:
-        file_path: Path object to a file to search.
-        dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode file_path.
-        case_sensitive: Considers case when checking file_path contents for dirty words.
+        label: Name used to identify data in the findings.
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to decode data.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
 
     Raises:
         RuntimeError: UnicodeDecodeError exception wrapped up nice and neat.  Likely, the encoding
-            codec can't decode file_path's contents.
+            codec can't decode data.
     """
     # LOCAL VARIABLES
     found = 0             # 0 if no dirty words were found, 3 if dirty words were found
-    file_contents = ''    # Contents of file_path
+    file_contents = ''    # Decoded content of data
     local_list = dw_list  # Local copy of dw_list contents
-    # Template Exception message
-    template_err = '{} {} ' + f'while decoding {file_path.absolute()} using {encoding}'
+    matcher = None        # Matcher for local_list
 
-    # READ IT
-    try:
-        file_contents = file_path.read_text(encoding=encoding).split('\n')
-    except UnicodeDecodeError as err:
-        raise RuntimeError(template_err.format('UnicodeDecodeError', str(err))) from err
-    except UnicodeError as err:
-        raise RuntimeError(template_err.format('UnicodeError', str(err))) from err
-    else:
-        # PREPARE IT
-        if not case_sensitive:
-            local_list = [dw_entry.lower() for dw_entry in dw_list]
-            file_contents = [file_entry.lower() for file_entry in file_contents]
-        # SEARCH IT
-        for line_num, file_entry in enumerate(file_contents):
-            for dw_entry in local_list:
-                if dw_entry in file_entry:
-                    found = 3
-                    print(f'{file_path.absolute()} : line {line_num + 1} : "{dw_entry}" '
-                          f'found in "{file_entry}"', file=sys.stderr)
+    # DECODE IT
+    file_contents = _decode_file_text(label=label, data=data, encoding=encoding)
+
+    # PREPARE IT
+    if not case_sensitive:
+        local_list = [dw_entry.lower() for dw_entry in dw_list]
+        file_contents = file_contents.lower()
+    matcher = get_matcher(local_list, engine)
+
+    # SEARCH IT
+    # One pass over the whole file rules out clean files before the line-by-line pass
+    if matcher.search(file_contents):
+        for line_num, file_entry in enumerate(file_contents.split('\n')):
+            for index in matcher.search(file_entry):
+                found = 3
+                emit_finding(f'{label} : line {line_num + 1} : "{local_list[index]}" '
+                             f'found in "{file_entry}"')
 
     # DONE
     return found
 
 
-def _search_null(file_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool) -> int:
-    """Compare a file's bytes, with \x00 values removed, to dw_list entries encoded as encoding.
+def _search_file_normalized(label: str, data: bytes, dw_list: List[str], encoding: str,
+                            case_sensitive: bool, engine: str) -> int:
+    """Strategy 1, after folding the decoded text and dw_list entries with lima_normalize.fold().
+
+    Findings quote the original line and, if it isn't the dirty word itself, the original text
+    of the match.  Entries that fold to nothing (e.g., only invisible characters) are skipped.
+    Does not validate input.
+
+    Args:
+        label: Name used to identify data in the findings.
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to decode data.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        RuntimeError: data can't be decoded.  See _search_file_text().
+    """
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_normalize import fold, get_span
+
+    # LOCAL VARIABLES
+    found = 0             # 0 if no dirty words were found, 3 if dirty words were found
+    file_contents = ''    # Decoded content of data
+    folded = ''           # file_contents, folded
+    local_list = dw_list if case_sensitive else [dw_entry.lower() for dw_entry in dw_list]
+    needles = []          # Folded local_list entries that didn't fold to nothing
+    indices = []          # Index into local_list of each needle
+    matcher = None        # Matcher for needles
+
+    # DECODE IT
+    file_contents = _decode_file_text(label=label, data=data, encoding=encoding)
+
+    # PREPARE IT
+    folded = fold(file_contents) if case_sensitive else fold(file_contents).lower()
+    for index, dw_entry in enumerate(dw_list):
+        needle = fold(dw_entry) if case_sensitive else fold(dw_entry).lower()
+        if needle:
+            needles.append(needle)
+            indices.append(index)
+    if not needles:
+        return found
+    matcher = get_matcher(needles, engine)
+
+    # SEARCH IT
+    # Folding never adds or removes a newline, so folded lines are the original lines folded
+    if matcher.search(folded):
+        for line_num, (file_entry, folded_entry) in enumerate(zip(file_contents.split('\n'),
+                                                                  folded.split('\n'))):
+            for needle_index in matcher.search(folded_entry):
+                found = 3
+                start = folded_entry.find(needles[needle_index])
+                start, end = get_span(file_entry, start, start + len(needles[needle_index]),
+                                      case_sensitive)
+                dw_entry = local_list[indices[needle_index]]
+                original = file_entry[start:end]  # The match, as it appears in the file
+                matched = original if case_sensitive else original.lower()
+                suffix = '' if matched == dw_entry else f' as "{original}"'
+                emit_finding(f'{label} : line {line_num + 1} : "{dw_entry}" found in '
+                             f'"{file_entry}"{suffix}')
+
+    # DONE
+    return found
+
+
+# pylint: disable=unused-argument
+def _search_extracted(label: str, data: bytes, dw_list: List[str], encoding: str,
+                      case_sensitive: bool, engine: str) -> int:
+    """Extractor: search the text of each part of a document, if data is one, line by line.
+
+    The text is searched whatever the encoding.  Does not validate input.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_extract import extract_parts, get_part_label
+
+    # LOCAL VARIABLES
+    found = 0  # 0 if no dirty words were found, 3 if dirty words were found
+    text_list = dw_list if case_sensitive else [dw_entry.lower() for dw_entry in dw_list]
+
+    # SEARCH IT
+    for part_name, lines in extract_parts(data, label):
+        line_search = _LineSearch(label=get_part_label(label, part_name), dw_list=text_list,
+                                  engine=engine)
+        for line in lines:
+            line_search.feed((line if case_sensitive else line.lower()) + '\n')
+        found = max(found, line_search.found)
+
+    # DONE
+    return found
+
+
+def _search_members(label: str, data: bytes, dw_list: List[str], encoding: str,
+                    case_sensitive: bool, engine: str) -> int:
+    """Extractor: stream each decompressed member of data through search_stream().
+
+    Does not validate input.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_decompress import get_member_label, open_members
+
+    # LOCAL VARIABLES
+    found = 0  # 0 if no dirty words were found, 3 if dirty words were found
+
+    # SEARCH IT
+    with io.BytesIO(data) as in_file:
+        for name, stream in open_members(in_file, label):
+            found = max(found, search_stream(stream, dw_list, encoding, case_sensitive, engine,
+                                             label=get_member_label(label, name)))
+
+    # DONE
+    return found
+
+
+def _search_null(label: str, data: bytes, dw_list: List[str], encoding: str,
+                 case_sensitive: bool, engine: str) -> int:
+    """Compare raw bytes, with \x00 values removed, to dw_list entries encoded as encoding.
 
     Some file types are encoded such that readable bytes are separated by \x00 values.  This
     strategy strips all \x00 bytes and searches the stripped bytes for encoded dirty words.
     This strategy was implemented for formats such as .NET assembly and 7z archives.
-    Prints findings to stderr.  Does not validate input.
+    Emits findings (see lima_output).  Does not validate input.
 
     Args:
-        file_path: Path object to a file to search.
-        dw_list: A list of non-empty strings to search file_path for.
-        encoding: Format with which to decode file_path.
-        case_sensitive: Considers case when checking file_path contents for dirty words.
+        label: Name used to identify data in the findings.
+        data: Raw contents to search.
+        dw_list: A list of non-empty strings to search data for.
+        encoding: Format with which to encode dw_list.
+        case_sensitive: Considers case when checking data for dirty words.
+        engine: Matching engine to use.
 
     Returns:
         0 if no dirty words were found, 3 if dirty words were found.
     """
     # LOCAL VARIABLES
     found = 0             # 0 if no dirty words were found, 3 if dirty words were found
-    file_contents = b''   # Byte content of file_path
+    file_contents = b''   # Byte content of data, minus null bytes
     # Local copy of dw_list contents as bytes objects
     local_list = [bytes(dw_entry, encoding=encoding) for dw_entry in dw_list]
 
-    # READ IT
-    file_contents = file_path.read_bytes().replace(b'\x00', b'')
+    # STRIP IT
+    file_contents = strip_nulls(data, case_sensitive)  # One pass strips and folds case
 
     # PREPARE IT
     if not case_sensitive:
         local_list = [local_entry.lower() for local_entry in local_list]
-        file_contents = [file_entry.lower() for file_entry in file_contents]
 
     # SEARCH IT
-    for local_entry in local_list:
-        if local_entry in file_contents:
-            found = 3
-            print(f'{file_path.absolute()} : {str(local_entry)[1:]} found in binary file using '
-                  f'{encoding}', file=sys.stderr)
+    for index in get_matcher(local_list, engine).search(file_contents):
+        found = 3
+        emit_finding(f'{label} : {str(local_list[index])[1:]} found in binary file using '
+                     f'{encoding}')
 
     # DONE
     return found
+
+
+def _get_decompress_signatures() -> Tuple[bytes, ...]:
+    """Leading bytes of the files lima_decompress decodes."""
+    # pylint: disable=import-outside-toplevel
+    from lima.lima_decompress import MAGIC_NUMBERS
+    return tuple(magic for magic, _ in MAGIC_NUMBERS)
+
+
+def _get_options(decompress: bool = False, extract: bool = False,
+                 normalize: bool = False) -> FrozenSet[str]:
+    """Names of the search options that are enabled, for lima_plugins.select_plugins()."""
+    return frozenset(name for name, enabled in (('decompress', decompress), ('extract', extract),
+                                                ('normalize', normalize)) if enabled)
+
+
+def _decode_file_text(label: str, data: bytes, encoding: str) -> str:
+    """Decode data for strategy 1, see _decode_text().
+
+    Raises:
+        RuntimeError: UnicodeDecodeError exception wrapped up nice and neat.  Likely, the encoding
+            codec can't decode data.
+    """
+    # Template Exception message
+    template_err = '{} {} ' + f'while decoding {label} using {encoding}'
+
+    try:
+        return _decode_text(data=data, encoding=encoding)
+    except UnicodeDecodeError as err:
+        raise RuntimeError(template_err.format('UnicodeDecodeError', str(err))) from err
+    except UnicodeError as err:
+        raise RuntimeError(template_err.format('UnicodeError', str(err))) from err
+
+
+def _decode_text(data: bytes, encoding: str) -> str:
+    """Decode data exactly like Path.read_text() would.
+
+    Text mode uses the codec's incremental decoder (e.g., the utf-16 stream decoder insists on
+    a BOM) and translates \r\n and \r into \n (universal newlines mode).
+
+    Raises:
+        LookupError: Unknown encoding.
+        UnicodeError: data can not be decoded using encoding.
+    """
+    text = codecs.getincrementaldecoder(encoding)().decode(data, final=True)
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _get_bytes_decoder(encoding: str) -> codecs.IncrementalDecoder:
+    """Get an incremental decoder that decodes exactly like bytes.decode() would.
+
+    Raises:
+        LookupError: Unknown encoding.
+    """
+    codec_name = codecs.lookup(encoding).name  # Normalized name
+    if codec_name in ('utf-16', 'utf-32'):
+        return _NativeOrderDecoder(codec_name)
+    return codecs.getincrementaldecoder(encoding)()
+
+
+# pylint: disable=too-many-arguments
+def _feed_decoder(decoder: io.IncrementalNewlineDecoder, line_search: _LineSearch, chunk: bytes,
+                  case_sensitive: bool, label: str,
+                  encoding: str) -> Optional[io.IncrementalNewlineDecoder]:
+    """Decode the next chunk of a stream for strategy 1.  An empty chunk flushes the decoder.
+
+    Returns:
+        decoder, or None if chunk can not be decoded.
+    """
+    try:
+        text = decoder.decode(chunk, final=not chunk)
+        line_search.feed(text if case_sensitive else text.lower())
+        if not chunk:
+            line_search.close()
+    except UnicodeError as err:
+        if VERBOSITY:
+            print(f'Unable to decode {label} using {encoding}... {err}')
+        return None
+    return decoder
+
+
+def validate_search_args(dw_list: List[str], encoding: str, case_sensitive: bool,
+                          engine: str) -> None:
+    """Validate the arguments shared by every search function.
+
+    Raises:
+        NotImplementedError: Unsupported or unavailable engine.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string).
+    """
+    validate_type(dw_list, 'dw_list', list)
+    if not dw_list:
+        raise ValueError('Dirty word list may not be empty')
+    for dw_entry in dw_list:
+        validate_string(dw_entry, 'dw_list entry')
+    validate_string(encoding, 'encoding')
+    validate_type(case_sensitive, 'case_sensitive', bool)
+    validate_engine(engine)
+
+
+# The built-in plugins.  The strategies keep their historic numbers as titles.
+register_plugin(Plugin(name='text', kind=KIND_STRATEGY, search=_search_file_text, cost=10,
+                       errors=(RuntimeError, UnicodeDecodeError), text=True, title='strategy 1',
+                       unless='normalize', prefilter_covered=True))
+# Stands in for strategy 1, finding every dirty word it would, and their lookalikes
+register_plugin(Plugin(name='normalized', kind=KIND_STRATEGY, search=_search_file_normalized,
+                       cost=10, errors=(RuntimeError, UnicodeDecodeError), text=True,
+                       option='normalize', title='strategy 1 (normalized)'))
+register_plugin(Plugin(name='decoded', kind=KIND_STRATEGY, search=_search_file_bytes, cost=20,
+                       errors=(UnicodeError,), title='strategy 2', prefilter_covered=True))
+register_plugin(Plugin(name='bytes', kind=KIND_STRATEGY, search=_search_bytes, cost=30,
+                       errors=(UnicodeError,), title='strategy 3', prefilter_covered=True))
+register_plugin(Plugin(name='null', kind=KIND_STRATEGY, search=_search_null, cost=40,
+                       errors=(UnicodeError,), title='strategy 4', prefilter_covered=True))
+register_plugin(Plugin(name='decompress', kind=KIND_EXTRACTOR, search=_search_members,
+                       signatures=_get_decompress_signatures, cost=200, option='decompress'))
+# extract_parts() matches the magic of every extractor lima_extract.register_extractor() added
+register_plugin(Plugin(name='extract', kind=KIND_EXTRACTOR, search=_search_extracted, cost=300,
+                       option='extract'))
@@ -0,0 +1,272 @@
+"""LIVING MANUAL (LIMA) section-aware string extraction from ELF and PE binaries.
+
+Most of a large executable is machine code that can never hold a meaningful string, yet every
+search strategy scans all of it.  get_string_data() parses ELF and PE headers with a minimal
+built-in parser and keeps only the string-bearing sections: .rodata and .data (ELF), .rdata,
+.data and .rsrc (PE), and the #Strings (UTF-8) and #US (UTF-16) heaps of a .NET assembly's
+metadata.  The binary search strategies (2 through 4) then run on those bytes, in file order,
+with the search's own encoding.  Strategy 1 is skipped: sections aren't lines of text, and a whole
+binary never decodes as text anyway.  Each section starts at the same file offset alignment it
+had in the file, so UTF-16 text decodes exactly as it did before.  Anything that isn't a
+well-formed ELF or PE file is searched whole, as usual.
+
+    Typical usage example:
+
+    from lima.lima_sections import SECTION_STATS, get_string_data
+
+    string_data = get_string_data(read_file(file_path))
+    ...  # Search string_data, unless it is None
+    print(SECTION_STATS.summary())
+"""
+
+# Standard Imports
+from threading import Lock
+from typing import List, Optional, Tuple
+import struct
+# Third Party Imports
+# Local Imports
+
+
+ELF_MAGIC = b'\x7fELF'
+PE_MAGIC = b'MZ'
+# Sections, and prefixes of sections (e.g., .rodata.str1.1), that hold strings
+ELF_STRING_SECTIONS = ('.rodata', '.data')
+PE_STRING_SECTIONS = ('.rdata', '.data', '.rsrc')
+NET_STRING_HEAPS = (b'#Strings', b'#US')  # .NET metadata heaps that hold strings
+ELF_SHT_NOBITS = 8         # Section type that occupies no file space (e.g., .bss)
+PE_COM_DESCRIPTOR = 14     # Index of the CLR runtime header in the PE data directories
+NET_METADATA_MAGIC = 0x424A5342  # 'BSJB'
+ALIGNMENT = 4  # Bytes: sections keep their file offset modulo this, for UTF-16 and UTF-32
+SECTION_SEPARATOR = b'\x00' * ALIGNMENT  # Keeps sections apart, and aligned
+
+
+class SectionStats():
+    """Thread-safe count of the bytes section-aware extraction kept."""
+
+    def __init__(self) -> None:
+        """SectionStats ctor."""
+        self._lock = Lock()
+        self.binaries = 0      # ELF and PE files parsed
+        self.unparsed = 0      # Buffers searched whole
+        self.total_bytes = 0   # Size of the binaries
+        self.kept_bytes = 0    # Bytes of the binaries' string-bearing sections
+
+    def record(self, total: int, kept: Optional[int]) -> None:
+        """Count one buffer of total bytes, kept of which were searched.  None: searched whole."""
+        with self._lock:
+            if kept is None:
+                self.unparsed += 1
+            else:
+                self.binaries += 1
+                self.total_bytes += total
+                self.kept_bytes += kept
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self.binaries = self.unparsed = self.total_bytes = self.kept_bytes = 0
+
+    def summary(self) -> str:
+        """Describe the counters in one line."""
+        with self._lock:
+            rate = 100 * self.kept_bytes / self.total_bytes if self.total_bytes else 0.0
+            return (f'Sections: {self.binaries} binaries, {self.kept_bytes} of '
+                    f'{self.total_bytes} bytes searched ({rate:.1f}%), {self.unparsed} other '
+                    'files searched whole')
+
+
+SECTION_STATS = SectionStats()  # Updated by every section-aware search in this process
+
+
+def get_string_data(data: bytes) -> Optional[bytes]:
+    """Keep only the string-bearing sections of an ELF or PE binary.
+
+    Does not validate input.
+
+    Args:
+        data: Contents of a file.
+
+    Returns:
+        The sections, in file order, or None if data isn't a well-formed ELF or PE file.
+    """
+    # LOCAL VARIABLES
+    regions = get_string_regions(data)  # (start, end) file offsets of the sections to keep
+    parts = []                          # Bytes to keep
+
+    # EXTRACT IT
+    if regions is None:
+        SECTION_STATS.record(len(data), None)
+        return None
+    view = memoryview(data)
+    for start, end in regions:
+        parts.append(view[start:end])
+    SECTION_STATS.record(len(data), sum(end - start for start, end in regions))
+
+    # DONE
+    return SECTION_SEPARATOR.join(parts)
+
+
+def get_string_regions(data: bytes) -> Optional[List[Tuple[int, int]]]:
+    """File offsets of the string-bearing sections of an ELF or PE binary.
+
+    Args:
+        data: Contents of a file.
+
+    Returns:
+        Sorted (start, end) file offsets, starts and lengths aligned to ALIGNMENT bytes (except
+        at the end of data), or None if data isn't a well-formed ELF or PE file.
+    """
+    # LOCAL VARIABLES
+    regions = None  # Return value
+
+    # PARSE IT
+    try:
+        if data[:4] == ELF_MAGIC:
+            regions = _get_elf_regions(data)
+        elif data[:2] == PE_MAGIC:
+            regions = _get_pe_regions(data)
+    except (IndexError, struct.error, UnicodeDecodeError, ValueError):
+        regions = None  # Truncated or malformed: search it whole
+
+    # DONE
+    if regions is None:
+        return None
+    return _merge_regions(regions, len(data))
+
+
+def _get_elf_regions(data: bytes) -> Optional[List[Tuple[int, int]]]:
+    """(start, end) file offsets of the ELF string sections."""
+    # LOCAL VARIABLES
+    regions = []                       # Return value
+    is_64 = data[4] == 2               # EI_CLASS: 1 is 32-bit, 2 is 64-bit
+    order = '<' if data[5] == 1 else '>'  # EI_DATA: 1 is little-endian, 2 is big-endian
+
+    # READ THE HEADER
+    if data[4] not in (1, 2) or data[5] not in (1, 2):
+        return None
+    if is_64:
+        shoff, = struct.unpack_from(order + 'Q', data, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(order + 'HHH', data, 0x3A)
+        section_format = order + 'IIQQQQ'  # name, type, flags, addr, offset, size
+    else:
+        shoff, = struct.unpack_from(order + 'I', data, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(order + 'HHH', data, 0x2E)
+        section_format = order + 'IIIIII'
+    if not shoff or not shnum or shstrndx >= shnum:
+        return None
+    sections = [struct.unpack_from(section_format, data, shoff + index * shentsize)
+                for index in range(shnum)]
+
+    # FIND THE STRING SECTIONS
+    names_offset = sections[shstrndx][4]  # Section header string table
+    for name_index, section_type, _, _, offset, size in sections:
+        name = _read_c_string(data, names_offset + name_index)
+        if section_type != ELF_SHT_NOBITS and _is_string_section(name, ELF_STRING_SECTIONS):
+            regions.append((offset, offset + size))
+
+    # DONE
+    return regions
+
+
+def _get_pe_regions(data: bytes) -> Optional[List[Tuple[int, int]]]:
+    """(start, end) file offsets of the PE string sections and .NET string heaps."""
+    # LOCAL VARIABLES
+    regions = []  # Return value
+    pe_offset, = struct.unpack_from('<I', data, 0x3C)
+
+    # READ THE HEADERS
+    if data[pe_offset:pe_offset + 4] != b'PE\x00\x00':
+        return None
+    num_sections, = struct.unpack_from('<H', data, pe_offset + 6)
+    optional_size, = struct.unpack_from('<H', data, pe_offset + 20)
+    optional_offset = pe_offset + 24
+    magic, = struct.unpack_from('<H', data, optional_offset)
+    if magic not in (0x10B, 0x20B):  # PE32, PE32+
+        return None
+    # Data directories follow the 96 (PE32) or 112 (PE32+) byte standard and Windows fields
+    directories_offset = optional_offset + (96 if magic == 0x10B else 112)
+    num_directories, = struct.unpack_from('<I', data, directories_offset - 4)
+    sections = []  # (name, virtual address, virtual size, raw offset, raw size)
+    for index in range(num_sections):
+        entry = optional_offset + optional_size + index * 40
+        name = data[entry:entry + 8].rstrip(b'\x00').decode('ascii', 'replace')
+        virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from(
+            '<IIII', data, entry + 8)
+        sections.append((name, virtual_address, virtual_size, raw_offset, raw_size))
+
+    # FIND THE STRING SECTIONS
+    for name, _, _, raw_offset, raw_size in sections:
+        if _is_string_section(name, PE_STRING_SECTIONS):
+            regions.append((raw_offset, raw_offset + raw_size))
+    # .NET metadata heaps usually live in .text, with the code
+    if num_directories > PE_COM_DESCRIPTOR:
+        clr_rva, clr_size = struct.unpack_from('<II', data, directories_offset
+                                               + PE_COM_DESCRIPTOR * 8)
+        if clr_rva and clr_size:
+            regions.extend(_get_net_regions(data, sections, _rva_to_offset(sections, clr_rva)))
+
+    # DONE
+    return regions
+
+
+def _get_net_regions(data: bytes, sections: List[Tuple[str, int, int, int, int]],
+                     clr_offset: int) -> List[Tuple[int, int]]:
+    """(start, end) file offsets of a .NET assembly's string heaps."""
+    # LOCAL VARIABLES
+    regions = []  # Return value
+    metadata_rva, = struct.unpack_from('<I', data, clr_offset + 8)
+    metadata_offset = _rva_to_offset(sections, metadata_rva)
+
+    # READ THE METADATA ROOT
+    if struct.unpack_from('<I', data, metadata_offset)[0] != NET_METADATA_MAGIC:
+        raise ValueError('Bad .NET metadata signature')
+    version_length, = struct.unpack_from('<I', data, metadata_offset + 12)
+    header = metadata_offset + 16 + version_length  # Flags, then the number of streams
+    num_streams, = struct.unpack_from('<H', data, header + 2)
+    header += 4
+    for _ in range(num_streams):
+        offset, size = struct.unpack_from('<II', data, header)
+        name_end = data.index(b'\x00', header + 8)
+        name = data[header + 8:name_end]
+        header = (name_end + 4) & ~3  # Names are null-terminated, padded to 4 bytes
+        if name in NET_STRING_HEAPS:
+            regions.append((metadata_offset + offset, metadata_offset + offset + size))
+
+    # DONE
+    return regions
+
+
+def _is_string_section(name: str, string_sections: Tuple[str, ...]) -> bool:
+    """Is name one of string_sections, or a subsection (e.g., .rodata.str1.1) of one?"""
+    return any(name == section or name.startswith(section + '.') for section in string_sections)
+
+
+def _merge_regions(regions: List[Tuple[int, int]], size: int) -> List[Tuple[int, int]]:
+    """Align regions to ALIGNMENT and clip them to size, then merge the ones that overlap or touch.
+
+    Joined by SECTION_SEPARATOR, aligned regions decode exactly as they did in the file.
+    """
+    merged = []  # Return value
+    for start, end in sorted(regions):
+        start = max(0, start - start % ALIGNMENT)
+        end = min(end + -end % ALIGNMENT, size)
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _read_c_string(data: bytes, offset: int) -> str:
+    """Read the null-terminated ASCII string at offset."""
+    return data[offset:data.index(b'\x00', offset)].decode('ascii')
+
+
+def _rva_to_offset(sections: List[Tuple[str, int, int, int, int]], rva: int) -> int:
+    """File offset of a PE relative virtual address."""
+    for _, virtual_address, virtual_size, raw_offset, raw_size in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return raw_offset + rva - virtual_address
+    raise ValueError(f'RVA {rva:#x} is outside every section')
@@ -0,0 +1,302 @@
+"""LIVING MANUAL (LIMA) scan server.
+
+`lima serve` loads the dirty word list once, listens on a Unix domain socket, and searches
+batches of paths or raw byte payloads on a pool of worker processes.  See lima_client for the
+protocol and the thin client used by `lima file` and `lima dir`.
+
+The server, and each worker, reloads the dirty word list whenever the --words file changes (see
+lima_words): the server before it checks each request, the workers before each item.  Requests
+are checked against the reloaded word list, and items already being searched finish with the
+dirty words they started with.
+
+    Typical usage example:
+
+    from lima.lima_server import serve
+
+    serve(socket_path=DEFAULT_SOCKET, words_path=Path('words.txt'), encoding='utf-8')
+"""
+
+# Standard Imports
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import base64
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+# Third Party Imports
+# Local Imports
+from lima.lima_client import (PROTOCOL_VERSION, RESP_DONE, RESP_ERROR, RESP_REJECTED,
+                              RESP_RESULT)
+from lima.lima_defaults import DEFAULT_SOCKET_DIR, DEFAULT_WORKERS
+from lima.lima_engine import ENGINE_AUTO, validate_engine
+from lima.lima_output import capture_findings
+from lima.lima_search import search_data, search_file, walk_dir
+from lima.lima_validation import validate_string, validate_type
+from lima.lima_words import WordList, describe_removed, reload_word_list
+
+
+WINDOW_PER_WORKER = 4   # In-flight items per worker, per connection
+ACCEPT_TIMEOUT = 0.5    # Seconds between checks of the stop_event
+# Settings added to the protocol after version 1, and the value older clients imply
+IMPLIED_SETTINGS = {'extract': False, 'plugins': False, 'subsume': False}
+
+_WORKER_SETTINGS: Dict[str, Any] = {}  # Search arguments, set once per worker process
+_WORKER_WORDS: Dict[str, WordList] = {}  # 'words' -> the worker process' WordList
+
+
+# pylint: disable=too-many-arguments
+def serve(socket_path: Path, words_path: Path, encoding: str, case_sensitive: bool = True,
+          engine: str = ENGINE_AUTO, workers: int = DEFAULT_WORKERS,
+          stop_event: Optional[Event] = None, extract: bool = False,
+          plugins: bool = False, subsume: bool = False) -> int:
+    """Search requests received on a Unix domain socket until interrupted.
+
+    With extract, the workers also extract and search the text of Office documents and PDFs.
+    Each worker caches what it extracted (see lima_extract), so a document sent again isn't
+    extracted again by that worker.  With plugins, the installed plugins are loaded up front, to
+    report the ones that don't load, and again by each worker (see lima_plugins).
+
+    Args:
+        socket_path: Path to create the Unix domain socket at.  Only its owner may connect.  In
+            DEFAULT_SOCKET_DIR, the directory is created if it's missing.
+        words_path: Path object to the --words file.
+        encoding: Format with which to decode searched content.
+        case_sensitive: Optional; Considers case when checking content for dirty words.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        workers: Optional; Number of worker processes.
+        stop_event: Optional; Stop serving once this Event is set.
+        extract: Optional; Also search the text of Office documents and PDFs.
+        plugins: Optional; Also run the installed plugins.
+        subsume: Optional; Drop dirty words that contain a shorter dirty word.
+
+    Returns:
+        0 once the server stops.
+
+    Raises:
+        FileNotFoundError: words_path is unavailable.
+        NotImplementedError: Unsupported or unavailable engine.
+        OSError: words_path is not a file, another server already owns socket_path, or
+            DEFAULT_SOCKET_DIR isn't a directory only this user may enter.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string, workers less than 1).
+    """
+    # LOCAL VARIABLES
+    word_list = None    # Dirty words, reloaded when words_path changes
+    settings = {}       # Search arguments every request must agree with
+    server_sock = None  # Listening socket
+    stop_event = stop_event if stop_event else Event()
+
+    # INPUT VALIDATION
+    validate_type(socket_path, 'socket_path', Path)
+    validate_string(encoding, 'encoding')
+    validate_type(case_sensitive, 'case_sensitive', bool)
+    validate_engine(engine)
+    validate_type(workers, 'workers', int)
+    if workers < 1:
+        raise ValueError('workers must be at least 1')
+    validate_type(stop_event, 'stop_event', Event)
+    validate_type(extract, 'extract', bool)
+    validate_type(plugins, 'plugins', bool)
+
+    # LOAD IT
+    word_list = WordList(words_path, case_sensitive=case_sensitive, subsume=subsume,
+                         encoding=encoding)
+    settings = {'words_digest': word_list.digest, 'encoding': encoding,
+                'case_sensitive': case_sensitive, 'engine': engine, 'extract': extract,
+                'plugins': plugins, 'subsume': subsume}
+    if word_list.removed:
+        print(f'Dropped dirty word entries: {describe_removed(word_list.removed)}',
+              file=sys.stderr)
+    if plugins:
+        # pylint: disable=import-outside-toplevel
+        from lima.lima_plugins import LOAD_FAILURES, load_plugins
+        load_plugins()
+        for record in LOAD_FAILURES:
+            print(f'Plugin not loaded: {record["path"]} ({record["detail"]})', file=sys.stderr)
+
+    # SERVE IT
+    server_sock = _bind(socket_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(words_path, encoding, case_sensitive, engine,
+                                           extract, plugins, subsume)) as executor:
+            print(f'Serving {len(word_list.words)} dirty words on {socket_path}',
+                  file=sys.stderr)
+            while not stop_event.is_set():
+                try:
+                    conn, _ = server_sock.accept()
+                except socket.timeout:
+                    continue
+                except KeyboardInterrupt:
+                    break
+                Thread(target=_handle_client, daemon=True,
+                       args=(conn, executor, settings, workers * WINDOW_PER_WORKER,
+                             word_list)).start()
+    except KeyboardInterrupt:
+        pass  # Time to stop
+    finally:
+        server_sock.close()
+        socket_path.unlink(missing_ok=True)
+
+    # DONE
+    return 0
+
+
+def _bind(socket_path: Path) -> socket.socket:
+    """Create the listening socket, replacing a stale socket file.
+
+    Raises:
+        OSError: Another server is already listening on socket_path, or DEFAULT_SOCKET_DIR isn't
+            a directory only this user may enter.
+    """
+    if socket_path.parent == DEFAULT_SOCKET_DIR:
+        _make_socket_dir(socket_path.parent)
+    if socket_path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(socket_path))
+        except ConnectionError:
+            socket_path.unlink()  # Stale
+        else:
+            raise OSError(f'A LIMA server is already listening on {socket_path}')
+    server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server_sock.bind(str(socket_path))
+    os.chmod(socket_path, stat.S_IRUSR | stat.S_IWUSR)  # Clients refuse a socket others can use
+    server_sock.listen()
+    server_sock.settimeout(ACCEPT_TIMEOUT)
+    return server_sock
+
+
+def _make_socket_dir(dir_path: Path) -> None:
+    """Create dir_path, if it's missing, for this user only, and check no one else made it.
+
+    Raises:
+        OSError: dir_path isn't a directory only this user may enter.
+    """
+    dir_path.mkdir(mode=stat.S_IRWXU, exist_ok=True)
+    stat_result = os.lstat(dir_path)  # Not a symlink's target
+    if not stat.S_ISDIR(stat_result.st_mode) \
+            or (hasattr(os, 'getuid') and stat_result.st_uid != os.getuid()) \
+            or stat_result.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise OSError(f'{dir_path} must be a directory only you may enter (mode 0700)')
+
+
+def _expand_items(items: List[Dict[str, str]], recursive: bool) -> Iterator[Tuple[str, Any]]:
+    """Yield (kind, value) work for each request item, expanding directories into files."""
+    for item in items:
+        if 'payload' in item:
+            yield 'payload', (base64.b64decode(item['payload']), item.get('name', 'payload'))
+        elif Path(item['path']).is_dir():
+            for file_path in walk_dir(dir_path=Path(item['path']), recursive=recursive):
+                yield 'path', str(file_path)
+        else:
+            yield 'path', item['path']
+
+
+def _handle_client(conn: socket.socket, executor: ProcessPoolExecutor,
+                   settings: Dict[str, Any], window: int, word_list: WordList) -> None:
+    """Serve every request sent on one client connection."""
+    with conn, conn.makefile('rb') as requests, conn.makefile('wb') as responses:
+        for line in requests:
+            try:
+                reload_word_list(word_list)
+                settings = dict(settings, words_digest=word_list.digest)
+                for response in _handle_request(json.loads(line), executor, settings, window):
+                    responses.write(json.dumps(response).encode() + b'\n')
+                    responses.flush()
+            except (BrokenPipeError, ConnectionError):
+                return  # Client went away
+            except (KeyError, TypeError, ValueError) as err:
+                responses.write(json.dumps({'type': RESP_REJECTED,
+                                            'message': f'Bad request: {err}'}).encode() + b'\n')
+                responses.flush()
+
+
+def _handle_request(request: Dict[str, Any], executor: ProcessPoolExecutor,
+                    settings: Dict[str, Any], window: int) -> Iterator[Dict[str, Any]]:
+    """Search one request's items on the worker pool and yield the responses in order."""
+    # LOCAL VARIABLES
+    found = 0                 # 0 if no dirty words were found, 3 if dirty words were found
+    in_flight = deque()       # (name, Future) pairs, oldest first
+
+    # VALIDATE IT
+    if request.get('version') != PROTOCOL_VERSION:
+        yield {'type': RESP_REJECTED, 'message': 'Unsupported protocol version'}
+        return
+    for key, value in settings.items():
+        if request.get(key, IMPLIED_SETTINGS.get(key)) != value:
+            yield {'type': RESP_REJECTED, 'message': f'This server uses a different {key}'}
+            return
+
+    # SEARCH IT
+    # Bound the in-flight items so a huge directory doesn't queue millions of futures
+    for kind, value in _expand_items(request['items'], bool(request.get('recursive'))):
+        if kind == 'payload':
+            in_flight.append((value[1], executor.submit(_scan_payload, *value)))
+        else:
+            in_flight.append((value, executor.submit(_scan_path, value)))
+        while len(in_flight) >= window:
+            response = _get_response(*in_flight.popleft())
+            found = response.get('code') or found
+            yield response
+    while in_flight:
+        response = _get_response(*in_flight.popleft())
+        found = response.get('code') or found
+        yield response
+
+    # DONE
+    yield {'type': RESP_DONE, 'code': found}
+
+
+def _get_response(name: str, future: Future) -> Dict[str, Any]:
+    """Wait for a worker result and translate it into a response."""
+    try:
+        code, findings = future.result()
+    except Exception as err:  # pylint: disable=broad-except
+        return {'type': RESP_ERROR, 'name': name, 'message': f'{name}: {err}'}
+    return {'type': RESP_RESULT, 'name': name, 'code': code, 'findings': findings}
+
+
+def _get_worker_words() -> List[str]:
+    """Worker: the dirty words, reloaded if the --words file changed.
+
+    The server process reports reloads and reload failures, so the workers stay quiet.
+    """
+    word_list = _WORKER_WORDS['words']  # The worker process' WordList
+    try:
+        word_list.reload()
+    except (OSError, ValueError):
+        pass  # Keep the old dirty words
+    return word_list.words
+
+
+def _init_worker(words_path: Path, encoding: str, case_sensitive: bool, engine: str,
+                 extract: bool, plugins: bool, subsume: bool) -> None:
+    """Load the dirty words and store the search arguments once per worker process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The server process handles Ctrl-C
+    _WORKER_WORDS['words'] = WordList(words_path, case_sensitive=case_sensitive,
+                                      subsume=subsume, encoding=encoding)
+    _WORKER_SETTINGS.update(encoding=encoding, case_sensitive=case_sensitive,
+                            engine=engine, extract=extract, plugins=plugins)
+
+
+def _scan_path(path: str) -> Tuple[int, List[str]]:
+    """Worker: search one file and capture its findings."""
+    dw_list = _get_worker_words()  # Dirty words for this file
+    with capture_findings() as findings:
+        code = search_file(file_path=Path(path), dw_list=dw_list, **_WORKER_SETTINGS)
+    return code, findings
+
+
+def _scan_payload(data: bytes, name: str) -> Tuple[int, List[str]]:
+    """Worker: search one raw byte payload and capture its findings."""
+    dw_list = _get_worker_words()  # Dirty words for this payload
+    with capture_findings() as findings:
+        code = search_data(data=data, label=name, dw_list=dw_list, **_WORKER_SETTINGS)
+    return code, findings
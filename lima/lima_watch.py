@@ -0,0 +1,463 @@
+"""LIVING MANUAL (LIMA) watch mode.
+
+Search a directory once, then keep watching it.  Files that are created or modified are searched
+again as soon as their writes settle.  Linux hosts subscribe to inotify events; every other host
+falls back to polling file modification times.  Once the inotify watch limit
+(fs.inotify.max_user_watches) is reached, the directories left over are polled.  If the inotify
+queue overflows, the watched directories are listed again for the files changed since the events
+before the lost ones.  Watching stops, with an error, if the watched directory is deleted.
+Given the --words file, the dirty words are reloaded whenever it changes (see lima_words).
+
+    Typical usage example:
+
+    from lima.lima_watch import watch_dir
+
+    exit_code = watch_dir(dir_path=Path('drop'), dw_list=['dirty'], encoding='utf-8')
+"""
+
+# Standard Imports
+from pathlib import Path
+from threading import Event
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import DEFAULT_DEBOUNCE
+from lima.lima_engine import ENGINE_AUTO
+from lima.lima_search import search_dir, search_file
+from lima.lima_validation import validate_path_dir, validate_type
+from lima.lima_words import WordList, reload_word_list
+
+
+DEFAULT_POLL_INTERVAL = 0.5  # Seconds between polling passes
+MAX_USER_WATCHES_PATH = '/proc/sys/fs/inotify/max_user_watches'  # inotify watch limit
+OVERFLOW_SLACK = 2.0  # Seconds of modification time granularity to allow for after an overflow
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct('iIII')  # struct inotify_event, minus the name
+INOTIFY_READ_SIZE = 1 << 16            # Bytes to read from the inotify descriptor at once
+
+
+class PollingWatcher():
+    """Portable watcher: compares (mtime, size) snapshots of the trees."""
+
+    def __init__(self, dir_path: Optional[Path], recursive: bool,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """PollingWatcher ctor.
+
+        Args:
+            dir_path: Directory to watch.  read_events() raises once it is deleted.  None to start
+                with nothing to watch (see add_dir()).
+            recursive: If True, watch all child directories too.
+            poll_interval: Optional; Seconds between snapshots.
+        """
+        self._dir_path = dir_path
+        self._dir_list = [dir_path] if dir_path else []  # Roots of the watched trees
+        self._recursive = recursive
+        self._poll_interval = poll_interval
+        self._last_poll = time.monotonic()
+        self._snapshot = self._take_snapshot(self._dir_list)
+
+    def add_dir(self, dir_path: Path) -> List[Path]:
+        """Also watch dir_path, and its children if recursive.
+
+        Returns:
+            Files already present in dir_path.  They may have been written before it was watched.
+        """
+        snapshot = self._take_snapshot([dir_path])  # Files in the new tree
+        self._dir_list.append(dir_path)
+        self._snapshot.update(snapshot)
+        return [Path(path) for path in snapshot]
+
+    def close(self) -> None:
+        """Release resources.  Nothing to release while polling."""
+
+    def read_events(self, timeout: float) -> List[Path]:
+        """Wait, at most timeout seconds, and return the files that changed since the last call.
+
+        Raises:
+            FileNotFoundError: dir_path was deleted.
+        """
+        # LOCAL VARIABLES
+        snapshot = {}   # Current snapshot
+        changed = []    # Files that were created or modified
+
+        # WAIT
+        time.sleep(max(0.0, min(timeout, self._last_poll + self._poll_interval
+                                - time.monotonic())))
+        if time.monotonic() < self._last_poll + self._poll_interval:
+            return changed
+        self._last_poll = time.monotonic()
+
+        # COMPARE
+        if self._dir_path and not self._dir_path.is_dir():
+            raise FileNotFoundError(f'{self._dir_path} was deleted, nothing left to watch')
+        snapshot = self._take_snapshot(self._dir_list)
+        changed = [Path(path) for path, stamp in snapshot.items()
+                   if self._snapshot.get(path) != stamp]
+        self._snapshot = snapshot
+
+        # DONE
+        return changed
+
+    def _take_snapshot(self, dir_list: List[Path]) -> Dict[str, Tuple[int, int]]:
+        """Map every file in the trees rooted at dir_list to its (mtime, size)."""
+        # LOCAL VARIABLES
+        snapshot = {}                                       # Return value
+        dir_stack = [str(dir_path) for dir_path in dir_list]  # Directories left to list
+
+        # WALK IT
+        while dir_stack:
+            try:
+                with os.scandir(dir_stack.pop()) as dir_iter:
+                    for entry in dir_iter:
+                        if entry.is_file():
+                            stat_result = entry.stat()
+                            snapshot[entry.path] = (stat_result.st_mtime_ns, stat_result.st_size)
+                        elif self._recursive and entry.is_dir(follow_symlinks=False):
+                            dir_stack.append(entry.path)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                pass  # Deleted or locked while walking
+
+        # DONE
+        return snapshot
+
+
+class InotifyWatcher():
+    """Linux watcher: subscribes to inotify events for every watched directory.
+
+    Directories left over once the watch limit is reached are polled by a PollingWatcher.
+
+    Raises:
+        OSError: inotify is unavailable or dir_path itself can't be watched.
+    """
+
+    def __init__(self, dir_path: Path, recursive: bool) -> None:
+        """InotifyWatcher ctor.
+
+        Args:
+            dir_path: Directory to watch.  read_events() raises once it is deleted.
+            recursive: If True, watch all child directories too, including new ones.
+        """
+        libc_name = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self._dir_path = dir_path
+        self._recursive = recursive
+        self._wd_dict: Dict[int, Path] = {}  # Watch descriptor -> directory
+        self._poller: Optional[PollingWatcher] = None  # Directories past the watch limit
+        self._polled: Set[Path] = set()  # Roots of the trees self._poller watches
+        self._last_read = time.time()    # Every change before this was read, or scanned
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            _raise_errno('inotify_init1')
+        try:
+            self._add_tree(dir_path)
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def read_events(self, timeout: float) -> List[Path]:
+        """Wait, at most timeout seconds, and return the files that changed.
+
+        Raises:
+            FileNotFoundError: dir_path was deleted.
+        """
+        # LOCAL VARIABLES
+        changed = []    # Files that were created or modified
+        buf = b''       # Raw inotify events
+        offset = 0      # Offset into buf
+        since = self._last_read  # Events lost to an overflow are for changes after this
+
+        # WAIT
+        if select.select([self._fd], [], [], timeout)[0]:
+            self._last_read = time.time()
+            try:
+                buf = os.read(self._fd, INOTIFY_READ_SIZE)
+            except BlockingIOError:
+                pass
+
+        # PARSE
+        while offset + INOTIFY_EVENT.size <= len(buf):
+            wd_num, mask, _, name_len = INOTIFY_EVENT.unpack_from(buf, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(buf[offset:offset + name_len].rstrip(b'\x00'))
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                print('WARNING: inotify queue overflowed, searching the watched directories '
+                      'again for changed files', file=sys.stderr)
+                changed.extend(self._rescan(since - OVERFLOW_SLACK))
+            elif mask & IN_DELETE_SELF and self._wd_dict.get(wd_num) == self._dir_path:
+                raise FileNotFoundError(f'{self._dir_path} was deleted, nothing left to watch')
+            elif mask & IN_IGNORED:
+                self._wd_dict.pop(wd_num, None)
+            elif wd_num in self._wd_dict and name:
+                path = self._wd_dict[wd_num] / name
+                if mask & IN_ISDIR:
+                    if self._recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.extend(self._add_tree(path))
+                elif mask & (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE):
+                    changed.append(path)
+        if self._poller:
+            changed.extend(self._poller.read_events(timeout=0))
+
+        # DONE
+        return changed
+
+    def _add_tree(self, dir_path: Path) -> List[Path]:
+        """Watch dir_path, and its children if recursive.
+
+        Returns:
+            Files already present in newly watched directories.  They may have been written
+            before the watch existed.
+        """
+        # LOCAL VARIABLES
+        existing = []             # Files found in the newly watched directories
+        dir_stack = [dir_path]    # Directories left to watch
+        wd_num = 0                # Watch descriptor
+
+        # WATCH IT
+        while dir_stack:
+            dir_path = dir_stack.pop()
+            wd_num = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), INOTIFY_MASK)
+            if wd_num < 0:
+                if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue  # Gone or locked before we could watch it
+                if ctypes.get_errno() == errno.ENOSPC and self._wd_dict:
+                    existing.extend(self._poll_dirs([dir_path] + dir_stack))
+                    break  # Out of watches, the rest of the tree is polled
+                _raise_errno(f'inotify_add_watch({dir_path})')
+            self._wd_dict[wd_num] = dir_path
+            try:
+                with os.scandir(dir_path) as dir_iter:
+                    for entry in dir_iter:
+                        if entry.is_file():
+                            existing.append(Path(entry.path))
+                        elif self._recursive and entry.is_dir(follow_symlinks=False):
+                            dir_stack.append(Path(entry.path))
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                pass  # Deleted or locked while walking
+
+        # DONE
+        return existing
+
+    def _poll_dirs(self, dir_list: List[Path]) -> List[Path]:
+        """Poll the trees rooted at dir_list, which are past the watch limit.
+
+        Returns:
+            Files already present in dir_list's trees.
+        """
+        # LOCAL VARIABLES
+        existing = []  # Files found in the newly polled trees
+
+        # POLL IT
+        if not self._poller:
+            print(f'WARNING: Reached the inotify watch limit (fs.inotify.max_user_watches = '
+                  f'{_get_max_user_watches()}) with {len(self._wd_dict)} directories watched, '
+                  'polling the rest', file=sys.stderr)
+            self._poller = PollingWatcher(dir_path=None, recursive=self._recursive)
+        for dir_path in dir_list:
+            existing.extend(self._poller.add_dir(dir_path))
+            self._polled.add(dir_path)
+
+        # DONE
+        return existing
+
+
+    def _rescan(self, since: float) -> List[Path]:
+        """Make up for lost events: list the watched directories again.
+
+        Args:
+            since: time.time() after which changes may have been lost.
+
+        Returns:
+            Files modified since then, and every file in child directories that weren't watched
+            yet (their creation may have been lost too).
+        """
+        # LOCAL VARIABLES
+        changed = []                                # Return value
+        watched = set(self._wd_dict.values())       # Directories inotify watches
+        new_dirs = []                               # Child directories to watch
+
+        # SCAN IT
+        for dir_path in watched:
+            try:
+                with os.scandir(dir_path) as dir_iter:
+                    for entry in dir_iter:
+                        if entry.is_file() and entry.stat().st_mtime >= since:
+                            changed.append(Path(entry.path))
+                        elif self._recursive and entry.is_dir(follow_symlinks=False) \
+                                and Path(entry.path) not in watched \
+                                and Path(entry.path) not in self._polled:
+                            new_dirs.append(Path(entry.path))
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                pass  # Deleted or locked while walking
+        for dir_path in new_dirs:
+            changed.extend(self._add_tree(dir_path))
+
+        # DONE
+        return changed
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def watch_dir(dir_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool = True,
+              recursive: bool = False, engine: str = ENGINE_AUTO,
+              debounce: float = DEFAULT_DEBOUNCE, poll: bool = False,
+              stop_event: Optional[Event] = None, words_path: Optional[Path] = None,
+              subsume: bool = False) -> int:
+    """Search dir_path, then search files again as they are created or modified.
+
+    Emits findings (see lima_output).  Runs until interrupted (e.g., Ctrl-C) or stop_event is set,
+    or dir_path is deleted.
+    With a words_path, changes to it are picked up between searches.  Files that were already
+    searched are not searched again for the new dirty words.
+
+    Args:
+        dir_path: Path object to a directory to watch.
+        dw_list: A list of non-empty strings to search for.
+        encoding: Format with which to decode files found in dir_path.
+        case_sensitive: Optional; Considers case when checking file contents for dirty words.
+        recursive: Optional; If True, watch all the child directories found in dir_path.
+        engine: Optional; Matching engine to use.  See lima_engine.SUPPORTED_ENGINES.
+        debounce: Optional; Seconds a file must go without writes before it is searched.
+        poll: Optional; If True, poll for changes even if inotify is available.
+        stop_event: Optional; Stop watching once this Event is set.
+        words_path: Optional; The --words file dw_list was loaded from.  Reload dw_list from it
+            whenever it changes.
+        subsume: Optional; Drop reloaded dirty words that contain a shorter dirty word.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+
+    Raises:
+        FileNotFoundError: dir_path or words_path is unavailable, or dir_path was deleted while
+            watching.
+        LookupError: Unknown encoding.
+        NotImplementedError: Unsupported or unavailable engine.
+        OSError: dir_path is not a directory or words_path is not a file.
+        TypeError: Bad data type.
+        ValueError: Bad value (e.g., empty string, negative debounce).
+    """
+    # LOCAL VARIABLES
+    found = 0           # 0 if no dirty words were found, 3 if dirty words were found
+    temp_found = 0      # Temporary return value storage
+    watcher = None      # InotifyWatcher or PollingWatcher
+    pending = {}        # Path -> monotonic time of the last change
+    word_list = None    # WordList reloaded from words_path
+    stop_event = stop_event if stop_event else Event()
+
+    # INPUT VALIDATION
+    validate_path_dir(dir_path)
+    validate_type(debounce, 'debounce', (int, float))
+    if debounce < 0:
+        raise ValueError('debounce may not be negative')
+    validate_type(poll, 'poll', bool)
+    validate_type(stop_event, 'stop_event', Event)
+    if words_path is not None:
+        word_list = WordList(words_path, case_sensitive=case_sensitive, subsume=subsume,
+                             encoding=encoding)
+        dw_list = word_list.words
+
+    # SUBSCRIBE
+    # Subscribe before the initial pass so writes made during it are not missed
+    watcher = _get_watcher(dir_path=dir_path, recursive=recursive, poll=poll)
+
+    try:
+        # INITIAL PASS
+        found = search_dir(dir_path=dir_path, dw_list=dw_list, encoding=encoding,
+                           case_sensitive=case_sensitive, recursive=recursive, engine=engine)
+        # WATCH IT
+        while not stop_event.is_set():
+            timeout = debounce if pending else DEFAULT_POLL_INTERVAL
+            for changed_file in watcher.read_events(timeout=timeout):
+                pending[changed_file] = time.monotonic()
+            if word_list and reload_word_list(word_list):
+                dw_list = word_list.words
+            for changed_file in _pop_settled(pending, debounce):
+                temp_found = _search_changed_file(file_path=changed_file, dw_list=dw_list,
+                                                  encoding=encoding,
+                                                  case_sensitive=case_sensitive, engine=engine)
+                if temp_found != 0:
+                    found = temp_found
+    except KeyboardInterrupt:
+        pass  # Time to stop
+    finally:
+        watcher.close()
+
+    # DONE
+    return found
+
+
+def _get_watcher(dir_path: Path, recursive: bool, poll: bool):
+    """Prefer an InotifyWatcher, fall back to a PollingWatcher."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(dir_path=dir_path, recursive=recursive)
+        except OSError as err:
+            print(f'WARNING: Unable to use inotify, falling back to polling... {err}',
+                  file=sys.stderr)
+    return PollingWatcher(dir_path=dir_path, recursive=recursive)
+
+
+def _get_max_user_watches() -> str:
+    """Read the inotify watch limit, for the record."""
+    try:
+        return Path(MAX_USER_WATCHES_PATH).read_text(encoding='ascii').strip()
+    except OSError:
+        return 'unknown'
+
+
+def _pop_settled(pending: Dict[Path, float], debounce: float) -> Iterable[Path]:
+    """Remove, and return, the pending files that have been quiet for debounce seconds."""
+    now = time.monotonic()
+    settled = [path for path, last_change in pending.items() if now - last_change >= debounce]
+    for path in settled:
+        del pending[path]
+    return settled
+
+
+def _raise_errno(func_name: str) -> None:
+    """Raise an OSError from the errno of a failed libc call."""
+    err_num = ctypes.get_errno()
+    raise OSError(err_num, f'{func_name} failed: {os.strerror(err_num)}')
+
+
+def _search_changed_file(file_path: Path, dw_list: List[str], encoding: str, case_sensitive: bool,
+                         engine: str) -> int:
+    """Search a changed file, ignoring files that vanished or became unreadable.
+
+    Returns:
+        0 if no dirty words were found, 3 if dirty words were found.
+    """
+    try:
+        if file_path.is_file():
+            return search_file(file_path=file_path, dw_list=dw_list, encoding=encoding,
+                               case_sensitive=case_sensitive, engine=engine)
+    except (FileNotFoundError, PermissionError) as err:
+        print(f'Unable to search {file_path.absolute()}... {err}', file=sys.stderr)
+    return 0
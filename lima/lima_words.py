@@ -0,0 +1,323 @@
+"""LIVING MANUAL (LIMA) dirty word lists: loading, preparation and reloading.
+
+Every --words file is prepared before it is searched.  Entries are stripped of surrounding
+whitespace (including the carriage return of Windows line endings) and normalized to Unicode NFC.
+Blank entries and duplicates are dropped.  A search that ignores case also drops entries that
+only differ in case.  Optionally, entries that contain a shorter entry are dropped too: every
+file that holds `topsecret` also holds `secret`, so `topsecret` can never find another file.
+prepare_dirty_words() reports how many entries it removed, and why.
+
+A WordList holds a --words file in memory and reloads it, in place, when the file changes.
+Each reload swaps in a new list of words, it never modifies the old one, so a search that started
+with the old list finishes with it.  The matchers built for a list that changed by a few words are
+staged from the old list's matchers (see lima_engine), so a reload doesn't stall the next search
+while a long list is rebuilt.  `lima watch` and `lima serve` reload their word list this way.
+
+    Typical usage example:
+
+    from lima.lima_words import WordList, load_dirty_words
+
+    dw_list, removed = load_dirty_words(Path('words.txt'), subsume=True)
+
+    word_list = WordList(Path('words.txt'))
+    search_file(file_path=Path('a.txt'), dw_list=word_list.words, encoding='utf-8')
+    word_list.reload()  # E.g., once a minute
+    search_file(file_path=Path('a.txt'), dw_list=word_list.words, encoding='utf-8')
+"""
+
+# Standard Imports
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+import io
+import sys
+import unicodedata
+# Third Party Imports
+# Local Imports
+from lima.lima_defaults import ENCODING_AUTO
+from lima.lima_detect import DETECTED_ENCODINGS
+from lima.lima_validation import validate_path_file, validate_string, validate_type
+
+
+# Reasons prepare_dirty_words() removes an entry, in report order
+REMOVED_BLANK = 'blank'          # Nothing but whitespace
+REMOVED_DUPLICATE = 'duplicate'  # Same as an earlier entry, once normalized (and case folded)
+REMOVED_SUBSUMED = 'subsumed'    # Contains a shorter entry, so it can't find another file
+REMOVED_REASONS = (REMOVED_BLANK, REMOVED_DUPLICATE, REMOVED_SUBSUMED)
+
+
+def describe_removed(removed: Dict[str, int]) -> str:
+    """Describe what prepare_dirty_words() removed (e.g., '2 blank, 1 subsumed')."""
+    return ', '.join(f'{removed[reason]} {reason}' for reason in REMOVED_REASONS
+                     if removed.get(reason))
+
+
+def load_dirty_words(dw_path: Path, case_sensitive: bool = True, subsume: bool = False,
+                     encoding: str = 'utf-8') -> Tuple[List[str], Dict[str, int]]:
+    """Parse and prepare a dirty word file.
+
+    Args:
+        dw_path: Path object to the --words file.
+        case_sensitive: Optional; The search considers case.
+        subsume: Optional; Drop entries that contain a shorter entry.
+        encoding: Optional; Format with which the search encodes dirty words.
+
+    Returns:
+        The dirty words, and the number of entries removed per reason (see REMOVED_REASONS).
+
+    Raises:
+        FileNotFoundError: dw_path is unavailable.
+        LookupError: Unknown encoding.
+        OSError: dw_path is not a file.
+        TypeError: Bad data type.
+    """
+    validate_path_file(dw_path)
+    return prepare_dirty_words(parse_dirty_words(dw_path.read_bytes()),
+                               case_sensitive=case_sensitive, subsume=subsume, encoding=encoding)
+
+
+def parse_dirty_words(contents: bytes) -> List[str]:
+    """Parse the contents of a dirty word file into a list of its non-empty lines.
+
+    Decodes contents like Path.read_text(): with the locale's preferred encoding and universal
+    newlines.
+
+    Args:
+        contents: Raw contents of the --words file.
+
+    Returns:
+        A list of unprepared dirty words.
+
+    Raises:
+        TypeError: Bad data type.
+    """
+    validate_type(contents, 'contents', bytes)
+    text = io.TextIOWrapper(io.BytesIO(contents)).read()  # Decoded like Path.read_text()
+    return [entry for entry in text.split('\n') if entry]
+
+
+def prepare_dirty_words(dw_list: List[str], case_sensitive: bool = True, subsume: bool = False,
+                        encoding: str = 'utf-8') -> Tuple[List[str], Dict[str, int]]:
+    """Normalize dw_list and remove the entries that can't change the outcome of a search.
+
+    Entries are stripped and normalized to NFC.  Blank entries and duplicates are removed.
+    Unless case_sensitive, entries that only differ in case (str.lower(), like the search
+    strategies) are duplicates.  With subsume, an entry that contains a shorter entry is removed
+    as long as the shorter one is also inside it once encoded (e.g., never for encodings that
+    start every encoded word with a byte order mark).  The first of several duplicates is kept,
+    and the order of dw_list is preserved.
+
+    Args:
+        dw_list: Dirty words, as parsed.
+        case_sensitive: Optional; The search considers case.
+        subsume: Optional; Drop entries that contain a shorter entry.
+        encoding: Optional; Format with which the search encodes dirty words.
+
+    Returns:
+        The dirty words, and the number of entries removed per reason (see REMOVED_REASONS).
+
+    Raises:
+        LookupError: Unknown encoding.
+        TypeError: Bad data type.
+        ValueError: Empty encoding.
+    """
+    # LOCAL VARIABLES
+    removed = {reason: 0 for reason in REMOVED_REASONS}  # Reason -> entries removed
+    prepared: Dict[str, str] = {}  # Folded entry -> entry, in order
+    subsumed = set()               # Folded entries that contain a shorter one
+
+    # INPUT VALIDATION
+    validate_type(dw_list, 'dw_list', list)
+    validate_type(case_sensitive, 'case_sensitive', bool)
+    validate_type(subsume, 'subsume', bool)
+    validate_string(encoding, 'encoding')
+
+    # PREPARE IT
+    for dw_entry in dw_list:
+        validate_type(dw_entry, 'dw_list entry', str)
+        word = unicodedata.normalize('NFC', dw_entry.strip())
+        key = word if case_sensitive else word.lower()
+        if not word:
+            removed[REMOVED_BLANK] += 1
+        elif key in prepared:
+            removed[REMOVED_DUPLICATE] += 1
+        else:
+            prepared[key] = word
+    if subsume:
+        subsumed = _get_subsumed(prepared, case_sensitive, encoding)
+        removed[REMOVED_SUBSUMED] = len(subsumed)
+
+    # DONE
+    return ([word for key, word in prepared.items() if key not in subsumed],
+            {reason: count for reason, count in removed.items() if count})
+
+
+class WordList():
+    """A --words file, reloaded in place when it changes."""
+
+    def __init__(self, words_path: Path, case_sensitive: bool = True, subsume: bool = False,
+                 encoding: str = 'utf-8') -> None:
+        """WordList ctor.  Loads words_path.
+
+        Args:
+            words_path: Path object to the --words file.
+            case_sensitive: Optional; The search considers case.  See prepare_dirty_words().
+            subsume: Optional; Drop entries that contain a shorter entry.
+            encoding: Optional; Format with which the search encodes dirty words.
+
+        Raises:
+            FileNotFoundError: words_path is unavailable.
+            LookupError: Unknown encoding.
+            OSError: words_path is not a file.
+            TypeError: Bad data type.
+            ValueError: words_path holds no dirty words.
+        """
+        validate_path_file(words_path)
+        validate_type(case_sensitive, 'case_sensitive', bool)
+        validate_type(subsume, 'subsume', bool)
+        validate_string(encoding, 'encoding')
+        self.words_path = words_path
+        self.case_sensitive = case_sensitive
+        self.subsume = subsume
+        self.encoding = encoding
+        self.removed: Dict[str, int] = {}  # Entries the last load removed, per reason
+        self.reloads = 0         # Number of times the words changed since they were first loaded
+        self._lock = Lock()      # Serializes reloads
+        self._signature = None   # (mtime, size, inode) of the words file when it was last read
+        self._snapshot: Tuple[List[str], str] = ([], '')  # (words, SHA-256 of the words file)
+        self.reload()
+        self.reloads = 0
+
+    @property
+    def words(self) -> List[str]:
+        """The dirty words.  Replaced, never modified, by reload()."""
+        return self._snapshot[0]
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 of the words file the dirty words were loaded from (see get_words_digest())."""
+        return self._snapshot[1]
+
+    def reload(self) -> Optional[Tuple[int, int]]:
+        """Load the words file again, if it changed since it was last read.
+
+        Returns:
+            None if the dirty words are unchanged, otherwise the number of dirty words added and
+            removed.
+
+        Raises:
+            FileNotFoundError: The words file is unavailable.
+            OSError: The words file can't be read.
+            ValueError: The words file holds no dirty words.  The dirty words are unchanged
+                until the words file changes again.
+        """
+        # pylint: disable=import-outside-toplevel
+        import hashlib  # Slow to import, and only needed to reload
+
+        # LOCAL VARIABLES
+        contents = b''     # Raw contents of the words file
+        digest = ''        # SHA-256 of contents
+        words = []         # Dirty words parsed from contents
+        old_words = set()  # Dirty words before the reload
+        new_words = set()  # Dirty words after the reload
+
+        with self._lock:
+            # CHECK IT
+            stat_result = self.words_path.stat()
+            signature = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+            if signature == self._signature:
+                return None
+            contents = self.words_path.read_bytes()
+            self._signature = signature  # Don't read, or complain about, this version again
+            digest = hashlib.sha256(contents).hexdigest()
+            if digest == self.digest:
+                return None
+
+            # LOAD IT
+            words, removed = prepare_dirty_words(parse_dirty_words(contents),
+                                                 case_sensitive=self.case_sensitive,
+                                                 subsume=self.subsume, encoding=self.encoding)
+            if not words:
+                raise ValueError(f'{self.words_path} holds no dirty words')
+            old_words, new_words = set(self.words), set(words)
+            self._snapshot = (words, digest)
+            self.removed = removed
+            self.reloads += 1
+
+        # DONE
+        return len(new_words - old_words), len(old_words - new_words)
+
+
+def reload_word_list(word_list: WordList) -> bool:
+    """Reload word_list, reporting a change, or a failure to reload, on stderr.
+
+    Returns:
+        True if the dirty words changed.
+    """
+    try:
+        change = word_list.reload()  # (added, removed), or None if unchanged
+    except (OSError, ValueError) as err:
+        print(f'WARNING: Unable to reload {word_list.words_path}, keeping the old dirty words... '
+              f'{err}', file=sys.stderr)
+        return False
+    if change:
+        print(f'Reloaded {len(word_list.words)} dirty words from {word_list.words_path} '
+              f'({change[0]} added, {change[1]} removed)', file=sys.stderr)
+        if word_list.removed:
+            print(f'Dropped dirty word entries: {describe_removed(word_list.removed)}',
+                  file=sys.stderr)
+    return bool(change)
+
+
+def _encode(word: str, case_sensitive: bool, encoding: str) -> Optional[bytes]:
+    """Encode word like the byte search strategies do, or None if it can't be encoded."""
+    try:
+        encoded = bytes(word, encoding=encoding)
+    except UnicodeError:
+        return None
+    return encoded if case_sensitive else encoded.lower()
+
+
+def _get_subsumed(prepared: Dict[str, str], case_sensitive: bool, encoding: str) -> Set[str]:
+    """Folded entries that contain a shorter folded entry, encoded or not.
+
+    Looks up every slice of each entry that is as long as a shorter entry, so it takes time
+    proportional to the total length of the entries times the number of distinct lengths.
+
+    Args:
+        prepared: Folded entry -> entry.
+        case_sensitive: The search considers case.
+        encoding: Format with which the search encodes dirty words.  With ENCODING_AUTO, an entry
+            is only subsumed if it is in every one of lima_detect.DETECTED_ENCODINGS.
+
+    Raises:
+        LookupError: Unknown encoding.
+    """
+    # LOCAL VARIABLES
+    subsumed = set()  # Return value
+    lengths = sorted({len(key) for key in prepared})  # Distinct entry lengths
+    # Every encoding the search may encode dirty words with
+    encodings = DETECTED_ENCODINGS if encoding == ENCODING_AUTO else (encoding,)
+    # Folded entry -> entry encoded with each of encodings
+    encoded = {key: [_encode(word, case_sensitive, codec) for codec in encodings]
+               for key, word in prepared.items()}
+
+    # FIND THEM
+    for key in prepared:
+        for length in lengths:
+            if length >= len(key):
+                break
+            if any(key[start:start + length] in prepared
+                   and all(_encoded_within(short, long) for short, long
+                           in zip(encoded[key[start:start + length]], encoded[key]))
+                   for start in range(len(key) - length + 1)):
+                subsumed.add(key)
+                break
+
+    # DONE
+    return subsumed
+
+
+def _encoded_within(short: Optional[bytes], long: Optional[bytes]) -> bool:
+    """Do the byte strategies find short everywhere they find long?"""
+    return long is None or (short is not None and short in long)
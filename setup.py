@@ -25,6 +25,8 @@ LIMA_DESCRIPTION = 'Dirty word search utility.'
 LIMA_URL = 'https://github.com/hark130/living_manual'
 LIMA_PYTHON = '>=3.7'  # See: setuptools.setup(python_requires)
 LIMA_REQUIRES = []  # See: setuptools.setup(install_requires)
+# Optional accelerators (e.g., pip install lima[ahocorasick]) See: setuptools.setup(extras_require)
+LIMA_EXTRAS = {'ahocorasick': ['pyahocorasick'], 'hyperscan': ['hyperscan']}
 
 
 def main() -> None:
@@ -67,6 +69,7 @@ def main() -> None:
             ],
             python_requires=LIMA_PYTHON,
             install_requires=LIMA_REQUIRES,
+            extras_require=LIMA_EXTRAS,
             entry_points={'console_scripts': ['lima=lima.lima_main:main']}
         )
 
@@ -0,0 +1,20 @@
+"""Defines the logic for running all existing benchmarks as a module.
+
+    Typical usage example:
+
+    python -m test.benchmark
+"""
+
+# Standard Imports
+import os
+import sys
+# Third Party Imports
+# Local Imports
+from test.loader import load_and_run
+from test.unit_test.lima_unit_test import REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))
+
+if __name__ == '__main__':
+    # Run all benchmarks discovered in this package
+    # Exit 0 on success, 1 otherwise
+    sys.exit(not load_and_run('test/benchmark'))
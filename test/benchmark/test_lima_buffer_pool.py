@@ -0,0 +1,164 @@
+"""Creates the BufferPool benchmark classes.
+
+    Prove reading into reused buffers pays for itself and keeps memory flat.  Files larger than
+    glibc's largest mmap() threshold (32 MiB) get fresh, zero-filled pages from Path.read_bytes()
+    every time, and pooled reads must beat that.  Below it, glibc may recycle buffers on its own,
+    so the mixed corpus only has to leave RSS, and the pool's allocations, flat, without the pool
+    keeping more than its limit.
+
+    Typical usage example:
+
+    python -m test.benchmark                                  # Runs all benchmarks
+    python -m test.benchmark.test_lima_buffer_pool            # Runs only these benchmarks
+    python -m test.benchmark.test_lima_buffer_pool -k n01     # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List
+import os
+import random
+import sys
+import time
+import unittest
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_engine import ENGINE_PYTHON  # noqa: E402
+from lima.lima_io import get_pool, read_file  # noqa: E402
+from lima.lima_search import search_dir  # noqa: E402
+
+
+NUM_SMALL = 2000        # Small files in the mixed corpus
+SMALL_SIZE = 1 << 13    # Largest small file, in bytes
+NUM_MEDIUM = 200        # Medium files in the mixed corpus
+MEDIUM_SIZE = 1 << 20   # Largest medium file, in bytes
+NUM_LARGE = 4           # Files in the large corpus
+LARGE_SIZE = 40 << 20   # Bytes per large file
+NUM_RUNS = 3            # Best of NUM_RUNS, to filter out a noisy host
+NUM_PASSES = 10         # Searches of the mixed corpus while watching RSS
+MAX_RATIO = 0.8         # Pooled read time / Path.read_bytes() time must not exceed this
+MAX_RSS_GROWTH = 1 << 20  # Bytes RSS may grow after the first search of the mixed corpus
+DIRTY_WORDS = ['Before Guido', 'missing dirty word']
+
+
+class BufferPoolBenchmark(LivingManualUnitTest):
+    """Reads and searches a corpus."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None   # TemporaryDirectory holding the corpus
+        self._files = []        # Every file in the corpus
+
+    def setUp(self) -> None:
+        """Make room for the corpus."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self) -> None:
+        """Remove the corpus."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function."""
+        return self._args[0]()
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self.assertLessEqual(*return_value)
+
+    def write_corpus(self, sizes: List[int]) -> None:
+        """Write one file of random bytes per entry in sizes."""
+        for num, size in enumerate(sizes):
+            self._files.append(Path(self._temp_dir.name) / f'clean{num}.bin')
+            self._files[-1].write_bytes(os.urandom(size))
+
+    def time_reads(self) -> Any:
+        """Time Path.read_bytes() and read_file(reuse=True).
+
+        Returns:
+            Tuple of (pooled seconds, MAX_RATIO * Path.read_bytes() seconds, message).
+        """
+        # LOCAL VARIABLES
+        best = {False: float('inf'), True: float('inf')}  # reuse -> best seconds
+        start = 0.0                                        # Timer
+
+        # TIME IT
+        for _ in range(NUM_RUNS):
+            for reuse in best:
+                start = time.perf_counter()
+                for file_path in self._files:
+                    if reuse:
+                        read_file(file_path, reuse=True)
+                    else:
+                        file_path.read_bytes()
+                best[reuse] = min(best[reuse], time.perf_counter() - start)
+
+        # DONE
+        return (best[True], MAX_RATIO * best[False],
+                f'Pooled reads took {best[True] * 1000:.1f} ms, Path.read_bytes() took '
+                f'{best[False] * 1000:.1f} ms')
+
+    def watch_rss(self) -> Any:
+        """Search the corpus NUM_PASSES times, watching RSS and the pool after the first search.
+
+        Returns:
+            Tuple of (growth, MAX_RSS_GROWTH, message).  Growth is the largest RSS growth, or
+            MAX_RSS_GROWTH + 1 if the pool allocated anything after the first search or kept
+            more than its limit.
+        """
+        # LOCAL VARIABLES
+        samples = []    # RSS, in bytes, after each search
+        allocated = []  # Bytes the pool allocated, after each search
+        retained = []   # Bytes the pool kept, after each search
+
+        # WATCH IT
+        for _ in range(NUM_PASSES):
+            self.assertEqual(search_dir(Path(self._temp_dir.name), DIRTY_WORDS, 'utf-8',
+                                        engine=ENGINE_PYTHON), 0)
+            samples.append(_get_rss())
+            allocated.append(get_pool().allocated)
+            retained.append(get_pool().retained)
+
+        # DONE
+        return (max(samples[1:]) - samples[0]
+                if len(set(allocated)) == 1 and max(retained) <= get_pool().limit
+                else MAX_RSS_GROWTH + 1, MAX_RSS_GROWTH,
+                f'RSS after each search: {samples}, pool allocations: {allocated}, pool kept: '
+                f'{retained} (limit {get_pool().limit})')
+
+
+class BufferPoolNormalBenchmark(BufferPoolBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_read_time(self) -> None:
+        """Reading large files into reused buffers is faster than Path.read_bytes()."""
+        self.write_corpus([LARGE_SIZE] * NUM_LARGE)
+        self.set_test_input(self.time_reads)
+        self.run_this_test()
+
+    def test_n02_stable_rss(self) -> None:
+        """Searching a mixed corpus again and again grows neither RSS nor the pool."""
+        if not os.path.exists('/proc/self/statm'):
+            raise unittest.SkipTest('Measuring RSS needs /proc/self/statm')
+        rand = random.Random(0)  # Same corpus every run
+        self.write_corpus([rand.randrange(SMALL_SIZE, MEDIUM_SIZE) for _ in range(NUM_MEDIUM)]
+                          + [rand.randrange(SMALL_SIZE) for _ in range(NUM_SMALL)])
+        self.set_test_input(self.watch_rss)
+        self.run_this_test()
+
+
+def _get_rss() -> int:
+    """Resident set size of this process, in bytes."""
+    with open('/proc/self/statm', encoding='ascii') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+if __name__ == '__main__':
+    execute_test_cases()
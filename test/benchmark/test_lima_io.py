@@ -0,0 +1,144 @@
+"""Creates the page cache benchmark classes.
+
+    Prove --no-cache-pollution keeps a scan out of the page cache.  Every test evicts a corpus,
+    searches it, then measures how much of the corpus the search left in the page cache by
+    reading it back with RWF_NOWAIT (which only returns cached bytes).
+
+    Typical usage example:
+
+    python -m test.benchmark                          # Runs all benchmarks
+    python -m test.benchmark.test_lima_io             # Runs only these benchmarks
+    python -m test.benchmark.test_lima_io -k n01      # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+import os
+import sys
+import unittest
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_search import search_dir  # noqa: E402
+
+
+NUM_FILES = 16          # Files in the corpus
+FILE_SIZE = 1 << 22     # Bytes per file
+PROBE_SIZE = 1 << 16    # Bytes per RWF_NOWAIT read
+MAX_RESIDENT = 0.1      # Fraction of the corpus --no-cache-pollution may leave cached
+DIRTY_WORDS = ['Before Guido', 'missing dirty word']
+
+
+class PageCacheBenchmark(LivingManualUnitTest):
+    """Measures the page cache a search_dir() leaves behind."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None   # TemporaryDirectory holding the corpus
+
+    def setUp(self) -> None:
+        """Write the corpus, then make sure this platform can measure the page cache."""
+        if not hasattr(os, 'RWF_NOWAIT') or not hasattr(os, 'posix_fadvise'):
+            raise unittest.SkipTest('Measuring the page cache needs RWF_NOWAIT and fadvise')
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        for num in range(NUM_FILES):
+            (Path(self._temp_dir.name) / f'clean{num}.bin').write_bytes(os.urandom(FILE_SIZE))
+        if _evict(Path(self._temp_dir.name)) > MAX_RESIDENT:
+            self._temp_dir.cleanup()
+            raise unittest.SkipTest('This file system keeps files in memory (e.g., tmpfs)')
+
+    def tearDown(self) -> None:
+        """Remove the corpus."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function.
+
+        Returns:
+            Tuple of (fraction cached by a plain search, fraction cached by the tested search).
+        """
+        # LOCAL VARIABLES
+        corpus = Path(self._temp_dir.name)  # Directory to search
+        resident = []                       # Fraction of the corpus cached after each search
+
+        # MEASURE IT
+        for kwargs in ({}, self._kwargs):
+            _evict(corpus)
+            self.assertEqual(search_dir(corpus, DIRTY_WORDS, 'utf-8', **kwargs), 0)
+            resident.append(_measure(corpus))
+
+        # DONE
+        return tuple(resident)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        plain, tested = return_value
+        self.assertLessEqual(tested, MAX_RESIDENT,
+                             f'{tested:.0%} of the corpus was left in the page cache '
+                             f'({plain:.0%} without --no-cache-pollution)')
+
+
+class PageCacheNormalBenchmark(PageCacheBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_no_cache_pollution(self) -> None:
+        """--no-cache-pollution leaves (almost) nothing in the page cache."""
+        self.set_test_input(no_cache_pollution=True)
+        self.run_this_test()
+
+    def test_n02_small_blocks(self) -> None:
+        """--no-cache-pollution with small blocks drops every block."""
+        self.set_test_input(block_size=1 << 16, no_cache_pollution=True)
+        self.run_this_test()
+
+
+def _evict(corpus: Path) -> float:
+    """Drop every corpus file from the page cache.
+
+    Returns:
+        The fraction of the corpus still cached.
+    """
+    for file_path in corpus.iterdir():
+        file_desc = os.open(file_path, os.O_RDONLY)
+        try:
+            os.fsync(file_desc)  # Dirty pages can't be dropped
+            os.posix_fadvise(file_desc, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(file_desc)
+    return _measure(corpus)
+
+
+def _measure(corpus: Path) -> float:
+    """Fraction of the corpus in the page cache."""
+    # LOCAL VARIABLES
+    cached = 0                      # Bytes in the page cache
+    total = 0                       # Bytes in the corpus
+    buffer = bytearray(PROBE_SIZE)  # Scratch space for the probes
+
+    # MEASURE IT
+    for file_path in corpus.iterdir():
+        file_desc = os.open(file_path, os.O_RDONLY)
+        try:
+            total += os.fstat(file_desc).st_size
+            for offset in range(0, os.fstat(file_desc).st_size, PROBE_SIZE):
+                try:
+                    cached += os.preadv(file_desc, [buffer], offset, os.RWF_NOWAIT)
+                except BlockingIOError:
+                    pass  # Not cached
+        finally:
+            os.close(file_desc)
+
+    # DONE
+    return cached / total if total else 0.0
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,102 @@
+"""Creates the normalized search benchmark classes.
+
+    Measure what `--normalize` costs.  Every test searches the same decoded buffer with strategy
+    1 and with its normalized stand-in, best of NUM_RUNS, and fails unless the normalized search
+    takes at most MAX_ASCII_RATIO (ASCII text, which is never translated) or MAX_RATIO (text
+    that is) times as long.  The overhead is printed either way.
+
+    Typical usage example:
+
+    python -m test.benchmark                                # Runs all benchmarks
+    python -m test.benchmark.test_lima_normalize            # Runs only these benchmarks
+    python -m test.benchmark.test_lima_normalize -k n01     # Runs only this Normal 01
+"""
+# Standard Imports
+from typing import Any
+import os
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_normalize import fold  # noqa: E402
+# pylint: disable=protected-access
+from lima.lima_search import _search_file_normalized, _search_file_text  # noqa: E402
+
+
+LINE_COUNT = 150000     # Lines per buffer
+NUM_RUNS = 3            # Best of NUM_RUNS, to filter out a noisy host
+MAX_ASCII_RATIO = 1.5   # Normalized seconds / strategy 1 seconds, ASCII text
+MAX_RATIO = 8.0         # Normalized seconds / strategy 1 seconds, text with non-ASCII characters
+DIRTY_WORDS = ['dirty', 'filthy', 'topsecret', 'résumé']
+ASCII_LINE = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n'
+UNICODE_LINE = 'Lorem ipsum dolor sít amet, consectetür adipiscing elit, «Привет мир».\n'
+
+
+class NormalizeBenchmark(LivingManualUnitTest):
+    """Measures the normalized strategy 1 against strategy 1."""
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function.
+
+        Returns:
+            Tuple of (strategy 1 seconds, normalized seconds, maximum ratio).
+        """
+        # LOCAL VARIABLES
+        data, case_sensitive, max_ratio = self._args  # Buffer to search, consider case, limit
+        best = [float('inf'), float('inf')]  # Strategy 1, normalized best seconds
+        start = 0.0                          # Timer
+
+        # TIME IT
+        fold('é')  # Build the translation table outside the timer
+        for _ in range(NUM_RUNS):
+            for index, strategy in enumerate((_search_file_text, _search_file_normalized)):
+                start = time.perf_counter()
+                self.assertEqual(_capture(strategy, 'bench', data, DIRTY_WORDS, 'utf-8',
+                                          case_sensitive, 'python'), (0, []))
+                best[index] = min(best[index], time.perf_counter() - start)
+
+        # DONE
+        return best[0], best[1], max_ratio
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        plain, normalized, max_ratio = return_value
+        print(f'\n{self.id()}: strategy 1 took {plain * 1000:.1f} ms, normalized took '
+              f'{normalized * 1000:.1f} ms ({normalized / plain:.2f}x)')
+        self.assertLessEqual(normalized / plain, max_ratio,
+                             f'The normalized search took {normalized * 1000:.1f} ms, strategy 1 '
+                             f'took {plain * 1000:.1f} ms')
+
+
+class NormalizeNormalBenchmark(NormalizeBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_ascii(self) -> None:
+        """ASCII text, case-sensitive."""
+        self.set_test_input((ASCII_LINE * LINE_COUNT).encode(), True, MAX_ASCII_RATIO)
+        self.run_this_test()
+
+    def test_n02_ascii_case_insensitive(self) -> None:
+        """ASCII text, case-insensitive."""
+        self.set_test_input((ASCII_LINE * LINE_COUNT).encode(), False, MAX_ASCII_RATIO)
+        self.run_this_test()
+
+    def test_n03_unicode(self) -> None:
+        """Text with accents and Cyrillic, case-sensitive."""
+        self.set_test_input((UNICODE_LINE * LINE_COUNT).encode(), True, MAX_RATIO)
+        self.run_this_test()
+
+    def test_n04_unicode_case_insensitive(self) -> None:
+        """Text with accents and Cyrillic, case-insensitive."""
+        self.set_test_input((UNICODE_LINE * LINE_COUNT).encode(), False, MAX_RATIO)
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
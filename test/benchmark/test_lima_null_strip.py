@@ -0,0 +1,111 @@
+"""Creates the strip_nulls() benchmark classes.
+
+    Prove the one-pass bytes.translate() behind Strategy 4 beats bytes.replace() followed by
+    bytes.lower() on null-heavy binaries.  Every test strips the same buffer both ways, best of
+    NUM_RUNS, and fails unless strip_nulls() is faster.  Raise BUFFER_SIZE to 1 << 30 to measure
+    1 GB binaries.
+
+    Typical usage example:
+
+    python -m test.benchmark                                # Runs all benchmarks
+    python -m test.benchmark.test_lima_null_strip           # Runs only these benchmarks
+    python -m test.benchmark.test_lima_null_strip -k n01    # Runs only this Normal 01
+"""
+# Standard Imports
+from typing import Any
+import os
+import random
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_prefilter import strip_nulls  # noqa: E402
+
+
+BUFFER_SIZE = 1 << 25   # Bytes per buffer
+NUM_RUNS = 3            # Best of NUM_RUNS, to filter out a noisy host
+MAX_RATIO = 0.8         # strip_nulls() time / bytes.replace() and bytes.lower() time
+
+
+class NullStripBenchmark(LivingManualUnitTest):
+    """Measures strip_nulls() against bytes.replace() and bytes.lower()."""
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function.
+
+        Returns:
+            Tuple of (baseline seconds, strip_nulls() seconds).
+        """
+        # LOCAL VARIABLES
+        data, case_sensitive = self._args   # Buffer to strip, fold case?
+        best = [float('inf'), float('inf')]  # Baseline, strip_nulls() best seconds
+        expected = b''                       # Baseline output
+        start = 0.0                          # Timer
+
+        # TIME IT
+        for _ in range(NUM_RUNS):
+            start = time.perf_counter()
+            expected = data.replace(b'\x00', b'')
+            expected = expected if case_sensitive else expected.lower()
+            best[0] = min(best[0], time.perf_counter() - start)
+            start = time.perf_counter()
+            self.assertEqual(strip_nulls(data, case_sensitive), expected)
+            best[1] = min(best[1], time.perf_counter() - start)
+
+        # DONE
+        return tuple(best)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        baseline, stripped = return_value
+        self.assertLessEqual(stripped / baseline, MAX_RATIO,
+                             f'strip_nulls() took {stripped * 1000:.1f} ms, bytes.replace() and '
+                             f'bytes.lower() took {baseline * 1000:.1f} ms')
+
+
+class NullStripNormalBenchmark(NullStripBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_utf16(self) -> None:
+        """UTF-16 text, case-sensitive."""
+        self.set_test_input(_get_utf16(), True)
+        self.run_this_test()
+
+    def test_n02_utf16_case_insensitive(self) -> None:
+        """UTF-16 text, case-insensitive."""
+        self.set_test_input(_get_utf16(), False)
+        self.run_this_test()
+
+    def test_n03_binary(self) -> None:
+        """Executable-like binary, one byte in five is null, case-sensitive."""
+        self.set_test_input(_get_binary(), True)
+        self.run_this_test()
+
+    def test_n04_binary_case_insensitive(self) -> None:
+        """Executable-like binary, one byte in five is null, case-insensitive."""
+        self.set_test_input(_get_binary(), False)
+        self.run_this_test()
+
+
+def _get_binary() -> bytes:
+    """BUFFER_SIZE bytes of random data, one byte in five null."""
+    rand = random.Random(0)  # Same buffer every run
+    block = bytearray(rand.randbytes(1 << 16))
+    for index in range(0, len(block), 5):
+        block[index] = 0
+    return bytes(block) * (BUFFER_SIZE >> 16)
+
+
+def _get_utf16() -> bytes:
+    """BUFFER_SIZE bytes of UTF-16 text."""
+    line = 'Lorem Ipsum Dolor Sit Amet, consectetur adipiscing elit.\n'.encode('utf-16-le')
+    return line * (BUFFER_SIZE // len(line))
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,112 @@
+"""Creates the Prefilter benchmark classes.
+
+    Prove the prefilter pays for itself on a clean corpus.  Every test searches the same directory
+    of clean text and binary files with and without the prefilter, best of NUM_RUNS, and fails
+    unless the prefiltered search is faster.
+
+    Typical usage example:
+
+    python -m test.benchmark                                # Runs all benchmarks
+    python -m test.benchmark.test_lima_prefilter            # Runs only these benchmarks
+    python -m test.benchmark.test_lima_prefilter -k n01     # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+import os
+import random
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_engine import ENGINE_PYTHON  # noqa: E402
+from lima.lima_prefilter import PREFILTER_STATS  # noqa: E402
+from lima.lima_search import search_dir  # noqa: E402
+
+
+NUM_FILES = 60          # Clean files in the corpus, half text and half binary
+FILE_SIZE = 1 << 16     # Bytes per file
+NUM_RUNS = 3            # Best of NUM_RUNS, to filter out a noisy host
+MAX_RATIO = 0.8         # Prefiltered time / full time must not exceed this
+DIRTY_WORDS = ['Before Guido', 'Waiting...', 'Dragon Feet', 'missing dirty word']
+
+
+class PrefilterBenchmark(LivingManualUnitTest):
+    """Measures search_dir() on a clean corpus with and without the prefilter."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None   # TemporaryDirectory holding the corpus
+
+    def setUp(self) -> None:
+        """Write the clean corpus."""
+        rand = random.Random(0)  # Same corpus every run
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        for num in range(NUM_FILES):
+            if num % 2:
+                data = bytes(rand.getrandbits(8) for _ in range(FILE_SIZE))
+            else:
+                data = ' '.join(rand.choice(['lorem', 'ipsum', 'dolor', 'sit', 'amet\n'])
+                                for _ in range(FILE_SIZE // 6)).encode()
+            (Path(self._temp_dir.name) / f'clean{num}.bin').write_bytes(data)
+
+    def tearDown(self) -> None:
+        """Remove the corpus."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function.
+
+        Returns:
+            Tuple of (full seconds, prefiltered seconds).
+        """
+        # LOCAL VARIABLES
+        best = {False: float('inf'), True: float('inf')}  # prefilter -> best seconds
+
+        # TIME IT
+        PREFILTER_STATS.reset()
+        for _ in range(NUM_RUNS):
+            for prefilter in best:
+                start = time.perf_counter()
+                self.assertEqual(search_dir(Path(self._temp_dir.name), DIRTY_WORDS, 'utf-8',
+                                            *self._args, engine=ENGINE_PYTHON,
+                                            prefilter=prefilter), 0)
+                best[prefilter] = min(best[prefilter], time.perf_counter() - start)
+
+        # DONE
+        return best[False], best[True]
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        full, prefiltered = return_value
+        self.assertLessEqual(prefiltered / full, MAX_RATIO,
+                             f'Prefiltered search took {prefiltered * 1000:.1f} ms, full search '
+                             f'took {full * 1000:.1f} ms.  {PREFILTER_STATS.summary()}')
+        self.assertEqual(PREFILTER_STATS.checked, NUM_FILES * NUM_RUNS)
+
+
+class PrefilterNormalBenchmark(PrefilterBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_clean_corpus(self) -> None:
+        """The prefilter makes a case-sensitive search of a clean corpus faster."""
+        self.set_test_input(True)
+        self.run_this_test()
+
+    def test_n02_clean_corpus_case_insensitive(self) -> None:
+        """The prefilter makes a case-insensitive search of a clean corpus faster."""
+        self.set_test_input(False)
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,107 @@
+"""Creates the word list reload benchmark classes.
+
+    Prove a reloaded word list doesn't stall the next search while its matcher is rebuilt.  Every
+    test builds a matcher for WORD_COUNT dirty words, adds ADDED_COUNT words, and times the first
+    search with the changed list (a StagedMatcher) against building its matcher from scratch.  It
+    fails unless the staged search is at most MAX_RATIO of the build.  Engines that aren't
+    installed are skipped.
+
+    Typical usage example:
+
+    python -m test.benchmark                          # Runs all benchmarks
+    python -m test.benchmark.test_lima_reload         # Runs only these benchmarks
+    python -m test.benchmark.test_lima_reload -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from typing import Any, List
+import os
+import random
+import string
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_engine import (ENGINE_AHOCORASICK, ENGINE_HYPERSCAN,  # noqa: E402
+                              StagedMatcher, get_available_engines, get_matcher)
+
+
+WORD_COUNT = 200000     # Dirty words before the reload
+ADDED_COUNT = 10        # Dirty words the reload adds
+MAX_RATIO = 0.25        # Staged search seconds / full build seconds
+COMPACT_TIMEOUT = 120.0  # Seconds to wait for the full matcher, so it doesn't slow other tests
+HAYSTACK = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n' * 1000
+
+
+class ReloadBenchmark(LivingManualUnitTest):
+    """Measures the first search after a reload against a full matcher build."""
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function.
+
+        Returns:
+            Tuple of (full build seconds, staged search seconds).
+        """
+        # LOCAL VARIABLES
+        engine = self._args[0]  # Engine to measure
+        words = _get_words(WORD_COUNT + ADDED_COUNT)  # Dirty words after the reload
+        base = None             # Matcher for the words before the reload
+        matcher = None          # Matcher for the words after the reload
+        start = 0.0             # Timer
+        seconds = [0.0, 0.0]    # Full build, staged search seconds
+
+        # TIME IT
+        base = get_matcher(words[:WORD_COUNT], engine)
+        start = time.perf_counter()
+        matcher = get_matcher(words, engine)
+        found = matcher.search(HAYSTACK)
+        seconds[1] = time.perf_counter() - start
+        self.assertIsInstance(matcher, StagedMatcher)
+        start = time.perf_counter()
+        self.assertEqual(type(base)(words).search(HAYSTACK), found)
+        seconds[0] = time.perf_counter() - start
+        self.assertTrue(matcher.compacted.wait(COMPACT_TIMEOUT))
+
+        # DONE
+        return tuple(seconds)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        full, staged = return_value
+        self.assertLessEqual(staged / full, MAX_RATIO,
+                             f'The staged search took {staged * 1000:.1f} ms, building from '
+                             f'scratch took {full * 1000:.1f} ms')
+
+    def run_engine(self, engine: str) -> None:
+        """Measure engine, if it is installed."""
+        if engine not in get_available_engines():
+            self.skipTest(f'The "{engine}" engine is not installed')
+        self.set_test_input(engine)
+        self.run_this_test()
+
+
+class ReloadNormalBenchmark(ReloadBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_ahocorasick(self) -> None:
+        """pyahocorasick."""
+        self.run_engine(ENGINE_AHOCORASICK)
+
+    def test_n02_hyperscan(self) -> None:
+        """hyperscan."""
+        self.run_engine(ENGINE_HYPERSCAN)
+
+
+def _get_words(count: int) -> List[str]:
+    """count random lowercase dirty words, the same ones every run."""
+    rand = random.Random(0)  # Same words every run
+    return [''.join(rand.choices(string.ascii_lowercase, k=rand.randint(5, 14)))
+            for _ in range(count)]
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,158 @@
+"""Creates the Startup benchmark classes.
+
+    Guard the cold start of the `lima` command line.  Every test runs `python -X importtime -m lima`
+    in a fresh interpreter, each time right after a bare interpreter (`python -c pass`) so both
+    see the same host load, and fails if the imports, or the whole run, take more than a multiple
+    of the bare interpreter's in every pair of runs.  Bytecode is cached in a temporary directory
+    first, as it would be for an installed package, and the pure-Python engine is used so optional
+    accelerators don't count.
+
+    Typical usage example:
+
+    python -m test.benchmark                                # Runs all benchmarks
+    python -m test.benchmark.test_lima_startup              # Runs only these benchmarks
+    python -m test.benchmark.test_lima_startup -k n01       # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Tuple
+import os
+import subprocess
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+
+
+# About 1.5 times the ratios measured (4 to 6 for imports, 3 to 4 for wall time), so a regression
+# that adds half of what lima imports fails
+IMPORT_RATIO = 7.5          # Times the import time of a bare interpreter `lima file` may take
+WALL_RATIO = 5.5            # Times the wall time of a bare interpreter `lima file` may take
+NUM_RUNS = 10               # Best of NUM_RUNS pairs of runs, to filter out a noisy host
+# Modules only the watch and serve sub-commands need
+HEAVY_MODULES = ['concurrent.futures', 'multiprocessing', 'ctypes', 'socket', 'json']
+
+
+def run_importtime(args: List[str], baseline_args: List[str],
+                   pycache_dir: str) -> Tuple[float, float, Dict[str, int]]:
+    """Run `python -X importtime <args>` from the repo, right after <baseline_args>, NUM_RUNS times.
+
+    Each pair of runs sees about the same host load, so the ratio of their times is steadier than
+    either time.
+
+    Args:
+        args: Interpreter arguments of the measured command.
+        baseline_args: Interpreter arguments of the command it is compared to.
+        pycache_dir: Directory to cache bytecode in.  The first, warm-up, runs fill it.
+
+    Returns:
+        Tuple of (lowest wall time ratio, lowest import time ratio, a dictionary of the module
+        names the measured command imported, in its quickest run, mapped to their self time in
+        microseconds).
+    """
+    # LOCAL VARIABLES
+    best = (float('inf'), float('inf'), {})  # Return value
+    best_import_ms = float('inf')            # Import time of the quickest measured run
+    times = []                               # (wall, import) milliseconds of the pair's runs
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache_dir)  # Interpreter environment
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    # RUN IT
+    for run_args in (baseline_args, args):
+        subprocess.run([sys.executable] + run_args, cwd=REPO_DIR, env=env, capture_output=True,
+                       check=False)  # Warm up the bytecode cache
+    for _ in range(NUM_RUNS):
+        times = []
+        for run_args in (baseline_args, args):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, '-X', 'importtime'] + run_args,
+                                    cwd=REPO_DIR, env=env, capture_output=True, text=True,
+                                    check=False)
+            modules = _parse_importtime(result.stderr)
+            times.append(((time.perf_counter() - start) * 1000, sum(modules.values()) / 1000))
+        if times[1][1] < best_import_ms:
+            best_import_ms = times[1][1]
+            best = (best[0], best[1], modules)
+        best = (min(best[0], times[1][0] / times[0][0]), min(best[1], times[1][1] / times[0][1]),
+                best[2])
+
+    # DONE
+    return best
+
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map each module in `-X importtime` output to its self time, in microseconds."""
+    modules = {}  # Return value
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            fields = line[len('import time:'):].split('|')
+            if fields[0].strip().isdigit():
+                modules[fields[2].strip()] = int(fields[0])
+    return modules
+
+
+class StartupBenchmark(LivingManualUnitTest):
+    """Measures the cold start of `lima file` on a 1 KB file against a bare interpreter."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None   # TemporaryDirectory holding the target and word list
+        self._lima_args = []    # Command line arguments for a `lima file` run
+
+    def setUp(self) -> None:
+        """Write a clean 1 KB target and a small word list."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        target = Path(self._temp_dir.name) / 'target.txt'
+        words = Path(self._temp_dir.name) / 'words.txt'
+        target.write_text(('All work and no play makes Jack a dull boy.\n' * 24)[:1024])
+        words.write_text('Before Guido\nWaiting...\nDragon Feet\n')
+        self._lima_args = ['-m', 'lima', 'file', '-f', str(target), '-w', str(words), '--local',
+                           '--engine', 'python']
+
+    def tearDown(self) -> None:
+        """Remove the temporary files."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function."""
+        # LOCAL VARIABLES
+        pycache_dir = os.path.join(self._temp_dir.name, 'pycache')  # Bytecode cache
+
+        # DONE
+        # `lima file`, each time after a bare interpreter
+        return run_importtime(self._lima_args, ['-c', 'pass'], pycache_dir)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        wall_ratio, import_ratio, modules = return_value
+        self.assertIn('lima.lima_main', modules, 'Unable to parse the -X importtime output')
+        self.assertLessEqual(import_ratio, IMPORT_RATIO,
+                             f'Imports took {import_ratio:.1f} times as long as a bare '
+                             f'interpreter\'s, over {IMPORT_RATIO}.  Slowest: ' +
+                             ', '.join(f'{name} ({usec} us)' for name, usec in sorted(
+                                 modules.items(), key=lambda item: -item[1])[:5]))
+        self.assertLessEqual(wall_ratio, WALL_RATIO,
+                             f'`lima file` took {wall_ratio:.1f} times as long as a bare '
+                             f'interpreter, over {WALL_RATIO}')
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, modules, f'`lima file` imported {module}')
+
+
+class StartupNormalBenchmark(StartupBenchmark):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_file_startup(self) -> None:
+        """`lima file` on a 1 KB file starts within its ratio and skips the heavy subsystems."""
+        self.set_test_input()
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
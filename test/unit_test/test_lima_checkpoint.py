@@ -0,0 +1,189 @@
+"""Creates the SearchDirCheckpoint test classes.
+
+    Facilitate unit testing of lima.lima_search.search_dir(checkpoint_path=...) by interrupting
+    and resuming searches of a temporary directory tree.
+
+    Typical usage example:
+
+    python -m unittest                                    # Runs every test case it can find
+    python -m test.unit_test                              # Runs all unit test cases
+    python -m test.unit_test.test_lima_checkpoint         # Runs only these test cases
+    python -m test.unit_test.test_lima_checkpoint -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Tuple
+import json
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_search import search_dir  # noqa: E402
+
+
+# Relative path -> contents of the directory tree
+TREE = {'a.txt': 'clean\n', 'b.txt': 'dirty\n', 'sub/c.txt': 'one\ndirty two\n',
+        'sub/d.txt': 'clean\n', 'sub/deeper/e.txt': 'dirty\n', 'sub/deeper/f.txt': 'clean\n'}
+
+
+class SearchDirCheckpointUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_dir() with a checkpoint and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None    # TemporaryDirectory holding the tree and the checkpoint
+        self._tree = None        # Directory to search
+        self._checkpoint = None  # Checkpoint file
+
+    def setUp(self) -> None:
+        """Create the directory tree."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name) / 'tree'
+        self._checkpoint = Path(self._temp_dir.name) / 'scan.ckpt'
+        for rel_path, contents in TREE.items():
+            (self._tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            (self._tree / rel_path).write_text(contents)
+
+    def tearDown(self) -> None:
+        """Remove the directory tree."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_dir() return value and the sorted findings.
+        """
+        return_value, findings = _capture(search_dir, *self._args, **self._kwargs)
+        return return_value, sorted(findings)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_expected(self) -> Tuple[int, List[str]]:
+        """Search the tree without a checkpoint."""
+        return_value, findings = _capture(search_dir, self._tree, ['dirty'], 'utf-8',
+                                          recursive=True)
+        return return_value, sorted(findings)
+
+    def get_records(self) -> List[dict]:
+        """Read every checkpoint record."""
+        return [json.loads(line) for line in self._checkpoint.read_text().splitlines()]
+
+
+class SearchDirCheckpointNormalUnitTest(SearchDirCheckpointUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_fresh(self) -> None:
+        """A fresh checkpoint reports the same findings and records every file and directory."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            checkpoint_path=self._checkpoint)
+        self.expect_return(self.get_expected())
+        self.run_this_test()
+        records = self.get_records()
+        self.assertEqual(sorted(record['f'] for record in records if 'f' in record),
+                         sorted(TREE))
+        self.assertEqual(sorted(record['d'] for record in records if 'd' in record),
+                         ['.', 'sub', 'sub/deeper'])
+
+    def test_n02_resume(self) -> None:
+        """Interrupted after two files: resumes without rescanning or duplicating findings."""
+        expected = self.get_expected()
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            checkpoint_path=self._checkpoint)
+        self.call_callable()
+        # Keep the settings and the first two file records, then tear the next record
+        lines = self._checkpoint.read_bytes().splitlines(keepends=True)
+        self._checkpoint.write_bytes(b''.join(lines[:3]) + lines[3][:5])
+        done = [json.loads(line)['f'] for line in lines[1:3]]
+        for rel_path in done:
+            (self._tree / rel_path).write_text('dirty, but already searched\n')
+        self.expect_return(expected)
+        self.run_this_test()
+        records = self.get_records()  # The torn record was dropped
+        self.assertEqual(sorted(record['f'] for record in records if 'f' in record),
+                         sorted(TREE))
+
+    def test_n03_complete(self) -> None:
+        """A completed checkpoint replays its findings without searching anything."""
+        expected = self.get_expected()
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            checkpoint_path=self._checkpoint)
+        self.call_callable()
+        for rel_path in TREE:
+            (self._tree / rel_path).unlink()
+        self.expect_return(expected)
+        self.run_this_test()
+
+    def test_n04_not_recursive(self) -> None:
+        """Not recursive: child directories are neither searched nor recorded."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint)
+        self.expect_return((3, [f'{(self._tree / "b.txt").absolute()} : line 1 : "dirty" found '
+                                'in "dirty"']))
+        self.run_this_test()
+        self.assertEqual([record['d'] for record in self.get_records() if 'd' in record], ['.'])
+
+
+class SearchDirCheckpointErrorUnitTest(SearchDirCheckpointUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_different_words(self) -> None:
+        """ValueError: checkpoint of a search with different dirty words."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint)
+        self.call_callable()
+        self.set_test_input(self._tree, ['other'], 'utf-8', checkpoint_path=self._checkpoint)
+        self.expect_exception(ValueError, 'not a checkpoint of this search')
+        self.run_this_test()
+
+    def test_e02_not_a_checkpoint(self) -> None:
+        """ValueError: checkpoint_path holds something else, which is left alone."""
+        self._checkpoint.write_text('precious\n')
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint)
+        self.expect_exception(ValueError, 'is not a checkpoint')
+        self.run_this_test()
+        self.assertEqual(self._checkpoint.read_text(), 'precious\n')
+
+    def test_e03_bad_checkpoint_path(self) -> None:
+        """TypeError: checkpoint_path is not a Path."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=str(self._checkpoint))
+        self.expect_exception(TypeError, 'checkpoint_path')
+        self.run_this_test()
+
+    def test_e04_different_options(self) -> None:
+        """ValueError: checkpoint of a search with an option that changes the findings."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint)
+        self.call_callable()
+        for option in ('sections', 'decompress', 'extract', 'plugins', 'normalize'):
+            self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint,
+                                **{option: True})
+            self.expect_exception(ValueError, 'not a checkpoint of this search')
+            self.run_this_test()
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', checkpoint_path=self._checkpoint,
+                            engine='python')
+        self.expect_exception(ValueError, 'not a checkpoint of this search')
+        self.run_this_test()
+
+
+def _capture(func, *args, **kwargs) -> Tuple[int, List[str]]:
+    """Call func and return its return value and the lines it printed to stderr."""
+    stderr = StringIO()  # Captured findings
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+        with RedirectStdStreams(stdout=devnull, stderr=stderr):
+            return_value = func(*args, **kwargs)
+    return return_value, stderr.getvalue().splitlines()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,366 @@
+"""Creates the SearchFileDecompress test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(decompress=...) and
+    lima.lima_decompress by searching compressed files, and 7z archives built by a minimal writer.
+
+    Typical usage example:
+
+    python -m unittest                                    # Runs every test case it can find
+    python -m test.unit_test                              # Runs all unit test cases
+    python -m test.unit_test.test_lima_decompress         # Runs only these test cases
+    python -m test.unit_test.test_lima_decompress -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Sequence, Set, Tuple
+import bz2
+import gzip
+import lzma
+import os
+import struct
+import sys
+import tracemalloc
+import zlib
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_decompress import DECOMPRESS_STATS, detect_format  # noqa: E402
+from lima.lima_report import parse_finding  # noqa: E402
+from lima.lima_search import search_dir, search_file  # noqa: E402
+
+
+# CORPUS entries for the 7z inputs
+ARCHIVES = [entry for entry in CORPUS if entry[0].endswith('.7z')]
+LZMA2_PROPERTY = 16           # 7z LZMA2 coder property byte for...
+LZMA2_DICT_SIZE = 1 << 20     # ...this dictionary size
+LZMA1_FILTER = {'id': lzma.FILTER_LZMA1, 'dict_size': 1 << 16, 'lc': 3, 'lp': 0, 'pb': 2}
+# 7z coders: (coder ID, coder properties, lzma raw filter chain or other compress function)
+COPY = (b'\x00', b'', None)
+LZMA2 = (b'\x21', bytes([LZMA2_PROPERTY]), [{'id': lzma.FILTER_LZMA2,
+                                             'dict_size': LZMA2_DICT_SIZE}])
+LZMA1 = (b'\x03\x01\x01', bytes([(2 * 5 + 0) * 9 + 3]) + struct.pack('<I', 1 << 16),
+         [LZMA1_FILTER])
+DEFLATE = (b'\x04\x01\x08', b'', None)
+BZIP2 = (b'\x04\x02\x02', b'', None)
+AES = (b'\x06\xf1\x07\x01', b'', None)  # Encrypted: not supported
+TEXT = 'The quick brown fox\njumps over the {} dog\n'  # Member contents, repeated
+
+
+def _member(word: str) -> bytes:
+    """Contents of a member that compresses well, so word doesn't appear in the clear."""
+    return (TEXT.format(word) * 100).encode()
+
+
+def _number(value: int) -> bytes:
+    """Encode a 7z variable-length NUMBER."""
+    for extra in range(8):
+        if value < 1 << (8 * extra + 7 - extra):
+            first = (0xFF << (8 - extra)) & 0xFF | value >> (8 * extra)
+            return bytes([first]) + (value & ((1 << 8 * extra) - 1)).to_bytes(extra, 'little')
+    return b'\xff' + value.to_bytes(8, 'little')
+
+
+def _pack(coders: Sequence[Tuple[bytes, bytes, Any]], data: bytes) -> bytes:
+    """Compress data the way a 7z folder coded with coders stores it."""
+    coder_id = coders[-1][0]
+    if coder_id == COPY[0]:
+        return data
+    if coder_id == DEFLATE[0]:
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if coder_id == BZIP2[0]:
+        return bz2.compress(data)
+    if coder_id == AES[0]:
+        return bytes(len(data))
+    filters = [{'id': lzma.FILTER_X86}] * (len(coders) - 1) + coders[-1][2]
+    return lzma.compress(data, format=lzma.FORMAT_RAW, filters=filters)
+
+
+def _streams_info(pack_offset: int, folders: List[Tuple[Sequence, bytes, List[int]]]) -> bytes:
+    """Encode a 7z StreamsInfo for folders of (coders, packed bytes, file sizes)."""
+    info = b'\x06' + _number(pack_offset) + _number(len(folders)) + b'\x09'
+    info += b''.join(_number(len(packed)) for _, packed, _ in folders) + b'\x00'
+    info += b'\x07\x0b' + _number(len(folders)) + b'\x00'
+    for coders, _, _ in folders:
+        info += _number(len(coders))
+        for coder_id, properties, _ in coders:
+            info += bytes([len(coder_id) | (0x20 if properties else 0)]) + coder_id
+            if properties:
+                info += _number(len(properties)) + properties
+        info += b''.join(_number(index) + _number(index + 1) for index in range(len(coders) - 1))
+    info += b'\x0c' + b''.join(_number(sum(sizes)) * len(coders)
+                               for coders, _, sizes in folders) + b'\x00'
+    info += b'\x08\x0d' + b''.join(_number(len(sizes)) for _, _, sizes in folders) + b'\x09'
+    info += b''.join(_number(size) for _, _, sizes in folders for size in sizes[:-1])
+    return info + b'\x00\x00'
+
+
+def make_7z(folders: List[Tuple[Sequence, List[Tuple[str, bytes]]]], empty: Sequence[str] = (),
+            encode_header: bool = False) -> bytes:
+    """Build a 7z archive.
+
+    Args:
+        folders: (coders, [(file name, contents)]) of each folder.
+        empty: Optional; Names of empty files, listed after the others.
+        encode_header: Optional; Compress the header with LZMA2, hiding the file names.
+    """
+    packed_folders = [(coders, _pack(coders, b''.join(data for _, data in files)),
+                       [len(data) for _, data in files]) for coders, files in folders]
+    names = [name for _, files in folders for name, _ in files] + list(empty)
+    body = b''.join(packed for _, packed, _ in packed_folders)
+    header = b'\x01\x04' + _streams_info(0, packed_folders) + b'\x05' + _number(len(names))
+    if empty:
+        bits = [name in empty for name in names]
+        vector = bytes(sum(0x80 >> index for index, bit in enumerate(bits[start:start + 8]) if bit)
+                       for start in range(0, len(bits), 8))
+        header += b'\x0e' + _number(len(vector)) + vector
+    encoded_names = b'\x00' + ''.join(name + '\x00' for name in names).encode('utf-16-le')
+    header += b'\x11' + _number(len(encoded_names)) + encoded_names + b'\x00\x00'
+    if encode_header:
+        packed = _pack([LZMA2], header)
+        header = b'\x17' + _streams_info(len(body), [([LZMA2], packed, [len(header)])])
+        body += packed
+    start_header = struct.pack('<QQI', len(body), len(header), zlib.crc32(header))
+    return (b'7z\xbc\xaf\x27\x1c\x00\x04' + struct.pack('<I', zlib.crc32(start_header))
+            + start_header + body + header)
+
+
+class SearchFileDecompressUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the (label, dirty word) findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the compressed files
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Zero the decompress stats."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        DECOMPRESS_STATS.reset()
+
+    def tearDown(self) -> None:
+        """Remove the compressed files."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, Set[Tuple[str, str]]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the (finding label, dirty word)
+            of every finding.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, {(finding.split(' : ')[0], parse_finding(finding)[2])
+                              for finding in findings}
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_target(self, input_name: str) -> Path:
+        """Path to the input_name test input."""
+        return Path(self._test_input_dir) / self._input_filename.format(input_name)
+
+    def write(self, name: str, contents: bytes) -> Path:
+        """Write a temporary compressed file."""
+        target = Path(self._temp_dir.name) / name
+        target.write_bytes(contents)
+        return target
+
+    def label(self, target: Path, member: str) -> str:
+        """Finding label of target's member."""
+        return f'{target.absolute()} (member {member})'
+
+
+class SearchFileDecompressNormalUnitTest(SearchFileDecompressUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_single_member(self) -> None:
+        """xz, lzma, bzip2 and gzip payloads are searched, one member each."""
+        data = _member('lazy')
+        for name, contents in (('a.txt.xz', lzma.compress(data)),
+                               ('b.txt.lzma', lzma.compress(data, format=lzma.FORMAT_ALONE)),
+                               ('c.txt.bz2', bz2.compress(data)),
+                               ('d.txt.gz', gzip.compress(data))):
+            target = self.write(name, contents)
+            self.assertIsNotNone(detect_format(contents), name)
+            self.set_test_input(target, ['lazy'], 'utf-8')
+            self.expect_return((0, set()))
+            self.run_this_test()
+            self.set_test_input(target, ['lazy'], 'utf-8', decompress=True)
+            self.expect_return((3, {(self.label(target, name.rsplit('.', 1)[0]), 'lazy')}))
+            self.run_this_test()
+        self.assertEqual((DECOMPRESS_STATS.files, DECOMPRESS_STATS.members), (4, 4))
+        self.assertEqual(DECOMPRESS_STATS.bytes, 4 * len(data))
+
+    def test_n02_7z_corpus(self) -> None:
+        """The 7z test inputs: the LZMA2 member is searched too, and only adds findings."""
+        for input_name, dirty_words, encoding in ARCHIVES:
+            target = self.get_target(input_name)
+            self.set_test_input(target, dirty_words, encoding)
+            return_value, findings = self.call_callable()
+            self.set_test_input(target, dirty_words, encoding, decompress=True)
+            member_value, member_findings = self.call_callable()
+            self.assertGreaterEqual(member_value, return_value, input_name)
+            self.assertTrue(findings.issubset(member_findings), input_name)
+        self.set_test_input(self.get_target('Normal19-input.7z'), ['reading'], 'utf-8',
+                            decompress=True)
+        return_value, findings = self.call_callable()
+        self.assertIn((self.label(self.get_target('Normal19-input.7z'), 'test_input.txt'),
+                       'reading'), findings)
+        self.assertEqual(DECOMPRESS_STATS.members, len(ARCHIVES) + 1)
+        self.assertEqual(DECOMPRESS_STATS.failed, [])
+
+    def test_n03_7z_solid(self) -> None:
+        """One LZMA2 folder holding several files, plus an empty file, under an encoded header."""
+        files = [('one.txt', _member('sleepy')),
+                 ('two.txt', _member('lazy')),
+                 ('three.txt', _member('dirty') * 1000)]
+        contents = make_7z([([LZMA2], files)], empty=['empty.txt'], encode_header=True)
+        self.assertNotIn('three.txt'.encode('utf-16-le'), contents)
+        target = self.write('solid.7z', contents)
+        self.set_test_input(target, ['lazy', 'dirty'], 'utf-8', decompress=True)
+        self.expect_return((3, {(self.label(target, 'two.txt'), 'lazy'),
+                                (self.label(target, 'three.txt'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual(DECOMPRESS_STATS.members, 3)
+        self.assertEqual(DECOMPRESS_STATS.bytes, sum(len(data) for _, data in files))
+
+    def test_n04_7z_coders(self) -> None:
+        """Copy, LZMA, BCJ + LZMA, Deflate and BZip2 folders."""
+        folders = [(coders, [(f'{index}.txt', _member(f'dirty{index}'))])
+                   for index, coders in enumerate(([COPY], [LZMA1], [(b'\x03\x03\x01\x03', b'',
+                                                                     None), LZMA1],
+                                                   [DEFLATE], [BZIP2]))]
+        target = self.write('coders.7z', make_7z(folders))
+        words = [f'dirty{index}' for index in range(len(folders))]
+        self.set_test_input(target, words, 'utf-8', decompress=True)
+        return_value, findings = self.call_callable()
+        self.assertEqual(return_value, 3)
+        self.assertTrue({(self.label(target, f'{index}.txt'), word)
+                         for index, word in enumerate(words)}.issubset(findings))
+        self.assertEqual(DECOMPRESS_STATS.failed, [])
+
+    def test_n05_search_dir(self) -> None:
+        """search_dir() passes decompress to every file, and reports name the archive."""
+        self.write('a.txt.xz', lzma.compress(_member('dirty')))
+        self.write('b.7z', make_7z([([LZMA2], [('b.txt', _member('dirty'))])]))
+        self.write('c.txt', b'clean')
+        return_value, findings = _capture(search_dir, Path(self._temp_dir.name), ['dirty'],
+                                          'utf-8', decompress=True)
+        self.assertEqual(return_value, 3)
+        self.assertEqual(sorted({parse_finding(finding)[0] for finding in findings}),
+                         [str(Path(self._temp_dir.name, name).absolute())
+                          for name in ('a.txt.xz', 'b.7z')])
+        self.assertEqual(DECOMPRESS_STATS.files, 2)
+
+
+class SearchFileDecompressSpecialUnitTest(SearchFileDecompressUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_streaming(self) -> None:
+        """A 32 MiB payload is searched one chunk at a time, never held in memory."""
+        size = 32 << 20
+        compressor = bz2.BZ2Compressor()
+        contents = b''.join(compressor.compress(b'\x00' * (1 << 20)) for _ in range(size >> 20))
+        contents += compressor.compress(b'dirty') + compressor.flush()
+        target = self.write('big.bin.bz2', contents)
+        tracemalloc.start()
+        try:
+            self.set_test_input(target, ['dirty'], 'utf-8', decompress=True)
+            self.expect_return((3, {(self.label(target, 'big.bin'), 'dirty')}))
+            self.run_this_test()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 4 << 20)
+        self.assertEqual(DECOMPRESS_STATS.bytes, size + len(b'dirty'))
+
+    def test_s02_zstd(self) -> None:
+        """zstd is searched if a zstd library is installed, and recorded as not decoded if not."""
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+            contents = zstandard.ZstdCompressor().compress(_member('dirty'))
+        except ImportError:
+            try:
+                from compression import zstd  # pylint: disable=import-outside-toplevel
+                contents = zstd.compress(_member('dirty'))
+            except ImportError:
+                contents = None
+        target = self.write('a.txt.zst', contents or b'\x28\xb5\x2f\xfd' + bytes(16))
+        self.set_test_input(target, ['dirty'], 'utf-8', decompress=True)
+        if contents:
+            return_value, findings = self.call_callable()
+            self.assertEqual(return_value, 3)
+            self.assertIn((self.label(target, 'a.txt'), 'dirty'), findings)
+        else:
+            self.expect_return((0, set()))
+            self.run_this_test()
+            self.assertEqual(DECOMPRESS_STATS.failed, [{'path': str(target.absolute()),
+                                                        'detail': 'zstd support is not installed'}])
+
+    def test_s03_corrupt(self) -> None:
+        """Corrupt members are recorded, findings made before the corruption stand."""
+        compressed = lzma.compress(_member('dirty') * 50 + os.urandom(1 << 17))
+        target = self.write('a.txt.xz', compressed[:len(compressed) // 2])
+        self.set_test_input(target, ['dirty'], 'utf-8', decompress=True)
+        self.expect_return((3, {(self.label(target, 'a.txt'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual([record['path'] for record in DECOMPRESS_STATS.failed],
+                         [self.label(target, 'a.txt')])
+        DECOMPRESS_STATS.reset()
+        contents = bytearray(make_7z([([LZMA2], [('a.txt', os.urandom(1 << 17)),
+                                                 ('b.txt', _member('dirty'))])]))
+        contents[32] = 0  # The first LZMA2 chunk is now the end of the pack stream
+        target = self.write('a.7z', bytes(contents))
+        self.set_test_input(target, ['dirty'], 'utf-8', decompress=True)
+        self.expect_return((0, set()))
+        self.run_this_test()
+        self.assertEqual([record['path'] for record in DECOMPRESS_STATS.failed],
+                         [self.label(target, 'a.txt'), self.label(target, 'b.txt')])
+
+    def test_s04_unsupported_coder(self) -> None:
+        """Unsupported folders (e.g., encrypted) are recorded, the other folders are searched."""
+        data = _member('dirty')
+        target = self.write('a.7z', make_7z([([AES], [('secret.txt', data)]),
+                                             ([LZMA2], [('open.txt', data)])]))
+        self.set_test_input(target, ['dirty'], 'utf-8', decompress=True)
+        self.expect_return((3, {(self.label(target, 'open.txt'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual([record['path'] for record in DECOMPRESS_STATS.failed],
+                         [self.label(target, 'secret.txt')])
+
+    def test_s05_not_compressed(self) -> None:
+        """Everything else is searched as usual, and only once."""
+        input_name, dirty_words, encoding = CORPUS[1]
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding)
+        self.expect_return(self.call_callable())
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding, decompress=True)
+        self.run_this_test()
+        self.assertEqual(DECOMPRESS_STATS.files, 0)
+
+
+class SearchFileDecompressErrorUnitTest(SearchFileDecompressUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_decompress_type(self) -> None:
+        """TypeError: decompress is not a bool."""
+        self.set_test_input(self.get_target('Normal19-input.7z'), ['dirty'], 'utf-8',
+                            decompress='yes')
+        self.expect_exception(TypeError, 'decompress')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
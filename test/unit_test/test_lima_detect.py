@@ -0,0 +1,204 @@
+"""Creates the SearchFileDetect test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(encoding='auto') and lima.lima_detect
+    by searching files that mix UTF-8, UTF-16, UTF-32 and Latin-1.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_detect         # Runs only these test cases
+    python -m test.unit_test.test_lima_detect -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Tuple
+import gzip
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_detect import (DETECT_CACHE, DETECT_STATS, SAMPLE_SIZE,  # noqa: E402
+                              detect_encoding, strip_bom)
+from lima.lima_search import search_dir, search_file, search_stream  # noqa: E402
+from lima.lima_words import prepare_dirty_words  # noqa: E402
+
+
+TEXT = 'clean\nvery dirtÿ word\n'  # Needs a codec that holds ÿ, and a strategy 1 finding
+# Codec a file is written with -> codec detected
+NATIVE = f'{sys.byteorder[0]}e'  # The utf-16 and utf-32 codecs encode in native byte order
+CODECS = {'utf-8': 'utf-8', 'utf-8-sig': 'utf-8', 'utf-16': f'utf-16-{NATIVE}',
+          'utf-16-le': 'utf-16-le', 'utf-16-be': 'utf-16-be', 'utf-32': f'utf-32-{NATIVE}',
+          'utf-32-le': 'utf-32-le', 'utf-32-be': 'utf-32-be', 'latin-1': 'latin-1'}
+
+
+class SearchFileDetectUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the searched files
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Make room for the searched files, and forget every detected encoding."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        DETECT_CACHE.clear()
+        DETECT_STATS.reset()
+
+    def tearDown(self) -> None:
+        """Remove the searched files."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and its findings, minus the label.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, [finding.split(' : ', 1)[1] for finding in findings]
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def write(self, name: str, contents: bytes) -> Path:
+        """Write a temporary file to search."""
+        target = Path(self._temp_dir.name) / name
+        target.write_bytes(contents)
+        return target
+
+
+class SearchFileDetectNormalUnitTest(SearchFileDetectUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_codecs(self) -> None:
+        """Every codec is detected, with or without a byte order mark."""
+        for codec, detected in CODECS.items():
+            self.assertEqual(detect_encoding(TEXT.encode(codec)), detected, codec)
+
+    def test_n02_search_codecs(self) -> None:
+        """Strategy 1 finds the dirty word in every codec, without a byte order mark on line 1."""
+        for codec in CODECS:
+            target = self.write(codec, f'dirtÿ\n{TEXT}'.encode(codec))
+            self.set_test_input(target, ['dirtÿ'], 'auto')
+            self.expect_return((3, ['line 1 : "dirtÿ" found in "dirtÿ"',
+                                    'line 3 : "dirtÿ" found in "very dirtÿ word"']))
+            self.run_this_test()
+
+    def test_n03_parity(self) -> None:
+        """Detecting finds the same dirty words as utf-8 in every utf-8 test input."""
+        for input_name, dirty_words, encoding in CORPUS:
+            if encoding != 'utf-8':
+                continue  # UTF-16 strings inside a binary aren't detected, see s02
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            self.set_test_input(target, dirty_words, encoding)
+            self.expect_return(self.call_callable())
+            self.set_test_input(target, dirty_words, 'auto')
+            self.run_this_test()
+
+    def test_n04_search_dir(self) -> None:
+        """search_dir() detects each file on its own, and counts them in DETECT_STATS."""
+        for codec in ('utf-8', 'utf-16', 'utf-16-be', 'latin-1'):
+            self.write(codec, TEXT.encode(codec))
+        self.write('binary', b'\x7fELF\x00\x00dirty\x00')
+        self.assertEqual(_capture(search_dir, Path(self._temp_dir.name), ['dirtÿ', 'dirty'],
+                                  'auto')[0], 3)
+        self.assertEqual(DETECT_STATS.encodings, {'utf-8': 2, f'utf-16-{NATIVE}': 1,
+                                                  'utf-16-be': 1, 'latin-1': 1})
+        self.assertIn('5 files (0 cached)', DETECT_STATS.summary())
+
+    def test_n05_cache(self) -> None:
+        """An unchanged file isn't sampled again, a changed one is."""
+        target = self.write('a.txt', TEXT.encode('utf-16-le'))
+        for _ in range(2):
+            self.set_test_input(target, ['dirtÿ'], 'auto')
+            self.expect_return((3, ['line 2 : "dirtÿ" found in "very dirtÿ word"']))
+            self.run_this_test()
+        self.assertEqual(DETECT_STATS.cache_hits, 1)
+        target.write_bytes(TEXT.encode('utf-8') + b'dirt\xff\n')  # Now Latin-1, and longer
+        self.set_test_input(target, ['dirtÿ'], 'auto')
+        self.expect_return((3, ['line 3 : "dirtÿ" found in "dirtÿ"']))
+        self.run_this_test()
+        self.assertEqual((DETECT_STATS.cache_hits, DETECT_STATS.encodings),
+                         (1, {'utf-16-le': 2, 'latin-1': 1}))
+
+    def test_n06_search_stream(self) -> None:
+        """search_stream() detects its encoding from the first bytes, whatever the chunk size."""
+        for chunk_size in (1, 3, 4096):
+            self.assertEqual(_capture(search_stream, BytesIO(TEXT.encode('utf-16')), ['dirtÿ'],
+                                      'auto', chunk_size=chunk_size),
+                             (3, ['<stdin> : line 2 : "dirtÿ" found in "very dirtÿ word"']))
+        self.assertEqual(_capture(search_stream, BytesIO(b''), ['dirty'], 'auto'), (0, []))
+
+    def test_n07_members(self) -> None:
+        """Each member of a compressed file is detected on its own."""
+        target = self.write('a.txt.gz', gzip.compress(TEXT.encode('utf-16')))
+        self.set_test_input(target, ['dirtÿ'], 'auto', decompress=True)
+        return_value, findings = self.call_callable()
+        self.assertEqual((return_value, findings[-1]),
+                         (3, 'line 2 : "dirtÿ" found in "very dirtÿ word"'))
+
+
+class SearchFileDetectSpecialUnitTest(SearchFileDetectUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_sample_boundary(self) -> None:
+        """A character straddling the end of the sample is still UTF-8, a truncated one isn't."""
+        data = b'a' * (SAMPLE_SIZE - 1) + 'ÿ'.encode()
+        self.assertEqual(detect_encoding(data), 'utf-8')
+        self.assertEqual(detect_encoding(data[:SAMPLE_SIZE]), 'latin-1')
+        self.assertEqual(detect_encoding(b''), 'utf-8')
+
+    def test_s02_binaries(self) -> None:
+        """Binaries are searched as UTF-8, even if their nulls look like UTF-16 or UTF-32."""
+        for input_name, _, _ in CORPUS:
+            if input_name.endswith(('.elf', '.exe')):
+                target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+                self.assertEqual(detect_encoding(target.read_bytes()), 'utf-8', input_name)
+        self.assertEqual(detect_encoding(b'\x00\x00\x00dirty'), 'utf-8')  # Not UTF-32
+
+    def test_s03_strip_bom(self) -> None:
+        """strip_bom() only strips the byte order mark of the detected encoding."""
+        data = 'dirty'.encode('utf-32')
+        self.assertEqual(strip_bom(data, detect_encoding(data)),
+                         'dirty'.encode(f'utf-32-{NATIVE}'))
+        self.assertIs(strip_bom(data, 'utf-8'), data)
+
+    def test_s04_subsume(self) -> None:
+        """Detecting subsumes an entry only if every detected encoding would."""
+        self.assertEqual(prepare_dirty_words(['secret', 'topsecret'], subsume=True,
+                                             encoding='auto'), (['secret'], {'subsumed': 1}))
+
+
+class SearchFileDetectErrorUnitTest(SearchFileDetectUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_data_type(self) -> None:
+        """TypeError: data is not bytes."""
+        with self.assertRaises(TypeError):
+            detect_encoding('dirty')
+
+    def test_e02_bad_encoding(self) -> None:
+        """LookupError: any other unknown encoding is still an error."""
+        self.set_test_input(self.write('a.txt', b'clean'), ['dirty'], 'automatic')
+        self.expect_exception(LookupError, 'automatic')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,192 @@
+"""Creates the Coordinate test classes.
+
+    Facilitate unit testing of lima.lima_distributed.coordinate() with in-process workers, and
+    workers that die or hang while holding a work unit.
+
+    Typical usage example:
+
+    python -m unittest                                     # Runs every test case it can find
+    python -m test.unit_test                               # Runs all unit test cases
+    python -m test.unit_test.test_lima_distributed         # Runs only these test cases
+    python -m test.unit_test.test_lima_distributed -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import Any, List, Tuple
+import json
+import os
+import socket
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_distributed import PROTOCOL_VERSION, coordinate, work  # noqa: E402
+from lima.lima_search import search_dir  # noqa: E402
+
+
+class CoordinateUnitTest(LivingManualUnitTest):
+    """Executes lima_distributed.coordinate() with workers in threads and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the tree
+        self._tree = None      # Directory to search
+        self._address = None   # Coordinator address
+        self._workers = 2      # Workers started for each test
+        self._rogue = None     # Optional; Called with the address before the workers start
+
+    def setUp(self) -> None:
+        """Create a tree of 40 files, 3 of them dirty."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name)
+        for num in range(40):
+            file_path = self._tree / f'sub{num % 3}' / f'file{num}.txt'
+            file_path.parent.mkdir(exist_ok=True)
+            file_path.write_text(f'line one\nline {"dirty" if num % 13 == 5 else "clean"}\n')
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self._address = probe.getsockname()
+
+    def tearDown(self) -> None:
+        """Remove the tree."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the coordinate() return value and the sorted findings.
+        """
+        # LOCAL VARIABLES
+        return_value = None  # Return value from function call
+        stderr = StringIO()  # Captured findings
+        workers = [Thread(target=work, args=(self._address,), daemon=True)
+                   for _ in range(self._workers)]
+
+        # CALL IT
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+            with RedirectStdStreams(stdout=devnull, stderr=stderr):
+                starter = Thread(target=self._start_workers, args=(workers,), daemon=True)
+                starter.start()
+                try:
+                    return_value = coordinate(*self._args, address=self._address,
+                                              **self._kwargs)
+                finally:
+                    starter.join()
+                    for worker in workers:
+                        worker.join(5)
+
+        # DONE
+        return return_value, sorted(line for line in stderr.getvalue().splitlines()
+                                    if not line.startswith('Coordinating '))
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_expected(self) -> Tuple[int, List[str]]:
+        """Search the tree locally."""
+        stderr = StringIO()  # Captured findings
+        with RedirectStdStreams(stdout=stderr, stderr=stderr):
+            return_value = search_dir(self._tree, ['dirty'], 'utf-8', recursive=True)
+        return return_value, sorted(stderr.getvalue().splitlines())
+
+    def _start_workers(self, workers: List[Thread]) -> None:
+        """Wait for the coordinator to listen, run the rogue, then start the workers."""
+        if not workers and not self._rogue:
+            return
+        for _ in range(100):
+            try:
+                socket.create_connection(self._address).close()  # Rejected, harmlessly
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.05)
+        if self._rogue:
+            self._rogue()
+        for worker in workers:
+            worker.start()
+
+    def _pull_one_unit(self) -> socket.socket:
+        """Connect like a worker and lease one unit, without ever searching it."""
+        conn = socket.create_connection(self._address)
+        conn.sendall(json.dumps({'type': 'hello', 'version': PROTOCOL_VERSION}).encode() + b'\n'
+                     + json.dumps({'type': 'pull'}).encode() + b'\n')
+        messages = conn.makefile('rb')
+        json.loads(messages.readline())  # Settings
+        self.assertEqual(json.loads(messages.readline())['type'], 'unit')
+        return conn
+
+
+class CoordinateNormalUnitTest(CoordinateUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_dirty(self) -> None:
+        """Two workers: same findings and exit code as a local search."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, unit_size=3)
+        self.expect_return(self.get_expected())
+        self.run_this_test()
+
+    def test_n02_clean(self) -> None:
+        """No dirty words: 0."""
+        self.set_test_input(self._tree, ['nowhere'], 'utf-8', recursive=True)
+        self.expect_return((0, []))
+        self.run_this_test()
+
+    def test_n03_dead_worker(self) -> None:
+        """A worker disconnects while holding a unit: the unit is reassigned."""
+        self._rogue = lambda: self._pull_one_unit().close()
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, unit_size=40)
+        self.expect_return(self.get_expected())
+        self.run_this_test()
+
+    def test_n04_hung_worker(self) -> None:
+        """A worker stops sending heartbeats while holding a unit: its lease expires."""
+        hung = []  # Keeps the rogue connection open until the test ends
+        self._rogue = lambda: hung.append(self._pull_one_unit())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, unit_size=40,
+                            lease=0.5)
+        try:
+            self.expect_return(self.get_expected())
+            self.run_this_test()
+        finally:
+            for conn in hung:
+                conn.close()
+
+
+class CoordinateErrorUnitTest(CoordinateUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_unit_size(self) -> None:
+        """ValueError: unit_size less than 1."""
+        self._workers = 0
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', unit_size=0)
+        self.expect_exception(ValueError, 'unit_size')
+        self.run_this_test()
+
+    def test_e02_not_a_dir(self) -> None:
+        """OSError: dir_path is a file."""
+        self._workers = 0
+        self.set_test_input(self._tree / 'sub0' / 'file0.txt', ['dirty'], 'utf-8')
+        self.expect_exception(OSError, 'file0.txt')
+        self.run_this_test()
+
+    def test_e03_bad_worker_count(self) -> None:
+        """ValueError: work() with fewer than one worker process."""
+        with self.assertRaisesRegex(ValueError, 'workers'):
+            work(self._address, workers=0)
+
+
+if __name__ == '__main__':
+    execute_test_cases()
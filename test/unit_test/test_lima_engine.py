@@ -0,0 +1,154 @@
+"""Creates the EngineParity test classes.
+
+    Facilitate unit testing of lima.lima_engine by proving every available engine reports the
+    same findings as the pure-Python engine across the existing test corpus.
+
+    Typical usage example:
+
+    python -m unittest                                       # Runs every test case it can find
+    python -m test.unit_test                                 # Runs all unit test cases
+    python -m test.unit_test.test_lima_engine                # Runs only these test cases
+    python -m test.unit_test.test_lima_engine -k ahocorasick # Runs only the pyahocorasick cases
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from typing import Any, List, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_engine import (ENGINE_AHOCORASICK, ENGINE_HYPERSCAN,  # noqa: E402
+                              ENGINE_PYTHON, get_available_engines, get_matcher)
+from lima.lima_search import search_file  # noqa: E402
+
+
+# Test corpus: (input filename, dirty words, encoding) lifted from test_lima_search
+CORPUS = [
+    ('Normal01-input.txt', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal02-input.txt', ['Before Guido', 'code is broken', 'fix my code'], 'utf-8'),
+    ('Normal03-input.txt', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal04-input.elf', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal05-input.elf', ['Waiting...'], 'utf-8'),
+    ('Normal06-input.exe', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal07-input.exe', ['HelloWorld.exe'], 'utf-8'),
+    ('Normal08-input.exe', ['not here', 'can not find this', 'missing dirty word'], 'utf-16'),
+    ('Normal09-input.exe', ['Dragon Feet'], 'utf-16'),
+    ('Normal10-input.zip', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal11-input.zip', ['LIMA-unit_test-lima_search-Normal01-input.txt'], 'utf-8'),
+    ('Normal12-input.tar', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal13-input.tar', ['this one is mine'], 'utf-8'),
+    ('Normal14-input.gz', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal15-input.gz', ['original.txt'], 'utf-8'),
+    ('Normal16-input.tar.gz', ['not here', 'can not find this', 'missing dirty word'],
+     'utf-16'),
+    ('Normal17-input.tar.gz', ['original'], 'utf-8'),
+    ('Normal18-input.7z', ['not here', 'can not find this', 'missing dirty word'], 'utf-8'),
+    ('Normal19-input.7z', ['reading'], 'utf-8'),
+    ('Normal20-input.7z', ['reading'], 'utf-16'),
+    ('Normal21-input.7z', ['test_input'], 'utf-16'),
+    ('Normal22-input.7z', ['test_input'], 'utf-8'),
+    ('Special01-input.exe', ['HelloWorld.exe'], 'utf-8'),
+    ('Special02-input.exe', ['Dragon Feet'], 'utf-8'),
+    ('Special03-input.exe', ['Hello World!'], 'utf-8'),
+    ('Special04-input.exe', ['HelloWorld.exe'], 'utf-16'),
+    ('Special05-input.exe', ['Dragon Feet'], 'utf-16'),
+    ('Special06-input.exe', ['Hello World!'], 'utf-16'),
+    # Multiple hits, duplicates, and overlapping entries in one list
+    ('Normal02-input.txt', ['code', 'code is broken', 'code', 'is broken', 'not here'], 'utf-8'),
+]
+
+
+class EngineParityUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() with a specific engine and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the lines printed to stderr.
+        """
+        return _capture_search(*self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def run_parity(self, engine: str, case_sensitive: bool = True) -> None:
+        """Compare engine's findings to the pure-Python engine for every CORPUS entry."""
+        if engine not in get_available_engines():
+            self.skipTest(f'The {engine} engine is not installed')
+        for input_name, dirty_words, encoding in CORPUS:
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            # TEST SETUP
+            self.set_test_input(target, dirty_words, encoding, case_sensitive, engine=engine)
+            self.expect_return(_capture_search(target, dirty_words, encoding, case_sensitive,
+                                               engine=ENGINE_PYTHON))
+            # RUN IT
+            self.run_this_test()
+
+
+class EngineParityNormalUnitTest(EngineParityUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_python(self) -> None:
+        """Pure-Python engine agrees with itself (sanity check of the harness)."""
+        self.run_parity(ENGINE_PYTHON)
+
+    def test_n02_ahocorasick(self) -> None:
+        """pyahocorasick engine matches the pure-Python engine."""
+        self.run_parity(ENGINE_AHOCORASICK)
+
+    def test_n03_hyperscan(self) -> None:
+        """hyperscan engine matches the pure-Python engine."""
+        self.run_parity(ENGINE_HYPERSCAN)
+
+    def test_n04_ahocorasick_case_insensitive(self) -> None:
+        """pyahocorasick engine matches the pure-Python engine; case insensitive."""
+        self.run_parity(ENGINE_AHOCORASICK, case_sensitive=False)
+
+    def test_n05_hyperscan_case_insensitive(self) -> None:
+        """hyperscan engine matches the pure-Python engine; case insensitive."""
+        self.run_parity(ENGINE_HYPERSCAN, case_sensitive=False)
+
+
+class EngineParitySpecialUnitTest(EngineParityUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_matcher_non_ascii(self) -> None:
+        """Every engine agrees on non-ASCII str and bytes haystacks."""
+        needles = ['café', 'é', 'naïve', '\U0001f600', 'absent']
+        haystack = 'Un café naïve \U0001f600'
+        for engine in get_available_engines():
+            self.assertEqual(get_matcher(needles, engine).search(haystack), [0, 1, 2, 3])
+            self.assertEqual(get_matcher([needle.encode('utf-16') for needle in needles],
+                                         engine).search(haystack.encode('utf-16')), [])
+            self.assertEqual(get_matcher([needle.encode('utf-8') for needle in needles],
+                                         engine).search(haystack.encode('utf-8')), [0, 1, 2, 3])
+
+
+def _capture_search(*args, **kwargs) -> Tuple[int, List[str]]:
+    """Call search_file() and capture everything it printed to stderr."""
+    stderr = StringIO()  # Captured findings
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+        with RedirectStdStreams(stdout=devnull, stderr=stderr):
+            return_value = search_file(*args, **kwargs)
+    return return_value, stderr.getvalue().splitlines()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,322 @@
+"""Creates the SearchFileExtract test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(extract=...) and lima.lima_extract by
+    searching OOXML, ODF and PDF documents built by minimal writers.
+
+    Typical usage example:
+
+    python -m unittest                                 # Runs every test case it can find
+    python -m test.unit_test                           # Runs all unit test cases
+    python -m test.unit_test.test_lima_extract         # Runs only these test cases
+    python -m test.unit_test.test_lima_extract -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Set, Tuple
+import io
+import os
+import sys
+import zipfile
+import zlib
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_extract import (EXTRACT_CACHE, EXTRACT_STATS, ExtractError,  # noqa: E402
+                               extract_parts, register_extractor)
+from lima.lima_report import parse_finding  # noqa: E402
+from lima.lima_search import search_data, search_dir, search_file  # noqa: E402
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+S_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+TEXT_NS = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+OFFICE_NS = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+# A Word paragraph with "dirty" split across two runs, and a tab between two words
+DOCX_BODY = (f'<w:document xmlns:w="{W_NS}"><w:body>'
+             '<w:p><w:r><w:t>The di</w:t></w:r><w:r><w:rPr><w:b/></w:rPr><w:t>rty dog</w:t>'
+             '</w:r></w:p><w:p><w:r><w:t>sleepy</w:t><w:tab/><w:t>fox</w:t></w:r></w:p>'
+             '</w:body></w:document>')
+
+
+def make_zip(parts: Dict[str, str], content_types: bool = True) -> bytes:
+    """Build a deflated zip archive, e.g. an OOXML document.
+
+    Args:
+        parts: Part name -> XML text.
+        content_types: Optional; Add the [Content_Types].xml part every OOXML document has.
+    """
+    buffer = io.BytesIO()  # Archive contents
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        if content_types:
+            archive.writestr('[Content_Types].xml', '<Types/>')
+        for name, text in parts.items():
+            archive.writestr(name, text)
+    return buffer.getvalue()
+
+
+def make_odf(content: str) -> bytes:
+    """Build an ODF text document whose body holds the content XML."""
+    buffer = io.BytesIO()  # Archive contents
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.text',
+                         compress_type=zipfile.ZIP_STORED)
+        archive.writestr('content.xml', f'<office:document-content xmlns:office="{OFFICE_NS}" '
+                                        f'xmlns:text="{TEXT_NS}"><office:body><office:text>'
+                                        f'{content}</office:text></office:body>'
+                                        '</office:document-content>')
+    return buffer.getvalue()
+
+
+def make_pdf(contents: List[bytes], compress: bool = True) -> bytes:
+    """Build a PDF whose page content streams are contents, FlateDecode unless not compress."""
+    objects = []  # Body of each object
+    for content in contents:
+        data = zlib.compress(content) if compress else content
+        filters = b' /Filter /FlateDecode' if compress else b''
+        objects.append(b'<< /Length %d%s >>\nstream\n%s\nendstream' % (len(data), filters, data))
+    pdf = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+    for number, body in enumerate(objects, start=1):
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    return pdf + b'trailer\n<< /Size %d >>\n%%%%EOF\n' % (len(objects) + 1)
+
+
+class SearchFileExtractUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the (label, dirty word) findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the documents
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Zero the extract stats and cache."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        EXTRACT_STATS.reset()
+        EXTRACT_CACHE.clear()
+
+    def tearDown(self) -> None:
+        """Remove the documents."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, Set[Tuple[str, str]]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the (finding label, dirty word)
+            of every finding.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, {(finding.split(' : ')[0], parse_finding(finding)[2])
+                              for finding in findings}
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_target(self, input_name: str) -> Path:
+        """Path to the input_name test input."""
+        return Path(self._test_input_dir) / self._input_filename.format(input_name)
+
+    def write(self, name: str, contents: bytes) -> Path:
+        """Write a temporary document."""
+        target = Path(self._temp_dir.name) / name
+        target.write_bytes(contents)
+        return target
+
+    def label(self, target: Path, part: str) -> str:
+        """Finding label of target's part."""
+        return f'{target.absolute()} (part {part})'
+
+
+class SearchFileExtractNormalUnitTest(SearchFileExtractUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_docx(self) -> None:
+        """Word: words split across runs are found, in the body and the headers."""
+        target = self.write('a.docx', make_zip({
+            'word/document.xml': DOCX_BODY,
+            'word/header1.xml': f'<w:hdr xmlns:w="{W_NS}"><w:p><w:r><w:t>lazy</w:t></w:r></w:p>'
+                                '</w:hdr>',
+            'word/styles.xml': f'<w:styles xmlns:w="{W_NS}"><w:t>lazy</w:t></w:styles>'}))
+        self.set_test_input(target, ['dirty', 'lazy', 'sleepy fox'], 'utf-8')
+        self.expect_return((0, set()))
+        self.run_this_test()
+        self.set_test_input(target, ['dirty', 'lazy', 'sleepy fox'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'word/document.xml'), 'dirty'),
+                                (self.label(target, 'word/document.xml'), 'sleepy fox'),
+                                (self.label(target, 'word/header1.xml'), 'lazy')}))
+        self.run_this_test()
+        self.assertEqual((EXTRACT_STATS.documents, EXTRACT_STATS.parts), (1, 2))
+
+    def test_n02_xlsx_pptx(self) -> None:
+        """Excel shared and inline strings, PowerPoint slides and the document properties."""
+        xlsx = self.write('a.xlsx', make_zip({
+            'xl/sharedStrings.xml': f'<sst xmlns="{S_NS}"><si><t>clean</t></si>'
+                                    '<si><r><t>dir</t></r><r><t>ty</t></r></si></sst>',
+            'xl/worksheets/sheet1.xml': f'<worksheet xmlns="{S_NS}"><sheetData><row>'
+                                        '<c t="inlineStr"><is><t>lazy</t></is></c></row>'
+                                        '</sheetData></worksheet>'}))
+        pptx = self.write('a.pptx', make_zip({
+            'ppt/slides/slide1.xml': f'<p:sld xmlns:p="p" xmlns:a="{A_NS}"><a:p><a:r>'
+                                     '<a:t>Dirty</a:t></a:r></a:p></p:sld>',
+            'docProps/core.xml': '<cp:coreProperties xmlns:cp="cp" xmlns:dc="dc">'
+                                 '<dc:creator>lazy writer</dc:creator></cp:coreProperties>'}))
+        self.set_test_input(xlsx, ['dirty', 'lazy'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(xlsx, 'xl/sharedStrings.xml'), 'dirty'),
+                                (self.label(xlsx, 'xl/worksheets/sheet1.xml'), 'lazy')}))
+        self.run_this_test()
+        self.set_test_input(pptx, ['dirty', 'lazy'], 'utf-8', case_sensitive=False, extract=True)
+        self.expect_return((3, {(self.label(pptx, 'ppt/slides/slide1.xml'), 'dirty'),
+                                (self.label(pptx, 'docProps/core.xml'), 'lazy')}))
+        self.run_this_test()
+
+    def test_n03_odf(self) -> None:
+        """ODF: spans, spaces and line breaks inside a paragraph."""
+        target = self.write('a.odt', make_odf(
+            '<text:h>Title</text:h><text:p>The <text:span>di</text:span>rty'
+            '<text:s/>dog<text:line-break/>lazy</text:p>'))
+        self.set_test_input(target, ['dirty dog', 'dog lazy'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'content.xml'), 'dirty dog'),
+                                (self.label(target, 'content.xml'), 'dog lazy')}))
+        self.run_this_test()
+
+    def test_n04_pdf(self) -> None:
+        """PDF: Tj and TJ strings, escapes, hex and UTF-16 strings, in FlateDecode streams."""
+        page = (b'BT /F1 12 Tf 72 712 Td (The di) Tj [(r) -20 (ty) -400 (dog)] TJ ET\n'
+                b'BT 72 690 Td (\\(l\\141zy\\)) Tj T* <736C65657079> Tj '
+                b'T* <FEFF00660069006C007400680079> Tj ET')
+        target = self.write('a.pdf', make_pdf([page]))
+        self.set_test_input(target, ['dirty dog', '(lazy)', 'sleepy', 'filthy'], 'utf-8')
+        self.expect_return((0, set()))
+        self.run_this_test()
+        self.set_test_input(target, ['dirty dog', '(lazy)', 'sleepy', 'filthy'], 'utf-8',
+                            extract=True)
+        self.expect_return((3, {(self.label(target, 'object 1 0'), 'dirty dog'),
+                                (self.label(target, 'object 1 0'), '(lazy)'),
+                                (self.label(target, 'object 1 0'), 'sleepy'),
+                                (self.label(target, 'object 1 0'), 'filthy')}))
+        self.run_this_test()
+
+    def test_n05_search_dir(self) -> None:
+        """search_dir() passes extract to every file, and reports name the document."""
+        self.write('a.docx', make_zip({'word/document.xml': DOCX_BODY}))
+        self.write('b.pdf', make_pdf([b'BT (dirty) Tj ET']))
+        self.write('c.txt', b'clean')
+        return_value, findings = _capture(search_dir, Path(self._temp_dir.name), ['dirty'],
+                                          'utf-8', extract=True)
+        self.assertEqual(return_value, 3)
+        self.assertEqual(sorted({parse_finding(finding)[0] for finding in findings}),
+                         [str(Path(self._temp_dir.name, name).absolute())
+                          for name in ('a.docx', 'b.pdf')])
+        self.assertEqual(EXTRACT_STATS.documents, 2)
+
+
+class SearchFileExtractSpecialUnitTest(SearchFileExtractUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_cache(self) -> None:
+        """A document seen again, under any name, is searched from the cache."""
+        contents = make_zip({'word/document.xml': DOCX_BODY})
+        for name in ('a.docx', 'copy.docx'):
+            target = self.write(name, contents)
+            self.set_test_input(target, ['dirty'], 'utf-8', extract=True)
+            self.expect_return((3, {(self.label(target, 'word/document.xml'), 'dirty')}))
+            self.run_this_test()
+        self.assertEqual((EXTRACT_STATS.documents, EXTRACT_STATS.cache_hits), (2, 1))
+        self.assertEqual(EXTRACT_STATS.parts, 1)
+        return_value, findings = _capture(search_data, contents, ['dirty'], 'utf-8',
+                                          label='payload', extract=True)
+        self.assertEqual((return_value, [parse_finding(finding)[0] for finding in findings]),
+                         (3, ['payload']))
+        self.assertEqual(EXTRACT_STATS.cache_hits, 2)
+
+    def test_s02_corrupt(self) -> None:
+        """Corrupt parts are recorded, the other parts are searched, and nothing is cached."""
+        contents = make_zip({'word/document.xml': DOCX_BODY,
+                             'word/footer1.xml': '<w:ftr><w:p>dirty'})
+        target = self.write('a.docx', contents)
+        self.set_test_input(target, ['dirty'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'word/document.xml'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual([record['path'] for record in EXTRACT_STATS.failed],
+                         [self.label(target, 'word/footer1.xml')])
+        self.run_this_test()
+        self.assertEqual(EXTRACT_STATS.cache_hits, 0)
+        EXTRACT_STATS.reset()
+        target = self.write('b.pdf', make_pdf([b'BT (dirty) Tj ET', b'BT (lazy) Tj ET'])[:-80])
+        self.set_test_input(target, ['dirty', 'lazy'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'object 1 0'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual(len(EXTRACT_STATS.failed), 1)
+
+    def test_s03_not_a_document(self) -> None:
+        """Zip archives that aren't documents, and everything else, are searched as usual."""
+        target = self.write('a.zip', make_zip({'word/document.xml': DOCX_BODY},
+                                              content_types=False))
+        self.set_test_input(target, ['dirty'], 'utf-8', extract=True)
+        self.expect_return((0, set()))
+        self.run_this_test()
+        input_name, dirty_words, encoding = CORPUS[1]
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding)
+        self.expect_return(self.call_callable())
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding, extract=True)
+        self.run_this_test()
+        self.assertEqual((EXTRACT_STATS.documents, EXTRACT_STATS.failed), (0, []))
+
+    def test_s04_register_extractor(self) -> None:
+        """A registered extractor is all a new format needs."""
+        def extract_rtf(data: bytes):
+            if data.startswith(b'{\\rtf1'):
+                text = data[6:-1].decode('ascii').replace('\\b ', '')  # Drop bold
+                yield 'body', iter(text.split('\\par'))
+
+        register_extractor('test_rtf', (b'{\\rtf',), extract_rtf)
+        target = self.write('a.rtf', b'{\\rtf1 clean\\par di\\b rty}')
+        self.set_test_input(target, ['dirty'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'body'), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual([part for part, _ in extract_parts(b'{\\rtf1 a}')], ['body'])
+
+    def test_s05_uncompressed_pdf_stream(self) -> None:
+        """Uncompressed content streams are extracted too."""
+        target = self.write('a.pdf', make_pdf([b'BT [(di) -10 (rty)] TJ ET'], compress=False))
+        self.set_test_input(target, ['dirty'], 'utf-8', extract=True)
+        self.expect_return((3, {(self.label(target, 'object 1 0'), 'dirty')}))
+        self.run_this_test()
+
+
+class SearchFileExtractErrorUnitTest(SearchFileExtractUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_extract_type(self) -> None:
+        """TypeError: extract is not a bool."""
+        self.set_test_input(self.get_target('Normal02-input.txt'), ['dirty'], 'utf-8',
+                            extract='yes')
+        self.expect_exception(TypeError, 'extract')
+        self.run_this_test()
+
+    def test_e02_extractor_error(self) -> None:
+        """Errors an extractor raises are recorded, not raised."""
+        def extract_bad(data: bytes):
+            raise ExtractError(f'Bad {len(data)}')
+            yield  # pylint: disable=unreachable
+
+        register_extractor('test_bad', (b'BAD',), extract_bad)
+        self.assertEqual(list(extract_parts(b'BAD!', 'bad')), [])
+        self.assertEqual(EXTRACT_STATS.failed, [{'path': 'bad', 'detail': 'Bad 4'}])
+
+
+if __name__ == '__main__':
+    execute_test_cases()
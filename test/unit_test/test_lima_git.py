@@ -0,0 +1,245 @@
+"""Creates the SearchGit test classes.
+
+    Facilitate unit testing of lima.lima_git.search_git() against small repositories built with
+    the git command line tool.  Every test is skipped if git is not installed.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_git            # Runs only these test cases
+    python -m test.unit_test.test_lima_git -k n01     # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+import json
+import os
+import shutil
+import subprocess
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_git import (GitObjectStore, get_cache_path, search_git,  # noqa: E402
+                           walk_blobs)
+
+
+# Deterministic commits
+GIT_ENV = {'GIT_AUTHOR_NAME': 'LIMA', 'GIT_AUTHOR_EMAIL': 'lima@example.com',
+           'GIT_COMMITTER_NAME': 'LIMA', 'GIT_COMMITTER_EMAIL': 'lima@example.com',
+           'GIT_CONFIG_NOSYSTEM': '1', 'HOME': os.devnull}
+
+
+class SearchGitUnitTest(LivingManualUnitTest):
+    """Executes lima_git.search_git() against a temporary repository and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None   # TemporaryDirectory holding the repository
+        self._repo = None       # Work tree of the repository
+        self._environ = None    # Points the user cache directory into _temp_dir
+
+    def setUp(self) -> None:
+        """Create an empty repository."""
+        if not shutil.which('git'):
+            self.skipTest('git is not installed')
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._repo = Path(self._temp_dir.name) / 'repo'
+        self._repo.mkdir()
+        self._git('init', '-q')
+        self._environ = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self._temp_dir.name})
+        self._environ.start()
+
+    def tearDown(self) -> None:
+        """Remove the repository."""
+        if self._environ:
+            self._environ.stop()
+        if self._temp_dir:
+            self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_git() return value and the lines printed to stderr.
+        """
+        # LOCAL VARIABLES
+        return_value = None  # Return value from function call
+        stderr = StringIO()  # Captured findings
+
+        # CALL IT
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+            with RedirectStdStreams(stdout=devnull, stderr=stderr):
+                return_value = search_git(*self._args, **self._kwargs)
+
+        # DONE
+        return return_value, stderr.getvalue().splitlines()
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def _commit(self, files: Dict[str, str], message: str) -> str:
+        """Write files (None deletes), commit them, and return the commit id."""
+        for filename, contents in files.items():
+            file_path = self._repo / filename
+            if contents is None:
+                file_path.unlink()
+            else:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(contents)
+        self._git('add', '-A')
+        self._git('commit', '-q', '-m', message)
+        return self._git('rev-parse', 'HEAD')
+
+    def _git(self, *args: str) -> str:
+        """Run a git command in the repository and return its stripped stdout."""
+        return subprocess.run(['git'] + list(args), cwd=self._repo, check=True, text=True,
+                              capture_output=True, env={**os.environ, **GIT_ENV}).stdout.strip()
+
+
+class SearchGitNormalUnitTest(SearchGitUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_clean(self) -> None:
+        """Clean history: no dirty words found."""
+        self._commit({'a.txt': 'nothing to see here\n'}, 'First')
+        self.set_test_input(self._repo, ['dirty'], 'utf-8')
+        self.expect_return((0, []))
+        self.run_this_test()
+
+    def test_n02_removed(self) -> None:
+        """Dirty word committed, then removed: found, with its commit, path and blob id."""
+        commit = self._commit({'docs/a.txt': 'one\nthis is dirty\n'}, 'Oops')
+        blob = self._git('rev-parse', f'{commit}:docs/a.txt')
+        self._commit({'docs/a.txt': 'one\nthis is clean\n'}, 'Fixed')
+        self.set_test_input(self._repo, ['dirty'], 'utf-8')
+        self.expect_return((3, [f'docs/a.txt (commit {commit}, blob {blob}) : line 2 : "dirty" '
+                                'found in "this is dirty"']))
+        self.run_this_test()
+
+    def test_n03_packed(self) -> None:
+        """Packed, deltified history: same findings as loose objects."""
+        base = ''.join(f'line {num}\n' for num in range(500))
+        for num in range(5):
+            self._commit({'big.txt': base + f'edit {num}\n' + ('dirty\n' if num == 2 else '')},
+                         f'Edit {num}')
+        self.set_test_input(self._repo, ['dirty'], 'utf-8', use_cache=False)
+        expected = self.call_callable()
+        self._git('gc', '-q', '--aggressive')
+        self.assertFalse(list((self._repo / '.git' / 'objects').glob('[0-9a-f][0-9a-f]/*')))
+        self.assertEqual(expected[0], 3)
+        self.expect_return(expected)
+        self.run_this_test()
+
+    def test_n04_each_blob_once(self) -> None:
+        """Every reachable blob is searched exactly once and cached by blob id."""
+        self._commit({'a.txt': 'same\n', 'b.txt': 'same\n', 'c/d.txt': 'other\n'}, 'First')
+        self._git('checkout', '-q', '-b', 'topic')
+        self._commit({'e.txt': 'topic only\n'}, 'Topic')
+        self._git('checkout', '-q', '-')
+        self._commit({'a.txt': 'changed\n'}, 'Second')
+        self.set_test_input(self._repo, ['dirty'], 'utf-8')
+        self.expect_return((0, []))
+        self.run_this_test()
+        expected = {entry.split()[2] for commit in self._git('rev-list', '--all').split()
+                    for entry in self._git('ls-tree', '-r', commit).splitlines()}
+        cache_path = get_cache_path(self._repo / '.git')
+        self.assertEqual(cache_path.parent, Path(self._temp_dir.name) / 'lima')
+        with open(cache_path, 'r', encoding='utf-8') as cache_file:
+            self.assertEqual(set(json.load(cache_file)['blobs']), expected)
+        self.assertFalse(list((self._repo / '.git').glob('lima*')))  # The repository is untouched
+
+    def test_n05_cached(self) -> None:
+        """Cached blobs are not searched again."""
+        commit = self._commit({'a.txt': 'clean\n'}, 'First')
+        blob = self._git('rev-parse', f'{commit}:a.txt')
+        cache_path = Path(self._temp_dir.name) / 'cache.json'
+        self.set_test_input(self._repo, ['dirty'], 'utf-8', cache_path=cache_path)
+        self.expect_return((0, []))
+        self.run_this_test()
+        # Plant a finding: it's only reported if the cache is trusted
+        cache = json.loads(cache_path.read_text())
+        cache['blobs'][blob] = ['planted']
+        cache_path.write_text(json.dumps(cache))
+        self.expect_return((3, [f'a.txt (commit {commit}, blob {blob}) : planted']))
+        self.run_this_test()
+        # Different dirty words invalidate the cache
+        self.set_test_input(self._repo, ['other'], 'utf-8', cache_path=cache_path)
+        self.expect_return((0, []))
+        self.run_this_test()
+
+
+class SearchGitSpecialUnitTest(SearchGitUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_delta_base_cache(self) -> None:
+        """Only delta bases are cached, within the byte limit, and any limit reads the same."""
+        base = ''.join(f'line {num}\n' for num in range(2000))
+        for num in range(5):
+            self._commit({'big.txt': base + f'edit {num}\n'}, f'Edit {num}')
+        self._git('gc', '-q', '--aggressive')
+        git_dir = self._repo / '.git'
+        contents = {}  # Byte limit -> every blob
+        for limit in (0, len(base) * 2, 1 << 30):
+            store = GitObjectStore(git_dir, base_cache_bytes=limit)
+            contents[limit] = [store.read(blob) for blob, _, _ in walk_blobs(store, git_dir)]
+            self.assertLessEqual(store.base_cache_size, limit)
+            if limit == 1 << 30:
+                # Some delta bases, far less than every blob read
+                self.assertGreater(store.base_cache_size, 0)
+                self.assertLess(store.base_cache_size, sum(len(obj[1]) for obj in contents[limit]))
+            store.close()
+        self.assertEqual(contents[0], contents[1 << 30])
+        self.assertEqual(contents[0], contents[len(base) * 2])
+
+    def test_s02_read_only_repository(self) -> None:
+        """A repository that can't be written to is searched, and cached outside of it."""
+        commit = self._commit({'a.txt': 'dirty\n'}, 'First')
+        os.chmod(self._repo / '.git', 0o555)
+        try:
+            self.set_test_input(self._repo, ['dirty'], 'utf-8')
+            return_value, findings = self.call_callable()
+        finally:
+            os.chmod(self._repo / '.git', 0o755)
+        self.assertEqual((return_value, len(findings)), (3, 1))
+        self.assertIn(commit, findings[0])
+        self.assertTrue(get_cache_path(self._repo / '.git').is_file())
+
+
+class SearchGitErrorUnitTest(SearchGitUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_not_a_repo(self) -> None:
+        """OSError: not a git repository."""
+        self.set_test_input(Path(self._temp_dir.name), ['dirty'], 'utf-8')
+        self.expect_exception(OSError, 'not a git repository')
+        self.run_this_test()
+
+    def test_e02_bad_cache_path(self) -> None:
+        """TypeError: cache_path is not a Path."""
+        self.set_test_input(self._repo, ['dirty'], 'utf-8', cache_path='cache.json')
+        self.expect_exception(TypeError, 'cache_path')
+        self.run_this_test()
+
+    def test_e03_empty_dirty_words(self) -> None:
+        """ValueError: empty dirty word list."""
+        self.set_test_input(self._repo, [], 'utf-8')
+        self.expect_exception(ValueError, 'empty')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,139 @@
+"""Creates the ReadFile test classes.
+
+    Facilitate unit testing of lima.lima_io.read_file() by comparing its output to
+    Path.read_bytes() across the existing test corpus, block sizes, page cache policies, and
+    reused buffers.
+
+    Typical usage example:
+
+    python -m unittest                            # Runs every test case it can find
+    python -m test.unit_test                      # Runs all unit test cases
+    python -m test.unit_test.test_lima_io         # Runs only these test cases
+    python -m test.unit_test.test_lima_io -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_io import BufferPool, read_file  # noqa: E402
+from lima.lima_search import search_file  # noqa: E402
+
+
+class ReadFileUnitTest(LivingManualUnitTest):
+    """Executes lima_io.read_file()."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function."""
+        return read_file(*self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_target(self, input_name: str) -> Path:
+        """Path to a test corpus file."""
+        return Path(self._test_input_dir) / self._input_filename.format(input_name)
+
+
+class ReadFileNormalUnitTest(ReadFileUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_corpus(self) -> None:
+        """Every block size and page cache policy reads the same bytes as Path.read_bytes()."""
+        for input_name, _, _ in CORPUS:
+            target = self.get_target(input_name)
+            for block_size in (1, 7, 4096, 1 << 20):
+                for no_cache_pollution in (False, True):
+                    for reuse in (False, True):
+                        self.set_test_input(target, block_size, no_cache_pollution, reuse)
+                        self.expect_return(target.read_bytes())
+                        self.run_this_test()
+
+    def test_n02_empty(self) -> None:
+        """An empty file reads as empty."""
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / 'empty.txt'
+            target.touch()
+            for reuse in (False, True):
+                self.set_test_input(target, no_cache_pollution=True, reuse=reuse)
+                self.expect_return(b'')
+                self.run_this_test()
+
+    def test_n03_search_file(self) -> None:
+        """search_file() reports the same findings whatever the page cache policy."""
+        for input_name, dirty_words, encoding in CORPUS:
+            target = self.get_target(input_name)
+            self.assertEqual(_capture(search_file, target, dirty_words, encoding, block_size=5,
+                                      no_cache_pollution=True),
+                             _capture(search_file, target, dirty_words, encoding))
+
+
+    def test_n04_pool_reuse(self) -> None:
+        """A size class hands out one buffer, resized in place, for every size in the class."""
+        pool = BufferPool(limit=1 << 12)
+        buffer = pool.get(1025)
+        allocation = buffer.__alloc__()
+        for size in (2048, 1025, 1500, 2047):
+            self.assertIs(pool.get(size), buffer)
+            self.assertEqual(len(buffer), size)
+            del buffer[size - 1:]  # read_file() trims the spare byte
+            self.assertEqual(buffer.__alloc__(), allocation)
+        self.assertIsNot(pool.get(1 << 13), pool.get(1 << 13))  # Over the limit, never kept
+        self.assertEqual((pool.reused, pool.retained), (4, 2048))
+
+    def test_n05_pool_limit(self) -> None:
+        """A pool keeps at most limit bytes of buffer, dropping the smallest buffers first."""
+        pool = BufferPool(limit=1 << 12)
+        small, medium = pool.get(1 << 9), pool.get(1 << 10)
+        self.assertEqual(pool.retained, 1536)
+        large = pool.get(1 << 12)  # Fits once both are dropped
+        self.assertEqual(pool.retained, 1 << 12)
+        self.assertIs(pool.get(1 << 12), large)
+        self.assertIsNot(pool.get(1 << 10), medium)  # Dropped, and large with it
+        self.assertIsNot(pool.get(1 << 9), small)
+        self.assertEqual((pool.retained, pool.reused), (1536, 1))
+
+
+class ReadFileErrorUnitTest(ReadFileUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_block_size(self) -> None:
+        """ValueError: block_size less than 1."""
+        self.set_test_input(self.get_target('Normal01-input.txt'), 0)
+        self.expect_exception(ValueError, 'block_size')
+        self.run_this_test()
+
+    def test_e02_bad_policy_type(self) -> None:
+        """TypeError: no_cache_pollution isn't a bool."""
+        self.set_test_input(self.get_target('Normal01-input.txt'), no_cache_pollution='yes')
+        self.expect_exception(TypeError, 'no_cache_pollution')
+        self.run_this_test()
+
+    def test_e03_missing_file(self) -> None:
+        """FileNotFoundError: file_path doesn't exist."""
+        self.set_test_input(self.get_target('does-not-exist.txt'))
+        self.expect_exception(FileNotFoundError, 'does-not-exist')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,213 @@
+"""Creates the SearchDirLimits test classes.
+
+    Facilitate unit testing of lima.lima_search.search_dir(timeout=..., max_file_size=...) by
+    searching a temporary directory tree that holds one pathological file.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_limits         # Runs only these test cases
+    python -m test.unit_test.test_lima_limits -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import Any, List, Tuple
+import os
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_checkpoint import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_engine import ENGINE_PYTHON  # noqa: E402
+from lima.lima_io import read_file  # noqa: E402
+from lima.lima_limits import (LIMIT_STATS, REASON_SIZE, REASON_TIMEOUT,  # noqa: E402
+                              FileLimitError, time_limit)
+from lima.lima_search import search_dir  # noqa: E402
+
+
+# Relative path -> contents of the directory tree
+TREE = {'a.txt': 'clean\n', 'b.txt': 'dirty\n', 'sub/c.txt': 'one\ndirty two\n'}
+HUGE_NAME = 'huge.txt'      # One enormous line, dirty at the start
+HUGE_SIZE = 40_000_000      # Bytes in HUGE_NAME, far more than TIMEOUT allows to search
+TIMEOUT = 0.01              # Seconds per file, the other files take well under a millisecond
+
+
+class SearchDirLimitsUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_dir() with per-file limits and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the tree
+        self._tree = None      # Directory to search
+
+    def setUp(self) -> None:
+        """Create the directory tree and its pathological file."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name) / 'tree'
+        for rel_path, contents in TREE.items():
+            (self._tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            (self._tree / rel_path).write_text(contents)
+        (self._tree / HUGE_NAME).write_bytes(b'dirty ' + b'x' * (HUGE_SIZE - 6))
+        LIMIT_STATS.reset()
+
+    def tearDown(self) -> None:
+        """Remove the directory tree."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_dir() return value and the sorted findings.
+        """
+        return_value, findings = _capture(search_dir, *self._args, **self._kwargs)
+        return return_value, sorted(findings)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_expected(self) -> Tuple[int, List[str]]:
+        """Search the tree, without the pathological file and without limits."""
+        (self._tree / HUGE_NAME).rename(Path(self._temp_dir.name) / HUGE_NAME)
+        try:
+            return self.call_callable()
+        finally:
+            (Path(self._temp_dir.name) / HUGE_NAME).rename(self._tree / HUGE_NAME)
+
+    def assert_skipped(self, reason: str) -> None:
+        """Only the pathological file was skipped, for reason."""
+        self.assertEqual([(record['path'], record['reason']) for record in LIMIT_STATS.skipped],
+                         [(str(self._tree / HUGE_NAME), reason)])
+
+
+class SearchDirLimitsNormalUnitTest(SearchDirLimitsUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_max_file_size(self) -> None:
+        """Files larger than max_file_size are skipped and recorded, the rest are searched."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True)
+        self.expect_return(self.get_expected())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            max_file_size=HUGE_SIZE - 1)
+        self.run_this_test()
+        self.assert_skipped(REASON_SIZE)
+        self.assertIn('1 files skipped, 0 timed out, 1 too large', LIMIT_STATS.summary())
+
+    def test_n02_timeout(self) -> None:
+        """Files that take longer than timeout are skipped and recorded, the rest are searched."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, engine=ENGINE_PYTHON)
+        self.expect_return(self.get_expected())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, engine=ENGINE_PYTHON,
+                            timeout=TIMEOUT)
+        start = time.perf_counter()
+        self.run_this_test()
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assert_skipped(REASON_TIMEOUT)
+
+    def test_n03_generous_limits(self) -> None:
+        """Limits nothing exceeds change nothing."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True)
+        self.expect_return(self.call_callable())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, timeout=60.0,
+                            max_file_size=HUGE_SIZE)
+        self.run_this_test()
+        self.assertEqual(LIMIT_STATS.skipped, [])
+
+    def test_n04_read_file_max_size(self) -> None:
+        """read_file() reads files of exactly max_size bytes, whatever the read policy."""
+        target = self._tree / HUGE_NAME
+        for no_cache_pollution in (False, True):
+            for reuse in (False, True):
+                self.assertEqual(len(read_file(target, no_cache_pollution=no_cache_pollution,
+                                               reuse=reuse, max_size=HUGE_SIZE)), HUGE_SIZE)
+                with self.assertRaises(FileLimitError):
+                    read_file(target, no_cache_pollution=no_cache_pollution, reuse=reuse,
+                              max_size=HUGE_SIZE - 1)
+        self.assertEqual(read_file(self._tree / 'b.txt', max_size=6), b'dirty\n')
+        with self.assertRaises(FileLimitError):
+            read_file(self._tree / 'b.txt', max_size=5)
+
+    def test_n05_checkpoint(self) -> None:
+        """A checkpoint records skipped files as done: a resumed search does not retry them."""
+        checkpoint = Path(self._temp_dir.name) / 'scan.ckpt'
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            checkpoint_path=checkpoint, max_file_size=HUGE_SIZE - 1)
+        self.expect_return(self.get_expected())
+        self.run_this_test()
+        LIMIT_STATS.reset()
+        self.run_this_test()
+        self.assertEqual(LIMIT_STATS.skipped, [])
+
+
+class SearchDirLimitsErrorUnitTest(SearchDirLimitsUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_timeout_not_positive(self) -> None:
+        """ValueError: timeout is not positive."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', timeout=0)
+        self.expect_exception(ValueError, 'timeout')
+        self.run_this_test()
+
+    def test_e02_negative_max_file_size(self) -> None:
+        """ValueError: max_file_size is negative."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', max_file_size=-1)
+        self.expect_exception(ValueError, 'max_file_size')
+        self.run_this_test()
+
+    def test_e03_bad_max_file_size_type(self) -> None:
+        """TypeError: max_file_size is not an int."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', max_file_size=1e6)
+        self.expect_exception(TypeError, 'max_file_size')
+        self.run_this_test()
+
+
+class SearchDirLimitsSpecialUnitTest(SearchDirLimitsUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_time_limit_other_thread(self) -> None:
+        """Outside the main thread, time_limit() can't interrupt, but its Deadline still expires."""
+        errors = []  # Exceptions raised in the thread
+
+        def _sleep() -> None:
+            try:
+                with time_limit(TIMEOUT) as deadline:
+                    time.sleep(TIMEOUT * 5)  # No signal interrupts this
+                    errors.append(None)
+                    deadline.check()
+            except FileLimitError as err:
+                errors.append(err)
+
+        thread = Thread(target=_sleep)
+        thread.start()
+        thread.join()
+        self.assertEqual([type(error) for error in errors], [type(None), FileLimitError])
+        self.assertEqual(errors[1].reason, REASON_TIMEOUT)
+
+    def test_s02_timeout_other_thread(self) -> None:
+        """Outside the main thread, files that take longer than timeout are still skipped."""
+        results = []  # What the thread found
+
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, engine=ENGINE_PYTHON)
+        self.expect_return(self.get_expected())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, engine=ENGINE_PYTHON,
+                            timeout=TIMEOUT)
+        thread = Thread(target=lambda: results.append(self.call_callable()))
+        thread.start()
+        thread.join()
+        self.validate_return_value(results[0])
+        self.assert_skipped(REASON_TIMEOUT)
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,212 @@
+"""Creates the SearchFileNormalize test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(normalize=...) and lima.lima_normalize
+    by searching text that hides dirty words behind Unicode lookalikes.
+
+    Typical usage example:
+
+    python -m unittest                                   # Runs every test case it can find
+    python -m test.unit_test                             # Runs all unit test cases
+    python -m test.unit_test.test_lima_normalize         # Runs only these test cases
+    python -m test.unit_test.test_lima_normalize -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_normalize import fold, get_offsets, get_span  # noqa: E402
+from lima.lima_plugins import select_plugins  # noqa: E402
+from lima.lima_prefilter import PREFILTER_STATS  # noqa: E402
+from lima.lima_search import search_data, search_dir, search_file  # noqa: E402
+
+
+# Every line hides 'dirty' differently: plain, full-width, mathematical bold, Cyrillic i,
+# zero-width space, soft hyphen, upper case
+LOOKALIKES = ('plain dirty\nthe ｄｉｒｔｙ dog\n'
+              '\U0001d41d\U0001d422\U0001d42b\U0001d42d\U0001d432\nd\u0456rty\n'
+              'dir\u200bty\ndi\u00adrty\nDIRTY\nclean\n')
+
+
+class SearchFileNormalizeUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the searched files
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Make room for the searched files."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self) -> None:
+        """Remove the searched files."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and its findings, minus the label.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, [finding.split(' : ', 1)[1] for finding in findings]
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def write(self, name: str, contents: str, encoding: str = 'utf-8') -> Path:
+        """Write a temporary file to search."""
+        target = Path(self._temp_dir.name) / name
+        target.write_bytes(contents.encode(encoding))
+        return target
+
+
+class SearchFileNormalizeNormalUnitTest(SearchFileNormalizeUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_lookalikes(self) -> None:
+        """Every lookalike is found, and quoted as it appears in the file."""
+        target = self.write('a.txt', LOOKALIKES)
+        self.set_test_input(target, ['dirty'], 'utf-8', normalize=True)
+        self.expect_return((3, [
+            'line 1 : "dirty" found in "plain dirty"',
+            'line 2 : "dirty" found in "the ｄｉｒｔｙ dog" as '
+            '"ｄｉｒｔｙ"',
+            'line 3 : "dirty" found in "\U0001d41d\U0001d422\U0001d42b\U0001d42d\U0001d432" as '
+            '"\U0001d41d\U0001d422\U0001d42b\U0001d42d\U0001d432"',
+            'line 4 : "dirty" found in "d\u0456rty" as "d\u0456rty"',
+            'line 5 : "dirty" found in "dir\u200bty" as "dir\u200bty"',
+            'line 6 : "dirty" found in "di\u00adrty" as "di\u00adrty"']))
+        self.run_this_test()
+
+    def test_n02_case_insensitive(self) -> None:
+        """Ignoring case folds after normalizing, and quotes the original line."""
+        target = self.write('a.txt', LOOKALIKES)
+        self.set_test_input(target, ['Dirty'], 'utf-8', case_sensitive=False, normalize=True)
+        return_value, findings = self.call_callable()
+        self.assertEqual((return_value, len(findings)), (3, 7))
+        self.assertEqual(findings[-1], 'line 7 : "dirty" found in "DIRTY"')
+
+    def test_n03_decomposed(self) -> None:
+        """NFC dirty words find NFD text, and the other way around."""
+        target = self.write('a.txt', 're\u0301sume\u0301\nrésumé\n')
+        for dw_entry in ('résumé', 're\u0301sume\u0301'):
+            self.set_test_input(target, [dw_entry], 'utf-8', normalize=True)
+            return_value, findings = self.call_callable()
+            self.assertEqual((return_value, len(findings)), (3, 2))
+
+    def test_n04_parity(self) -> None:
+        """Normalizing finds the same dirty words in every text test input, with and without."""
+        for input_name, dirty_words, encoding in CORPUS:
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            if input_name.endswith(('.elf', '.exe')):
+                continue  # Not text, strategy 1 never applies
+            self.set_test_input(target, dirty_words, encoding)
+            self.expect_return(self.call_callable())
+            self.set_test_input(target, dirty_words, encoding, normalize=True)
+            self.run_this_test()
+
+    def test_n05_search_dir(self) -> None:
+        """search_dir() and search_data() pass normalize on."""
+        self.write('a.txt', 'd\u0456rty')
+        self.write('b.txt', 'clean')
+        self.assertEqual(_capture(search_dir, Path(self._temp_dir.name), ['dirty'], 'utf-8',
+                                  normalize=True)[0], 3)
+        self.assertEqual(_capture(search_data, 'd\u0456rty'.encode(), ['dirty'], 'utf-8',
+                                  normalize=True)[0], 3)
+        self.assertEqual(_capture(search_data, 'd\u0456rty'.encode(), ['dirty'], 'utf-8')[0], 0)
+
+    def test_n06_fold(self) -> None:
+        """fold() maps lookalikes onto ASCII, decomposes the rest, and keeps newlines."""
+        self.assertEqual(fold(LOOKALIKES).split('\n')[:7], ['plain dirty', 'the dirty dog'] +
+                         ['dirty'] * 4 + ['DIRTY'])
+        self.assertEqual(fold('\u041f\u0440\u0438\u0432\u0435\u0442'),
+                         '\u041fp\u0438\u0432e\u0442')  # Only the homoglyphs of p and e fold
+        self.assertEqual(fold('\ud55c\uad6d'),  # Hangul syllables decompose into jamo
+                         '\u1112\u1161\u11ab\u1100\u116e\u11a8')
+        self.assertEqual(fold('a\nb\r '), 'a\nb\r ')
+
+    def test_n07_get_span(self) -> None:
+        """get_span() maps a match in folded text back to the original text."""
+        line = 'the ｄｉ\u200bｒｔｙ dog'
+        start = fold(line).find('dirty')
+        self.assertEqual(get_span(line, start, start + 5), (4, 10))
+        self.assertEqual(get_span(line, 0, 3), (0, 3))
+        self.assertEqual(get_span(line, 3, 3), (3, 3))
+        self.assertEqual(len(get_offsets(line)), len(fold(line)) + 1)
+        # Lower-casing lengthens U+0130, offsets still line up
+        line = 'İ DIRTY'
+        start = fold(line).lower().find('dirty')
+        self.assertEqual(get_span(line, start, start + 5, case_sensitive=False), (2, 7))
+
+
+class SearchFileNormalizeSpecialUnitTest(SearchFileNormalizeUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_replaces_strategy_1(self) -> None:
+        """The normalized strategy stands in for strategy 1, the others still run."""
+        strategies, _ = select_plugins(b'plain', True, frozenset(('normalize',)))
+        self.assertEqual([plugin.title for plugin in strategies],
+                         ['strategy 1 (normalized)', 'strategy 2', 'strategy 3', 'strategy 4'])
+        target = self.write('a.txt', 'd\u0456rty', encoding='utf-16')
+        self.set_test_input(target, ['dirty'], 'utf-16', normalize=True)
+        self.expect_return((3, ['line 1 : "dirty" found in "d\u0456rty" as "d\u0456rty"']))
+        self.run_this_test()
+
+    def test_s02_invisible_dirty_word(self) -> None:
+        """Dirty words that fold to nothing are skipped, the others are still searched."""
+        target = self.write('a.txt', 'dirty')
+        self.set_test_input(target, ['\u200b'], 'utf-8', normalize=True)
+        self.expect_return((0, []))
+        self.run_this_test()
+        self.set_test_input(target, ['\u200b', 'dirty'], 'utf-8', normalize=True)
+        self.expect_return((3, ['line 1 : "dirty" found in "dirty"']))
+        self.run_this_test()
+
+    def test_s03_no_prefilter(self) -> None:
+        """The prefilter can't rule out lookalikes, so normalize turns it off."""
+        PREFILTER_STATS.reset()
+        target = self.write('a.txt', 'd\u0456rty')
+        self.set_test_input(target, ['dirty'], 'utf-8', prefilter=True, normalize=True)
+        self.expect_return((3, ['line 1 : "dirty" found in "d\u0456rty" as "d\u0456rty"']))
+        self.run_this_test()
+
+
+class SearchFileNormalizeErrorUnitTest(SearchFileNormalizeUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_normalize_type(self) -> None:
+        """TypeError: normalize is not a bool."""
+        self.set_test_input(self.write('a.txt', 'clean'), ['dirty'], 'utf-8', normalize='yes')
+        self.expect_exception(TypeError, 'normalize')
+        self.run_this_test()
+
+    def test_e02_bad_span(self) -> None:
+        """IndexError: the slice is not inside the folded text."""
+        with self.assertRaises(IndexError):
+            get_span('dirty', 2, 6)
+        with self.assertRaises(IndexError):
+            get_span('dirty', 3, 2)
+        with self.assertRaises(TypeError):
+            fold(b'dirty')
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,183 @@
+"""Creates the OpenSink test classes.
+
+    Facilitate unit testing of lima.lima_output.open_sink() by emitting findings from one or more
+    threads and reading back the --output file.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_output         # Runs only these test cases
+    python -m test.unit_test.test_lima_output -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from typing import Any, List
+import os
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_output import OutputSink, capture_findings, emit_finding, open_sink  # noqa: E402
+
+
+class SlowStream():
+    """Text stream that takes a while to write and remembers the most findings it ever saw."""
+
+    def __init__(self, delay: float = 0.01, error: Exception = None) -> None:
+        """SlowStream ctor."""
+        self.delay = delay  # Seconds per write()
+        self.error = error  # Raised by write(), if set
+        self.lines = []     # Every finding written
+
+    def flush(self) -> None:
+        """Nothing to flush."""
+
+    def write(self, text: str) -> None:
+        """Slowly record the findings."""
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.lines.extend(text.splitlines())
+
+
+class OpenSinkUnitTest(LivingManualUnitTest):
+    """Emits findings from threads through lima_output.open_sink() and reads the output file."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+
+    def call_callable(self) -> List[str]:
+        """Defines how to call the function.
+
+        The first positional argument is a list of finding lists, one per emitting thread.
+
+        Returns:
+            The lines written to the output file.
+        """
+        # LOCAL VARIABLES
+        per_thread = self._args[0]  # Findings to emit, one list per thread
+        threads = []                # Emitting threads
+
+        # CALL IT
+        with TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / 'findings.txt'
+            with open_sink(output_path, *self._args[1:], **self._kwargs):
+                for findings in per_thread:
+                    threads.append(Thread(target=_emit_all, args=(findings,)))
+                    threads[-1].start()
+                for thread in threads:
+                    thread.join()
+            return output_path.read_text(encoding='utf-8').splitlines()
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+
+class OpenSinkNormalUnitTest(OpenSinkUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_in_order(self) -> None:
+        """One thread: every finding written, in order."""
+        findings = [f'finding {num}' for num in range(10000)]
+        self.set_test_input([findings])
+        self.expect_return(findings)
+        self.run_this_test()
+
+    def test_n02_threads_never_interleave(self) -> None:
+        """Many threads: every finding written whole, each thread's findings in order."""
+        per_thread = [[f'thread {thread} finding {num} ' + 'x' * 100 for num in range(2000)]
+                      for thread in range(8)]
+        self.set_test_input(per_thread, queue_size=64, batch_size=16)
+        written = self.call_callable()
+        self.assertEqual(sorted(written), sorted(sum(per_thread, [])))
+        for thread, findings in enumerate(per_thread):
+            self.assertEqual([line for line in written if line.startswith(f'thread {thread} ')],
+                             findings)
+
+    def test_n03_partial_batch_written(self) -> None:
+        """A partial batch is written without waiting for close()."""
+        stream = SlowStream(delay=0)
+        sink = OutputSink(stream, batch_size=1000)
+        try:
+            sink.write('only finding')
+            for _ in range(50):
+                if stream.lines:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(stream.lines, ['only finding'])
+        finally:
+            sink.close()
+
+    def test_n04_capture_findings(self) -> None:
+        """Captured findings bypass the sink."""
+        with TemporaryDirectory() as temp_dir:
+            output_path = Path(temp_dir) / 'findings.txt'
+            with open_sink(output_path):
+                with capture_findings() as captured:
+                    emit_finding('captured')
+                emit_finding('written')
+            self.assertEqual(captured, ['captured'])
+            self.assertEqual(output_path.read_text(encoding='utf-8'), 'written\n')
+
+
+class OpenSinkErrorUnitTest(OpenSinkUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_queue_size(self) -> None:
+        """ValueError: queue_size less than 1."""
+        self.set_test_input([['finding']], queue_size=0)
+        self.expect_exception(ValueError, 'at least 1')
+        self.run_this_test()
+
+    def test_e02_bad_output_path(self) -> None:
+        """TypeError: output_path is not a Path."""
+        with self.assertRaisesRegex(TypeError, 'output_path'):
+            with open_sink('findings.txt'):
+                pass
+
+    def test_e03_broken_pipe(self) -> None:
+        """BrokenPipeError: raised by close(), after every finding was drained."""
+        sink = OutputSink(SlowStream(delay=0, error=BrokenPipeError('gone')), queue_size=4,
+                          batch_size=1)
+        for num in range(100):
+            sink.write(f'finding {num}')  # Would block forever if the writer stopped draining
+        with self.assertRaises(BrokenPipeError):
+            sink.close()
+
+
+class OpenSinkSpecialUnitTest(OpenSinkUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_backpressure(self) -> None:
+        """A slow stream blocks the producer instead of buffering without bound."""
+        stream = SlowStream(delay=0.01)
+        sink = OutputSink(stream, queue_size=8, batch_size=2)
+        start = time.monotonic()
+        for num in range(100):
+            sink.write(f'finding {num}')
+        blocked = time.monotonic() - start  # 50 batches, at most 4 queued plus 1 being written
+        sink.close()
+        self.assertGreater(blocked, 0.3)
+        self.assertEqual(stream.lines, [f'finding {num}' for num in range(100)])
+
+
+def _emit_all(findings: List[str]) -> None:
+    """Emit each finding."""
+    for finding in findings:
+        emit_finding(finding)
+
+
+if __name__ == '__main__':
+    execute_test_cases()
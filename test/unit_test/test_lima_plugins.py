@@ -0,0 +1,275 @@
+"""Creates the SearchFilePlugins test classes.
+
+    Facilitate unit testing of lima.lima_plugins by registering strategy and extractor plugins,
+    and installing some under the 'lima.plugins' entry point group, then searching files.
+
+    Typical usage example:
+
+    python -m unittest                                 # Runs every test case it can find
+    python -m test.unit_test                           # Runs all unit test cases
+    python -m test.unit_test.test_lima_plugins         # Runs only these test cases
+    python -m test.unit_test.test_lima_plugins -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Set, Tuple
+import codecs
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima import lima_plugins  # noqa: E402
+from lima.lima_output import emit_finding  # noqa: E402
+from lima.lima_plugins import (KIND_EXTRACTOR, KIND_STRATEGY, LOAD_FAILURES,  # noqa: E402
+                               Plugin, get_plugins, register_plugin, select_plugins)
+from lima.lima_profile import PROFILE_STATS  # noqa: E402
+from lima.lima_report import parse_finding  # noqa: E402
+from lima.lima_search import search_dir, search_file  # noqa: E402
+
+
+ROT13_MAGIC = b'ROT13:'  # Files the rot13 strategy applies to
+CALLS: List[str] = []    # Labels the test plugins searched, in order
+# An installed plugin's module, and the entry points its distribution advertises
+PLUGIN_MODULE = '''from lima.lima_plugins import KIND_STRATEGY, Plugin
+from lima.lima_output import emit_finding
+
+def _search(label, data, dw_list, encoding, case_sensitive, engine):
+    if b'installed' in data:
+        emit_finding(f'{label} : installed found in binary file using {encoding}')
+        return 3
+    return 0
+
+INSTALLED = Plugin(name='installed', kind=KIND_STRATEGY, search=_search,
+                   signatures=(b'INSTALLED:',), cost=5)
+NOT_A_PLUGIN = 42
+'''
+PLUGIN_ENTRY_POINTS = '''[lima.plugins]
+installed = lima_unit_test_plugin:INSTALLED
+not_a_plugin = lima_unit_test_plugin:NOT_A_PLUGIN
+missing = lima_unit_test_plugin:MISSING
+'''
+
+
+def search_rot13(label: str, data: bytes, dw_list: List[str], encoding: str,
+                 case_sensitive: bool, engine: str) -> int:
+    """Strategy: decode rot13 text after ROT13_MAGIC."""
+    # pylint: disable=unused-argument
+    CALLS.append(label)
+    text = codecs.decode(data[len(ROT13_MAGIC):].decode(encoding), 'rot13')
+    found = 0
+    for dw_entry in dw_list:
+        if dw_entry in text:
+            found = 3
+            emit_finding(f'{label} : {dw_entry} found in binary file using {encoding}')
+    return found
+
+
+def search_trailer(label: str, data: bytes, dw_list: List[str], encoding: str,
+                   case_sensitive: bool, engine: str) -> int:
+    """Extractor: search the bytes after a TRAILER: marker as their own part."""
+    # pylint: disable=unused-argument
+    CALLS.append(label)
+    trailer = data.split(b'TRAILER:', 1)[-1].decode(encoding)
+    found = 0
+    for dw_entry in dw_list:
+        if dw_entry in trailer.replace('-', ''):
+            found = 3
+            emit_finding(f'{label} (part trailer) : {dw_entry} found in binary file using '
+                         f'{encoding}')
+    return found
+
+
+def search_broken(label: str, data: bytes, dw_list: List[str], encoding: str,
+                  case_sensitive: bool, engine: str) -> int:
+    """Strategy: can never decode anything."""
+    # pylint: disable=unused-argument
+    CALLS.append(label)
+    raise UnicodeError('Broken on purpose')
+
+
+register_plugin(Plugin(name='rot13', kind=KIND_STRATEGY, search=search_rot13,
+                       signatures=(ROT13_MAGIC,), cost=50))
+register_plugin(Plugin(name='trailer', kind=KIND_EXTRACTOR, search=search_trailer,
+                       signatures=(b'TRAILED:',)))
+register_plugin(Plugin(name='broken', kind=KIND_STRATEGY, search=search_broken,
+                       signatures=(b'BROKEN:',), cost=1, errors=(UnicodeError,)))
+
+
+class SearchFilePluginsUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the (label, dirty word) findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the searched files
+
+    def setUp(self) -> None:
+        """Forget which plugins ran."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        CALLS.clear()
+
+    def tearDown(self) -> None:
+        """Remove the searched files."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, Set[Tuple[str, str]]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the (finding label, dirty word)
+            of every finding.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, {(finding.split(' : ')[0], parse_finding(finding)[2])
+                              for finding in findings}
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def write(self, name: str, contents: bytes) -> Path:
+        """Write a temporary file to search."""
+        target = Path(self._temp_dir.name) / name
+        target.write_bytes(contents)
+        return target
+
+
+class SearchFilePluginsNormalUnitTest(SearchFilePluginsUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_builtins(self) -> None:
+        """The four strategies are plugins, in their historic order."""
+        self.assertEqual([plugin.title for plugin in get_plugins()
+                          if plugin.title.startswith('strategy') and plugin.option is None],
+                         ['strategy 1', 'strategy 2', 'strategy 3', 'strategy 4'])
+        strategies, extractors = select_plugins(b'plain', True, frozenset())
+        self.assertEqual([plugin.name for plugin in strategies],
+                         ['text', 'decoded', 'bytes', 'null'])
+        self.assertEqual(extractors, [])
+        strategies, extractors = select_plugins(b'\x1f\x8b', False,
+                                                frozenset(('decompress', 'extract')))
+        self.assertEqual([plugin.name for plugin in strategies], ['decoded', 'bytes', 'null'])
+        self.assertEqual([plugin.name for plugin in extractors], ['decompress', 'extract'])
+
+    def test_n02_signatures(self) -> None:
+        """A plugin only runs against the files whose signature it declared."""
+        rot13 = self.write('a.rot13', ROT13_MAGIC + b'the qvegl dog')
+        plain = self.write('b.txt', b'nothing to see')
+        self.set_test_input(rot13, ['dirty'], 'utf-8')
+        self.expect_return((3, {(str(rot13.absolute()), 'dirty')}))
+        self.run_this_test()
+        self.set_test_input(plain, ['dirty'], 'utf-8')
+        self.expect_return((0, set()))
+        self.run_this_test()
+        self.assertEqual(CALLS, [str(rot13.absolute())])
+
+    def test_n03_cost_order(self) -> None:
+        """Strategies run cheapest first, and stop once one finds a dirty word."""
+        target = self.write('a.rot13', ROT13_MAGIC + b'dirty ' + codecs.encode(
+            'filthy', 'rot13').encode())
+        self.set_test_input(target, ['dirty', 'filthy'], 'utf-8')
+        self.expect_return((3, {(str(target.absolute()), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual(CALLS, [])  # Strategy 1 found 'dirty' before rot13 could run
+
+    def test_n04_extractor(self) -> None:
+        """Extractors run after the strategies, whatever they found."""
+        target = self.write('a.bin', b'TRAILED: dirty TRAILER:f-i-l-t-h-y')
+        self.set_test_input(target, ['dirty', 'filthy'], 'utf-8')
+        self.expect_return((3, {(str(target.absolute()), 'dirty'),
+                                (f'{target.absolute()} (part trailer)', 'filthy')}))
+        self.run_this_test()
+
+    def test_n05_profile(self) -> None:
+        """Profiled searches time every plugin that ran."""
+        PROFILE_STATS.reset()
+        self.write('a.rot13', ROT13_MAGIC + b'qvegl')
+        self.write('b.txt', b'clean')
+        return_value, _ = _capture(search_dir, Path(self._temp_dir.name), ['dirty'], 'utf-8',
+                                   profile=True)
+        self.assertEqual(return_value, 3)
+        self.assertEqual({title: totals[0] for title, totals in PROFILE_STATS.plugins.items()},
+                         {'strategy 1': 2, 'strategy 2': 2, 'strategy 3': 2, 'strategy 4': 2,
+                          'rot13': 1})
+        self.assertEqual(PROFILE_STATS.plugins['rot13'][2], 1)
+        self.assertIn('Plugins (calls, seconds, calls that found dirty words):',
+                      PROFILE_STATS.summary())
+
+
+class SearchFilePluginsSpecialUnitTest(SearchFilePluginsUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_decode_failure(self) -> None:
+        """A strategy that can't decode a file is a decode failure, and the next one runs."""
+        PROFILE_STATS.reset()
+        target = self.write('a.bin', b'BROKEN: dirty')
+        self.set_test_input(target, ['dirty'], 'utf-8', profile=True)
+        self.expect_return((3, {(str(target.absolute()), 'dirty')}))
+        self.run_this_test()
+        self.assertEqual(CALLS, [str(target.absolute())])
+        self.assertEqual(PROFILE_STATS.decode_failures, {'broken': 1})
+
+    def test_s02_entry_points(self) -> None:
+        """load_plugins() registers installed plugins, and records the ones that don't load."""
+        site = Path(self._temp_dir.name) / 'site'
+        dist_info = site / 'lima_unit_test_plugin-1.0.dist-info'
+        dist_info.mkdir(parents=True)
+        (dist_info / 'METADATA').write_text('Name: lima_unit_test_plugin\nVersion: 1.0\n')
+        (dist_info / 'entry_points.txt').write_text(PLUGIN_ENTRY_POINTS)
+        (site / 'lima_unit_test_plugin.py').write_text(PLUGIN_MODULE)
+        target = self.write('a.bin', b'INSTALLED: installed')
+        sys.path.insert(0, str(site))
+        try:
+            self.set_test_input(target, ['dirty'], 'utf-8')
+            self.expect_return((0, set()))
+            self.run_this_test()
+            lima_plugins._LOADED = False  # pylint: disable=protected-access
+            LOAD_FAILURES.clear()
+            self.set_test_input(target, ['dirty'], 'utf-8', plugins=True)
+            self.expect_return((3, {(str(target.absolute()), 'installed')}))
+            self.run_this_test()
+        finally:
+            sys.path.remove(str(site))
+        self.assertEqual(sorted(record['path'] for record in LOAD_FAILURES),
+                         ['missing', 'not_a_plugin'])
+
+    def test_s03_prefilter(self) -> None:
+        """The prefilter only skips the built-in strategies: other strategies still run."""
+        target = self.write('a.rot13', ROT13_MAGIC + b'the qvegl dog')
+        for prefilter in (False, True):
+            self.set_test_input(target, ['dirty'], 'utf-8', plugins=True, prefilter=prefilter)
+            self.expect_return((3, {(str(target.absolute()), 'dirty')}))
+            self.run_this_test()
+        self.assertEqual(CALLS, [str(target.absolute())] * 2)
+
+
+class SearchFilePluginsErrorUnitTest(SearchFilePluginsUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_plugins_type(self) -> None:
+        """TypeError: plugins is not a bool."""
+        self.set_test_input(self.write('a.txt', b'clean'), ['dirty'], 'utf-8', plugins='yes')
+        self.expect_exception(TypeError, 'plugins')
+        self.run_this_test()
+
+    def test_e02_bad_plugin(self) -> None:
+        """Plugins are validated when they are built and registered."""
+        with self.assertRaises(ValueError):
+            Plugin(name='bad', kind='scanner', search=search_rot13)
+        with self.assertRaises(TypeError):
+            Plugin(name='bad', kind=KIND_STRATEGY, search=search_rot13, signatures=b'ROT13:')
+        with self.assertRaises(TypeError):
+            register_plugin(search_rot13)
+
+
+if __name__ == '__main__':
+    execute_test_cases()
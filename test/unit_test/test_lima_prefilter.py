@@ -0,0 +1,141 @@
+"""Creates the Prefilter test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(prefilter=True) by proving the
+    prefiltered search reports the same findings as the full search across the existing test
+    corpus, and that the prefilter rejects clean input.
+
+    Typical usage example:
+
+    python -m unittest                                   # Runs every test case it can find
+    python -m test.unit_test                             # Runs all unit test cases
+    python -m test.unit_test.test_lima_prefilter         # Runs only these test cases
+    python -m test.unit_test.test_lima_prefilter -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from typing import Any, List, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_prefilter import (PREFILTER_STATS, UNSAFE_LOWER, get_prefilter,  # noqa: E402
+                                 strip_nulls)
+from lima.lima_search import search_data, search_file  # noqa: E402
+
+
+# Tricky buffers: (data, dirty words, encoding, case_sensitive)
+TRICKY = [
+    ('KeKY'.encode('utf-8'), ['kekey'[2:]], 'utf-8', False),          # KELVIN SIGN lowers to k
+    ('d\x00i\x00r\x00t\x00y\x00'.encode('latin-1'), ['dirty'], 'utf-8', True),  # Strategy 4
+    ('DIRTY'.encode('utf-16'), ['dirty'], 'utf-16', False),                     # Decoded, folded
+    ('line\r\nnext'.encode('utf-8'), ['line\nnext'], 'utf-8', True),            # Universal newlines
+    ('café'.encode('utf-8'), ['café'], 'utf-8', True),                # Non-ASCII, exact
+    ('CAFÉ'.encode('utf-8'), ['café'], 'utf-8', False),               # Non-ASCII, folded
+]
+
+
+class PrefilterUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() with the prefilter and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the lines printed to stderr.
+        """
+        return _capture(search_file, *self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def run_parity(self, case_sensitive: bool) -> None:
+        """Compare prefiltered findings to full findings for every CORPUS entry."""
+        for input_name, dirty_words, encoding in CORPUS:
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            # TEST SETUP
+            self.set_test_input(target, dirty_words, encoding, case_sensitive, prefilter=True)
+            self.expect_return(_capture(search_file, target, dirty_words, encoding,
+                                        case_sensitive))
+            # RUN IT
+            self.run_this_test()
+
+
+class PrefilterNormalUnitTest(PrefilterUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_parity(self) -> None:
+        """Prefiltered findings match full findings."""
+        self.run_parity(case_sensitive=True)
+
+    def test_n02_parity_case_insensitive(self) -> None:
+        """Prefiltered findings match full findings, ignoring case."""
+        self.run_parity(case_sensitive=False)
+
+    def test_n03_stats(self) -> None:
+        """Clean files are rejected and counted, dirty files are candidates."""
+        target = Path(self._test_input_dir) / self._input_filename.format('Normal01-input.txt')
+        PREFILTER_STATS.reset()
+        self.set_test_input(target, ['nowhere to be found'], 'utf-8', prefilter=True)
+        self.expect_return((0, []))
+        self.run_this_test()
+        self.assertEqual((PREFILTER_STATS.checked, PREFILTER_STATS.rejected), (1, 1))
+        self.assertIn('1 rejected', PREFILTER_STATS.summary())
+
+    def test_n04_tricky(self) -> None:
+        """Case folding, null bytes, newlines and non-ASCII words are never rejected wrongly."""
+        for data, dirty_words, encoding, case_sensitive in TRICKY:
+            expected = _capture(search_data, data, dirty_words, encoding, case_sensitive)
+            self.assertEqual(_capture(search_data, data, dirty_words, encoding, case_sensitive,
+                                      prefilter=True), expected, f'{data!r} {dirty_words}')
+
+
+class PrefilterSpecialUnitTest(PrefilterUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_unsafe_lower(self) -> None:
+        """UNSAFE_LOWER matches this interpreter's Unicode database."""
+        self.assertEqual(UNSAFE_LOWER, {char for code in range(0x80, sys.maxunicode + 1)
+                                        for char in chr(code).lower() if char.isascii()})
+
+    def test_s02_disabled(self) -> None:
+        """Words without a usable probe, or an unsupported codec, disable the prefilter."""
+        self.assertFalse(get_prefilter(('éè',), 'utf-8', False, 'python').enabled)
+        self.assertFalse(get_prefilter(('dirty',), 'cp500', True, 'python').enabled)
+        self.assertTrue(get_prefilter(('dirty',), 'utf-16', False, 'python').enabled)
+
+    def test_s03_strip_nulls(self) -> None:
+        """strip_nulls() matches bytes.replace() and bytes.lower() for every byte value."""
+        data = bytes(range(256)) * 2 + 'DIRTY'.encode('utf-16')
+        self.assertEqual(strip_nulls(data), data.replace(b'\x00', b''))
+        self.assertEqual(strip_nulls(data, False), data.replace(b'\x00', b'').lower())
+        self.assertIs(strip_nulls(b'no nulls'), b'no nulls')
+
+
+def _capture(func, *args, **kwargs) -> Tuple[int, List[str]]:
+    """Call func and capture everything it printed to stderr."""
+    stderr = StringIO()  # Captured findings
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+        with RedirectStdStreams(stdout=devnull, stderr=stderr):
+            return_value = func(*args, **kwargs)
+    return return_value, stderr.getvalue().splitlines()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,156 @@
+"""Creates the SearchDirProfile test classes.
+
+    Facilitate unit testing of lima.lima_search.search_dir(profile=...) and lima.lima_profile by
+    profiling searches of a temporary directory tree.
+
+    Typical usage example:
+
+    python -m unittest                                 # Runs every test case it can find
+    python -m test.unit_test                           # Runs all unit test cases
+    python -m test.unit_test.test_lima_profile         # Runs only these test cases
+    python -m test.unit_test.test_lima_profile -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Tuple
+import os
+import pstats
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_checkpoint import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_profile import (PROFILE_STATS, STRATEGY_CLEAN, STRATEGY_PREFILTERED,  # noqa: E402
+                               get_size_class, profile_scan)
+from lima.lima_search import search_dir  # noqa: E402
+
+
+# Relative path -> contents of the directory tree
+TREE = {'a.txt': b'dirty\n', 'b.txt': b'clean\n', 'sub/c.bin': 'x dirty y'.encode('utf-16'),
+        'sub/d.bin': b'\xff' * 70_000}
+SLOWEST = 2  # Slowest files to keep
+
+
+class SearchDirProfileUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_dir() and captures the sorted findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the tree
+        self._tree = None      # Directory to search
+
+    def setUp(self) -> None:
+        """Create the directory tree."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name) / 'tree'
+        for rel_path, contents in TREE.items():
+            (self._tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            (self._tree / rel_path).write_bytes(contents)
+        PROFILE_STATS.reset(slowest=SLOWEST)
+
+    def tearDown(self) -> None:
+        """Remove the directory tree."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_dir() return value and the sorted findings.
+        """
+        return_value, findings = _capture(search_dir, *self._args, **self._kwargs)
+        return return_value, sorted(findings)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_strategies(self) -> List[Tuple[str, str]]:
+        """Sorted (size class, winning strategy) of every histogram."""
+        return sorted(PROFILE_STATS.histograms)
+
+
+class SearchDirProfileNormalUnitTest(SearchDirProfileUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_parity(self) -> None:
+        """Profiling changes no finding, and records every file once."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True)
+        self.expect_return(self.call_callable())
+        self.assertEqual(PROFILE_STATS.files, 0)
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, profile=True)
+        self.run_this_test()
+        self.assertEqual(PROFILE_STATS.files, len(TREE))
+        self.assertEqual(sum(count for histogram in PROFILE_STATS.histograms.values()
+                             for count in histogram.values()), len(TREE))
+
+    def test_n02_histograms(self) -> None:
+        """Files are grouped by size class and winning strategy, decode failures are counted."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, profile=True)
+        self.expect_return((3, [f'{(self._tree / "a.txt").absolute()} : line 1 : "dirty" found '
+                                'in "dirty"',
+                                f"{(self._tree / 'sub/c.bin').absolute()} : 'dirty' found in "
+                                'binary file using utf-8']))
+        self.run_this_test()
+        self.assertEqual(self.get_strategies(), sorted([
+            (get_size_class(6), STRATEGY_CLEAN), (get_size_class(6), 'strategy 1'),
+            (get_size_class(20), 'strategy 4'), (get_size_class(70_000), STRATEGY_CLEAN)]))
+        self.assertEqual(PROFILE_STATS.decode_failures, {'strategy 1': 2, 'strategy 2': 2})
+
+    def test_n03_slowest(self) -> None:
+        """Only the slowest files are kept, slowest first in the summary."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, profile=True)
+        self.expect_return(self.call_callable())
+        self.assertEqual(len(PROFILE_STATS.slowest), SLOWEST)
+        summary = PROFILE_STATS.summary()
+        self.assertIn(f'Profile: {len(TREE)} files', summary)
+        slowest = summary.split('Slowest files:\n')[1].split('\n')
+        self.assertEqual(len(slowest), SLOWEST)
+        self.assertGreaterEqual(float(slowest[0].split()[0]), float(slowest[1].split()[0]))
+
+    def test_n04_prefiltered(self) -> None:
+        """Files the prefilter proves clean are recorded as prefiltered."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True)
+        self.expect_return(self.call_callable())
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True, prefilter=True,
+                            profile=True)
+        self.run_this_test()
+        self.assertIn((get_size_class(6), STRATEGY_PREFILTERED), self.get_strategies())
+        self.assertEqual(PROFILE_STATS.files, len(TREE))
+
+    def test_n05_profile_scan(self) -> None:
+        """profile_scan() dumps pstats that cover the search."""
+        pstats_path = Path(self._temp_dir.name) / 'scan.pstats'
+        with profile_scan(pstats_path):
+            _capture(search_dir, self._tree, ['dirty'], 'utf-8', recursive=True, profile=True)
+        functions = {function for _, _, function in pstats.Stats(str(pstats_path)).stats}
+        self.assertIn('search_dir', functions)
+        self.assertIn('_search_data', functions)
+
+
+class SearchDirProfileErrorUnitTest(SearchDirProfileUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_profile_type(self) -> None:
+        """TypeError: profile is not a bool."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', profile='yes')
+        self.expect_exception(TypeError, 'profile')
+        self.run_this_test()
+
+    def test_e02_bad_pstats_path_type(self) -> None:
+        """TypeError: pstats_path is not a Path."""
+        with self.assertRaisesRegex(TypeError, 'pstats_path'):
+            with profile_scan(str(Path(self._temp_dir.name) / 'scan.pstats')):
+                pass
+
+
+if __name__ == '__main__':
+    execute_test_cases()
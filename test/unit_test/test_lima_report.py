@@ -0,0 +1,206 @@
+"""Creates the Report test classes.
+
+    Facilitate unit testing of lima.lima_report by parsing the findings every search strategy
+    reports, and by writing SARIF, CSV and summary reports of a temporary directory tree.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_report         # Runs only these test cases
+    python -m test.unit_test.test_lima_report -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+import csv
+import json
+import os
+import sys
+import tracemalloc
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_output import open_sink  # noqa: E402
+from lima.lima_report import (OTHER_KEY, REPORT_CSV, REPORT_SARIF, REPORT_SUMMARY,  # noqa: E402
+                              ROOT_KEY, STRATEGY_BYTES, STRATEGY_DECODED, STRATEGY_TEXT,
+                              STRATEGY_UNKNOWN, BoundedCounter, SarifReport, open_report,
+                              parse_finding)
+from lima.lima_search import search_dir, search_file  # noqa: E402
+
+
+# Relative path -> contents of the directory tree
+TREE = {'a.txt': b'dirty\nclean\nDirty dirty\n', 'sub/b.txt': b'one\ndirty two\n',
+        'sub/deeper/c.bin': 'x dirty y'.encode('utf-16'), 'other/d.txt': b'clean\n'}
+
+
+class ReportUnitTest(LivingManualUnitTest):
+    """Executes lima_report.parse_finding()."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the tree and the reports
+        self._tree = None      # Directory to search
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Create the directory tree."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name) / 'tree'
+        for rel_path, contents in TREE.items():
+            (self._tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            (self._tree / rel_path).write_bytes(contents)
+
+    def tearDown(self) -> None:
+        """Remove the directory tree and the reports."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function."""
+        return parse_finding(*self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def write_reports(self) -> Path:
+        """Search the tree, with every kind of report, and return the directory holding them."""
+        reports_dir = Path(self._temp_dir.name)  # Return value
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            stderr, sys.stderr = sys.stderr, devnull
+            try:
+                reports = [open_report(report_format, reports_dir / f'lima.{report_format}',
+                                       root=self._tree)
+                           for report_format in (REPORT_SARIF, REPORT_CSV, REPORT_SUMMARY)]
+                with open_sink(reports=reports):
+                    search_dir(self._tree, ['dirty'], 'utf-16', recursive=True)
+                    search_dir(self._tree, ['dirty'], 'utf-8', case_sensitive=False,
+                               recursive=True)
+            finally:
+                sys.stderr = stderr
+        return reports_dir
+
+
+class ReportNormalUnitTest(ReportUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_text(self) -> None:
+        """Strategy 1 findings."""
+        self.set_test_input('/tree/a.txt : line 3 : "dirty" found in "Dirty : dirty"')
+        self.expect_return(('/tree/a.txt', 3, 'dirty', STRATEGY_TEXT))
+        self.run_this_test()
+
+    def test_n02_decoded(self) -> None:
+        """Strategy 2 findings."""
+        self.set_test_input('/tree/a.exe : Dragon Feet found in binary file using utf-16')
+        self.expect_return(('/tree/a.exe', None, 'Dragon Feet', STRATEGY_DECODED))
+        self.run_this_test()
+
+    def test_n03_bytes(self) -> None:
+        """Strategy 3 and 4 findings decode the dirty word, with or without its null bytes."""
+        for encoded in (bytes("it's", 'utf-16'), bytes("it's", 'utf-16').replace(b'\x00', b'')):
+            self.set_test_input(f'/tree/a.exe : {str(encoded)[1:]} found in binary file using '
+                                'utf-16')
+            self.expect_return(('/tree/a.exe', None, "it's", STRATEGY_BYTES))
+            self.run_this_test()
+
+    def test_n04_git(self) -> None:
+        """lima_git findings are reported against the path, not the commit and blob."""
+        self.set_test_input('docs/a.txt (commit 0a1b2c, blob 3d4e5f) : line 1 : "dirty" found in '
+                            '"dirty"')
+        self.expect_return(('docs/a.txt', 1, 'dirty', STRATEGY_TEXT))
+        self.run_this_test()
+
+    def test_n05_corpus(self) -> None:
+        """Every finding the test corpus produces parses into one of its dirty words."""
+        for input_name, dirty_words, encoding in CORPUS:
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            for case_sensitive in (True, False):
+                words = dirty_words if case_sensitive else [word.lower() for word in dirty_words]
+                for finding in _capture(search_file, target, dirty_words, encoding,
+                                        case_sensitive)[1]:
+                    path, _, word, strategy = parse_finding(finding)
+                    self.assertEqual(path, str(target.absolute()), finding)
+                    self.assertIn(word, words, finding)
+                    self.assertNotEqual(strategy, STRATEGY_UNKNOWN, finding)
+
+    def test_n06_reports(self) -> None:
+        """SARIF, CSV and summary reports agree with the findings and with each other."""
+        reports_dir = self.write_reports()
+        sarif = json.loads((reports_dir / 'lima.sarif').read_text(encoding='utf-8'))
+        counts = sarif['runs'][0]['properties']
+        self.assertEqual(sarif['version'], '2.1.0')
+        self.assertEqual(len(sarif['runs'][0]['results']), counts['findings'])
+        self.assertEqual(counts['words'], {'dirty': counts['findings']})
+        self.assertEqual(counts['dirs'], {ROOT_KEY: 2, 'sub': 3})
+        self.assertEqual(counts['strategies'], {STRATEGY_TEXT: 4, STRATEGY_BYTES: 1})
+        with open(reports_dir / 'lima.csv', newline='', encoding='utf-8') as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        self.assertEqual([row['finding'] for row in rows],
+                         [result['message']['text'] for result in sarif['runs'][0]['results']])
+        self.assertEqual({row['path'] for row in rows},
+                         {str((self._tree / rel_path).absolute())
+                          for rel_path in ('a.txt', 'sub/b.txt', 'sub/deeper/c.bin')})
+        self.assertIn(f'Findings: {counts["findings"]}',
+                      (reports_dir / 'lima.summary').read_text(encoding='utf-8'))
+
+
+class ReportSpecialUnitTest(ReportUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_unparsable(self) -> None:
+        """Anything else is counted, not dropped."""
+        self.set_test_input('Not a finding')
+        self.expect_return(('Not a finding', None, OTHER_KEY, STRATEGY_UNKNOWN))
+        self.run_this_test()
+
+    def test_s02_bounded_counter(self) -> None:
+        """A BoundedCounter holds max_keys keys, plus OTHER_KEY for the rest."""
+        counter = BoundedCounter(max_keys=3)
+        for num in range(1000):
+            counter.add(str(num % 10))
+        self.assertEqual(counter.most_common(), {OTHER_KEY: 700, '0': 100, '1': 100, '2': 100})
+
+    def test_s03_bounded_memory(self) -> None:
+        """A SARIF report of 200,000 findings over 50,000 files takes a few megabytes at most."""
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            report = SarifReport(devnull, root=self._tree)
+            tracemalloc.start()
+            try:
+                for num in range(200_000):
+                    report.add(f'{self._tree}/dir{num % 50_000}/file{num}.txt : line {num} : '
+                               f'"word{num}" found in "word{num}"')
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertLess(peak, 4 << 20)
+        self.assertEqual(report.stats.findings, 200_000)
+
+
+class ReportErrorUnitTest(ReportUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_format(self) -> None:
+        """ValueError: unsupported report format."""
+        with self.assertRaisesRegex(ValueError, 'Unsupported report format'):
+            open_report('xml', Path(self._temp_dir.name) / 'lima.xml')
+
+    def test_e02_bad_path(self) -> None:
+        """TypeError: output_path is not a Path."""
+        with self.assertRaisesRegex(TypeError, 'output_path'):
+            open_report(REPORT_CSV, str(Path(self._temp_dir.name) / 'lima.csv'))
+
+
+if __name__ == '__main__':
+    execute_test_cases()
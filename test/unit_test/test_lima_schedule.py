@@ -0,0 +1,190 @@
+"""Creates the SearchDirSchedule test classes.
+
+    Facilitate unit testing of lima.lima_search.search_dir(schedule=..., time_budget=...) by
+    searching a temporary directory tree in each order, and with budgets that run out.
+
+    Typical usage example:
+
+    python -m unittest                                  # Runs every test case it can find
+    python -m test.unit_test                            # Runs all unit test cases
+    python -m test.unit_test.test_lima_schedule         # Runs only these test cases
+    python -m test.unit_test.test_lima_schedule -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_checkpoint import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_schedule import (SCHEDULE_EXTENSION, SCHEDULE_NEWEST,  # noqa: E402
+                                SCHEDULE_SMALLEST, SCHEDULE_STATS, get_schedule)
+from lima.lima_search import search_dir  # noqa: E402
+
+
+# Relative path -> contents of the directory tree, oldest first
+TREE = {'a.txt': 'dirty and dirty\n', 'b.iso': 'dirty\n', 'sub/c.log': 'clean!\n',
+        'sub/d.txt': 'one dirty\n'}
+WEIGHTS = {'.txt': -1, '.iso': 5}  # Extension weights: text first, disk images last
+
+
+class SearchDirScheduleUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_dir() with a schedule and captures the findings, in order."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the tree
+        self._tree = None      # Directory to search
+
+    def setUp(self) -> None:
+        """Create the directory tree, each file a minute newer than the last."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._tree = Path(self._temp_dir.name) / 'tree'
+        for num, (rel_path, contents) in enumerate(TREE.items()):
+            (self._tree / rel_path).parent.mkdir(parents=True, exist_ok=True)
+            (self._tree / rel_path).write_text(contents)
+            os.utime(self._tree / rel_path, (1_000_000 + 60 * num, 1_000_000 + 60 * num))
+        SCHEDULE_STATS.reset()
+
+    def tearDown(self) -> None:
+        """Remove the directory tree."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_dir() return value and the findings, in order.
+        """
+        return _capture(search_dir, *self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_expected(self, rel_paths: List[str]) -> Tuple[int, List[str]]:
+        """Findings for the dirty files in rel_paths, in that order."""
+        findings = []  # Expected findings
+        for rel_path in rel_paths:
+            line = TREE[rel_path].rstrip('\n')
+            if 'dirty' in line:
+                findings.append(f'{(self._tree / rel_path).absolute()} : line 1 : "dirty" '
+                                f'found in "{line}"')
+        return (3 if findings else 0), findings
+
+    def get_order(self, schedule: str) -> List[str]:
+        """Relative paths of the tree, in schedule order."""
+        return [file_path.relative_to(self._tree).as_posix()
+                for file_path, _ in get_schedule(self._tree, True, schedule, WEIGHTS)]
+
+
+class SearchDirScheduleNormalUnitTest(SearchDirScheduleUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_smallest(self) -> None:
+        """Smallest first: findings come out in size order."""
+        order = ['b.iso', 'sub/c.log', 'sub/d.txt', 'a.txt']
+        self.assertEqual(self.get_order(SCHEDULE_SMALLEST), order)
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            schedule=SCHEDULE_SMALLEST)
+        self.expect_return(self.get_expected(order))
+        self.run_this_test()
+        self.assertEqual((SCHEDULE_STATS.searched, SCHEDULE_STATS.unsearched), (4, []))
+
+    def test_n02_newest(self) -> None:
+        """Newest first: findings come out in reverse modification order."""
+        order = ['sub/d.txt', 'sub/c.log', 'b.iso', 'a.txt']
+        self.assertEqual(self.get_order(SCHEDULE_NEWEST), order)
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            schedule=SCHEDULE_NEWEST)
+        self.expect_return(self.get_expected(order))
+        self.run_this_test()
+
+    def test_n03_extension(self) -> None:
+        """Extension weights: lowest weight first, then smallest, unlisted extensions weigh 0."""
+        order = ['sub/d.txt', 'a.txt', 'sub/c.log', 'b.iso']
+        self.assertEqual(self.get_order(SCHEDULE_EXTENSION), order)
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            schedule=SCHEDULE_EXTENSION, extension_weights=WEIGHTS)
+        self.expect_return(self.get_expected(order))
+        self.run_this_test()
+
+    def test_n04_budget_parity(self) -> None:
+        """A budget that doesn't run out finds everything an unscheduled search finds."""
+        return_value, findings = _capture(search_dir, self._tree, ['dirty'], 'utf-8',
+                                          recursive=True)
+        for schedule in (None, SCHEDULE_SMALLEST, SCHEDULE_NEWEST, SCHEDULE_EXTENSION):
+            scheduled = _capture(search_dir, self._tree, ['dirty'], 'utf-8', recursive=True,
+                                 schedule=schedule, time_budget=60.0)
+            self.assertEqual((scheduled[0], sorted(scheduled[1])), (return_value, sorted(findings)))
+
+    def test_n05_budget_runs_out(self) -> None:
+        """A spent budget searches nothing and records every file, in schedule order."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            schedule=SCHEDULE_SMALLEST, time_budget=0)
+        self.expect_return((0, []))
+        self.run_this_test()
+        self.assertEqual(SCHEDULE_STATS.unsearched,
+                         [str(self._tree / rel_path) for rel_path in self.get_order(
+                             SCHEDULE_SMALLEST)])
+        self.assertEqual(SCHEDULE_STATS.unsearched_bytes, sum(len(text) for text in TREE.values()))
+        self.assertIn('4 files (39 bytes) not searched', SCHEDULE_STATS.summary())
+
+    def test_n06_not_recursive(self) -> None:
+        """Not recursive: child directories are not scheduled."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', schedule=SCHEDULE_SMALLEST)
+        self.expect_return(self.get_expected(['b.iso', 'a.txt']))
+        self.run_this_test()
+
+    def test_n07_checkpoint(self) -> None:
+        """A budgeted search with a checkpoint resumes where the budget ran out."""
+        checkpoint = Path(self._temp_dir.name) / 'scan.ckpt'
+        _capture(search_dir, self._tree, ['dirty'], 'utf-8', recursive=True,
+                 checkpoint_path=checkpoint, schedule=SCHEDULE_SMALLEST, time_budget=0)
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', recursive=True,
+                            checkpoint_path=checkpoint, schedule=SCHEDULE_SMALLEST)
+        self.expect_return(self.get_expected(self.get_order(SCHEDULE_SMALLEST)))
+        self.run_this_test()
+
+
+class SearchDirScheduleErrorUnitTest(SearchDirScheduleUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_schedule(self) -> None:
+        """ValueError: unsupported schedule."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', schedule='largest')
+        self.expect_exception(ValueError, 'Unsupported schedule')
+        self.run_this_test()
+
+    def test_e02_negative_budget(self) -> None:
+        """ValueError: negative time_budget."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', time_budget=-1.0)
+        self.expect_exception(ValueError, 'time_budget')
+        self.run_this_test()
+
+    def test_e03_bad_budget_type(self) -> None:
+        """TypeError: time_budget is not a number."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', time_budget='60')
+        self.expect_exception(TypeError, 'time_budget')
+        self.run_this_test()
+
+    def test_e04_bad_weight(self) -> None:
+        """TypeError: extension weight is not an integer."""
+        self.set_test_input(self._tree, ['dirty'], 'utf-8', schedule=SCHEDULE_EXTENSION,
+                            extension_weights={'.txt': 'heavy'})
+        self.expect_exception(TypeError, 'extension_weights')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
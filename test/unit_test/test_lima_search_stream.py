@@ -0,0 +1,134 @@
+"""Creates the SearchStream test classes.
+
+    Facilitate unit testing of lima.lima_search.search_stream() by proving a streamed search
+    reports the same findings as search_file() across the existing test corpus, no matter where
+    the chunk boundaries fall.
+
+    Typical usage example:
+
+    python -m unittest                                       # Runs every test case it can find
+    python -m test.unit_test                                 # Runs all unit test cases
+    python -m test.unit_test.test_lima_search_stream         # Runs only these test cases
+    python -m test.unit_test.test_lima_search_stream -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import Any, List, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_search import MAX_LINE_LENGTH, search_file, search_stream  # noqa: E402
+
+
+CHUNK_SIZES = [1, 3, 4096]  # Chunk sizes that put boundaries inside words, BOMs and \r\n
+
+
+class SearchStreamUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_stream() and captures the findings."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def call_callable(self) -> Tuple[int, List[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_stream() return value and the lines printed to stderr.
+        """
+        return _capture(search_stream, *self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def run_parity(self, case_sensitive: bool) -> None:
+        """Compare streamed findings to search_file() for every CORPUS entry and chunk size."""
+        for input_name, dirty_words, encoding in CORPUS:
+            target = Path(self._test_input_dir) / self._input_filename.format(input_name)
+            expected = _capture(search_file, target, dirty_words, encoding, case_sensitive)
+            for chunk_size in CHUNK_SIZES:
+                # TEST SETUP
+                self.set_test_input(BytesIO(target.read_bytes()), dirty_words, encoding,
+                                    case_sensitive, label=str(target.absolute()),
+                                    chunk_size=chunk_size)
+                self.expect_return(expected)
+                # RUN IT
+                self.run_this_test()
+
+
+class SearchStreamNormalUnitTest(SearchStreamUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_parity(self) -> None:
+        """Streamed findings match search_file() findings."""
+        self.run_parity(case_sensitive=True)
+
+    def test_n02_parity_case_insensitive(self) -> None:
+        """Streamed findings match search_file() findings; case insensitive."""
+        self.run_parity(case_sensitive=False)
+
+    def test_n03_text(self) -> None:
+        """Text lines are reported with the same line numbers, across every newline style."""
+        self.set_test_input(BytesIO(b'one\r\ntwo dirty\rthree\nfour dirty'), ['dirty'], 'utf-8',
+                            chunk_size=4)
+        self.expect_return((3, ['<stdin> : line 2 : "dirty" found in "two dirty"',
+                                '<stdin> : line 4 : "dirty" found in "four dirty"']))
+        self.run_this_test()
+
+    def test_n04_long_line(self) -> None:
+        """A line longer than MAX_LINE_LENGTH is searched in pieces, straddled words included."""
+        data = b'x' * (MAX_LINE_LENGTH - 2) + b'dirty' + b'x' * MAX_LINE_LENGTH + b'\nclean'
+        return_value, findings = _capture(search_stream, BytesIO(data), ['dirty'], 'utf-8',
+                                          chunk_size=4096)
+        self.assertEqual(return_value, 3)
+        self.assertEqual(len(findings), 1)
+        self.assertTrue(findings[0].startswith('<stdin> : line 1 : "dirty" found in "'))
+
+
+class SearchStreamErrorUnitTest(SearchStreamUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_not_a_stream(self) -> None:
+        """TypeError: stream is not a binary stream."""
+        self.set_test_input(b'dirty', ['dirty'], 'utf-8')
+        self.expect_exception(TypeError, 'stream')
+        self.run_this_test()
+
+    def test_e02_bad_chunk_size(self) -> None:
+        """ValueError: chunk_size less than 1."""
+        self.set_test_input(BytesIO(b'dirty'), ['dirty'], 'utf-8', chunk_size=0)
+        self.expect_exception(ValueError, 'chunk_size')
+        self.run_this_test()
+
+    def test_e03_empty_dirty_words(self) -> None:
+        """ValueError: empty dirty word list."""
+        self.set_test_input(BytesIO(b'dirty'), [], 'utf-8')
+        self.expect_exception(ValueError, 'empty')
+        self.run_this_test()
+
+
+def _capture(func, *args, **kwargs) -> Tuple[int, List[str]]:
+    """Call func and capture everything it printed to stderr."""
+    stderr = StringIO()  # Captured findings
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+        with RedirectStdStreams(stdout=devnull, stderr=stderr):
+            return_value = func(*args, **kwargs)
+    return return_value, stderr.getvalue().splitlines()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
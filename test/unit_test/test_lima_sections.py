@@ -0,0 +1,171 @@
+"""Creates the SearchFileSections test classes.
+
+    Facilitate unit testing of lima.lima_search.search_file(sections=...) and lima.lima_sections
+    by searching the ELF and PE test inputs with and without section-aware extraction.
+
+    Typical usage example:
+
+    python -m unittest                                  # Runs every test case it can find
+    python -m test.unit_test                            # Runs all unit test cases
+    python -m test.unit_test.test_lima_sections         # Runs only these test cases
+    python -m test.unit_test.test_lima_sections -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List, Set, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_engine import CORPUS
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_report import parse_finding  # noqa: E402
+from lima.lima_search import search_dir, search_file  # noqa: E402
+from lima.lima_sections import (ALIGNMENT, SECTION_STATS, get_string_data,  # noqa: E402
+                                get_string_regions)
+
+
+# CORPUS entries for the ELF and PE inputs
+BINARIES = [entry for entry in CORPUS if entry[0].endswith(('.elf', '.exe'))]
+
+
+class SearchFileSectionsUnitTest(LivingManualUnitTest):
+    """Executes lima_search.search_file() and captures the dirty words found."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-{}'
+
+    def setUp(self) -> None:
+        """Zero the section stats."""
+        SECTION_STATS.reset()
+
+    def call_callable(self) -> Tuple[int, Set[str]]:
+        """Defines how to call the function.
+
+        Returns:
+            A tuple containing the search_file() return value and the dirty words found.
+        """
+        return_value, findings = _capture(search_file, *self._args, **self._kwargs)
+        return return_value, {parse_finding(finding)[2] for finding in findings}
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_target(self, input_name: str) -> Path:
+        """Path to the input_name test input."""
+        return Path(self._test_input_dir) / self._input_filename.format(input_name)
+
+    def get_regions(self, input_name: str) -> List[Tuple[int, int]]:
+        """String-bearing regions of the input_name test input."""
+        return get_string_regions(self.get_target(input_name).read_bytes())
+
+
+class SearchFileSectionsNormalUnitTest(SearchFileSectionsUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_parity(self) -> None:
+        """Section-aware searches find the same dirty words in every ELF and PE test input."""
+        for input_name, dirty_words, encoding in BINARIES:
+            for case_sensitive in (True, False):
+                self.set_test_input(self.get_target(input_name), dirty_words, encoding,
+                                    case_sensitive)
+                self.expect_return(self.call_callable())
+                self.set_test_input(self.get_target(input_name), dirty_words, encoding,
+                                    case_sensitive, sections=True)
+                self.run_this_test()
+        self.assertEqual((SECTION_STATS.binaries, SECTION_STATS.unparsed), (len(BINARIES) * 2, 0))
+        self.assertLess(SECTION_STATS.kept_bytes, SECTION_STATS.total_bytes / 2)
+
+    def test_n02_elf(self) -> None:
+        """ELF: only .rodata and .data are kept, aligned."""
+        regions = self.get_regions('Normal05-input.elf')
+        data = self.get_target('Normal05-input.elf').read_bytes()
+        self.assertEqual(len(regions), 2)
+        self.assertTrue(all(start % ALIGNMENT == 0 for start, _ in regions))
+        self.assertIn(b'Waiting...', data[regions[0][0]:regions[0][1]])
+        self.assertNotIn(b'ELF', get_string_data(data))
+
+    def test_n03_pe(self) -> None:
+        """PE: the .NET string heaps and .rsrc are kept, the code and headers are not."""
+        data = self.get_target('Normal09-input.exe').read_bytes()
+        string_data = get_string_data(data)
+        self.assertIn(b'HelloWorld', string_data)                 # #Strings
+        self.assertIn('Dragon Feet'.encode('utf-16-le'), string_data)  # #US
+        self.assertIn('VS_VERSION_INFO'.encode('utf-16-le'), string_data)  # .rsrc
+        self.assertNotIn(b'This program cannot be run in DOS mode', string_data)
+        self.assertNotIn(b'BSJB', string_data)
+
+    def test_n04_not_a_binary(self) -> None:
+        """Everything else is searched whole, text strategy and all."""
+        input_name, dirty_words, encoding = CORPUS[1]
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding)
+        self.expect_return(self.call_callable())
+        self.set_test_input(self.get_target(input_name), dirty_words, encoding, sections=True)
+        self.run_this_test()
+        self.assertEqual((SECTION_STATS.binaries, SECTION_STATS.unparsed), (0, 1))
+
+    def test_n05_search_dir(self) -> None:
+        """search_dir() passes sections to every file (the two ELF inputs are the same binary)."""
+        with TemporaryDirectory() as temp_dir:
+            for input_name, _, _ in BINARIES[:4]:
+                (Path(temp_dir) / input_name).write_bytes(
+                    self.get_target(input_name).read_bytes())
+            return_value, findings = _capture(search_dir, Path(temp_dir), ['Waiting...'],
+                                              'utf-8', sections=True)
+        self.assertEqual((return_value, len(findings)), (3, 2))
+        self.assertEqual(SECTION_STATS.binaries, 4)
+
+
+class SearchFileSectionsSpecialUnitTest(SearchFileSectionsUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_truncated(self) -> None:
+        """Truncated or malformed binaries are searched whole."""
+        for input_name in ('Normal05-input.elf', 'Normal09-input.exe'):
+            data = self.get_target(input_name).read_bytes()
+            for size in (2, 64, 200):
+                self.assertIsNone(get_string_regions(data[:size]), (input_name, size))
+        self.assertIsNone(get_string_regions(b'MZ' + b'\xff' * 100))
+        self.assertIsNone(get_string_regions(b'\x7fELF' + b'\x09' * 100))
+
+    def test_s02_code_is_skipped(self) -> None:
+        """A dirty word outside every string section is no longer found: the trade-off."""
+        data = bytearray(self.get_target('Normal04-input.elf').read_bytes())
+        offset = self.get_regions('Normal04-input.elf')[0][0] - 64  # Code, just before .rodata
+        data[offset:offset + 5] = b'dirty'
+        with TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / 'patched.elf'
+            target.write_bytes(bytes(data))
+            self.set_test_input(target, ['dirty'], 'utf-8')
+            self.expect_return((3, {'dirty'}))
+            self.run_this_test()
+            self.set_test_input(target, ['dirty'], 'utf-8', sections=True)
+            self.expect_return((0, set()))
+            self.run_this_test()
+
+
+class SearchFileSectionsErrorUnitTest(SearchFileSectionsUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_sections_type(self) -> None:
+        """TypeError: sections is not a bool."""
+        self.set_test_input(self.get_target('Normal05-input.elf'), ['dirty'], 'utf-8',
+                            sections='yes')
+        self.expect_exception(TypeError, 'sections')
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,303 @@
+"""Creates the ForwardRequest test classes.
+
+    Facilitate unit testing of lima.lima_server by forwarding searches to a LIMA server running
+    in a background thread.
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_server         # Runs only these test cases
+    python -m test.unit_test.test_lima_server -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+import base64
+import json
+import os
+import socket
+import stat
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_client import (RESP_DONE, RESP_ERROR, RESP_RESULT,  # noqa: E402
+                              forward_request, get_words_digest, request_scan)
+from lima.lima_server import serve  # noqa: E402
+
+
+class ForwardRequestUnitTest(LivingManualUnitTest):
+    """Executes an lima_server.forward_request() unit test against a live server."""
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Template input filename
+        self._input_filename = 'LIMA-unit_test-lima_search-Normal{}-input.{}'
+        self._temp_dir = None       # TemporaryDirectory holding the socket and word list
+        self._socket_path = None    # Server socket
+        self._words_path = None     # Server word list
+        self._stop_event = None     # Stops the server
+        self._server = None         # Server thread
+
+    def setUp(self) -> None:
+        """Start a LIMA server holding a small word list."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._socket_path = Path(self._temp_dir.name) / 'lima.sock'
+        self._words_path = Path(self._temp_dir.name) / 'words.txt'
+        self._words_path.write_text('Before Guido\nWaiting...\nDragon Feet\n')
+        self._stop_event = Event()
+        self._server = Thread(target=self._serve)
+        self._server.start()
+        while not self._socket_path.exists() and self._server.is_alive():
+            time.sleep(0.05)
+
+    def tearDown(self) -> None:
+        """Stop the LIMA server."""
+        self._stop_event.set()
+        self._server.join()
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> Any:
+        """Defines how to call the function."""
+        # LOCAL VARIABLES
+        return_value = None  # Return value from function call
+
+        # CALL IT
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for output
+            with RedirectStdStreams(stdout=devnull, stderr=devnull):
+                return_value = forward_request(*self._args, **self._kwargs)
+
+        # DONE
+        return return_value
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def fake_server(self, responses: List[Dict[str, Any]]) -> Tuple[Path, Thread]:
+        """Answer one request with responses, then hang up, like a server that died.
+
+        Returns:
+            The fake server's socket, and the thread serving it.
+        """
+        socket_path = Path(self._temp_dir.name) / 'fake.sock'
+        server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server_sock.bind(str(socket_path))
+        server_sock.listen(1)
+
+        def answer() -> None:
+            with server_sock, server_sock.accept()[0] as conn, conn.makefile('rwb') as stream:
+                stream.readline()
+                for response in responses:
+                    stream.write(json.dumps(response).encode() + b'\n')
+
+        fake = Thread(target=answer)
+        fake.start()
+        return socket_path, fake
+
+    def _serve(self) -> None:
+        """Run the server until the test is done."""
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for output
+            with RedirectStdStreams(stderr=devnull):
+                serve(socket_path=self._socket_path, words_path=self._words_path,
+                      encoding='utf-8', workers=2, stop_event=self._stop_event)
+
+
+class ForwardRequestNormalUnitTest(ForwardRequestUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_file_clean(self) -> None:
+        """Forwarded file: no dirty words found."""
+        target = Path(self._test_input_dir) / self._input_filename.format('10', 'zip')
+        self.set_test_input(words_path=self._words_path, encoding='utf-8', file_path=target,
+                            socket_path=self._socket_path)
+        self.expect_return(0)
+        self.run_this_test()
+
+    def test_n02_file_dirty(self) -> None:
+        """Forwarded file: dirty words found."""
+        target = Path(self._test_input_dir) / self._input_filename.format('02', 'txt')
+        self.set_test_input(words_path=self._words_path, encoding='utf-8', file_path=target,
+                            socket_path=self._socket_path)
+        self.expect_return(3)
+        self.run_this_test()
+
+    def test_n03_dir_dirty(self) -> None:
+        """Forwarded directory: dirty words found."""
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), socket_path=self._socket_path)
+        self.expect_return(3)
+        self.run_this_test()
+
+    def test_n04_no_server(self) -> None:
+        """No server listening: the caller must search locally."""
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir),
+                            socket_path=Path(self._temp_dir.name) / 'missing.sock')
+        self.expect_return(None)
+        self.run_this_test()
+
+    def test_n05_different_words(self) -> None:
+        """Server holds a different word list: the caller must search locally."""
+        other_words = Path(self._temp_dir.name) / 'other.txt'
+        other_words.write_text('Before Guido\n')
+        self.set_test_input(words_path=other_words, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), socket_path=self._socket_path)
+        self.expect_return(None)
+        self.run_this_test()
+
+    def test_n06_different_encoding(self) -> None:
+        """Server uses a different encoding: the caller must search locally."""
+        self.set_test_input(words_path=self._words_path, encoding='utf-16',
+                            dir_path=Path(self._test_input_dir), socket_path=self._socket_path)
+        self.expect_return(None)
+        self.run_this_test()
+
+    def test_n07_different_extract(self) -> None:
+        """Server doesn't extract documents: the caller must search locally."""
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), extract=True,
+                            socket_path=self._socket_path)
+        self.expect_return(None)
+        self.run_this_test()
+
+
+    def test_n08_different_subsume(self) -> None:
+        """Server doesn't drop subsumed dirty words: the caller must search locally."""
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), subsume=True,
+                            socket_path=self._socket_path)
+        self.expect_return(None)
+        self.run_this_test()
+
+
+class ForwardRequestSpecialUnitTest(ForwardRequestUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_payload_batch(self) -> None:
+        """Raw byte payloads are searched without touching the disk."""
+        request = {'words_digest': get_words_digest(self._words_path), 'encoding': 'utf-8',
+                   'case_sensitive': True, 'engine': 'auto'}
+        items = [{'payload': base64.b64encode(b'nothing here').decode(), 'name': 'clean'},
+                 {'payload': base64.b64encode(b'\xff\xfeDragon Feet').decode(), 'name': 'dirty'}]
+        responses = list(request_scan(socket_path=self._socket_path, request=request,
+                                      items=items))
+        self.assertEqual([(resp['type'], resp.get('name'), resp['code']) for resp in responses],
+                         [(RESP_RESULT, 'clean', 0), (RESP_RESULT, 'dirty', 3),
+                          (RESP_DONE, None, 3)])
+        self.assertEqual(responses[1]['findings'],
+                         ["dirty : 'Dragon Feet' found in binary file using utf-8"])
+
+    def test_s02_reloaded_words(self) -> None:
+        """The server, and its workers, reload a changed word list before searching."""
+        target = Path(self._test_input_dir) / self._input_filename.format('02', 'txt')
+        self.set_test_input(words_path=self._words_path, encoding='utf-8', file_path=target,
+                            socket_path=self._socket_path)
+        self.expect_return(3)
+        self.run_this_test()
+        self._words_path.write_text('not here\n')
+        self.expect_return(0)
+        self.run_this_test()
+        self._words_path.write_text('not here\nfix my code\n')
+        self.expect_return(3)
+        self.run_this_test()
+
+    def test_s03_server_went_away(self) -> None:
+        """The server hangs up after findings were emitted: fail instead of reporting twice."""
+        socket_path, fake = self.fake_server([
+            {'type': RESP_RESULT, 'name': 'a', 'code': 3, 'findings': ['a : dirty']}])
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), socket_path=socket_path)
+        self.expect_exception(ConnectionError, '--local')
+        self.run_this_test()
+        fake.join()
+
+    def test_s04_server_went_away_early(self) -> None:
+        """The server hangs up before any finding was emitted: the caller may search locally."""
+        socket_path, fake = self.fake_server([
+            {'type': RESP_RESULT, 'name': 'a', 'code': 0, 'findings': []}])
+        self.set_test_input(words_path=self._words_path, encoding='utf-8',
+                            dir_path=Path(self._test_input_dir), socket_path=socket_path)
+        self.expect_return(None)
+        self.run_this_test()
+        fake.join()
+
+    def test_s05_item_error(self) -> None:
+        """An item the server fails to search is reported, and the directory search goes on."""
+        socket_path, fake = self.fake_server([
+            {'type': RESP_ERROR, 'name': 'a', 'message': 'a: Permission denied'},
+            {'type': RESP_RESULT, 'name': 'b', 'code': 3, 'findings': ['b : dirty']},
+            {'type': RESP_DONE, 'code': 3}])
+        stderr = StringIO()  # Captured findings and errors
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for stdout
+            with RedirectStdStreams(stdout=devnull, stderr=stderr):
+                return_value = forward_request(words_path=self._words_path, encoding='utf-8',
+                                               dir_path=Path(self._test_input_dir),
+                                               socket_path=socket_path)
+        fake.join()
+        self.assertEqual((return_value, stderr.getvalue().splitlines()),
+                         (3, ['ERROR: a: Permission denied', 'b : dirty']))
+
+    def test_s06_untrusted_socket(self) -> None:
+        """A socket owned by another user, or that others may write to, is ignored."""
+        target = Path(self._test_input_dir) / self._input_filename.format('10', 'zip')
+        self.set_test_input(words_path=self._words_path, encoding='utf-8', file_path=target,
+                            socket_path=self._socket_path)
+        self.expect_return(None)
+        with mock.patch.object(os, 'getuid', return_value=os.getuid() + 1):
+            self.run_this_test()
+        for mode in (0o620, 0o602):
+            os.chmod(self._socket_path, mode)
+            self.run_this_test()
+        os.chmod(self._socket_path, 0o600)  # As the server made it
+        self.expect_return(0)
+        self.run_this_test()
+
+    def test_s07_not_a_socket(self) -> None:
+        """A file, or a symlink to the server's socket, is ignored."""
+        target = Path(self._test_input_dir) / self._input_filename.format('10', 'zip')
+        for name in ('file', 'link'):
+            socket_path = Path(self._temp_dir.name) / name
+            if name == 'file':
+                socket_path.write_text('')
+            else:
+                socket_path.symlink_to(self._socket_path)
+            self.set_test_input(words_path=self._words_path, encoding='utf-8', file_path=target,
+                                socket_path=socket_path)
+            self.expect_return(None)
+            self.run_this_test()
+
+    def test_s08_socket_dir(self) -> None:
+        """The server's socket is its user's alone, and so is the default socket directory."""
+        self.assertEqual(stat.S_IMODE(os.lstat(self._socket_path).st_mode), 0o600)
+        socket_dir = Path(self._temp_dir.name) / 'lima-uid'
+        stop_event = Event()  # Already set: serve() binds, then returns
+        stop_event.set()
+        with mock.patch('lima.lima_server.DEFAULT_SOCKET_DIR', socket_dir), \
+                open(os.devnull, 'w', encoding='utf-8') as devnull, \
+                RedirectStdStreams(stderr=devnull):
+            serve(socket_path=socket_dir / 'lima.sock', words_path=self._words_path,
+                  encoding='utf-8', workers=1, stop_event=stop_event)
+            self.assertEqual(stat.S_IMODE(os.lstat(socket_dir).st_mode), 0o700)
+            socket_dir.chmod(0o777)  # As if another user had made it first
+            with self.assertRaisesRegex(OSError, 'only you may enter'):
+                serve(socket_path=socket_dir / 'lima.sock', words_path=self._words_path,
+                      encoding='utf-8', workers=1, stop_event=stop_event)
+
+
+if __name__ == '__main__':
+    execute_test_cases()
@@ -0,0 +1,302 @@
+"""Creates the WatchDir test classes.
+
+    Facilitate unit testing of lima.lima_watch.watch_dir().
+
+    Typical usage example:
+
+    python -m unittest                                # Runs every test case it can find
+    python -m test.unit_test                          # Runs all unit test cases
+    python -m test.unit_test.test_lima_watch          # Runs only these test cases
+    python -m test.unit_test.test_lima_watch -k n01   # Runs only this Normal 01
+"""
+# Standard Imports
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Event, Thread
+from typing import Any, Dict, Optional
+from unittest import mock
+import ctypes
+import errno
+import os
+import shutil
+import sys
+import time
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_search import RedirectStdStreams
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_watch import (INOTIFY_EVENT, IN_Q_OVERFLOW, InotifyWatcher,  # noqa: E402
+                             watch_dir)
+
+
+WATCH_TIMEOUT = 3.0  # Seconds to wait for watch_dir() to notice a change
+MAX_WATCHES = 2      # inotify watches LimitedLibc hands out
+REAL_CDLL = ctypes.CDLL  # LimitedLibc wraps it
+
+
+class LimitedLibc():
+    """libc whose inotify_add_watch() runs out of watches after MAX_WATCHES calls."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """LimitedLibc ctor, takes the ctypes.CDLL arguments."""
+        self._libc = REAL_CDLL(*args, **kwargs)
+        self._watches = 0  # Watches handed out
+
+    def __getattr__(self, name: str) -> Any:
+        """Everything else is libc's."""
+        return getattr(self._libc, name)
+
+    def inotify_add_watch(self, *args) -> int:
+        """Fail with ENOSPC, like the kernel at fs.inotify.max_user_watches."""
+        if self._watches >= MAX_WATCHES:
+            ctypes.set_errno(errno.ENOSPC)
+            return -1
+        self._watches += 1
+        return self._libc.inotify_add_watch(*args)
+
+
+class WatchDirUnitTest(LivingManualUnitTest):
+    """Executes an lima_watch.watch_dir() unit test.
+
+    Files listed in self._writes are written after the initial pass starts, or deleted if their
+    contents are None.  The watcher is stopped once WATCH_TIMEOUT expires.
+    """
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        # Relative filename -> contents to write while watching, None to delete it
+        self._writes: Dict[str, Optional[str]] = {}
+
+    def call_callable(self) -> int:
+        """Defines how to call the function."""
+        # LOCAL VARIABLES
+        return_value = None                         # Return value from function call
+        stop_event = Event()                        # Stops watch_dir()
+        writer = Thread(target=self._write_files, args=(stop_event,))
+
+        # CALL IT
+        self._kwargs['stop_event'] = stop_event
+        writer.start()
+        try:
+            with open(os.devnull, 'w', encoding='utf-8') as devnull:  # Shunt for output
+                with RedirectStdStreams(stdout=devnull, stderr=devnull):
+                    return_value = watch_dir(*self._args, **self._kwargs)
+        finally:
+            stop_event.set()
+            writer.join()
+
+        # DONE
+        return return_value
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def _write_files(self, stop_event: Event) -> None:
+        """Write self._writes into the watched directory, in bursts, then stop the watcher."""
+        dir_path = self._kwargs['dir_path']
+        if stop_event.wait(0.5):  # Let the initial pass finish
+            return
+        for filename, contents in self._writes.items():
+            if contents is None:
+                shutil.rmtree(dir_path / filename)
+                continue
+            (dir_path / filename).parent.mkdir(parents=True, exist_ok=True)
+            with open(dir_path / filename, 'w', encoding='utf-8') as out_file:
+                for word in contents.split(' '):
+                    out_file.write(word + ' ')
+                    out_file.flush()
+        stop_event.wait(WATCH_TIMEOUT)
+        stop_event.set()
+
+
+class WatchDirNormalUnitTest(WatchDirUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_clean(self) -> None:
+        """Clean file written: no dirty words found."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            self._writes = {'clean.txt': 'nothing to see here'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8')
+            self.expect_return(0)
+            # RUN IT
+            self.run_this_test()
+
+    def test_n02_dirty(self) -> None:
+        """Dirty file written after the initial pass: dirty words found."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            self._writes = {'dirty.txt': 'this file is dirty'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8')
+            self.expect_return(3)
+            # RUN IT
+            self.run_this_test()
+
+    def test_n03_dirty_poll(self) -> None:
+        """Dirty file written after the initial pass: dirty words found by polling."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            self._writes = {'dirty.txt': 'this file is dirty'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8',
+                                poll=True)
+            self.expect_return(3)
+            # RUN IT
+            self.run_this_test()
+
+    def test_n04_dirty_new_subdir(self) -> None:
+        """Dirty file written to a new child directory: dirty words found."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            self._writes = {os.path.join('new', 'dirty.txt'): 'this file is dirty'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8',
+                                recursive=True)
+            self.expect_return(3)
+            # RUN IT
+            self.run_this_test()
+
+    def test_n05_dirty_new_subdir_not_recursive(self) -> None:
+        """Dirty file written to a new child directory without recursion: no dirty words found."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            self._writes = {os.path.join('new', 'dirty.txt'): 'this file is dirty'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8')
+            self.expect_return(0)
+            # RUN IT
+            self.run_this_test()
+
+
+class WatchDirSpecialUnitTest(WatchDirUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_reloaded_words(self) -> None:
+        """Words added to the --words file while watching are found in later writes."""
+        with TemporaryDirectory() as temp_dir, TemporaryDirectory() as words_dir:
+            # TEST SETUP
+            words_path = Path(words_dir) / 'words.txt'
+            words_path.write_text('dirty\n')
+            # Written word by word, so the new dirty word is 'filthy ', with a trailing space
+            self._writes = {str(words_path): 'dirty\nfilthy', 'filthy.txt': 'this file is filthy'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8',
+                                words_path=words_path)
+            self.expect_return(3)
+            # RUN IT
+            self.run_this_test()
+
+    def test_s02_watch_limit(self) -> None:
+        """Past the watch limit, watched directories keep inotify and the rest are polled."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            dir_path = Path(temp_dir)
+            for child in ('a', 'b', 'c', os.path.join('c', 'd')):
+                (dir_path / child).mkdir()
+            stderr = StringIO()  # Captured warning
+            with mock.patch.object(ctypes, 'CDLL', LimitedLibc), \
+                    RedirectStdStreams(stderr=stderr):
+                watcher = InotifyWatcher(dir_path=dir_path, recursive=True)
+            self.assertIn('fs.inotify.max_user_watches = ', stderr.getvalue())
+            self.assertIn(f'with {MAX_WATCHES} directories watched', stderr.getvalue())
+            # RUN IT
+            try:
+                expected = {dir_path / child / 'dirty.txt'
+                            for child in ('', 'a', 'b', 'c', os.path.join('c', 'd'))}
+                for file_path in expected:
+                    file_path.write_text('dirty')
+                changed = set()  # Files the watcher reported
+                deadline = time.monotonic() + WATCH_TIMEOUT
+                while changed != expected and time.monotonic() < deadline:
+                    changed.update(watcher.read_events(timeout=0.1))
+            finally:
+                watcher.close()
+            self.assertEqual(changed, expected)
+
+    def test_s03_watch_limit_new_subdir(self) -> None:
+        """Dirty file written to a new child directory past the watch limit: dirty words found."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            for child in ('a', 'b'):
+                (Path(temp_dir) / child).mkdir()
+            self._writes = {os.path.join('new', 'dirty.txt'): 'this file is dirty'}
+            self.set_test_input(dir_path=Path(temp_dir), dw_list=['dirty'], encoding='utf-8',
+                                recursive=True)
+            self.expect_return(3)
+            # RUN IT
+            with mock.patch.object(ctypes, 'CDLL', LimitedLibc):
+                self.run_this_test()
+
+    def test_s04_queue_overflow(self) -> None:
+        """After an inotify queue overflow, files changed while events were lost are reported."""
+        with TemporaryDirectory() as temp_dir:
+            # TEST SETUP
+            dir_path = Path(temp_dir)
+            (dir_path / 'a').mkdir()
+            (dir_path / 'old.txt').write_text('dirty')
+            os.utime(dir_path / 'old.txt', (time.time() - 3600,) * 2)  # Long since searched
+            watcher = InotifyWatcher(dir_path=dir_path, recursive=True)
+            # Written while the queue overflowed: a file, and a new directory and its file
+            expected = {dir_path / 'a' / 'new.txt', dir_path / 'b' / 'inner.txt'}
+            for file_path in expected:
+                file_path.parent.mkdir(exist_ok=True)
+                file_path.write_text('dirty')
+            stderr = StringIO()  # Captured warning
+            # RUN IT
+            try:
+                with mock.patch.object(os, 'read', return_value=INOTIFY_EVENT.pack(
+                        -1, IN_Q_OVERFLOW, 0, 0)), RedirectStdStreams(stderr=stderr):
+                    changed = set(watcher.read_events(timeout=WATCH_TIMEOUT))
+                (dir_path / 'b' / 'later.txt').write_text('dirty')  # b is watched now
+                deadline = time.monotonic() + WATCH_TIMEOUT
+                while dir_path / 'b' / 'later.txt' not in changed \
+                        and time.monotonic() < deadline:
+                    changed.update(watcher.read_events(timeout=0.1))
+            finally:
+                watcher.close()
+            self.assertIn('queue overflowed', stderr.getvalue())
+            self.assertEqual(changed, expected | {dir_path / 'b' / 'later.txt'})
+
+
+class WatchDirErrorUnitTest(WatchDirUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_negative_debounce(self) -> None:
+        """ValueError: negative debounce."""
+        # TEST SETUP
+        self.set_test_input(dir_path=Path(self._test_input_dir), dw_list=['dirty'],
+                            encoding='utf-8', debounce=-1.0)
+        self.expect_exception(ValueError, 'debounce')
+        # RUN IT
+        self.run_this_test()
+
+    def test_e02_not_a_dir(self) -> None:
+        """OSError: dir_path is not a directory."""
+        # TEST SETUP
+        self.set_test_input(dir_path=Path(__file__), dw_list=['dirty'], encoding='utf-8')
+        self.expect_exception(OSError, 'not a directory')
+        # RUN IT
+        self.run_this_test()
+
+    def test_e03_dir_deleted(self) -> None:
+        """FileNotFoundError: dir_path was deleted while watching, by inotify or polling."""
+        for poll in (False, True):
+            with TemporaryDirectory() as temp_dir:
+                # TEST SETUP
+                dir_path = Path(temp_dir) / 'watched'
+                (dir_path / 'sub').mkdir(parents=True)
+                self._writes = {'': None}
+                self.set_test_input(dir_path=dir_path, dw_list=['dirty'], encoding='utf-8',
+                                    recursive=True, poll=poll)
+                self.expect_exception(FileNotFoundError, 'was deleted')
+                # RUN IT
+                self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()
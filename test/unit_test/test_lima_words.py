@@ -0,0 +1,342 @@
+"""Creates the PrepareDirtyWords, WordList and StagedMatcher test classes.
+
+    Facilitate unit testing of lima.lima_words by preparing messy word lists and rewriting a
+    --words file between reloads, and of lima.lima_engine.StagedMatcher by changing a long needle
+    list a few entries at a time.
+
+    Typical usage example:
+
+    python -m unittest                               # Runs every test case it can find
+    python -m test.unit_test                         # Runs all unit test cases
+    python -m test.unit_test.test_lima_words         # Runs only these test cases
+    python -m test.unit_test.test_lima_words -k n01  # Runs only this Normal 01
+"""
+# Standard Imports
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import sys
+# Third Party Imports
+from tediousstart.tediousstart import execute_test_cases
+# Local Imports
+# pylint: disable=wrong-import-order
+from test.unit_test.lima_unit_test import LivingManualUnitTest, REPO_DIR
+from test.unit_test.test_lima_prefilter import _capture
+sys.path.insert(0, os.path.join(REPO_DIR, 'lima'))  # Put all lima_* imports after this line
+# pylint: disable=wrong-import-position
+from lima.lima_client import get_words_digest  # noqa: E402
+from lima.lima_engine import (ENGINE_AHOCORASICK, ENGINE_HYPERSCAN,  # noqa: E402
+                              STAGE_MIN_NEEDLES, Matcher, StagedMatcher,
+                              get_available_engines, get_matcher)
+from lima.lima_search import search_file  # noqa: E402
+from lima.lima_words import (WordList, describe_removed, prepare_dirty_words,  # noqa: E402
+                             reload_word_list)
+
+
+COMPACT_TIMEOUT = 30.0  # Seconds to wait for a StagedMatcher to build its full matcher
+# Long needle list: every entry is distinct, and none contains another
+NEEDLES = [f'<word {index:05d}>' for index in range(2 * STAGE_MIN_NEEDLES)]
+
+
+class PrepareDirtyWordsUnitTest(LivingManualUnitTest):
+    """Executes lima_words.prepare_dirty_words()."""
+
+    def call_callable(self) -> Tuple[List[str], Dict[str, int]]:
+        """Defines how to call the function."""
+        return prepare_dirty_words(*self._args, **self._kwargs)
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+
+class PrepareDirtyWordsNormalUnitTest(PrepareDirtyWordsUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_normalize(self) -> None:
+        """Whitespace, carriage returns and decomposed characters are normalized."""
+        self.set_test_input([' dirty\r', 'cafe\u0301', '\t', 'café', 'dirty', 'filthy'])
+        self.expect_return((['dirty', 'café', 'filthy'], {'blank': 1, 'duplicate': 2}))
+        self.run_this_test()
+
+    def test_n02_case_folding(self) -> None:
+        """Entries that only differ in case are duplicates of a search that ignores case."""
+        self.set_test_input(['Dirty', 'DIRTY', 'dirty'], case_sensitive=False)
+        self.expect_return((['Dirty'], {'duplicate': 2}))
+        self.run_this_test()
+        self.set_test_input(['Dirty', 'DIRTY', 'dirty'])
+        self.expect_return((['Dirty', 'DIRTY', 'dirty'], {}))
+        self.run_this_test()
+
+    def test_n03_subsume(self) -> None:
+        """Entries that contain a shorter entry are dropped."""
+        self.set_test_input(['topsecret', 'secrets', 'secret', 'top', 'cret'], subsume=True)
+        self.expect_return((['top', 'cret'], {'subsumed': 3}))
+        self.run_this_test()
+        self.set_test_input(['TopSecret', 'secret'], case_sensitive=False, subsume=True)
+        self.expect_return((['secret'], {'subsumed': 1}))
+        self.run_this_test()
+
+    def test_n04_describe(self) -> None:
+        """Reports list the reasons in order, and skip the ones that didn't remove anything."""
+        self.assertEqual(describe_removed({'subsumed': 1, 'blank': 2}), '2 blank, 1 subsumed')
+        self.assertEqual(describe_removed({}), '')
+
+
+class PrepareDirtyWordsSpecialUnitTest(PrepareDirtyWordsUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_byte_order_mark(self) -> None:
+        """Encoded entries that don't contain the shorter encoded entry are kept."""
+        self.set_test_input(['topsecret', 'secret'], subsume=True, encoding='utf-16')
+        self.expect_return((['topsecret', 'secret'], {}))
+        self.run_this_test()
+
+    def test_s02_same_findings(self) -> None:
+        """A subsumed list finds every file the whole list finds."""
+        target = Path(self._test_input_dir) / 'LIMA-unit_test-lima_search-Normal02-input.txt'
+        words = ['fix my code', 'my code', 'Guido', 'Before Guido']
+        prepared, _ = prepare_dirty_words(words, subsume=True)
+        self.assertEqual(prepared, ['my code', 'Guido'])
+        self.assertEqual(_capture(search_file, target, prepared, 'utf-8')[0],
+                         _capture(search_file, target, words, 'utf-8')[0])
+
+
+class PrepareDirtyWordsErrorUnitTest(PrepareDirtyWordsUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_bad_entry(self) -> None:
+        """TypeError: dw_list holds something other than str."""
+        self.set_test_input(['dirty', b'filthy'])
+        self.expect_exception(TypeError, 'dw_list entry')
+        self.run_this_test()
+
+    def test_e02_bad_encoding(self) -> None:
+        """LookupError: unknown encoding."""
+        self.set_test_input(['dirty'], subsume=True, encoding='not-an-encoding')
+        self.expect_exception(LookupError, 'not-an-encoding')
+        self.run_this_test()
+
+
+class WordListUnitTest(LivingManualUnitTest):
+    """Loads a WordList, then rewrites its file and reloads it once per entry in self._args.
+
+    Returns a list of (reload() return value, words) pairs, the first one for the initial load.
+    """
+
+    # pylint: disable=useless-super-delegation
+    def __init__(self, *args, **kwargs) -> None:
+        """LivingManualUnitTest ctor."""
+
+        super().__init__(*args, **kwargs)
+        self._temp_dir = None  # TemporaryDirectory holding the words file
+
+    def setUp(self) -> None:
+        """Create a temporary directory for the words file."""
+        self._temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+
+    def tearDown(self) -> None:
+        """Remove the words file."""
+        self._temp_dir.cleanup()
+
+    def call_callable(self) -> List[Tuple[Optional[Tuple[int, int]], List[str]]]:
+        """Defines how to call the function."""
+        # LOCAL VARIABLES
+        words_path = Path(self._temp_dir.name) / 'words.txt'  # The --words file
+        results = []  # Return value
+
+        # CALL IT
+        words_path.write_bytes(self._args[0])
+        word_list = WordList(words_path)
+        results.append((None, word_list.words))
+        for contents in self._args[1:]:
+            if contents is not None:
+                words_path.write_bytes(contents)
+            results.append((word_list.reload(), word_list.words))
+
+        # DONE
+        return results
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+
+class WordListNormalUnitTest(WordListUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_reload(self) -> None:
+        """Reloads report the words added and removed."""
+        self.set_test_input(b'dirty\nfilthy\n', b'dirty\ngrimy\nmucky\n', b'mucky\n')
+        self.expect_return([(None, ['dirty', 'filthy']), ((2, 1), ['dirty', 'grimy', 'mucky']),
+                            ((0, 2), ['mucky'])])
+        self.run_this_test()
+
+    def test_n02_unchanged(self) -> None:
+        """An untouched, or rewritten but identical, words file is not reloaded."""
+        self.set_test_input(b'dirty\n', None, b'dirty\n')
+        self.expect_return([(None, ['dirty']), (None, ['dirty']), (None, ['dirty'])])
+        self.run_this_test()
+
+    def test_n04_prepared(self) -> None:
+        """Reloaded words are prepared like the first ones, and the report is printed."""
+        words_path = Path(self._temp_dir.name) / 'words.txt'
+        words_path.write_text('dirty\n')
+        word_list = WordList(words_path, subsume=True)
+        words_path.write_text('dirty\ndirty\nextra dirty\nfilthy \n')
+        self.assertEqual(_capture(reload_word_list, word_list)[1],
+                         [f'Reloaded 2 dirty words from {words_path} (1 added, 0 removed)',
+                          'Dropped dirty word entries: 1 duplicate, 1 subsumed'])
+        self.assertEqual(word_list.words, ['dirty', 'filthy'])
+
+    def test_n03_same_as_get_dirty_words(self) -> None:
+        """A WordList holds what get_dirty_words() loads and get_words_digest() fingerprints."""
+        words_path = Path(self._temp_dir.name) / 'words.txt'
+        words_path.write_bytes(b'dirty\r\n\r\nfilthy')
+        word_list = WordList(words_path)
+        self.assertEqual(word_list.words, ['dirty', 'filthy'])
+        self.assertEqual(word_list.digest, get_words_digest(words_path))
+
+
+class WordListSpecialUnitTest(WordListUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_snapshot(self) -> None:
+        """A reload swaps in a new list, the list a search already holds is unchanged."""
+        words_path = Path(self._temp_dir.name) / 'words.txt'
+        target = Path(self._temp_dir.name) / 'a.txt'
+        target.write_text('the filthy dog\n')
+        words_path.write_text('dirty\n')
+        word_list = WordList(words_path)
+        held = word_list.words
+        words_path.write_text('dirty\nfilthy\n')
+        self.assertEqual(_capture(reload_word_list, word_list)[1],
+                         [f'Reloaded 2 dirty words from {words_path} (1 added, 0 removed)'])
+        self.assertEqual(held, ['dirty'])
+        self.assertEqual(word_list.reloads, 1)
+        self.assertEqual(_capture(search_file, target, held, 'utf-8')[0], 0)
+        self.assertEqual(_capture(search_file, target, word_list.words, 'utf-8')[0], 3)
+
+    def test_s02_emptied(self) -> None:
+        """A words file emptied mid-edit keeps the old words, and is only reported once."""
+        words_path = Path(self._temp_dir.name) / 'words.txt'
+        words_path.write_text('dirty\n')
+        word_list = WordList(words_path)
+        words_path.write_text('\n')
+        return_value, lines = _capture(reload_word_list, word_list)
+        self.assertFalse(return_value)
+        self.assertEqual(len(lines), 1)
+        self.assertIn('keeping the old dirty words', lines[0])
+        self.assertEqual(_capture(reload_word_list, word_list), (False, []))
+        self.assertEqual(word_list.words, ['dirty'])
+
+
+class WordListErrorUnitTest(WordListUnitTest):
+    """Organizes all the Error test cases."""
+
+    def test_e01_empty(self) -> None:
+        """ValueError: the words file holds no dirty words."""
+        self.set_test_input(b'\n\n')
+        self.expect_exception(ValueError, 'no dirty words')
+        self.run_this_test()
+
+    def test_e02_missing(self) -> None:
+        """FileNotFoundError: the words file is unavailable."""
+        with self.assertRaises(FileNotFoundError):
+            WordList(Path(self._temp_dir.name) / 'missing.txt')
+
+
+class StagedMatcherUnitTest(LivingManualUnitTest):
+    """Changes a long needle list, then compares get_matcher() to a Matcher built from scratch.
+
+    Every available engine that stages changes is tested.  Returns (staged?, indices found while
+    staged, indices found once compacted) for each engine.
+    """
+
+    def call_callable(self) -> List[Tuple[bool, List[int], List[int]]]:
+        """Defines how to call the function."""
+        # LOCAL VARIABLES
+        old_needles, new_needles, haystack = self._args  # Before and after, text to search
+        results = []  # Return value
+        matcher = None  # Matcher for new_needles
+
+        # CALL IT
+        for engine in self.get_engines():
+            get_matcher(old_needles, engine).search(haystack)
+            matcher = get_matcher(new_needles, engine)
+            results.append((isinstance(matcher, StagedMatcher), matcher.search(haystack), []))
+            if isinstance(matcher, StagedMatcher):
+                self.assertTrue(matcher.compacted.wait(COMPACT_TIMEOUT))
+            results[-1][2].extend(matcher.search(haystack))
+
+        # DONE
+        return results
+
+    def validate_return_value(self, return_value: Any) -> None:
+        """Defines how to validate the return value."""
+        self._validate_return_value(return_value=return_value)
+
+    def get_engines(self) -> List[str]:
+        """Available engines that stage changes, skipping the test if there are none."""
+        engines = [engine for engine in (ENGINE_AHOCORASICK, ENGINE_HYPERSCAN)
+                   if engine in get_available_engines()]
+        if not engines:
+            self.skipTest('No accelerated engine is installed')
+        return engines
+
+    def expect_staged(self, old_needles: List[Any], new_needles: List[Any], haystack: Any,
+                      staged: bool = True) -> None:
+        """Expect every engine to find what the pure-Python Matcher finds."""
+        found = Matcher(new_needles).search(haystack)
+        self.set_test_input(old_needles, new_needles, haystack)
+        self.expect_return([(staged, found, found)] * len(self.get_engines()))
+
+
+class StagedMatcherNormalUnitTest(StagedMatcherUnitTest):
+    """Organizes all the Normal test cases."""
+
+    def test_n01_added(self) -> None:
+        """Words added to a long list are staged."""
+        new_needles = NEEDLES[:100] + ['<added 1>', '<added 2>'] + NEEDLES[100:]
+        self.expect_staged(NEEDLES, new_needles, 'a <word 00007> and <added 2> and <word 02000>')
+        self.run_this_test()
+
+    def test_n02_removed(self) -> None:
+        """Words removed from a long list are no longer found."""
+        new_needles = [needle for needle in NEEDLES if needle != '<word 00007>']
+        self.expect_staged(NEEDLES, new_needles, 'a <word 00007> and <word 00008>')
+        self.run_this_test()
+
+    def test_n03_bytes(self) -> None:
+        """Encoded needle lists are staged too."""
+        old_needles = [needle.encode() for needle in NEEDLES]
+        new_needles = old_needles[1:] + [b'<added>']
+        self.expect_staged(old_needles, new_needles, b'<word 00000> <word 00001> <added>')
+        self.run_this_test()
+
+
+class StagedMatcherSpecialUnitTest(StagedMatcherUnitTest):
+    """Organizes all the Special test cases."""
+
+    def test_s01_duplicates(self) -> None:
+        """Duplicate needles each report their index."""
+        new_needles = NEEDLES + ['<word 00003>', '<added>', '<added>']
+        self.expect_staged(NEEDLES, new_needles, '<word 00003> <added>')
+        self.run_this_test()
+
+    def test_s02_too_many_changes(self) -> None:
+        """A list that changed too much is built from scratch."""
+        new_needles = NEEDLES[:STAGE_MIN_NEEDLES] + [f'<new {index}>' for index in
+                                                     range(STAGE_MIN_NEEDLES)]
+        self.expect_staged(NEEDLES, new_needles, '<word 00001> <new 1>', staged=False)
+        self.run_this_test()
+
+    def test_s03_short_list(self) -> None:
+        """A short list is always built from scratch."""
+        self.expect_staged(NEEDLES[:10], NEEDLES[:11], '<word 00010>', staged=False)
+        self.run_this_test()
+
+
+if __name__ == '__main__':
+    execute_test_cases()